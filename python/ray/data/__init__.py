@@ -6,6 +6,7 @@ from ray.data.read_api import (
     read_parquet,
     read_json,
     read_csv,
+    read_arrow_ipc,
     read_binary_files,
     from_dask,
     from_modin,
@@ -22,6 +23,7 @@ from ray.data.read_api import (
 )
 from ray.data.datasource import Datasource, ReadTask
 from ray.data.dataset import Dataset
+from ray.data.expressions import col, lit
 from ray.data.impl.progress_bar import set_progress_bars
 from ray.data.impl.compute import ActorPoolStrategy
 
@@ -35,6 +37,7 @@ __all__ = [
     "Dataset",
     "Datasource",
     "ReadTask",
+    "col",
     "from_dask",
     "from_items",
     "from_arrow",
@@ -45,12 +48,14 @@ __all__ = [
     "from_pandas",
     "from_pandas_refs",
     "from_spark",
+    "lit",
     "range",
     "range_arrow",
     "range_tensor",
     "read_text",
     "read_binary_files",
     "read_csv",
+    "read_arrow_ipc",
     "read_datasource",
     "read_json",
     "read_numpy",
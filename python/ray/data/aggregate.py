@@ -8,9 +8,11 @@ from ray.data.impl.null_aggregate import (
     _null_wrap_accumulate,
     _null_wrap_merge,
     _null_wrap_finalize,
+    _wrap_acc,
 )
 
 if TYPE_CHECKING:
+    import pandas
     from ray.data import Dataset
 
 
@@ -55,6 +57,20 @@ class AggregateFn(object):
         """Raise an error if this cannot be applied to the given dataset."""
         pass
 
+    def _supports_vectorized_combine(self, df: "pandas.DataFrame") -> bool:
+        """Whether _vectorized_combine() can be used for rows of this frame."""
+        return False
+
+    def _vectorized_combine(
+        self, groups: "pandas.core.groupby.DataFrameGroupBy"
+    ) -> List[AggType]:
+        """Return the accumulator of every group, in group order.
+
+        This is equivalent to calling init() and then accumulate() on each row
+        of every group, but runs as vectorized pandas group-by kernels.
+        """
+        raise NotImplementedError
+
 
 class _AggregateOnKeyBase(AggregateFn):
     def _set_key_fn(self, on: KeyFn):
@@ -63,6 +79,54 @@ class _AggregateOnKeyBase(AggregateFn):
     def _validate(self, ds: "Dataset") -> None:
         _validate_key_fn(ds, self._key_fn)
 
+    def _set_vectorized_kernel(
+        self,
+        ignore_nulls: bool,
+        init_acc: AggType,
+        kernel: Callable[["pandas.core.groupby.SeriesGroupBy"], List[AggType]],
+    ):
+        """Set the group-by kernel used for vectorized combining.
+
+        Args:
+            ignore_nulls: Whether nulls are ignored by this aggregation.
+            init_acc: The accumulator of a group without any non-null values,
+                before null wrapping.
+            kernel: Computes the accumulator of each group over its non-null
+                values, before null wrapping.
+        """
+        self._ignore_nulls = ignore_nulls
+        self._init_acc = init_acc
+        self._kernel = kernel
+
+    def _supports_vectorized_combine(self, df: "pandas.DataFrame") -> bool:
+        import pandas as pd
+
+        if not hasattr(self, "_kernel") or not isinstance(self._key_fn, str):
+            return False
+        if self._key_fn not in df.columns:
+            return False
+        dtype = df[self._key_fn].dtype
+        return pd.api.types.is_numeric_dtype(dtype) and not (
+            pd.api.types.is_bool_dtype(dtype)
+        )
+
+    def _vectorized_combine(
+        self, groups: "pandas.core.groupby.DataFrameGroupBy"
+    ) -> List[AggType]:
+        col = groups[self._key_fn]
+        accs = []
+        for acc, num_values, size in zip(
+            self._kernel(col), col.count().tolist(), groups.size().tolist()
+        ):
+            if num_values < size and not self._ignore_nulls:
+                # Same as _null_wrap_accumulate() for a group with a null.
+                accs.append(None)
+            elif num_values == 0:
+                accs.append(_wrap_acc(self._init_acc, has_data=False))
+            else:
+                accs.append(_wrap_acc(acc, has_data=True))
+        return accs
+
 
 @PublicAPI
 class Count(AggregateFn):
@@ -76,6 +140,14 @@ class Count(AggregateFn):
             name="count()",
         )
 
+    def _supports_vectorized_combine(self, df: "pandas.DataFrame") -> bool:
+        return True
+
+    def _vectorized_combine(
+        self, groups: "pandas.core.groupby.DataFrameGroupBy"
+    ) -> List[AggType]:
+        return groups.size().tolist()
+
 
 @PublicAPI
 class Sum(_AggregateOnKeyBase):
@@ -92,6 +164,7 @@ class Sum(_AggregateOnKeyBase):
             finalize=_null_wrap_finalize(lambda a: a),
             name=(f"sum({str(on)})"),
         )
+        self._set_vectorized_kernel(ignore_nulls, 0, lambda col: col.sum().tolist())
 
 
 @PublicAPI
@@ -109,6 +182,9 @@ class Min(_AggregateOnKeyBase):
             finalize=_null_wrap_finalize(lambda a: a),
             name=(f"min({str(on)})"),
         )
+        self._set_vectorized_kernel(
+            ignore_nulls, float("inf"), lambda col: col.min().tolist()
+        )
 
 
 @PublicAPI
@@ -126,6 +202,9 @@ class Max(_AggregateOnKeyBase):
             finalize=_null_wrap_finalize(lambda a: a),
             name=(f"max({str(on)})"),
         )
+        self._set_vectorized_kernel(
+            ignore_nulls, float("-inf"), lambda col: col.max().tolist()
+        )
 
 
 @PublicAPI
@@ -147,6 +226,14 @@ class Mean(_AggregateOnKeyBase):
             finalize=_null_wrap_finalize(lambda a: a[0] / a[1]),
             name=(f"mean({str(on)})"),
         )
+        self._set_vectorized_kernel(
+            ignore_nulls,
+            [0, 0],
+            lambda col: [
+                [total, count]
+                for total, count in zip(col.sum().tolist(), col.count().tolist())
+            ],
+        )
 
 
 @PublicAPI
@@ -216,6 +303,18 @@ class Std(_AggregateOnKeyBase):
             name=(f"std({str(on)})"),
         )
 
+        def kernel(col: "pandas.core.groupby.SeriesGroupBy") -> List[List[float]]:
+            counts = col.count()
+            M2s = col.var(ddof=0) * counts
+            return [
+                [M2, mean, count]
+                for M2, mean, count in zip(
+                    M2s.tolist(), col.mean().tolist(), counts.tolist()
+                )
+            ]
+
+        self._set_vectorized_kernel(ignore_nulls, [0, 0, 0], kernel)
+
 
 def _to_on_fn(on: Optional[KeyFn]):
     if on is None:
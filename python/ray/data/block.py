@@ -99,12 +99,15 @@ class BlockExecStats:
     """Execution stats for this block.
 
     Attributes:
+        start_time_s: The wall-clock time (seconds since the epoch) at which
+            the computation of this block started.
         wall_time_s: The wall-clock time it took to compute this block.
         cpu_time_s: The CPU time it took to compute this block.
         node_id: A unique id for the node that computed this block.
     """
 
     def __init__(self):
+        self.start_time_s: Optional[float] = None
         self.wall_time_s: Optional[float] = None
         self.cpu_time_s: Optional[float] = None
         self.node_id = ray.runtime_context.get_runtime_context().node_id.hex()
@@ -116,6 +119,7 @@ class BlockExecStats:
     def __repr__(self):
         return repr(
             {
+                "start_time_s": self.start_time_s,
                 "wall_time_s": self.wall_time_s,
                 "cpu_time_s": self.cpu_time_s,
                 "node_id": self.node_id,
@@ -131,11 +135,13 @@ class _BlockExecStatsBuilder:
     """
 
     def __init__(self):
+        self.start_wall_time = time.time()
         self.start_time = time.perf_counter()
         self.start_cpu = time.process_time()
 
     def build(self) -> "BlockExecStats":
         stats = BlockExecStats()
+        stats.start_time_s = self.start_wall_time
         stats.wall_time_s = time.perf_counter() - self.start_time
         stats.cpu_time_s = time.process_time() - self.start_cpu
         return stats
@@ -251,6 +257,10 @@ class BlockAccessor(Generic[T]):
         """Zip this block with another block of the same type and size."""
         raise NotImplementedError
 
+    def select(self, columns: List[str]) -> Block:
+        """Return a block containing only the given columns, in the given order."""
+        raise NotImplementedError
+
     @staticmethod
     def builder() -> "BlockBuilder[T]":
         """Create a builder for this block type."""
@@ -292,6 +302,10 @@ class BlockAccessor(Generic[T]):
         """Return a list of sorted partitions of this block."""
         raise NotImplementedError
 
+    def hash_partition(self, key: KeyFn, num_partitions: int) -> List["Block[T]"]:
+        """Return a list of partitions of this block by the hash of the key."""
+        raise NotImplementedError
+
     def combine(self, key: KeyFn, agg: "AggregateFn") -> Block[U]:
         """Combine rows with the same key into an accumulator."""
         raise NotImplementedError
@@ -305,7 +319,11 @@ class BlockAccessor(Generic[T]):
 
     @staticmethod
     def aggregate_combined_blocks(
-        blocks: List[Block], key: KeyFn, agg: "AggregateFn"
+        blocks: List[Block], key: KeyFn, agg: "AggregateFn", finalize: bool = True
     ) -> Tuple[Block[U], BlockMetadata]:
-        """Aggregate partially combined and sorted blocks."""
+        """Aggregate partially combined and sorted blocks.
+
+        If ``finalize`` is False, the accumulators are merged but not finalized,
+        so that the output is again a partially combined and sorted block.
+        """
         raise NotImplementedError
@@ -1,4 +1,5 @@
 from typing import Optional
+import os
 import threading
 
 import ray
@@ -11,6 +12,20 @@ _context_lock = threading.Lock()
 # The max target block size in bytes for reads and transformations.
 DEFAULT_TARGET_MAX_BLOCK_SIZE = 2048 * 1024 * 1024
 
+# The max target block size in bytes for reads with automatic parallelism. This
+# is lower than the max target block size, since splitting a read further is
+# cheap and gives more parallelism to the stages that follow it.
+DEFAULT_READ_TARGET_MAX_BLOCK_SIZE = 512 * 1024 * 1024
+
+# The min target block size in bytes for reads with automatic parallelism. Reads
+# of small datasets aren't split into smaller blocks than this, unless that
+# would leave CPUs of the cluster idle.
+DEFAULT_TARGET_MIN_BLOCK_SIZE = 1024 * 1024
+
+# The default number of read tasks for reads with automatic parallelism, as long
+# as the blocks are within the min and max target block sizes.
+DEFAULT_MIN_PARALLELISM = 200
+
 # Whether block splitting is on by default
 DEFAULT_BLOCK_SPLITTING_ENABLED = False
 
@@ -28,6 +43,35 @@ DEFAULT_OPTIMIZE_FUSE_READ_STAGES = True
 # Whether to furthermore fuse prior map tasks with shuffle stages.
 DEFAULT_OPTIMIZE_FUSE_SHUFFLE_STAGES = True
 
+# Whether to use the push-based shuffle engine for shuffles, sorts and groupbys.
+DEFAULT_USE_PUSH_BASED_SHUFFLE = bool(
+    os.environ.get("RAY_DATASET_PUSH_BASED_SHUFFLE", None)
+)
+
+# Whether to push down expression filters and column projections that follow a
+# read into the datasource (currently Parquet only).
+DEFAULT_OPTIMIZE_READ_PUSHDOWN = True
+
+# Whether to partition groupby aggregations by key hash instead of sampled key
+# ranges. This skips the sampling pass, but the output is only sorted by key
+# within each block.
+DEFAULT_USE_HASH_AGGREGATE = False
+
+# Joins broadcast the smaller dataset instead of shuffling both datasets if its
+# size in bytes is under this threshold. Set to 0 to disable broadcast joins.
+DEFAULT_BROADCAST_JOIN_THRESHOLD_BYTES = 10 * 1024 * 1024
+
+# Whether to stream blocks through trailing map stages when iterating over or
+# writing a lazy dataset, instead of materializing every stage in full. Eager
+# datasets are always executed in full when they are created.
+DEFAULT_USE_STREAMING_EXECUTOR = bool(
+    os.environ.get("RAY_DATASET_STREAMING_EXECUTOR", None)
+)
+
+# The max number of blocks processed at a time by the streaming executor, or
+# None to use twice the number of CPUs in the cluster.
+DEFAULT_STREAMING_MAX_BLOCKS_IN_FLIGHT = None
+
 
 @DeveloperAPI
 class DatasetContext:
@@ -42,19 +86,37 @@ class DatasetContext:
         block_owner: ray.actor.ActorHandle,
         block_splitting_enabled: bool,
         target_max_block_size: int,
+        read_target_max_block_size: int,
+        target_min_block_size: int,
+        min_parallelism: int,
         enable_pandas_block: bool,
         optimize_fuse_stages: bool,
         optimize_fuse_read_stages: bool,
         optimize_fuse_shuffle_stages: bool,
+        optimize_read_pushdown: bool,
+        use_push_based_shuffle: bool,
+        use_streaming_executor: bool,
+        streaming_max_blocks_in_flight: Optional[int],
+        use_hash_aggregate: bool,
+        broadcast_join_threshold_bytes: int,
     ):
         """Private constructor (use get_current() instead)."""
         self.block_owner = block_owner
         self.block_splitting_enabled = block_splitting_enabled
         self.target_max_block_size = target_max_block_size
+        self.read_target_max_block_size = read_target_max_block_size
+        self.target_min_block_size = target_min_block_size
+        self.min_parallelism = min_parallelism
         self.enable_pandas_block = enable_pandas_block
         self.optimize_fuse_stages = optimize_fuse_stages
         self.optimize_fuse_read_stages = optimize_fuse_read_stages
         self.optimize_fuse_shuffle_stages = optimize_fuse_shuffle_stages
+        self.optimize_read_pushdown = optimize_read_pushdown
+        self.use_push_based_shuffle = use_push_based_shuffle
+        self.use_streaming_executor = use_streaming_executor
+        self.streaming_max_blocks_in_flight = streaming_max_blocks_in_flight
+        self.use_hash_aggregate = use_hash_aggregate
+        self.broadcast_join_threshold_bytes = broadcast_join_threshold_bytes
 
     @staticmethod
     def get_current() -> "DatasetContext":
@@ -72,10 +134,23 @@ class DatasetContext:
                     block_owner=None,
                     block_splitting_enabled=DEFAULT_BLOCK_SPLITTING_ENABLED,
                     target_max_block_size=DEFAULT_TARGET_MAX_BLOCK_SIZE,
+                    read_target_max_block_size=DEFAULT_READ_TARGET_MAX_BLOCK_SIZE,
+                    target_min_block_size=DEFAULT_TARGET_MIN_BLOCK_SIZE,
+                    min_parallelism=DEFAULT_MIN_PARALLELISM,
                     enable_pandas_block=DEFAULT_ENABLE_PANDAS_BLOCK,
                     optimize_fuse_stages=DEFAULT_OPTIMIZE_FUSE_STAGES,
                     optimize_fuse_read_stages=DEFAULT_OPTIMIZE_FUSE_READ_STAGES,
                     optimize_fuse_shuffle_stages=DEFAULT_OPTIMIZE_FUSE_SHUFFLE_STAGES,
+                    optimize_read_pushdown=DEFAULT_OPTIMIZE_READ_PUSHDOWN,
+                    use_push_based_shuffle=DEFAULT_USE_PUSH_BASED_SHUFFLE,
+                    use_streaming_executor=DEFAULT_USE_STREAMING_EXECUTOR,
+                    streaming_max_blocks_in_flight=(
+                        DEFAULT_STREAMING_MAX_BLOCKS_IN_FLIGHT
+                    ),
+                    use_hash_aggregate=DEFAULT_USE_HASH_AGGREGATE,
+                    broadcast_join_threshold_bytes=(
+                        DEFAULT_BROADCAST_JOIN_THRESHOLD_BYTES
+                    ),
                 )
 
             if (
@@ -1,3 +1,4 @@
+import json
 import logging
 import os
 import time
@@ -55,6 +56,7 @@ from ray.data.datasource import (
     JSONDatasource,
     NumpyDatasource,
     ParquetDatasource,
+    ArrowIPCDatasource,
     BlockWritePathProvider,
     DefaultBlockWritePathProvider,
     WriteResult,
@@ -66,18 +68,37 @@ from ray.data.datasource.file_based_datasource import (
 from ray.data.row import TableRow
 from ray.data.aggregate import AggregateFn, Sum, Max, Min, Mean, Std
 from ray.data.impl.remote_fn import cached_remote_fn
-from ray.data.impl.block_batching import batch_blocks, BatchType
-from ray.data.impl.plan import ExecutionPlan, OneToOneStage, AllToAllStage
+from ray.data.impl.block_batching import batch_blocks, BatchType, _make_async_gen
+from ray.data.impl.plan import (
+    ExecutionPlan,
+    OneToOneStage,
+    AllToAllStage,
+    ReadPushdown,
+    _get_streaming_window_size,
+)
 from ray.data.impl.stats import DatasetStats
 from ray.data.impl.compute import cache_wrapper, CallableClass, ComputeStrategy
 from ray.data.impl.output_buffer import BlockOutputBuffer
 from ray.data.impl.progress_bar import ProgressBar
 from ray.data.impl.shuffle import simple_shuffle
+from ray.data.impl.join import join_impl, JOIN_TYPES
+from ray.data.impl.cache import (
+    CacheDatasource,
+    load_cache_metadata,
+    local_node_remote_args,
+    plan_fingerprint,
+    resolve_cache_dir,
+    write_cache,
+)
 from ray.data.impl.fast_repartition import fast_repartition
+from ray.data.impl.split import plan_equal_split, split_blocks_by_plan
+from ray.data.expressions import Expr, _eval_column, _referenced_columns
 from ray.data.impl.sort import sort_impl
 from ray.data.impl.block_list import BlockList
 from ray.data.impl.lazy_block_list import LazyBlockList
 from ray.data.impl.delegating_block_builder import DelegatingBlockBuilder
+from ray.data.impl.simple_block import SimpleBlockAccessor
+from ray.data.impl.util import _lazy_import_pyarrow_dataset
 
 logger = logging.getLogger(__name__)
 
@@ -344,6 +365,66 @@ class Dataset(Generic[T]):
             process_batch, batch_format="pandas", compute=compute, **ray_remote_args
         )
 
+    def with_column(
+        self,
+        col: str,
+        expr: Expr,
+        *,
+        compute: Optional[str] = None,
+        **ray_remote_args,
+    ) -> "Dataset[T]":
+        """Add a column computed from an expression over the other columns.
+
+        This is only supported for Arrow and pandas datasets. The expression is
+        evaluated with ``pyarrow.compute`` kernels on each block in Arrow
+        format, which is much faster than computing the column row by row with
+        ``.map()`` or through pandas with ``.add_column()``.
+
+        Examples:
+            >>> from ray.data import col
+            >>> ds = ray.data.range_arrow(100)
+            >>> # Add a new column equal to value * 2 + 1.
+            >>> ds = ds.with_column("new_col", col("value") * 2 + 1)
+
+        Time complexity: O(dataset size / parallelism)
+
+        Args:
+            col: Name of the column to add. If the name already exists, the
+                column will be overwritten.
+            expr: The expression computing the column values, built with
+                ``ray.data.col()`` and ``ray.data.lit()``.
+            compute: The compute strategy, either "tasks" (default) to use Ray
+                tasks, or ActorPoolStrategy(min, max) to use an autoscaling actor pool.
+            ray_remote_args: Additional resource requirements to request from
+                ray (e.g., num_gpus=1 to request GPUs for the map tasks).
+        """
+        if not isinstance(expr, Expr):
+            raise ValueError(
+                f"`expr` must be an expression built with ray.data.col(), got {expr}"
+            )
+        context = DatasetContext.get_current()
+
+        def transform(block: Block) -> Iterable[Block]:
+            DatasetContext._set_current(context)
+            accessor = BlockAccessor.for_block(block)
+            if isinstance(accessor, SimpleBlockAccessor):
+                raise ValueError(
+                    "with_column() requires dataset format to be 'arrow' or "
+                    "'pandas', was 'simple'."
+                )
+            table = accessor.to_arrow()
+            values = _eval_column(expr, table)
+            if col in table.column_names:
+                table = table.set_column(table.column_names.index(col), col, values)
+            else:
+                table = table.append_column(col, values)
+            return [table]
+
+        plan = self._plan.with_stage(
+            OneToOneStage("with_column", transform, compute, ray_remote_args)
+        )
+        return Dataset(plan, self._epoch, self._lazy)
+
     def flat_map(
         self,
         fn: Union[CallableClass, Callable[[T], Iterable[U]]],
@@ -393,7 +474,9 @@ class Dataset(Generic[T]):
 
     def filter(
         self,
-        fn: Union[CallableClass, Callable[[T], bool]],
+        fn: Union[
+            CallableClass, Callable[[T], bool], Expr, "pyarrow.dataset.Expression"
+        ],
         *,
         compute: Optional[str] = None,
         **ray_remote_args,
@@ -403,19 +486,38 @@ class Dataset(Generic[T]):
         This is a blocking operation. Consider using ``.map_batches()`` for
         better performance (you can implement filter by dropping records).
 
+        The predicate can also be an expression built with ``ray.data.col()``
+        or a ``pyarrow.dataset.Expression`` for Arrow and pandas datasets.
+        Expression filters are evaluated in batch by Arrow, and are pushed
+        down into the read when applied directly after
+        ``ray.data.read_parquet()``, so that unneeded row groups and files are
+        skipped.
+
         Examples:
             >>> ds.filter(lambda x: x % 2 == 0)
 
+            >>> # Filter with a column expression.
+            >>> from ray.data import col
+            >>> ds.filter((col("value") > 10) & (col("value") % 2 == 0))
+
+            >>> # Filter with an Arrow expression.
+            >>> import pyarrow.dataset as pds
+            >>> ds.filter(pds.field("value") > 10)
+
         Time complexity: O(dataset size / parallelism)
 
         Args:
-            fn: The predicate to apply to each record, or a class type
-                that can be instantiated to create such a callable.
+            fn: The predicate to apply to each record, a class type
+                that can be instantiated to create such a callable, or an
+                expression.
             compute: The compute strategy, either "tasks" (default) to use Ray
                 tasks, or ActorPoolStrategy(min, max) to use an autoscaling actor pool.
             ray_remote_args: Additional resource requirements to request from
                 ray (e.g., num_gpus=1 to request GPUs for the map tasks).
         """
+        pa_ds = _lazy_import_pyarrow_dataset()
+        if isinstance(fn, Expr) or (pa_ds and isinstance(fn, pa_ds.Expression)):
+            return self._filter_by_expression(fn, compute, ray_remote_args)
 
         fn = cache_wrapper(fn, compute)
         context = DatasetContext.get_current()
@@ -434,6 +536,53 @@ class Dataset(Generic[T]):
         )
         return Dataset(plan, self._epoch, self._lazy)
 
+    def select_columns(
+        self,
+        cols: List[str],
+        *,
+        compute: Optional[str] = None,
+        **ray_remote_args,
+    ) -> "Dataset[T]":
+        """Select the given columns from the dataset, dropping all others.
+
+        This is only supported for Arrow and pandas datasets. When applied
+        directly after ``ray.data.read_parquet()``, the projection is pushed
+        down into the read so that the other columns are never read.
+
+        Examples:
+            >>> ds = ray.data.read_parquet("s3://bucket/path")
+            >>> # Only read the "a" and "b" columns.
+            >>> ds = ds.select_columns(["a", "b"])
+
+        Time complexity: O(dataset size / parallelism)
+
+        Args:
+            cols: Names of the columns to select, in the output order.
+            compute: The compute strategy, either "tasks" (default) to use Ray
+                tasks, or ActorPoolStrategy(min, max) to use an autoscaling actor pool.
+            ray_remote_args: Additional resource requirements to request from
+                ray (e.g., num_gpus=1 to request GPUs for the map tasks).
+        """
+        if not isinstance(cols, list) or not all(isinstance(c, str) for c in cols):
+            raise ValueError(f"`cols` must be a list of column names, got {cols}")
+        cols = list(cols)
+        context = DatasetContext.get_current()
+
+        def transform(block: Block) -> Iterable[Block]:
+            DatasetContext._set_current(context)
+            return [BlockAccessor.for_block(block).select(cols)]
+
+        plan = self._plan.with_stage(
+            OneToOneStage(
+                "select_columns",
+                transform,
+                compute,
+                ray_remote_args,
+                read_pushdown=ReadPushdown(columns=cols),
+            )
+        )
+        return Dataset(plan, self._epoch, self._lazy)
+
     def repartition(self, num_blocks: int, *, shuffle: bool = False) -> "Dataset[T]":
         """Repartition the dataset into exactly this number of blocks.
 
@@ -555,6 +704,48 @@ class Dataset(Generic[T]):
         )
         return Dataset(plan, self._epoch, self._lazy)
 
+    def randomize_block_order(self, *, seed: Optional[int] = None) -> "Dataset[T]":
+        """Randomly shuffle the blocks of this dataset.
+
+        Unlike ``random_shuffle()``, this doesn't move any data, so it's
+        cheap, but the rows within each block stay in the same order. This can
+        be combined with a local shuffle of the rows during iteration (see the
+        ``local_shuffle_buffer_size`` argument of ``iter_batches()``) as a
+        cheaper alternative to a full shuffle of every epoch.
+
+        Examples:
+            >>> # Shuffle the block order of each epoch.
+            >>> pipe = ds.repeat().randomize_block_order_each_window()
+            >>> for batch in pipe.iter_batches(
+            ...     batch_size=32, local_shuffle_buffer_size=1000
+            ... ):
+            ...     print(batch)
+
+        Time complexity: O(num blocks)
+
+        Args:
+            seed: Fix the random seed to use, otherwise one will be chosen
+                based on system randomness.
+
+        Returns:
+            The block-shuffled dataset.
+        """
+
+        def do_randomize(block_list, clear_input_blocks: bool, block_udf, remote_args):
+            blocks_with_metadata = block_list.get_blocks_with_metadata()
+            if clear_input_blocks:
+                block_list.clear()
+            random = np.random.RandomState(seed)
+            order = random.permutation(len(blocks_with_metadata))
+            blocks = [blocks_with_metadata[i][0] for i in order]
+            metadata = [blocks_with_metadata[i][1] for i in order]
+            return BlockList(blocks, metadata), {}
+
+        plan = self._plan.with_stage(
+            AllToAllStage("randomize_block_order", None, do_randomize)
+        )
+        return Dataset(plan, self._epoch, self._lazy)
+
     def split(
         self, n: int, *, equal: bool = False, locality_hints: Optional[List[Any]] = None
     ) -> List["Dataset[T]"]:
@@ -580,7 +771,9 @@ class Dataset(Generic[T]):
                 divided equally among the splits.
             locality_hints: A list of Ray actor handles of size ``n``. The
                 system will try to co-locate the blocks of the ith dataset
-                with the ith actor to maximize data locality.
+                with the ith actor to maximize data locality. If ``equal`` is
+                set, the blocks that straddle split boundaries are sliced by
+                tasks on the nodes that hold them.
 
         Returns:
             A list of ``n`` disjoint dataset splits.
@@ -832,6 +1025,16 @@ class Dataset(Generic[T]):
                 for actor in actors
             }
 
+        if equal:
+            return self._split_equal_with_locality(
+                block_refs,
+                metadata,
+                build_block_refs_by_node_id(block_refs),
+                build_node_id_by_actor(locality_hints),
+                locality_hints,
+                stats,
+            )
+
         # expected number of blocks to be allocated for each actor
         expected_block_count_by_actor = build_allocation_size_map(
             len(block_refs), locality_hints
@@ -886,6 +1089,52 @@ class Dataset(Generic[T]):
             n,
         )
 
+    def _split_equal_with_locality(
+        self,
+        block_refs: List[ObjectRef[Block]],
+        metadata: List[BlockMetadata],
+        block_refs_by_node_id: Dict[str, List[ObjectRef[Block]]],
+        node_id_by_actor: Dict[Any, str],
+        actors: List[Any],
+        stats: DatasetStats,
+    ) -> List["Dataset[T]"]:
+        """Split into shards of exactly equal row counts, co-locating the rows
+        of each shard with its actor where possible.
+
+        Blocks are only sliced where a shard boundary falls inside them, by
+        tasks scheduled on the node of the block.
+        """
+        get_num_rows = cached_remote_fn(_get_num_rows)
+        num_rows = [
+            m.num_rows if m.num_rows is not None else get_num_rows.remote(b)
+            for b, m in zip(block_refs, metadata)
+        ]
+        pending = [i for i, r in enumerate(num_rows) if isinstance(r, ObjectRef)]
+        for i, r in zip(pending, ray.get([num_rows[i] for i in pending])):
+            num_rows[i] = r
+
+        node_id_by_block_ref = {
+            b: node_id for node_id, refs in block_refs_by_node_id.items() for b in refs
+        }
+        block_node_ids = [node_id_by_block_ref.get(b) for b in block_refs]
+        plan = plan_equal_split(
+            num_rows,
+            block_node_ids,
+            [node_id_by_actor[actor] for actor in actors],
+            sum(num_rows) // len(actors),
+        )
+        splits = split_blocks_by_plan(
+            list(block_refs), list(metadata), num_rows, block_node_ids, plan
+        )
+        return [
+            Dataset(
+                ExecutionPlan(BlockList(blocks, meta), stats),
+                self._epoch,
+                self._lazy,
+            )
+            for blocks, meta in splits
+        ]
+
     def split_at_indices(self, indices: List[int]) -> List["Dataset[T]"]:
         """Split the dataset at the given indices (like np.split).
 
@@ -1373,6 +1622,10 @@ class Dataset(Generic[T]):
 
         Time complexity: O(dataset size * log(dataset size / parallelism))
 
+        The output is split into blocks of at most ``target_max_block_size``
+        bytes (see ``DatasetContext``), so that each merge task only holds a
+        bounded amount of data in memory.
+
         Args:
             key:
                 - For Arrow tables, key must be a single column name.
@@ -1471,6 +1724,60 @@ class Dataset(Generic[T]):
         plan = self._plan.with_stage(AllToAllStage("zip", None, do_zip_all))
         return Dataset(plan, self._epoch, self._lazy)
 
+    def join(
+        self,
+        other: "Dataset[U]",
+        on: Union[str, List[str]],
+        how: str = "inner",
+    ) -> "Dataset[TableRow]":
+        """Join this dataset with another tabular dataset on key columns.
+
+        This is a blocking operation.
+
+        Examples:
+            >>> users = ray.data.from_items(
+            ...     [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+            >>> orders = ray.data.from_items(
+            ...     [{"id": 1, "total": 10}, {"id": 1, "total": 20}])
+            >>> users.join(orders, on="id").take()
+            [{'id': 1, 'name': 'a', 'total': 10}, {'id': 1, 'name': 'a', 'total': 20}]
+
+        Both datasets are hash partitioned by the key and joined partition by
+        partition. If one side is smaller than
+        ``DatasetContext.broadcast_join_threshold_bytes``, it is instead sent
+        to every block of the other side, as long as the join type doesn't need
+        to keep its unmatched rows.
+
+        Time complexity: O(dataset size / parallelism)
+
+        Args:
+            other: The dataset to join with on the right hand side.
+            on: The name of the key column, or a list of key column names. Both
+                datasets must have these columns.
+            how: The type of join, one of "inner", "left", "right" or "outer",
+                with the same semantics as in ``pandas.merge()``.
+
+        Returns:
+            An Arrow dataset with the columns of this dataset, followed by the
+            non-key columns of the other dataset. Conflicting column names of
+            the other dataset get a "_right" suffix. The output is not ordered.
+        """
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Join type must be one of {JOIN_TYPES}, got: {how}")
+        on = [on] if isinstance(on, str) else list(on)
+        if not on:
+            raise ValueError("At least one join key column is required.")
+
+        def do_join(block_list, clear_input_blocks: bool, *_):
+            right = other._plan.execute()
+            blocks, stage_info = join_impl(block_list, right, on, how)
+            if clear_input_blocks:
+                block_list.clear()
+            return blocks, stage_info
+
+        plan = self._plan.with_stage(AllToAllStage("join", None, do_join))
+        return Dataset(plan, self._epoch, self._lazy)
+
     def limit(self, limit: int) -> "Dataset[T]":
         """Limit the dataset to the first number of records specified.
 
@@ -1638,13 +1945,16 @@ class Dataset(Generic[T]):
         try_create_dir: bool = True,
         arrow_open_stream_args: Optional[Dict[str, Any]] = None,
         block_path_provider: BlockWritePathProvider = DefaultBlockWritePathProvider(),
+        target_file_size_bytes: Optional[int] = None,
+        partition_cols: Optional[List[str]] = None,
         arrow_parquet_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
         **arrow_parquet_args,
     ) -> None:
         """Write the dataset to parquet.
 
         This is only supported for datasets convertible to Arrow records.
-        To control the number of files, use ``.repartition()``.
+        To control the number of files, use ``.repartition()`` or
+        ``target_file_size_bytes``.
 
         Unless a custom block path provider is given, the format of the output
         files will be {uuid}_{block_idx}.parquet, where ``uuid`` is an unique
@@ -1665,6 +1975,12 @@ class Dataset(Generic[T]):
                 pyarrow.fs.FileSystem.open_output_stream
             block_path_provider: BlockWritePathProvider implementation to
                 write each dataset block to a custom output path.
+            target_file_size_bytes: If given, coalesce small blocks and split
+                large blocks into files of about this size. The files are
+                named after the block paths, with a file index suffix.
+            partition_cols: If given, write the rows to hive-style
+                ``{col}={value}`` subdirectories by the values of these
+                columns, which are dropped from the files.
             arrow_parquet_args_fn: Callable that returns a dictionary of write
                 arguments to use when writing each block to a file. Overrides
                 any duplicate keys from arrow_parquet_args. This should be used
@@ -1683,6 +1999,8 @@ class Dataset(Generic[T]):
             try_create_dir=try_create_dir,
             open_stream_args=arrow_open_stream_args,
             block_path_provider=block_path_provider,
+            target_file_size_bytes=target_file_size_bytes,
+            partition_cols=partition_cols,
             write_args_fn=arrow_parquet_args_fn,
             **arrow_parquet_args,
         )
@@ -1695,13 +2013,16 @@ class Dataset(Generic[T]):
         try_create_dir: bool = True,
         arrow_open_stream_args: Optional[Dict[str, Any]] = None,
         block_path_provider: BlockWritePathProvider = DefaultBlockWritePathProvider(),
+        target_file_size_bytes: Optional[int] = None,
+        partition_cols: Optional[List[str]] = None,
         pandas_json_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
         **pandas_json_args,
     ) -> None:
         """Write the dataset to json.
 
         This is only supported for datasets convertible to Arrow records.
-        To control the number of files, use ``.repartition()``.
+        To control the number of files, use ``.repartition()`` or
+        ``target_file_size_bytes``.
 
         Unless a custom block path provider is given, the format of the output
         files will be {self._uuid}_{block_idx}.json, where ``uuid`` is an
@@ -1722,6 +2043,12 @@ class Dataset(Generic[T]):
                 pyarrow.fs.FileSystem.open_output_stream
             block_path_provider: BlockWritePathProvider implementation to
                 write each dataset block to a custom output path.
+            target_file_size_bytes: If given, coalesce small blocks and split
+                large blocks into files of about this size. The files are
+                named after the block paths, with a file index suffix.
+            partition_cols: If given, write the rows to hive-style
+                ``{col}={value}`` subdirectories by the values of these
+                columns, which are dropped from the files.
             pandas_json_args_fn: Callable that returns a dictionary of write
                 arguments to use when writing each block to a file. Overrides
                 any duplicate keys from pandas_json_args. This should be used
@@ -1741,6 +2068,8 @@ class Dataset(Generic[T]):
             try_create_dir=try_create_dir,
             open_stream_args=arrow_open_stream_args,
             block_path_provider=block_path_provider,
+            target_file_size_bytes=target_file_size_bytes,
+            partition_cols=partition_cols,
             write_args_fn=pandas_json_args_fn,
             **pandas_json_args,
         )
@@ -1753,13 +2082,16 @@ class Dataset(Generic[T]):
         try_create_dir: bool = True,
         arrow_open_stream_args: Optional[Dict[str, Any]] = None,
         block_path_provider: BlockWritePathProvider = DefaultBlockWritePathProvider(),
+        target_file_size_bytes: Optional[int] = None,
+        partition_cols: Optional[List[str]] = None,
         arrow_csv_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
         **arrow_csv_args,
     ) -> None:
         """Write the dataset to csv.
 
         This is only supported for datasets convertible to Arrow records.
-        To control the number of files, use ``.repartition()``.
+        To control the number of files, use ``.repartition()`` or
+        ``target_file_size_bytes``.
 
         Unless a custom block path provider is given, the format of the output
         files will be {uuid}_{block_idx}.csv, where ``uuid`` is an unique id
@@ -1780,6 +2112,12 @@ class Dataset(Generic[T]):
                 pyarrow.fs.FileSystem.open_output_stream
             block_path_provider: BlockWritePathProvider implementation to
                 write each dataset block to a custom output path.
+            target_file_size_bytes: If given, coalesce small blocks and split
+                large blocks into files of about this size. The files are
+                named after the block paths, with a file index suffix.
+            partition_cols: If given, write the rows to hive-style
+                ``{col}={value}`` subdirectories by the values of these
+                columns, which are dropped from the files.
             arrow_csv_args_fn: Callable that returns a dictionary of write
                 arguments to use when writing each block to a file. Overrides
                 any duplicate keys from arrow_csv_args. This should be used
@@ -1796,10 +2134,84 @@ class Dataset(Generic[T]):
             try_create_dir=try_create_dir,
             open_stream_args=arrow_open_stream_args,
             block_path_provider=block_path_provider,
+            target_file_size_bytes=target_file_size_bytes,
+            partition_cols=partition_cols,
             write_args_fn=arrow_csv_args_fn,
             **arrow_csv_args,
         )
 
+    def write_arrow_ipc(
+        self,
+        path: str,
+        *,
+        filesystem: Optional["pyarrow.fs.FileSystem"] = None,
+        try_create_dir: bool = True,
+        arrow_open_stream_args: Optional[Dict[str, Any]] = None,
+        block_path_provider: BlockWritePathProvider = DefaultBlockWritePathProvider(),
+        target_file_size_bytes: Optional[int] = None,
+        partition_cols: Optional[List[str]] = None,
+        arrow_ipc_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
+        **arrow_ipc_args,
+    ) -> None:
+        """Write the dataset to Arrow IPC (Feather V2) files.
+
+        This is only supported for datasets convertible to Arrow records.
+        To control the number of files, use ``.repartition()`` or
+        ``target_file_size_bytes``.
+
+        Unless a custom block path provider is given, the format of the output
+        files will be {uuid}_{block_idx}.arrow, where ``uuid`` is an unique id
+        for the dataset.
+
+        Uncompressed files can be read back with ``ray.data.read_arrow_ipc()``
+        without decoding or copying them, while compressed files (e.g., with
+        ``options=pyarrow.ipc.IpcWriteOptions(compression="lz4")``) trade
+        this for smaller files.
+
+        Examples:
+            >>> ds.write_arrow_ipc("/tmp/path")
+
+        Time complexity: O(dataset size / parallelism)
+
+        Args:
+            path: The path to the destination root directory, where Arrow IPC
+                files will be written to.
+            filesystem: The filesystem implementation to write to.
+            try_create_dir: Try to create all directories in destination path
+                if True. Does nothing if all directories already exist.
+            arrow_open_stream_args: kwargs passed to
+                pyarrow.fs.FileSystem.open_output_stream
+            block_path_provider: BlockWritePathProvider implementation to
+                write each dataset block to a custom output path.
+            target_file_size_bytes: If given, coalesce small blocks and split
+                large blocks into files of about this size. The files are
+                named after the block paths, with a file index suffix.
+            partition_cols: If given, write the rows to hive-style
+                ``{col}={value}`` subdirectories by the values of these
+                columns, which are dropped from the files.
+            arrow_ipc_args_fn: Callable that returns a dictionary of write
+                arguments to use when writing each block to a file. Overrides
+                any duplicate keys from arrow_ipc_args. This should be used
+                instead of arrow_ipc_args if any of your write arguments
+                cannot be pickled, or if you'd like to lazily resolve the write
+                arguments for each dataset block.
+            arrow_ipc_args: Other IPC write options to pass to
+                pyarrow.ipc.new_file.
+        """
+        self.write_datasource(
+            ArrowIPCDatasource(),
+            path=path,
+            dataset_uuid=self._uuid,
+            filesystem=filesystem,
+            try_create_dir=try_create_dir,
+            open_stream_args=arrow_open_stream_args,
+            block_path_provider=block_path_provider,
+            target_file_size_bytes=target_file_size_bytes,
+            partition_cols=partition_cols,
+            write_args_fn=arrow_ipc_args_fn,
+            **arrow_ipc_args,
+        )
+
     def write_numpy(
         self,
         path: str,
@@ -1863,18 +2275,15 @@ class Dataset(Generic[T]):
         """
 
         ctx = DatasetContext.get_current()
-        blocks, metadata = zip(*self._plan.execute().get_blocks_with_metadata())
 
-        # TODO(ekl) remove this feature flag.
-        if "RAY_DATASET_FORCE_LOCAL_METADATA" in os.environ:
-            write_results: List[ObjectRef[WriteResult]] = datasource.do_write(
-                blocks, metadata, **write_args
-            )
-        else:
+        def submit_write(blocks, metadata, write_args):
+            # TODO(ekl) remove this feature flag.
+            if "RAY_DATASET_FORCE_LOCAL_METADATA" in os.environ:
+                return datasource.do_write(blocks, metadata, **write_args)
             # Prepare write in a remote task so that in Ray client mode, we
             # don't do metadata resolution from the client machine.
             do_write = cached_remote_fn(_do_write, retry_exceptions=False, num_cpus=0)
-            write_results: List[ObjectRef[WriteResult]] = ray.get(
+            return ray.get(
                 do_write.remote(
                     datasource,
                     ctx,
@@ -1884,6 +2293,14 @@ class Dataset(Generic[T]):
                 )
             )
 
+        if self._use_streaming_executor():
+            write_results = self._write_streaming(submit_write, write_args)
+        else:
+            blocks, metadata = zip(*self._plan.execute().get_blocks_with_metadata())
+            write_results: List[ObjectRef[WriteResult]] = submit_write(
+                blocks, metadata, write_args
+            )
+
         progress = ProgressBar("Write Progress", len(write_results))
         try:
             progress.block_until_complete(write_results)
@@ -1894,7 +2311,60 @@ class Dataset(Generic[T]):
         finally:
             progress.close()
 
-    def iter_rows(self, *, prefetch_blocks: int = 0) -> Iterator[Union[T, TableRow]]:
+    def _use_streaming_executor(self) -> bool:
+        """Whether to stream the output blocks instead of executing in full.
+
+        Eager datasets are executed when they are created, so only lazy
+        datasets (see ``_experimental_lazy()``) are streamed.
+        """
+        return (
+            DatasetContext.get_current().use_streaming_executor
+            and self._lazy
+            and not self._plan.has_computed_output()
+        )
+
+    def _write_streaming(
+        self,
+        submit_write: Callable[
+            [List[ObjectRef[Block]], List[BlockMetadata], dict],
+            List[ObjectRef[WriteResult]],
+        ],
+        write_args: dict,
+    ) -> List[ObjectRef[WriteResult]]:
+        """Write the output blocks in windows as they are computed.
+
+        The write tasks of each window are submitted as a separate write to
+        the datasource, and a window isn't computed until the writes of the
+        previous window have finished. Each window is written with its own
+        ``dataset_uuid`` (if given), so that file names don't collide.
+        """
+        blocks, _ = self._plan.execute_streaming()
+        window_size = _get_streaming_window_size()
+        write_results = []
+        pending = []
+        for i in itertools.count():
+            window = list(itertools.islice(blocks, window_size))
+            if not window:
+                break
+            if pending:
+                ray.wait(pending, num_returns=len(pending), fetch_local=False)
+            window_args = write_args
+            if "dataset_uuid" in write_args:
+                window_args = dict(
+                    write_args, dataset_uuid=f"{write_args['dataset_uuid']}_{i:06}"
+                )
+            block_refs, metadata = zip(*window)
+            pending = submit_write(list(block_refs), list(metadata), window_args)
+            write_results.extend(pending)
+        return write_results
+
+    def iter_rows(
+        self,
+        *,
+        prefetch_blocks: int = 0,
+        local_shuffle_buffer_size: Optional[int] = None,
+        local_shuffle_seed: Optional[int] = None,
+    ) -> Iterator[Union[T, TableRow]]:
         """Return a local row iterator over the dataset.
 
         If the dataset is a tabular dataset (Arrow/Pandas blocks), dict-like mappings
@@ -1910,6 +2380,11 @@ class Dataset(Generic[T]):
         Args:
             prefetch_blocks: The number of blocks to prefetch ahead of the
                 current block during the scan.
+            local_shuffle_buffer_size: If not None, the rows are randomly
+                shuffled using a local in-memory buffer of at least this many
+                rows, which spans multiple blocks. This is a cheaper
+                alternative to ``random_shuffle()``, with less randomness.
+            local_shuffle_seed: The seed to use for the local random shuffle.
 
         Returns:
             A local iterator over the entire dataset.
@@ -1930,8 +2405,17 @@ class Dataset(Generic[T]):
                 if dataset_format == "pandas"
                 else "native"
             )
+        batch_size = None
+        if local_shuffle_buffer_size is not None:
+            # The rows are yielded one at a time, so the batch size only
+            # affects how often the buffer is sliced.
+            batch_size = max(local_shuffle_buffer_size, 1)
         for batch in self.iter_batches(
-            prefetch_blocks=prefetch_blocks, batch_format=batch_format
+            prefetch_blocks=prefetch_blocks,
+            batch_size=batch_size,
+            batch_format=batch_format,
+            local_shuffle_buffer_size=local_shuffle_buffer_size,
+            local_shuffle_seed=local_shuffle_seed,
         ):
             batch = BlockAccessor.for_block(batch)
             for row in batch.iter_rows():
@@ -1944,6 +2428,9 @@ class Dataset(Generic[T]):
         batch_size: Optional[int] = None,
         batch_format: str = "native",
         drop_last: bool = False,
+        prefetch_batches: int = 0,
+        local_shuffle_buffer_size: Optional[int] = None,
+        local_shuffle_seed: Optional[int] = None,
     ) -> Iterator[BatchType]:
         """Return a local batched iterator over the dataset.
 
@@ -1960,25 +2447,48 @@ class Dataset(Generic[T]):
             batch_format: The format in which to return each batch.
                 Specify "native" to use the current block format (promoting
                 Arrow to pandas automatically), "pandas" to
-                select ``pandas.DataFrame`` or "pyarrow" to select
-                ``pyarrow.Table``. Default is "native".
+                select ``pandas.DataFrame``, "pyarrow" to select
+                ``pyarrow.Table``, or "numpy" to select a dict of column name
+                to ``numpy.ndarray`` (or a single ``numpy.ndarray`` for simple
+                datasets). Tensor columns are returned as ndarrays of shape
+                (N, *tensor_shape), without copying when possible. Default is
+                "native".
             drop_last: Whether to drop the last batch if it's incomplete.
+            prefetch_batches: The number of batches to fetch and format ahead
+                of the consumer in a background thread, so that this overlaps
+                with the processing of the current batch. If 0, batches are
+                fetched and formatted when requested.
+            local_shuffle_buffer_size: If not None, the rows are randomly
+                shuffled using a local in-memory buffer of at least this many
+                rows, which spans multiple blocks, and each batch is drawn
+                from the buffer. This requires ``batch_size`` to be set. This
+                is a cheaper alternative to ``random_shuffle()``, with less
+                randomness: larger buffers give more randomness, at the cost
+                of memory and of the delay before the first batch.
+            local_shuffle_seed: The seed to use for the local random shuffle.
 
         Returns:
             An iterator over record batches.
         """
-        blocks = self._plan.execute()
-        stats = self._plan.stats()
+        if self._use_streaming_executor():
+            blocks, stats = self._plan.execute_streaming()
+            blocks = (block for block, _ in blocks)
+        else:
+            blocks = self._plan.execute().iter_blocks()
+            stats = self._plan.stats()
 
         time_start = time.perf_counter()
 
         yield from batch_blocks(
-            blocks.iter_blocks(),
+            blocks,
             stats,
             prefetch_blocks=prefetch_blocks,
             batch_size=batch_size,
             batch_format=batch_format,
             drop_last=drop_last,
+            prefetch_batches=prefetch_batches,
+            local_shuffle_buffer_size=local_shuffle_buffer_size,
+            local_shuffle_seed=local_shuffle_seed,
         )
 
         stats.iter_total_s.add(time.perf_counter() - time_start)
@@ -1998,6 +2508,9 @@ class Dataset(Generic[T]):
         prefetch_blocks: int = 0,
         drop_last: bool = False,
         unsqueeze_label_tensor: bool = True,
+        prefetch_batches: int = 0,
+        local_shuffle_buffer_size: Optional[int] = None,
+        local_shuffle_seed: Optional[int] = None,
     ) -> "torch.utils.data.IterableDataset":
         """Return a Torch IterableDataset over this dataset.
 
@@ -2034,6 +2547,12 @@ class Dataset(Generic[T]):
         ``Dataset`` will be treated as the label, and the output label tensor
         will be ``None``.
 
+        Tensor columns are flattened into the columns of the feature tensor,
+        unless a single tensor column is selected, in which case the feature
+        tensor has the shape (N, *tensor_shape) of the column. Such tensors
+        are created from the Arrow blocks without copying when the dtype
+        isn't changed, so they may be read-only views of the data.
+
         Note that you probably want to call ``.split()`` on this dataset if
         there are to be multiple Torch workers consuming the data.
 
@@ -2071,6 +2590,15 @@ Dict[str, List[str]]]): The names of the columns
                 be left as is, that is (N, ). In general, regression loss
                 functions expect an unsqueezed tensor, while classification
                 loss functions expect a squeezed one. Defaults to True.
+            prefetch_batches (int): The number of batches to fetch and convert
+                to tensors ahead of the training loop in a background thread.
+                If 0, batches are fetched and converted when requested.
+            local_shuffle_buffer_size (Optional[int]): If not None, the rows
+                are randomly shuffled using a local in-memory buffer of at
+                least this many rows, from which the batches are drawn. See
+                ``iter_batches()``.
+            local_shuffle_seed (Optional[int]): The seed to use for the local
+                random shuffle.
 
         Returns:
             A torch IterableDataset.
@@ -2078,7 +2606,7 @@ Dict[str, List[str]]]): The names of the columns
         import torch
 
         from ray.data.impl.torch_iterable_dataset import TorchIterableDataset
-        from ray.ml.utils.torch_utils import convert_pandas_to_torch_tensor
+        from ray.ml.utils.torch_utils import convert_numpy_to_torch_tensor
 
         # If an empty collection is passed in, treat it the same as None
         if not feature_columns:
@@ -2117,12 +2645,16 @@ Dict[str, List[str]]]): The names of the columns
         def make_generator():
             for batch in self.iter_batches(
                 batch_size=batch_size,
-                batch_format="pandas",
+                batch_format="numpy",
                 prefetch_blocks=prefetch_blocks,
                 drop_last=drop_last,
+                local_shuffle_buffer_size=local_shuffle_buffer_size,
+                local_shuffle_seed=local_shuffle_seed,
             ):
+                if isinstance(batch, np.ndarray):
+                    batch = {"value": batch}
                 if label_column:
-                    label_vals = batch.pop(label_column).values
+                    label_vals = batch.pop(label_column)
                     label_tensor = torch.as_tensor(label_vals, dtype=label_column_dtype)
                     if unsqueeze_label_tensor:
                         label_tensor = label_tensor.view(-1, 1)
@@ -2131,7 +2663,7 @@ Dict[str, List[str]]]): The names of the columns
 
                 if isinstance(feature_columns, dict):
                     features_tensor = {
-                        key: convert_pandas_to_torch_tensor(
+                        key: convert_numpy_to_torch_tensor(
                             batch,
                             feature_columns[key],
                             feature_column_dtypes[key]
@@ -2141,7 +2673,7 @@ Dict[str, List[str]]]): The names of the columns
                         for key in feature_columns
                     }
                 else:
-                    features_tensor = convert_pandas_to_torch_tensor(
+                    features_tensor = convert_numpy_to_torch_tensor(
                         batch,
                         columns=feature_columns,
                         column_dtypes=feature_column_dtypes,
@@ -2149,7 +2681,12 @@ Dict[str, List[str]]]): The names of the columns
 
                 yield (features_tensor, label_tensor)
 
-        return TorchIterableDataset(make_generator)
+        def make_prefetching_generator():
+            return _make_async_gen(make_generator(), prefetch_batches)
+
+        return TorchIterableDataset(
+            make_prefetching_generator if prefetch_batches > 0 else make_generator
+        )
 
     def to_tf(
         self,
@@ -2159,6 +2696,7 @@ Dict[str, List[str]]]): The names of the columns
         feature_columns: Optional[List[str]] = None,
         prefetch_blocks: int = 0,
         batch_size: int = 1,
+        prefetch_batches: int = 0,
     ) -> "tf.data.Dataset":
         """Return a TF Dataset over this dataset.
 
@@ -2193,6 +2731,9 @@ Dict[str, List[str]]]): The names of the columns
             prefetch_blocks: The number of blocks to prefetch ahead of the
                 current block during the scan.
             batch_size: Record batch size. Defaults to 1.
+            prefetch_batches: The number of batches to fetch and convert to
+                arrays ahead of the generator in a background thread. If 0,
+                batches are fetched and converted when requested.
 
         Returns:
             A tf.data.Dataset.
@@ -2222,8 +2763,12 @@ Dict[str, List[str]]]): The names of the columns
                 else:
                     yield batch.values
 
+        def make_prefetching_generator():
+            return _make_async_gen(make_generator(), prefetch_batches)
+
         dataset = tf.data.Dataset.from_generator(
-            make_generator, output_signature=output_signature
+            make_prefetching_generator if prefetch_batches > 0 else make_generator,
+            output_signature=output_signature,
         )
 
         return dataset
@@ -2662,10 +3207,124 @@ Dict[str, List[str]]]): The names of the columns
         ds._set_uuid(self._get_uuid())
         return ds
 
+    def cache(
+        self,
+        path: Optional[str] = None,
+        *,
+        storage: str = "memory",
+        key: Optional[str] = None,
+        filesystem: Optional["pyarrow.fs.FileSystem"] = None,
+    ) -> "Dataset[T]":
+        """Compute the blocks of this dataset once and cache them for reuse.
+
+        With ``storage="memory"``, this is the same as ``fully_executed()``:
+        the blocks are held in the object store for as long as the returned
+        dataset is referenced.
+
+        With ``storage="disk"``, the blocks are written as Arrow IPC files to a
+        directory under ``path`` that is named by a content key of this
+        dataset. The key is computed from the read of the dataset (the
+        datasource, read arguments, input file names and sizes) and its
+        transforms. If a complete cache with the same key already exists,
+        e.g., because an earlier job cached the same dataset, a lazy dataset
+        (whose transforms haven't run yet) isn't computed at all. The returned
+        dataset reads its blocks from the cache files, which are memory-mapped
+        if local, so the blocks don't stay pinned in the object store, and
+        each epoch of ``repeat()`` re-reads the cache instead of recomputing
+        the dataset.
+
+        Examples:
+            >>> # Preprocess once, then read back the cache in every epoch.
+            >>> ds = ray.data.read_parquet("s3://bucket/path")
+            >>> ds = ds.map_batches(preprocess)
+            >>> ds = ds.cache("/tmp/ray_cache", storage="disk")
+            >>> for epoch in ds.repeat(10).iter_epochs():
+            ...     train(epoch)
+
+        Time complexity: O(dataset size / parallelism)
+
+        Args:
+            path: The directory to cache the blocks under, required for disk
+                storage. A local path pins the cache tasks to this node; on
+                multi-node clusters, use a shared filesystem (e.g., NFS or
+                S3) to spread them over the cluster.
+            storage: Either "memory" or "disk".
+            key: The key to cache the blocks under, instead of the computed
+                content key. The computed key doesn't cover the contents of
+                the input files, so pass a new key to invalidate a cache of
+                files that were modified in place. Datasets that aren't read
+                from a datasource have no content key, and are cached under
+                their uuid unless a key is given.
+            filesystem: The filesystem implementation to use for the cache.
+
+        Returns:
+            A Dataset with the blocks of this dataset, cached in the given
+            storage.
+        """
+        if storage == "memory":
+            if path is not None:
+                raise ValueError("A path can only be given for disk storage.")
+            return self.fully_executed()
+        if storage != "disk":
+            raise ValueError(
+                f"storage must be either 'memory' or 'disk', got {storage!r}."
+            )
+        if path is None:
+            raise ValueError("A path is required for disk storage.")
+
+        from ray.data.read_api import read_datasource
+
+        key = key or plan_fingerprint(self._plan) or self._get_uuid()
+        cache_dir, filesystem = resolve_cache_dir(path, key, filesystem)
+        remote_args = local_node_remote_args(filesystem)
+        cached = load_cache_metadata(cache_dir, filesystem)
+        if cached is None:
+            blocks = self._plan.execute()
+            cached = write_cache(blocks, cache_dir, filesystem, remote_args)
+        files, metadata = cached
+        return read_datasource(
+            CacheDatasource(),
+            parallelism=len(files),
+            ray_remote_args=dict(remote_args),
+            files=files,
+            metadata=metadata,
+            filesystem=filesystem,
+        )
+
     def stats(self) -> str:
         """Returns a string containing execution timing information."""
         return self._plan.stats().summary_string()
 
+    def stats_dict(self) -> Dict[str, Any]:
+        """Returns the execution timing information as a dict.
+
+        This has the same information as ``Dataset.stats()``, plus the
+        timings of each block and the aggregates of each stage per node,
+        so that it can be analyzed programmatically or dumped to JSON.
+        """
+        return self._plan.stats().to_dict()
+
+    def timeline(self, filename: Optional[str] = None) -> Optional[List[Dict]]:
+        """Returns the execution timeline of this dataset as Chrome trace events.
+
+        The timeline has the task that computed each block of each stage,
+        grouped by node, and the time the iterator spent waiting for,
+        fetching, formatting and consuming batches. It can be viewed in
+        chrome://tracing or Perfetto.
+
+        Args:
+            filename: If given, the timeline is written to this file as JSON
+                instead of being returned.
+
+        Returns:
+            The trace events, if no filename is given.
+        """
+        events = self._plan.stats().to_chrome_trace()
+        if filename is None:
+            return events
+        with open(filename, "w") as f:
+            json.dump(events, f)
+
     @DeveloperAPI
     def get_internal_block_refs(self) -> List[ObjectRef[Block]]:
         """Get a list of references to the underlying blocks of this dataset.
@@ -2685,6 +3344,59 @@ Dict[str, List[str]]]): The names of the columns
         self._lazy = True
         return self
 
+    def _filter_by_expression(
+        self,
+        expr: Union[Expr, "pyarrow.dataset.Expression"],
+        compute: Optional[str],
+        ray_remote_args: Dict[str, Any],
+    ) -> "Dataset[T]":
+        """Filter this dataset with an expression (see ``.filter()``)."""
+        context = DatasetContext.get_current()
+        pushdown_expr = expr
+        if isinstance(expr, Expr):
+            try:
+                pushdown_expr = expr.to_pyarrow()
+            except ValueError:
+                # Evaluate the filter after the read.
+                pushdown_expr = None
+
+        def transform(block: Block) -> Iterable[Block]:
+            DatasetContext._set_current(context)
+            import pyarrow.dataset as pa_ds
+
+            accessor = BlockAccessor.for_block(block)
+            if accessor.num_rows() == 0:
+                return [block]
+            if isinstance(accessor, SimpleBlockAccessor):
+                raise ValueError(
+                    "Expression filters require dataset format to be 'arrow' "
+                    "or 'pandas', was 'simple'."
+                )
+            table = accessor.to_arrow()
+            if isinstance(expr, Expr):
+                return [table.filter(_eval_column(expr, table))]
+            return [pa_ds.dataset(table).to_table(filter=expr)]
+
+        if pushdown_expr is not None:
+            read_pushdown = ReadPushdown(
+                filter_expr=pushdown_expr,
+                filter_columns=sorted(_referenced_columns(expr))
+                if isinstance(expr, Expr)
+                else None,
+            )
+        else:
+            read_pushdown = None
+        plan = self._plan.with_stage(
+            OneToOneStage(
+                "filter",
+                transform,
+                compute,
+                ray_remote_args,
+                read_pushdown=read_pushdown,
+            )
+        )
+        return Dataset(plan, self._epoch, self._lazy)
+
     def _split(
         self, index: int, return_right_half: bool
     ) -> ("Dataset[T]", "Dataset[T]"):
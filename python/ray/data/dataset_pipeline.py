@@ -1,9 +1,11 @@
 import inspect
+import json
 import logging
 import time
 from typing import (
     Any,
     Callable,
+    Dict,
     List,
     Iterator,
     Iterable,
@@ -35,10 +37,26 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 # Operations that can be naively applied per dataset row in the pipeline.
-_PER_DATASET_OPS = ["map", "map_batches", "add_column", "flat_map", "filter"]
+_PER_DATASET_OPS = [
+    "map",
+    "map_batches",
+    "add_column",
+    "flat_map",
+    "filter",
+    "select_columns",
+]
 
 # Operations that apply to each dataset holistically in the pipeline.
-_HOLISTIC_PER_DATASET_OPS = ["repartition", "random_shuffle", "sort"]
+_HOLISTIC_PER_DATASET_OPS = [
+    "repartition",
+    "random_shuffle",
+    "randomize_block_order",
+    "sort",
+]
+
+# Holistic operations that were previously available without the
+# "_each_window" suffix.
+_RENAMED_HOLISTIC_PER_DATASET_OPS = ["repartition", "random_shuffle", "sort"]
 
 # Similar to above but we should force evaluation immediately.
 _PER_DATASET_OUTPUT_OPS = [
@@ -96,7 +114,13 @@ class DatasetPipeline(Generic[T]):
         self._executed = _executed or [False]
         self._stats = DatasetPipelineStats()
 
-    def iter_rows(self, *, prefetch_blocks: int = 0) -> Iterator[Union[T, TableRow]]:
+    def iter_rows(
+        self,
+        *,
+        prefetch_blocks: int = 0,
+        local_shuffle_buffer_size: Optional[int] = None,
+        local_shuffle_seed: Optional[int] = None,
+    ) -> Iterator[Union[T, TableRow]]:
         """Return a local row iterator over the data in the pipeline.
 
         If the dataset is a tabular dataset (Arrow/Pandas blocks), dict-like mappings
@@ -112,6 +136,10 @@ class DatasetPipeline(Generic[T]):
         Args:
             prefetch_blocks: The number of blocks to prefetch ahead of the
                 current block during the scan.
+            local_shuffle_buffer_size: If not None, the rows of each window are
+                randomly shuffled using a local in-memory buffer of at least
+                this many rows. See ``Dataset.iter_rows()``.
+            local_shuffle_seed: The seed to use for the local random shuffle.
 
         Returns:
             A local iterator over the records in the pipeline.
@@ -122,7 +150,11 @@ class DatasetPipeline(Generic[T]):
 
             for ds in self.iter_datasets():
                 wait_start = time.perf_counter()
-                for row in ds.iter_rows(prefetch_blocks=prefetch_blocks):
+                for row in ds.iter_rows(
+                    prefetch_blocks=prefetch_blocks,
+                    local_shuffle_buffer_size=local_shuffle_buffer_size,
+                    local_shuffle_seed=local_shuffle_seed,
+                ):
                     self._stats.iter_wait_s.add(time.perf_counter() - wait_start)
                     with self._stats.iter_user_s.timer():
                         yield row
@@ -139,6 +171,9 @@ class DatasetPipeline(Generic[T]):
         batch_size: int = None,
         batch_format: str = "native",
         drop_last: bool = False,
+        prefetch_batches: int = 0,
+        local_shuffle_buffer_size: Optional[int] = None,
+        local_shuffle_seed: Optional[int] = None,
     ) -> Iterator[BatchType]:
         """Return a local batched iterator over the data in the pipeline.
 
@@ -155,9 +190,23 @@ class DatasetPipeline(Generic[T]):
             batch_format: The format in which to return each batch.
                 Specify "native" to use the current block format (promoting
                 Arrow to pandas automatically), "pandas" to
-                select ``pandas.DataFrame`` or "pyarrow" to select
-                ``pyarrow.Table``. Default is "native".
+                select ``pandas.DataFrame``, "pyarrow" to select
+                ``pyarrow.Table``, or "numpy" to select a dict of column name
+                to ``numpy.ndarray`` (or a single ``numpy.ndarray`` for simple
+                datasets). Tensor columns are returned as ndarrays of shape
+                (N, *tensor_shape), without copying when possible. Default is
+                "native".
             drop_last: Whether to drop the last batch if it's incomplete.
+            prefetch_batches: The number of batches to fetch and format ahead
+                of the consumer in a background thread. If 0, batches are
+                fetched and formatted when requested.
+            local_shuffle_buffer_size: If not None, the rows are randomly
+                shuffled using a local in-memory buffer of at least this many
+                rows, which spans multiple blocks and windows, and each batch
+                is drawn from the buffer. This requires ``batch_size`` to be
+                set. Combine with ``randomize_block_order_each_window()`` for a
+                cheap alternative to ``random_shuffle_each_window()``.
+            local_shuffle_seed: The seed to use for the local random shuffle.
 
         Returns:
             An iterator over record batches.
@@ -170,6 +219,9 @@ class DatasetPipeline(Generic[T]):
             batch_size=batch_size,
             batch_format=batch_format,
             drop_last=drop_last,
+            prefetch_batches=prefetch_batches,
+            local_shuffle_buffer_size=local_shuffle_buffer_size,
+            local_shuffle_seed=local_shuffle_seed,
         )
         self._stats.iter_total_s.add(time.perf_counter() - time_start)
 
@@ -688,6 +740,28 @@ class DatasetPipeline(Generic[T]):
         """
         return self._stats.summary_string(exclude_first_window)
 
+    def stats_dict(self) -> Dict[str, Any]:
+        """Returns the execution timing information of the recent windows and
+        of the pipeline iterator as a dict."""
+        return self._stats.to_dict()
+
+    def timeline(self, filename: Optional[str] = None) -> Optional[List[Dict]]:
+        """Returns the execution timeline of the recent windows and of the
+        pipeline iterator as Chrome trace events.
+
+        Args:
+            filename: If given, the timeline is written to this file as JSON
+                instead of being returned.
+
+        Returns:
+            The trace events, if no filename is given.
+        """
+        events = self._stats.to_chrome_trace()
+        if filename is None:
+            return events
+        with open(filename, "w") as f:
+            json.dump(events, f)
+
     @staticmethod
     def from_iterable(
         iterable: Iterable[Callable[[], Dataset[T]]],
@@ -796,7 +870,8 @@ Apply ``Dataset.{method}`` to each dataset/window in this pipeline.
 
         return impl
 
-    setattr(DatasetPipeline, method, deprecation_warning(method))
+    if method in _RENAMED_HOLISTIC_PER_DATASET_OPS:
+        setattr(DatasetPipeline, method, deprecation_warning(method))
     setattr(DatasetPipeline, method + "_each_window", make_impl(method))
 
 for method in _PER_DATASET_OUTPUT_OPS:
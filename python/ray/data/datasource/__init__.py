@@ -11,6 +11,7 @@ from ray.data.datasource.csv_datasource import CSVDatasource
 from ray.data.datasource.numpy_datasource import NumpyDatasource
 from ray.data.datasource.parquet_datasource import ParquetDatasource
 from ray.data.datasource.binary_datasource import BinaryDatasource
+from ray.data.datasource.arrow_ipc_datasource import ArrowIPCDatasource
 from ray.data.datasource.file_based_datasource import (
     FileBasedDatasource,
     _S3FileSystemWrapper,
@@ -24,6 +25,7 @@ __all__ = [
     "NumpyDatasource",
     "ParquetDatasource",
     "BinaryDatasource",
+    "ArrowIPCDatasource",
     "FileBasedDatasource",
     "_S3FileSystemWrapper",
     "Datasource",
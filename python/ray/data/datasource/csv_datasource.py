@@ -6,6 +6,8 @@ if TYPE_CHECKING:
 from ray.data.block import BlockAccessor, Block
 from ray.data.datasource.file_based_datasource import (
     FileBasedDatasource,
+    _ArrowTableWriter,
+    _BlockWriter,
     _resolve_kwargs,
 )
 
@@ -53,5 +55,22 @@ class CSVDatasource(FileBasedDatasource):
         write_options = writer_args.pop("write_options", None)
         csv.write_csv(block.to_arrow(), f, write_options, **writer_args)
 
+    def _open_block_writer(
+        self,
+        f: "pyarrow.NativeFile",
+        writer_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
+        **writer_args
+    ) -> _BlockWriter:
+        from pyarrow import csv
+
+        # Write the header once, followed by the rows of every block.
+        writer_args = _resolve_kwargs(writer_args_fn, **writer_args)
+        write_options = writer_args.pop("write_options", None)
+        return _ArrowTableWriter(
+            lambda schema: csv.CSVWriter(
+                f, schema, write_options=write_options, **writer_args
+            )
+        )
+
     def _file_format(self):
         return "csv"
@@ -1,4 +1,5 @@
 import builtins
+import itertools
 from typing import Any, Generic, List, Callable, Union, Tuple, Iterable
 
 import numpy as np
@@ -157,6 +158,29 @@ class ReadTask(Callable[[], BlockPartition]):
             return builder.build()
 
 
+def _merge_read_tasks(read_tasks: List[ReadTask]) -> ReadTask:
+    """Merge read tasks into a single read task that reads all of their blocks
+    in order, combining their metadata."""
+    if len(read_tasks) == 1:
+        return read_tasks[0]
+    metadata = [task.get_metadata() for task in read_tasks]
+    num_rows = [m.num_rows for m in metadata]
+    size_bytes = [m.size_bytes for m in metadata]
+    input_files = [f for m in metadata for f in m.input_files or []]
+    meta = BlockMetadata(
+        num_rows=None if None in num_rows else sum(num_rows),
+        size_bytes=None if None in size_bytes else sum(size_bytes),
+        schema=next((m.schema for m in metadata if m.schema is not None), None),
+        input_files=input_files or None,
+        exec_stats=None,
+    )  # Exec stats filled in later.
+    read_fns = [task._read_fn for task in read_tasks]
+    return ReadTask(
+        lambda: itertools.chain.from_iterable(read_fn() for read_fn in read_fns),
+        meta,
+    )
+
+
 class RangeDatasource(Datasource[Union[ArrowRow, int]]):
     """An example datasource that generates ranges of numbers from [0..n).
 
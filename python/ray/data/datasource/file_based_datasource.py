@@ -22,6 +22,7 @@ from ray.data.context import DatasetContext
 from ray.data.impl.arrow_block import ArrowRow
 from ray.data.impl.block_list import BlockMetadata
 from ray.data.impl.output_buffer import BlockOutputBuffer
+from ray.data.impl.delegating_block_builder import DelegatingBlockBuilder
 from ray.data.datasource.datasource import Datasource, ReadTask, WriteResult
 from ray.util.annotations import DeveloperAPI
 from ray.data.impl.util import _check_pyarrow_version
@@ -122,7 +123,8 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
     must implement _read_file().
 
     Current subclasses:
-        JSONDatasource, CSVDatasource, NumpyDatasource, BinaryDatasource
+        JSONDatasource, CSVDatasource, NumpyDatasource, BinaryDatasource,
+        ArrowIPCDatasource
     """
 
     def prepare_read(
@@ -145,6 +147,7 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
         file_sizes = [file_info.size for file_info in file_infos]
 
         read_stream = self._read_stream
+        open_input_source = self._open_input_source
 
         filesystem = _wrap_s3_serialization_workaround(filesystem)
 
@@ -163,7 +166,7 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
                 block_udf=_block_udf, target_max_block_size=ctx.target_max_block_size
             )
             for read_path in read_paths:
-                with fs.open_input_stream(read_path, **open_stream_args) as f:
+                with open_input_source(fs, read_path, **open_stream_args) as f:
                     for data in read_stream(f, read_path, **reader_args):
                         output_buffer.add_block(data)
                         if output_buffer.has_next():
@@ -201,6 +204,16 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
         """Returns the number of rows per file, or None if unknown."""
         return None
 
+    def _open_input_source(
+        self, filesystem: "pyarrow.fs.FileSystem", path: str, **open_args
+    ) -> "pyarrow.NativeFile":
+        """Opens a single file for reading, passing all kwargs to the filesystem.
+
+        By default, opens a sequential input stream. Subclasses can override
+        this for formats that need random access to the file.
+        """
+        return filesystem.open_input_stream(path, **open_args)
+
     def _read_stream(
         self, f: "pyarrow.NativeFile", path: str, **reader_args
     ) -> Iterator[Block]:
@@ -230,20 +243,45 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
         open_stream_args: Optional[Dict[str, Any]] = None,
         block_path_provider: BlockWritePathProvider = DefaultBlockWritePathProvider(),
         write_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
+        target_file_size_bytes: Optional[int] = None,
+        partition_cols: Optional[List[str]] = None,
         _block_udf: Optional[Callable[[Block], Block]] = None,
         **write_args,
     ) -> List[ObjectRef[WriteResult]]:
-        """Creates and returns write tasks for a file-based datasource."""
+        """Creates and returns write tasks for a file-based datasource.
+
+        By default, each block is written to one file by one task. If
+        ``target_file_size_bytes`` or ``partition_cols`` is given, the blocks
+        are instead written by rolling writers (see ``_write_rolling()``).
+        """
         path, filesystem = _resolve_paths_and_filesystem(path, filesystem)
         path = path[0]
         if try_create_dir:
             filesystem.create_dir(path, recursive=True)
         filesystem = _wrap_s3_serialization_workaround(filesystem)
 
-        _write_block_to_file = self._write_block
-
         if open_stream_args is None:
             open_stream_args = {}
+        if not block_path_provider:
+            block_path_provider = DefaultBlockWritePathProvider()
+
+        if target_file_size_bytes is not None or partition_cols:
+            return self._write_rolling(
+                blocks,
+                metadata,
+                path,
+                dataset_uuid,
+                filesystem,
+                open_stream_args,
+                block_path_provider,
+                write_args_fn,
+                target_file_size_bytes,
+                partition_cols or [],
+                _block_udf,
+                write_args,
+            )
+
+        _write_block_to_file = self._write_block
 
         def write_block(write_path: str, block: Block):
             logger.debug(f"Writing {write_path} file.")
@@ -265,8 +303,6 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
 
         file_format = self._file_format()
         write_tasks = []
-        if not block_path_provider:
-            block_path_provider = DefaultBlockWritePathProvider()
         for block_idx, block in enumerate(blocks):
             write_path = block_path_provider(
                 path,
@@ -281,6 +317,89 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
 
         return write_tasks
 
+    def _write_rolling(
+        self,
+        blocks: List[ObjectRef[Block]],
+        metadata: List[BlockMetadata],
+        path: str,
+        dataset_uuid: str,
+        filesystem: "pyarrow.fs.FileSystem",
+        open_stream_args: Dict[str, Any],
+        block_path_provider: BlockWritePathProvider,
+        write_args_fn: Callable[[], Dict[str, Any]],
+        target_file_size_bytes: Optional[int],
+        partition_cols: List[str],
+        block_udf: Optional[Callable[[Block], Block]],
+        write_args: Dict[str, Any],
+    ) -> List[ObjectRef[WriteResult]]:
+        """Write the blocks into files of about ``target_file_size_bytes``.
+
+        Consecutive small blocks are grouped into one write task, so that they
+        are coalesced into the same files, while large blocks are split over
+        several files. If ``partition_cols`` is given, the rows are written to
+        hive-style ``{col}={value}`` directories by the values of the columns,
+        with a rolling file per partition, and the columns are dropped from
+        the files.
+
+        The files of write task ``i`` are named after the path provided for
+        block index ``i``, with a file index suffix.
+        """
+        file_format = self._file_format()
+        open_block_writer = self._open_block_writer
+
+        def write_group(task_idx: int, *group: Block):
+            fs = filesystem
+            if isinstance(fs, _S3FileSystemWrapper):
+                fs = fs.unwrap()
+            created_dirs = set()
+
+            def open_file(partition_dir: str, file_idx: int):
+                base_path = path
+                if partition_dir:
+                    base_path = f"{path}/{partition_dir}"
+                    if base_path not in created_dirs:
+                        fs.create_dir(base_path, recursive=True)
+                        created_dirs.add(base_path)
+                write_path = _add_file_index(
+                    block_path_provider(
+                        base_path,
+                        filesystem=filesystem,
+                        dataset_uuid=dataset_uuid,
+                        block_index=task_idx,
+                        file_format=file_format,
+                    ),
+                    file_idx,
+                    file_format,
+                )
+                logger.debug(f"Writing {write_path} file.")
+                return fs.open_output_stream(write_path, **open_stream_args)
+
+            def open_writer(f: "pyarrow.NativeFile") -> _BlockWriter:
+                return open_block_writer(f, writer_args_fn=write_args_fn, **write_args)
+
+            writers = {}
+            for block in group:
+                if block_udf is not None:
+                    block = block_udf(block)
+                for partition_dir, part in _partition_block(block, partition_cols):
+                    if partition_dir not in writers:
+                        writers[partition_dir] = _RollingFileWriter(
+                            lambda i, d=partition_dir: open_file(d, i),
+                            open_writer,
+                            target_file_size_bytes,
+                        )
+                    writers[partition_dir].add(part)
+            for writer in writers.values():
+                writer.close()
+
+        write_group = cached_remote_fn(write_group)
+        return [
+            write_group.remote(task_idx, *group)
+            for task_idx, group in enumerate(
+                _group_blocks(blocks, metadata, target_file_size_bytes)
+            )
+        ]
+
     def _write_block(
         self,
         f: "pyarrow.NativeFile",
@@ -296,6 +415,52 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
             "Subclasses of FileBasedDatasource must implement _write_files()."
         )
 
+    def _write_blocks(
+        self,
+        f: "pyarrow.NativeFile",
+        blocks: List[Block],
+        writer_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
+        **writer_args,
+    ):
+        """Writes several blocks to a single file.
+
+        By default, the blocks are concatenated and written with
+        ``_write_block()``. Subclasses can override this to write the blocks
+        one by one without concatenating them, e.g., as row groups.
+        """
+        if len(blocks) == 1:
+            block = blocks[0]
+        else:
+            builder = DelegatingBlockBuilder()
+            for b in blocks:
+                builder.add_block(b)
+            block = builder.build()
+        self._write_block(
+            f,
+            BlockAccessor.for_block(block),
+            writer_args_fn=writer_args_fn,
+            **writer_args,
+        )
+
+    def _open_block_writer(
+        self,
+        f: "pyarrow.NativeFile",
+        writer_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
+        **writer_args,
+    ) -> "_BlockWriter":
+        """Returns a writer that writes blocks to a single file.
+
+        By default, the blocks are buffered and written with ``_write_blocks()``
+        once the file is complete. Subclasses can override this to write each
+        block as it's added, so that rolling writes can track the size of the
+        file as it's written.
+        """
+        return _BufferedBlockWriter(
+            lambda blocks: self._write_blocks(
+                f, blocks, writer_args_fn=writer_args_fn, **writer_args
+            )
+        )
+
     def _file_format(self):
         """Returns the file format string, to be used as the file extension
         when writing files.
@@ -307,6 +472,247 @@ class FileBasedDatasource(Datasource[Union[ArrowRow, Any]]):
         )
 
 
+class _BlockWriter:
+    """Writes blocks to a single open file."""
+
+    def write(self, block: Block) -> bool:
+        """Write the block, or return False if it can't be added to this file,
+        e.g., because its schema differs from the blocks already written."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish writing the file, without closing the file itself."""
+        raise NotImplementedError
+
+
+class _BufferedBlockWriter(_BlockWriter):
+    """Buffers the blocks of a file and writes them all at once when closed."""
+
+    def __init__(self, write_blocks: Callable[[List[Block]], None]):
+        self._write_blocks = write_blocks
+        self._blocks: List[Block] = []
+
+    def write(self, block: Block) -> bool:
+        self._blocks.append(block)
+        return True
+
+    def close(self) -> None:
+        if self._blocks:
+            self._write_blocks(self._blocks)
+
+
+class _ArrowTableWriter(_BlockWriter):
+    """Writes each block as an Arrow table as it's added, with a writer opened
+    for the schema of the first block (e.g., a Parquet writer)."""
+
+    def __init__(self, open_writer: Callable[["pyarrow.Schema"], Any], **write_args):
+        self._open_writer = open_writer
+        self._write_args = write_args
+        self._writer = None
+        self._schema = None
+
+    def write(self, block: Block) -> bool:
+        table = BlockAccessor.for_block(block).to_arrow()
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_writer(table.schema)
+        elif not table.schema.equals(self._schema):
+            return False
+        self._writer.write_table(table, **self._write_args)
+        return True
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _RollingFileWriter:
+    """Writes the added blocks to a sequence of files of a target size.
+
+    A new file is started once the bytes written to the current file reach the
+    target size. A block that would overflow the current file is sliced, by
+    the ratio of written bytes to in-memory block bytes seen so far. Writers
+    that only write a file once it's complete (see ``_BufferedBlockWriter``)
+    learn this ratio from the previous files. Blocks that can't be added to
+    the current file, e.g., because their schema differs, start a new file.
+    If the target size is None, all blocks are written to one file.
+    """
+
+    def __init__(
+        self,
+        open_file: Callable[[int], "pyarrow.NativeFile"],
+        open_writer: Callable[["pyarrow.NativeFile"], _BlockWriter],
+        target_size_bytes: Optional[int],
+    ):
+        self._open_file = open_file
+        self._open_writer = open_writer
+        self._target_size_bytes = target_size_bytes
+        self._num_files = 0
+        self._file = None
+        self._writer = None
+        # The in-memory size of the blocks written to the current file.
+        self._file_block_bytes = 0
+        # The number of bytes written per byte of in-memory block.
+        self._bytes_per_block_byte = 1.0
+
+    def add(self, block: Block) -> None:
+        target = self._target_size_bytes
+        accessor = BlockAccessor.for_block(block)
+        while accessor.num_rows() > 0:
+            num_rows = accessor.num_rows()
+            size_bytes = accessor.size_bytes()
+            head_rows = num_rows
+            if target is not None:
+                # The in-memory bytes that fit in the rest of the current file.
+                space = (target - self._written_bytes()) / self._bytes_per_block_byte
+                if size_bytes > space:
+                    head_rows = min(
+                        max(1, int(space * num_rows / size_bytes)), num_rows
+                    )
+            if head_rows == num_rows:
+                self._write(block)
+                if target is not None and self._written_bytes() >= target:
+                    self._close_file()
+                return
+            self._write(accessor.slice(0, head_rows, copy=False))
+            self._close_file()
+            block = accessor.slice(head_rows, num_rows, copy=False)
+            accessor = BlockAccessor.for_block(block)
+
+    def close(self) -> None:
+        self._close_file()
+
+    def _written_bytes(self) -> float:
+        """The (estimated) bytes written to the current file."""
+        return self._file_block_bytes * self._bytes_per_block_byte
+
+    def _write(self, block: Block) -> None:
+        if self._writer is None:
+            self._file = self._open_file(self._num_files)
+            self._writer = self._open_writer(self._file)
+        if not self._writer.write(block):
+            self._close_file()
+            self._write(block)
+            return
+        self._file_block_bytes += BlockAccessor.for_block(block).size_bytes()
+        self._update_ratio()
+
+    def _update_ratio(self) -> None:
+        written = self._file.tell()
+        if written > 0 and self._file_block_bytes > 0:
+            self._bytes_per_block_byte = written / self._file_block_bytes
+
+    def _close_file(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._update_ratio()
+        self._file.close()
+        self._num_files += 1
+        self._file = None
+        self._writer = None
+        self._file_block_bytes = 0
+
+
+def _group_blocks(
+    blocks: List[ObjectRef[Block]],
+    metadata: List[BlockMetadata],
+    target_size_bytes: Optional[int],
+) -> List[List[ObjectRef[Block]]]:
+    """Group consecutive blocks of a total size up to the target size, so that
+    small blocks are written to the same files.
+
+    Blocks of unknown size are written on their own.
+    """
+    if target_size_bytes is None:
+        return [[b] for b in blocks]
+    groups = []
+    group = []
+    group_size_bytes = 0
+    for block, meta in zip(blocks, metadata):
+        size_bytes = meta.size_bytes
+        if size_bytes is None or (
+            group and group_size_bytes + size_bytes > target_size_bytes
+        ):
+            if group:
+                groups.append(group)
+            group, group_size_bytes = [], 0
+        group.append(block)
+        if size_bytes is None:
+            groups.append(group)
+            group = []
+        else:
+            group_size_bytes += size_bytes
+    if group:
+        groups.append(group)
+    return groups
+
+
+def _partition_block(
+    block: Block, partition_cols: List[str]
+) -> Iterator[Tuple[str, Block]]:
+    """Split a block by the values of the partition columns.
+
+    Yields the hive-style directory of each partition, relative to the base
+    path, and the rows of the partition without the partition columns.
+    """
+    if not partition_cols:
+        yield "", block
+        return
+    if isinstance(block, list):
+        raise ValueError(
+            "Writing with partition_cols requires dataset format to be 'arrow' "
+            "or 'pandas', was 'simple'."
+        )
+    import numpy as np
+    import pyarrow.compute as pc
+
+    table = BlockAccessor.for_block(block).to_arrow()
+    missing = [c for c in partition_cols if c not in table.column_names]
+    if missing:
+        raise ValueError(
+            f"The partition columns {missing} don't exist, available columns: "
+            f"{table.column_names}"
+        )
+    if table.num_rows == 0:
+        return
+    # Number the distinct combinations of partition values.
+    codes = []
+    dictionaries = []
+    for c in partition_cols:
+        encoded = pc.dictionary_encode(table.column(c).combine_chunks())
+        # Nulls get their own code past the end of the dictionary.
+        indices = encoded.indices.fill_null(len(encoded.dictionary))
+        codes.append(np.asarray(indices))
+        dictionaries.append(encoded.dictionary.to_pylist() + [None])
+    keys, inverse = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+    data = table.drop(partition_cols)
+    for i, key in enumerate(keys):
+        partition_dir = "/".join(
+            f"{c}={_hive_partition_value(d[k])}"
+            for c, d, k in zip(partition_cols, dictionaries, key)
+        )
+        indices = order[bounds[i] : bounds[i + 1]]
+        yield partition_dir, data.take(indices)
+
+
+def _hive_partition_value(value: Any) -> str:
+    if value is None:
+        return "__HIVE_DEFAULT_PARTITION__"
+    return urllib.parse.quote(str(value), safe="")
+
+
+def _add_file_index(write_path: str, file_idx: int, file_format: str) -> str:
+    """Add the index of a rolled file to its path, before the extension."""
+    extension = f".{file_format}"
+    if write_path.endswith(extension):
+        return f"{write_path[:-len(extension)]}_{file_idx:06}{extension}"
+    return f"{write_path}_{file_idx:06}"
+
+
 # TODO(Clark): Add unit test coverage of _resolve_paths_and_filesystem and
 # _expand_paths.
 
@@ -14,6 +14,8 @@ from ray.data.context import DatasetContext
 from ray.data.datasource.datasource import ReadTask
 from ray.data.datasource.file_based_datasource import (
     FileBasedDatasource,
+    _ArrowTableWriter,
+    _BlockWriter,
     _resolve_paths_and_filesystem,
     _resolve_kwargs,
 )
@@ -89,11 +91,20 @@ class ParquetDatasource(FileBasedDatasource):
             paths = paths[0]
 
         dataset_kwargs = reader_args.pop("dataset_kwargs", {})
+        row_filter = reader_args.get("filter")
+        if row_filter is not None and "filters" not in dataset_kwargs:
+            # Prune fragments whose partition expression can't satisfy the filter
+            # at planning time. Row groups are pruned by the reader using the
+            # column statistics.
+            dataset_kwargs = dict(dataset_kwargs, filters=row_filter)
         pq_ds = pq.ParquetDataset(
             paths, **dataset_kwargs, filesystem=filesystem, use_legacy_dataset=False
         )
         if schema is None:
             schema = pq_ds.schema
+        # The filter is bound to the dataset schema, since it may refer to
+        # columns that aren't read.
+        dataset_schema = schema
         if columns:
             schema = pa.schema(
                 [schema.field(column) for column in columns], schema.metadata
@@ -130,7 +141,7 @@ class ParquetDatasource(FileBasedDatasource):
                 batches = piece.to_batches(
                     use_threads=use_threads,
                     columns=columns,
-                    schema=schema,
+                    schema=dataset_schema,
                     batch_size=PARQUET_READER_ROW_BATCH_SIZE,
                     **reader_args,
                 )
@@ -138,6 +149,8 @@ class ParquetDatasource(FileBasedDatasource):
                     table = pyarrow.Table.from_batches([batch], schema=schema)
                     if part:
                         for col, value in part.items():
+                            if col not in table.column_names:
+                                continue
                             table = table.set_column(
                                 table.schema.get_field_index(col),
                                 col,
@@ -182,7 +195,9 @@ class ParquetDatasource(FileBasedDatasource):
                     continue
                 pieces, metadata = zip(*piece_data)
                 serialized_pieces = cloudpickle.dumps(pieces)
-                meta = _build_block_metadata(pieces, metadata, inferred_schema)
+                meta = _build_block_metadata(
+                    pieces, metadata, inferred_schema, row_filter is not None
+                )
                 read_tasks.append(
                     ReadTask(lambda p=serialized_pieces: read_pieces(p), meta)
                 )
@@ -203,6 +218,22 @@ class ParquetDatasource(FileBasedDatasource):
         writer_args = _resolve_kwargs(writer_args_fn, **writer_args)
         pq.write_table(block.to_arrow(), f, **writer_args)
 
+    def _open_block_writer(
+        self,
+        f: "pyarrow.NativeFile",
+        writer_args_fn: Callable[[], Dict[str, Any]] = lambda: {},
+        **writer_args,
+    ) -> _BlockWriter:
+        import pyarrow.parquet as pq
+
+        # Write the blocks as separate row groups, without concatenating them.
+        writer_args = _resolve_kwargs(writer_args_fn, **writer_args)
+        row_group_size = writer_args.pop("row_group_size", None)
+        return _ArrowTableWriter(
+            lambda schema: pq.ParquetWriter(f, schema, **writer_args),
+            row_group_size=row_group_size,
+        )
+
     def _file_format(self) -> str:
         return "parquet"
 
@@ -262,13 +293,16 @@ def _build_block_metadata(
     pieces: List["pyarrow.dataset.ParquetFileFragment"],
     metadata: List["pyarrow.parquet.FileMetaData"],
     schema: Optional[Union[type, "pyarrow.lib.Schema"]],
+    filtered: bool = False,
 ) -> BlockMetadata:
     input_files = [p.path for p in pieces]
     if len(metadata) == len(pieces):
         # Piece metadata was available, construct a normal
-        # BlockMetadata.
+        # BlockMetadata. If a row filter is applied during the read, the
+        # number of output rows is unknown until the read is executed, and
+        # the size is an upper bound.
         block_metadata = BlockMetadata(
-            num_rows=sum(m.num_rows for m in metadata),
+            num_rows=None if filtered else sum(m.num_rows for m in metadata),
             size_bytes=sum(
                 sum(m.row_group(i).total_byte_size for i in range(m.num_row_groups))
                 for m in metadata
@@ -0,0 +1,280 @@
+import operator
+from typing import Any, Callable, Dict, List, Optional, Set, Union, TYPE_CHECKING
+
+from ray.util.annotations import PublicAPI
+
+if TYPE_CHECKING:
+    import pyarrow
+    import pyarrow.dataset
+
+# The result of evaluating an expression on a table.
+ExprResult = Union["pyarrow.Array", "pyarrow.ChunkedArray", "pyarrow.Scalar"]
+
+# The operators of ``pyarrow.dataset.Expression`` for compute functions.
+_PYARROW_OPERATORS: Dict[str, Callable[..., "pyarrow.dataset.Expression"]] = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+    "equal": operator.eq,
+    "not_equal": operator.ne,
+    "less": operator.lt,
+    "less_equal": operator.le,
+    "greater": operator.gt,
+    "greater_equal": operator.ge,
+    "and_kleene": operator.and_,
+    "or_kleene": operator.or_,
+    "invert": operator.invert,
+    "is_null": lambda e: e.is_null(),
+    "is_valid": lambda e: e.is_valid(),
+}
+
+
+@PublicAPI
+class Expr:
+    """An expression over the columns of a tabular dataset.
+
+    Expressions are built from ``col()`` and ``lit()`` with Python operators,
+    and are evaluated with ``pyarrow.compute`` kernels on whole Arrow blocks,
+    without converting the blocks to pandas or iterating over rows. Arithmetic
+    and comparisons follow Arrow semantics, e.g., dividing integers truncates
+    and nulls propagate.
+
+    Examples:
+        >>> from ray.data import col, lit
+        >>> ds = ray.data.range_arrow(100)
+        >>> ds = ds.with_column("double", col("value") * 2)
+        >>> ds = ds.filter((col("double") > 10) & ~col("value").is_in([20, 30]))
+    """
+
+    def eval(self, table: "pyarrow.Table") -> ExprResult:
+        """Evaluate this expression on the given table."""
+        raise NotImplementedError
+
+    def to_pyarrow(self) -> "pyarrow.dataset.Expression":
+        """Convert this expression to a ``pyarrow.dataset.Expression``.
+
+        Raises:
+            ValueError: If the expression has no Arrow dataset equivalent.
+        """
+        raise NotImplementedError
+
+    def __add__(self, other: Any) -> "Expr":
+        return _CallExpr("add", [self, other])
+
+    def __radd__(self, other: Any) -> "Expr":
+        return _CallExpr("add", [other, self])
+
+    def __sub__(self, other: Any) -> "Expr":
+        return _CallExpr("subtract", [self, other])
+
+    def __rsub__(self, other: Any) -> "Expr":
+        return _CallExpr("subtract", [other, self])
+
+    def __mul__(self, other: Any) -> "Expr":
+        return _CallExpr("multiply", [self, other])
+
+    def __rmul__(self, other: Any) -> "Expr":
+        return _CallExpr("multiply", [other, self])
+
+    def __truediv__(self, other: Any) -> "Expr":
+        return _CallExpr("divide", [self, other])
+
+    def __rtruediv__(self, other: Any) -> "Expr":
+        return _CallExpr("divide", [other, self])
+
+    def __neg__(self) -> "Expr":
+        return _CallExpr("negate", [self])
+
+    def __eq__(self, other: Any) -> "Expr":
+        return _CallExpr("equal", [self, other])
+
+    # __eq__ builds an expression, so hash by identity like object does.
+    __hash__ = object.__hash__
+
+    def __ne__(self, other: Any) -> "Expr":
+        return _CallExpr("not_equal", [self, other])
+
+    def __lt__(self, other: Any) -> "Expr":
+        return _CallExpr("less", [self, other])
+
+    def __le__(self, other: Any) -> "Expr":
+        return _CallExpr("less_equal", [self, other])
+
+    def __gt__(self, other: Any) -> "Expr":
+        return _CallExpr("greater", [self, other])
+
+    def __ge__(self, other: Any) -> "Expr":
+        return _CallExpr("greater_equal", [self, other])
+
+    def __and__(self, other: Any) -> "Expr":
+        return _CallExpr("and_kleene", [self, other])
+
+    def __rand__(self, other: Any) -> "Expr":
+        return _CallExpr("and_kleene", [other, self])
+
+    def __or__(self, other: Any) -> "Expr":
+        return _CallExpr("or_kleene", [self, other])
+
+    def __ror__(self, other: Any) -> "Expr":
+        return _CallExpr("or_kleene", [other, self])
+
+    def __invert__(self) -> "Expr":
+        return _CallExpr("invert", [self])
+
+    def __bool__(self):
+        raise TypeError(
+            "Expressions can't be converted to bool, use '&', '|' and '~' "
+            "instead of 'and', 'or' and 'not'."
+        )
+
+    def is_null(self) -> "Expr":
+        """Whether the values are null."""
+        return _CallExpr("is_null", [self])
+
+    def is_valid(self) -> "Expr":
+        """Whether the values are not null."""
+        return _CallExpr("is_valid", [self])
+
+    def is_in(self, values: List[Any]) -> "Expr":
+        """Whether the values are in the given list of values."""
+        return _CallExpr("is_in", [self], {"value_set": list(values)})
+
+    def cast(self, target_type: "pyarrow.DataType") -> "Expr":
+        """Cast the values to the given Arrow type."""
+        return _CallExpr("cast", [self], {"target_type": target_type})
+
+    def call(self, function: str, *args: Any, **options: Any) -> "Expr":
+        """Apply a ``pyarrow.compute`` function to this and the given arguments.
+
+        Examples:
+            >>> col("name").call("utf8_upper")
+            >>> col("name").call("match_substring", pattern="foo")
+
+        Args:
+            function: The name of the ``pyarrow.compute`` function.
+            args: The other arguments of the function, as expressions or
+                Python values.
+            options: The options of the function, as keyword arguments.
+        """
+        return _CallExpr(function, [self, *args], options)
+
+
+@PublicAPI
+def col(name: str) -> Expr:
+    """Return an expression referring to the column with the given name."""
+    return _ColumnExpr(name)
+
+
+@PublicAPI
+def lit(value: Any) -> Expr:
+    """Return an expression with the given constant value."""
+    return _LiteralExpr(value)
+
+
+class _ColumnExpr(Expr):
+    def __init__(self, name: str):
+        self.name = name
+
+    def eval(self, table: "pyarrow.Table") -> ExprResult:
+        if self.name not in table.column_names:
+            raise ValueError(
+                f"The column '{self.name}' doesn't exist, available columns: "
+                f"{table.column_names}"
+            )
+        return table.column(self.name)
+
+    def to_pyarrow(self) -> "pyarrow.dataset.Expression":
+        import pyarrow.dataset as pds
+
+        return pds.field(self.name)
+
+    def __repr__(self):
+        return f"col({self.name!r})"
+
+
+class _LiteralExpr(Expr):
+    def __init__(self, value: Any):
+        self.value = value
+
+    def eval(self, table: "pyarrow.Table") -> ExprResult:
+        import pyarrow as pa
+
+        return pa.scalar(self.value)
+
+    def to_pyarrow(self) -> "pyarrow.dataset.Expression":
+        import pyarrow.dataset as pds
+
+        return pds.scalar(self.value)
+
+    def __repr__(self):
+        return f"lit({self.value!r})"
+
+
+class _CallExpr(Expr):
+    def __init__(
+        self, function: str, args: List[Any], options: Optional[Dict[str, Any]] = None
+    ):
+        self.function = function
+        self.args: List[Expr] = [a if isinstance(a, Expr) else lit(a) for a in args]
+        self.options = options or {}
+
+    def eval(self, table: "pyarrow.Table") -> ExprResult:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        args = [a.eval(table) for a in self.args]
+        if self.function == "is_in":
+            return pc.is_in(args[0], value_set=pa.array(self.options["value_set"]))
+        if self.function == "cast":
+            return pc.cast(args[0], self.options["target_type"])
+        return getattr(pc, self.function)(*args, **self.options)
+
+    def to_pyarrow(self) -> "pyarrow.dataset.Expression":
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        args = [a.to_pyarrow() for a in self.args]
+        if self.function == "is_in":
+            return args[0].isin(self.options["value_set"])
+        if self.function == "cast":
+            return args[0].cast(self.options["target_type"])
+        try:
+            if self.function in _PYARROW_OPERATORS and not self.options:
+                return _PYARROW_OPERATORS[self.function](*args)
+            # Compute functions accept expressions in newer versions of Arrow.
+            return getattr(pc, self.function)(*args, **self.options)
+        except (AttributeError, TypeError, pa.ArrowException) as e:
+            raise ValueError(
+                f"The function '{self.function}' with options {self.options} "
+                "can't be converted to an Arrow dataset expression."
+            ) from e
+
+    def __repr__(self):
+        args = [repr(a) for a in self.args]
+        args += [f"{k}={v!r}" for k, v in self.options.items()]
+        return f"{self.function}({', '.join(args)})"
+
+
+def _referenced_columns(expr: Expr) -> Set[str]:
+    """Return the names of the columns the expression refers to."""
+    if isinstance(expr, _ColumnExpr):
+        return {expr.name}
+    if isinstance(expr, _CallExpr):
+        return set().union(*(_referenced_columns(a) for a in expr.args))
+    return set()
+
+
+def _eval_column(expr: Expr, table: "pyarrow.Table") -> "pyarrow.ChunkedArray":
+    """Evaluate the expression to a column of the table's length."""
+    import pyarrow as pa
+
+    result = expr.eval(table)
+    if isinstance(result, pa.Scalar):
+        # Constant expressions evaluate to a scalar.
+        return pa.chunked_array(
+            [pa.array([result.as_py()] * table.num_rows, type=result.type)]
+        )
+    if isinstance(result, pa.Array):
+        return pa.chunked_array([result])
+    return result
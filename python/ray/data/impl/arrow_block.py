@@ -106,19 +106,33 @@ class ArrowBlockAccessor(TableBlockAccessor):
                 f"Cannot find column {column}, available columns: "
                 f"{self._table.column_names}"
             )
+        from ray.data.extensions.tensor_extension import ArrowTensorType
+
         array = self._table[column]
+        if isinstance(array.type, ArrowTensorType):
+            # Tensor columns are converted to a single ndarray of shape
+            # (num_rows, *tensor_shape), which is a zero-copy view of the
+            # column if it has a single chunk. Arrow can't concatenate
+            # extension arrays, so the chunks are concatenated by NumPy.
+            chunks = [chunk.to_numpy() for chunk in array.chunks]
+            if len(chunks) == 1:
+                return chunks[0]
+            if not chunks:
+                dtype = array.type.storage_type.value_type.to_pandas_dtype()
+                return np.empty((0,) + array.type.shape, dtype=dtype)
+            return np.concatenate(chunks)
         if array.num_chunks > 1:
-            # TODO(ekl) combine fails since we can't concat
-            # ArrowTensorType?
             array = array.combine_chunks()
-        else:
-            assert array.num_chunks == 1, array
+        elif array.num_chunks == 1:
             array = array.chunk(0)
         return array.to_numpy(zero_copy_only=False)
 
     def to_arrow(self) -> "pyarrow.Table":
         return self._table
 
+    def select(self, columns: List[str]) -> "pyarrow.Table":
+        return self._table.select(columns)
+
     def num_rows(self) -> int:
         return self._table.num_rows
 
@@ -209,7 +223,8 @@ class ArrowBlockAccessor(TableBlockAccessor):
     def combine(self, key: KeyFn, aggs: Tuple[AggregateFn]) -> Block[ArrowRow]:
         """Combine rows with the same key into an accumulator.
 
-        This assumes the block is already sorted by key in ascending order.
+        This assumes the block is already sorted by key in ascending order,
+        unless all of the aggregations support vectorized combining.
 
         Args:
             key: The column name of key or None for global aggregation.
@@ -221,7 +236,10 @@ class ArrowBlockAccessor(TableBlockAccessor):
             aggregation.
             If key is None then the k column is omitted.
         """
-        # TODO(jjyao) This can be implemented natively in Arrow
+        combined = self._combine_vectorized(key, aggs)
+        if combined is not None:
+            return combined
+
         key_fn = (lambda r: r[key]) if key is not None else (lambda r: None)
         iter = self.iter_rows()
         next_row = None
@@ -268,6 +286,61 @@ class ArrowBlockAccessor(TableBlockAccessor):
                 break
         return builder.build()
 
+    def _combine_vectorized(
+        self, key: KeyFn, aggs: Tuple[AggregateFn]
+    ) -> Optional[Block[ArrowRow]]:
+        """Combine rows using pandas group-by kernels.
+
+        Unlike the row-based combine(), this doesn't require the block to be
+        sorted by key.
+
+        Returns:
+            The same block as combine(), or None if the key has nulls, a numeric
+            column changes type when converted to pandas (e.g. integers with
+            nulls become floats), or any of the aggregations doesn't support
+            vectorized combining.
+        """
+        import pandas as pd
+
+        if self.num_rows() == 0:
+            return ArrowBlockAccessor._empty_table()
+        if key is not None and self._table.column(key).null_count > 0:
+            return None
+        df = self.to_pandas()
+        schema = self._table.schema
+        for name, dtype in df.dtypes.items():
+            if pd.api.types.is_numeric_dtype(dtype) and (
+                pyarrow.from_numpy_dtype(dtype) != schema.field(name).type
+            ):
+                return None
+        if not all(agg._supports_vectorized_combine(df) for agg in aggs):
+            return None
+
+        columns = {}
+        if key is None:
+            codes = np.zeros(self.num_rows(), dtype=np.int8)
+        else:
+            try:
+                codes, uniques = pd.factorize(self.to_numpy(key), sort=True)
+            except TypeError:
+                # The keys aren't comparable, so can't be sorted.
+                return None
+            # Take the key of each group from one of its rows, to keep its type.
+            group_rows = np.empty(len(uniques), dtype=np.int64)
+            group_rows[codes] = np.arange(len(codes))
+            columns[key] = self._table.column(key).take(group_rows)
+        groups = df.groupby(codes, sort=True)
+
+        count = collections.defaultdict(int)
+        for agg in aggs:
+            name = agg.name
+            # Check for conflicts with existing aggregation name.
+            if count[name] > 0:
+                name = self._munge_conflict(name, count[name])
+            count[name] += 1
+            columns[name] = agg._vectorized_combine(groups)
+        return pyarrow.Table.from_pydict(columns)
+
     @staticmethod
     def _munge_conflict(name, count):
         return f"{name}_{count+1}"
@@ -288,7 +361,10 @@ class ArrowBlockAccessor(TableBlockAccessor):
 
     @staticmethod
     def aggregate_combined_blocks(
-        blocks: List[Block[ArrowRow]], key: KeyFn, aggs: Tuple[AggregateFn]
+        blocks: List[Block[ArrowRow]],
+        key: KeyFn,
+        aggs: Tuple[AggregateFn],
+        finalize: bool = True,
     ) -> Tuple[Block[ArrowRow], BlockMetadata]:
         """Aggregate sorted, partially combined blocks with the same key range.
 
@@ -299,6 +375,8 @@ class ArrowBlockAccessor(TableBlockAccessor):
             blocks: A list of partially combined and sorted blocks.
             key: The column name of key or None for global aggregation.
             aggs: The aggregations to do.
+            finalize: Whether to finalize the aggregations. If False, the
+                output holds the merged accumulators instead.
 
         Returns:
             A block of [k, v_1, ..., v_n] columns and its metadata where k is
@@ -369,7 +447,10 @@ class ArrowBlockAccessor(TableBlockAccessor):
                 for agg, agg_name, accumulator in zip(
                     aggs, resolved_agg_names, accumulators
                 ):
-                    row[agg_name] = agg.finalize(accumulator)
+                    if finalize:
+                        row[agg_name] = agg.finalize(accumulator)
+                    else:
+                        row[agg_name] = accumulator
 
                 builder.add(row)
             except StopIteration:
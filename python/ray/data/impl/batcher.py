@@ -1,5 +1,7 @@
 from typing import Optional
 
+import numpy as np
+
 from ray.data.block import Block, BlockAccessor
 from ray.data.impl.delegating_block_builder import DelegatingBlockBuilder
 
@@ -36,6 +38,10 @@ class Batcher:
             >= self._batch_size
         )
 
+    def done_adding(self) -> None:
+        """Indicate to the batcher that no more blocks will be added."""
+        pass
+
     def has_any(self) -> bool:
         """Whether this Batcher has any data."""
         return any(BlockAccessor.for_block(b).num_rows() > 0 for b in self._buffer)
@@ -76,3 +82,101 @@ class Batcher:
         # blocks consumed on the next batch extraction.
         self._buffer = leftover
         return output.build()
+
+
+class ShufflingBatcher:
+    """Chunks blocks into randomly shuffled batches.
+
+    The rows of the added blocks are kept in a shuffle buffer, and batches are
+    taken from the buffer only while it holds at least
+    ``shuffle_buffer_min_size`` rows in addition to the batch, so that each
+    batch is drawn from a window of at least that many rows spanning multiple
+    blocks. Once no more blocks will be added, the buffer is drained.
+
+    To avoid shuffling the whole buffer for every batch, the buffer is only
+    reshuffled when blocks were added since the last shuffle. The batches are
+    then taken as zero-copy slices of the shuffled buffer.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int],
+        shuffle_buffer_min_size: int,
+        shuffle_seed: Optional[int] = None,
+    ):
+        if batch_size is None:
+            raise ValueError("Must specify a batch_size if using a local shuffle.")
+        if shuffle_buffer_min_size < 0:
+            raise ValueError(
+                "The local shuffle buffer size must be non-negative, got "
+                f"{shuffle_buffer_min_size}."
+            )
+        self._batch_size = batch_size
+        self._buffer_min_size = shuffle_buffer_min_size
+        self._random = np.random.RandomState(shuffle_seed)
+        # Rows added since the last shuffle.
+        self._builder = DelegatingBlockBuilder()
+        # The shuffled rows, of which the rows from _batch_head are unconsumed.
+        self._shuffle_buffer = None
+        self._batch_head = 0
+        self._done_adding = False
+
+    def add(self, block: Block):
+        """Add a block to the shuffle buffer.
+
+        Args:
+            block: Block to add to the shuffle buffer.
+        """
+        if BlockAccessor.for_block(block).num_rows() > 0:
+            self._builder.add_block(block)
+
+    def done_adding(self) -> None:
+        """Indicate to the batcher that no more blocks will be added, so that
+        the shuffle buffer can be drained."""
+        self._done_adding = True
+
+    def has_batch(self) -> bool:
+        """Whether this batcher has any full batches."""
+        buffer_size = self._buffer_size()
+        if not self._done_adding:
+            return buffer_size - self._batch_size >= self._buffer_min_size
+        return buffer_size >= self._batch_size
+
+    def has_any(self) -> bool:
+        """Whether this batcher has any data."""
+        return self._buffer_size() > 0
+
+    def next_batch(self) -> Block:
+        """Get the next shuffled batch from the shuffle buffer.
+
+        Returns:
+            A batch represented as a Block.
+        """
+        if self._builder.num_rows() > 0:
+            # Shuffle the newly added rows together with the unconsumed rows.
+            if self._shuffle_buffer is not None:
+                accessor = BlockAccessor.for_block(self._shuffle_buffer)
+                if self._batch_head < accessor.num_rows():
+                    self._builder.add_block(
+                        accessor.slice(self._batch_head, accessor.num_rows(), False)
+                    )
+            accessor = BlockAccessor.for_block(self._builder.build())
+            self._shuffle_buffer = accessor.random_shuffle(
+                self._random.randint(0, 2 ** 32 - 1)
+            )
+            self._builder = DelegatingBlockBuilder()
+            self._batch_head = 0
+
+        accessor = BlockAccessor.for_block(self._shuffle_buffer)
+        batch_end = min(self._batch_head + self._batch_size, accessor.num_rows())
+        batch = accessor.slice(self._batch_head, batch_end, False)
+        self._batch_head = batch_end
+        return batch
+
+    def _buffer_size(self) -> int:
+        """Return the number of unconsumed rows in the shuffle buffer."""
+        buffer_size = self._builder.num_rows()
+        if self._shuffle_buffer is not None:
+            num_rows = BlockAccessor.for_block(self._shuffle_buffer).num_rows()
+            buffer_size += num_rows - self._batch_head
+        return buffer_size
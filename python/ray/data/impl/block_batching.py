@@ -1,6 +1,17 @@
 import collections
 import itertools
-from typing import Iterator, Iterable, Union, Optional, TYPE_CHECKING
+import queue
+import threading
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    Iterable,
+    Union,
+    Optional,
+    TypeVar,
+    TYPE_CHECKING,
+)
 
 if TYPE_CHECKING:
     import pyarrow
@@ -11,11 +22,19 @@ import numpy as np
 import ray
 from ray.types import ObjectRef
 from ray.data.block import Block, BlockAccessor
-from ray.data.impl.batcher import Batcher
+from ray.data.impl.batcher import Batcher, ShufflingBatcher
 from ray.data.impl.stats import DatasetStats, DatasetPipelineStats
 
 # An output type of iter_batches() determined by the batch_format parameter.
-BatchType = Union["pandas.DataFrame", "pyarrow.Table", np.ndarray, list]
+BatchType = Union[
+    "pandas.DataFrame", "pyarrow.Table", np.ndarray, Dict[str, np.ndarray], list
+]
+
+T = TypeVar("T")
+
+# How long the background thread of _make_async_gen() waits on a full queue
+# before checking whether the consumer has stopped.
+ASYNC_GEN_PUT_TIMEOUT_S = 0.1
 
 
 def batch_blocks(
@@ -26,6 +45,9 @@ def batch_blocks(
     batch_size: Optional[int] = None,
     batch_format: str = "native",
     drop_last: bool = False,
+    prefetch_batches: int = 0,
+    local_shuffle_buffer_size: Optional[int] = None,
+    local_shuffle_seed: Optional[int] = None,
 ) -> Iterator[BatchType]:
     """Create batches of data from 1 or more blocks.
 
@@ -41,14 +63,30 @@ def batch_blocks(
         batch_format: The format in which to return each batch.
             Specify "native" to use the current block format (promoting
             Arrow to pandas automatically), "pandas" to
-            select ``pandas.DataFrame`` or "pyarrow" to select
-            ``pyarrow.Table``. Default is "native".
+            select ``pandas.DataFrame``, "pyarrow" to select
+            ``pyarrow.Table``, or "numpy" to select a dict of column name to
+            ``numpy.ndarray`` (or a single ``numpy.ndarray`` for simple
+            datasets). Default is "native".
         drop_last: Whether to drop the last batch if it's incomplete.
+        prefetch_batches: The number of batches to fetch and format ahead of
+            the consumer in a background thread. If 0, batches are fetched and
+            formatted on the consumer thread when requested.
+        local_shuffle_buffer_size: If not None, the rows are randomly shuffled
+            using a local buffer of at least this many rows, from which the
+            batches are drawn.
+        local_shuffle_seed: The seed to use for the local random shuffle.
 
     Returns:
         An iterator over record batches.
     """
-    batcher = Batcher(batch_size=batch_size)
+    if local_shuffle_buffer_size is not None:
+        batcher = ShufflingBatcher(
+            batch_size=batch_size,
+            shuffle_buffer_min_size=local_shuffle_buffer_size,
+            shuffle_seed=local_shuffle_seed,
+        )
+    else:
+        batcher = Batcher(batch_size=batch_size)
 
     def batch_block(block: ObjectRef[Block]):
         with stats.iter_get_s.timer():
@@ -57,27 +95,38 @@ def batch_blocks(
         while batcher.has_batch():
             with stats.iter_format_batch_s.timer():
                 result = _format_batch(batcher.next_batch(), batch_format)
-            with stats.iter_user_s.timer():
-                yield result
-
-    block_window = []  # Handle empty sliding window gracefully.
-    for block_window in _sliding_window(blocks, prefetch_blocks + 1):
-        block_window = list(block_window)
-        with stats.iter_wait_s.timer():
-            ray.wait(block_window, num_returns=1, fetch_local=True)
-        yield from batch_block(block_window[0])
-
-    # Consume remainder of final block window.
-    for block in block_window[1:]:
-        yield from batch_block(block)
-
-    # Yield any remainder batches.
-    if batcher.has_any() and not drop_last:
-        with stats.iter_format_batch_s.timer():
-            result = _format_batch(batcher.next_batch(), batch_format)
-        with stats.iter_user_s.timer():
             yield result
 
+    def get_batches() -> Iterator[BatchType]:
+        block_window = []  # Handle empty sliding window gracefully.
+        for block_window in _sliding_window(blocks, prefetch_blocks + 1):
+            block_window = list(block_window)
+            with stats.iter_wait_s.timer():
+                ray.wait(block_window, num_returns=1, fetch_local=True)
+            yield from batch_block(block_window[0])
+
+        # Consume remainder of final block window.
+        for block in block_window[1:]:
+            yield from batch_block(block)
+
+        # Yield any remainder batches.
+        batcher.done_adding()
+        while batcher.has_batch():
+            with stats.iter_format_batch_s.timer():
+                result = _format_batch(batcher.next_batch(), batch_format)
+            yield result
+        if batcher.has_any() and not drop_last:
+            with stats.iter_format_batch_s.timer():
+                result = _format_batch(batcher.next_batch(), batch_format)
+            yield result
+
+    batches = get_batches()
+    if prefetch_batches > 0:
+        batches = _make_async_gen(batches, prefetch_batches)
+    for batch in batches:
+        with stats.iter_user_s.timer():
+            yield batch
+
 
 def _format_batch(batch: Block, batch_format: str) -> BatchType:
     import pyarrow as pa
@@ -95,6 +144,13 @@ def _format_batch(batch: Block, batch_format: str) -> BatchType:
     elif batch_format == "pyarrow":
         batch = BlockAccessor.for_block(batch)
         return batch.to_arrow()
+    elif batch_format == "numpy":
+        if isinstance(batch, list):
+            return BlockAccessor.for_block(batch).to_numpy()
+        # Convert each column separately, so that tensor columns are returned
+        # as views of the block buffers instead of being copied to pandas.
+        batch = BlockAccessor.for_block(batch)
+        return {name: batch.to_numpy(name) for name in batch.schema().names}
     else:
         raise ValueError(
             f"The given batch format: {batch_format} "
@@ -102,6 +158,67 @@ def _format_batch(batch: Block, batch_format: str) -> BatchType:
         )
 
 
+class _AsyncGenFailure:
+    """Wraps an exception raised by the background thread of _make_async_gen()."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+_ASYNC_GEN_DONE = object()
+
+
+def _make_async_gen(base_iterator: Iterator[T], prefetch: int) -> Iterator[T]:
+    """Runs an iterator in a background thread, buffering up to prefetch of its
+    outputs ahead of the consumer.
+
+    Exceptions raised by the base iterator are re-raised to the consumer. If
+    the consumer stops early, the background thread exits once it produces
+    its next output.
+
+    Args:
+        base_iterator: The iterator to run in the background.
+        prefetch: The max number of outputs buffered ahead of the consumer.
+
+    Returns:
+        An iterator over the outputs of the base iterator.
+    """
+    output_queue = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                output_queue.put(item, timeout=ASYNC_GEN_PUT_TIMEOUT_S)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run() -> None:
+        try:
+            for item in base_iterator:
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_AsyncGenFailure(e))
+        else:
+            put(_ASYNC_GEN_DONE)
+
+    thread = threading.Thread(target=run, name="BatchPrefetcher", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = output_queue.get()
+            if item is _ASYNC_GEN_DONE:
+                return
+            if isinstance(item, _AsyncGenFailure):
+                raise item.exc
+            yield item
+    finally:
+        stopped.set()
+
+
 def _sliding_window(iterable: Iterable, n: int):
     """Creates an iterator consisting of n-width sliding windows over
     iterable. The sliding windows are constructed lazily such that an
@@ -0,0 +1,315 @@
+"""
+Persistent caching of dataset blocks on disk.
+
+``Dataset.cache(path, storage="disk")`` writes the output blocks of a dataset
+to ``<path>/<key>/``, one Arrow IPC file per tabular block (or a pickle file
+per simple block), followed by a metadata file that lists the cached blocks.
+The metadata file is written last, so its presence marks a complete cache.
+
+The key defaults to a fingerprint of the plan of the dataset: the datasource
+and arguments of its read, the input files and their sizes, and the
+transforms applied to the read. Transforms are identified by the bytecode of
+their functions and the values these refer to, rather than by their pickled
+bytes, which differ across jobs. Later epochs and later jobs that compute the
+same dataset read the cached blocks back instead of recomputing them. Local
+cache files are memory-mapped when read, so reading back a cached block
+doesn't copy it through the heap of the read task.
+"""
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import sysconfig
+import types
+import uuid
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import ray
+from ray.data.block import Block, BlockAccessor, BlockMetadata
+from ray.data.context import DatasetContext
+from ray.data.datasource.datasource import Datasource, ReadTask
+from ray.data.datasource.file_based_datasource import (
+    _resolve_paths_and_filesystem,
+    _wrap_s3_serialization_workaround,
+    _S3FileSystemWrapper,
+)
+from ray.data.impl.block_list import BlockList
+from ray.data.impl.progress_bar import ProgressBar
+from ray.data.impl.remote_fn import cached_remote_fn
+
+if TYPE_CHECKING:
+    import pyarrow
+    from ray.data.impl.plan import ExecutionPlan
+
+logger = logging.getLogger(__name__)
+
+# The name of the file listing the cached blocks, written once all blocks are.
+CACHE_METADATA_FILE = "_cache_metadata.pkl"
+
+# The max nesting depth of the values that a plan fingerprint covers.
+_MAX_FINGERPRINT_DEPTH = 20
+
+
+def plan_fingerprint(plan: "ExecutionPlan") -> Optional[str]:
+    """Compute a content key for the output of a plan.
+
+    Returns None if the plan doesn't start with a read or if its transforms
+    refer to values that can't be described (see ``_describe()``), in which
+    case the output can't be identified across jobs.
+    """
+    in_blocks = plan._in_blocks
+    datasource = getattr(in_blocks, "_read_datasource", None)
+    if datasource is None:
+        return None
+    inputs = [
+        (m.input_files, m.size_bytes, m.num_rows) for m in in_blocks.get_metadata()
+    ]
+    stages = [(stage.name, _get_stage_fn(stage)) for stage in plan._stages]
+    try:
+        description = _describe(
+            (datasource, in_blocks._read_args, inputs, stages), 0, set()
+        )
+        payload = pickle.dumps(description, protocol=4)
+    except Exception as e:
+        logger.debug(f"Failed to fingerprint the dataset plan: {e}")
+        return None
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _describe(value: Any, depth: int, seen: Set[int]) -> Any:
+    """Return a description of a value that is the same in every process.
+
+    Functions are described by their bytecode and by the values they close
+    over or refer to, since pickling them by value isn't deterministic across
+    jobs. Other objects are described by their type and pickled state. Raises
+    if the value can't be described.
+    """
+    if depth > _MAX_FINGERPRINT_DEPTH:
+        raise ValueError("The value is too deeply nested to fingerprint.")
+    depth += 1
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(_describe(v, depth, seen) for v in value)
+    if isinstance(value, dict):
+        return "dict", tuple(
+            (_describe(k, depth, seen), _describe(v, depth, seen))
+            for k, v in value.items()
+        )
+    if isinstance(value, (set, frozenset)):
+        return "set", tuple(sorted(repr(_describe(v, depth, seen)) for v in value))
+    if isinstance(value, types.ModuleType):
+        return "module", value.__name__
+    if isinstance(value, DatasetContext):
+        # The context only affects how the output is split into blocks.
+        return "context"
+    if isinstance(value, type):
+        if _is_library_code(value) or id(value) in seen:
+            return "type", value.__module__, value.__qualname__
+        seen.add(id(value))
+        methods = tuple(
+            (name, _describe(attr, depth, seen))
+            for name, attr in vars(value).items()
+            if isinstance(attr, types.FunctionType)
+        )
+        return "type", value.__module__, value.__qualname__, methods
+    if isinstance(value, types.CodeType):
+        return (
+            "code",
+            value.co_code,
+            value.co_names,
+            tuple(_describe(c, depth, seen) for c in value.co_consts),
+        )
+    if isinstance(value, types.FunctionType):
+        name = ("function", value.__module__, value.__qualname__)
+        if _is_library_code(value) or id(value) in seen:
+            return name
+        seen.add(id(value))
+        closure = tuple(
+            _describe(cell.cell_contents, depth, seen)
+            for cell in value.__closure__ or ()
+        )
+        # The globals that the function refers to by name, e.g. helpers.
+        global_refs = tuple(
+            (name, _describe(value.__globals__[name], depth, seen))
+            for name in value.__code__.co_names
+            if name in value.__globals__
+        )
+        return name + (
+            _describe(value.__code__, depth, seen),
+            _describe(value.__defaults__, depth, seen),
+            closure,
+            global_refs,
+        )
+    if isinstance(value, types.MethodType):
+        return (
+            "method",
+            _describe(value.__func__, depth, seen),
+            _describe(value.__self__, depth, seen),
+        )
+    if isinstance(value, functools.partial):
+        return (
+            "partial",
+            _describe(value.func, depth, seen),
+            _describe(value.args, depth, seen),
+            _describe(value.keywords, depth, seen),
+        )
+    if isinstance(value, types.BuiltinFunctionType):
+        return "builtin", getattr(value, "__module__", None), value.__qualname__
+    return _describe(type(value), depth, seen), pickle.dumps(value, protocol=4)
+
+
+def _is_library_code(value: Any) -> bool:
+    """Whether a function or class is importable from Ray, the standard library
+    or an installed package, so that it can be described by its name."""
+    if "<locals>" in value.__qualname__:
+        return False
+    return _is_library_module(value.__module__)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_library_module(name: Optional[str]) -> bool:
+    if name is None or name == "__main__":
+        return False
+    if name == "builtins" or name == "ray" or name.startswith("ray."):
+        return True
+    module = sys.modules.get(name)
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return False
+    path = os.path.realpath(path)
+    return any(
+        path.startswith(os.path.realpath(sysconfig.get_paths()[key]) + os.sep)
+        for key in ("stdlib", "platstdlib", "purelib", "platlib")
+    )
+
+
+def resolve_cache_dir(
+    path: str, key: str, filesystem: Optional["pyarrow.fs.FileSystem"]
+) -> Tuple[str, "pyarrow.fs.FileSystem"]:
+    """Return the directory of the cache with the given key, and its filesystem."""
+    paths, filesystem = _resolve_paths_and_filesystem(path, filesystem)
+    return f"{paths[0].rstrip('/')}/{key}", filesystem
+
+
+def load_cache_metadata(
+    cache_dir: str, filesystem: "pyarrow.fs.FileSystem"
+) -> Optional[Tuple[List[str], List[BlockMetadata]]]:
+    """Return the files and metadata of a complete cache, or None if missing."""
+    from pyarrow.fs import FileType
+
+    metadata_path = f"{cache_dir}/{CACHE_METADATA_FILE}"
+    if filesystem.get_file_info(metadata_path).type != FileType.File:
+        return None
+    with filesystem.open_input_stream(metadata_path) as f:
+        return pickle.loads(f.read())
+
+
+def write_cache(
+    blocks: BlockList,
+    cache_dir: str,
+    filesystem: "pyarrow.fs.FileSystem",
+    ray_remote_args: Dict[str, Any],
+) -> Tuple[List[str], List[BlockMetadata]]:
+    """Write the blocks to the cache directory, returning the cached files and
+    the metadata of the blocks as they will be read back."""
+    filesystem.create_dir(cache_dir, recursive=True)
+    wrapped_fs = _wrap_s3_serialization_workaround(filesystem)
+    write_block = cached_remote_fn(_write_cache_block).options(**ray_remote_args)
+
+    # Prefix the files with a unique id, so that concurrent writers of the
+    # same cache never overwrite each other's files.
+    prefix = uuid.uuid4().hex[:8]
+    metadata = [
+        write_block.remote(block, f"{cache_dir}/{prefix}_{i:06}", wrapped_fs)
+        for i, block in enumerate(blocks.get_blocks())
+    ]
+    write_bar = ProgressBar("Write Cache", len(metadata))
+    metadata = write_bar.fetch_until_complete(metadata)
+    write_bar.close()
+    # Each block is read back from the single file it was written to.
+    files = [m.input_files[0] for m in metadata]
+    with filesystem.open_output_stream(f"{cache_dir}/{CACHE_METADATA_FILE}") as f:
+        f.write(pickle.dumps((files, metadata)))
+    return files, metadata
+
+
+def local_node_remote_args(filesystem: "pyarrow.fs.FileSystem") -> Dict[str, Any]:
+    """Return remote args that pin the cache tasks to this node if the cache is
+    on the local filesystem, which isn't shared with the other nodes."""
+    from pyarrow.fs import LocalFileSystem
+
+    if isinstance(filesystem, LocalFileSystem):
+        node_ip = ray.util.get_node_ip_address()
+        return {"resources": {f"node:{node_ip}": 0.001}}
+    return {}
+
+
+class CacheDatasource(Datasource[Any]):
+    """Reads back the blocks written by ``write_cache()``.
+
+    The cached files and their metadata are passed as read arguments, so that
+    preparing the read doesn't require access to the cache directory.
+    """
+
+    def prepare_read(
+        self,
+        parallelism: int,
+        files: List[str],
+        metadata: List[BlockMetadata],
+        filesystem: "pyarrow.fs.FileSystem",
+    ) -> List[ReadTask]:
+        filesystem = _wrap_s3_serialization_workaround(filesystem)
+        return [
+            ReadTask(
+                lambda file_path=file_path: [_read_cache_file(file_path, filesystem)],
+                meta,
+            )
+            for file_path, meta in zip(files, metadata)
+        ]
+
+
+def _write_cache_block(block: Block, base_path: str, fs: Any) -> BlockMetadata:
+    import pyarrow as pa
+
+    if isinstance(fs, _S3FileSystemWrapper):
+        fs = fs.unwrap()
+    accessor = BlockAccessor.for_block(block)
+    if isinstance(block, list):
+        file_path = base_path + ".pkl"
+        with fs.open_output_stream(file_path) as f:
+            f.write(pickle.dumps(block))
+    else:
+        file_path = base_path + ".arrow"
+        block = accessor.to_arrow()
+        accessor = BlockAccessor.for_block(block)
+        with fs.open_output_stream(file_path) as f:
+            with pa.ipc.new_file(f, block.schema) as writer:
+                writer.write_table(block)
+    return accessor.get_metadata(input_files=[file_path], exec_stats=None)
+
+
+def _read_cache_file(file_path: str, fs: Any) -> Block:
+    import pyarrow as pa
+    from pyarrow.fs import LocalFileSystem
+
+    if isinstance(fs, _S3FileSystemWrapper):
+        fs = fs.unwrap()
+    if file_path.endswith(".pkl"):
+        with fs.open_input_stream(file_path) as f:
+            return pickle.loads(f.read())
+    if isinstance(fs, LocalFileSystem):
+        # The buffers of the table reference the mapped file, so nothing is
+        # read into memory until the block is used.
+        source = pa.memory_map(file_path)
+    else:
+        source = fs.open_input_file(file_path)
+    return pa.ipc.open_file(source).read_all()
+
+
+def _get_stage_fn(stage: Any) -> Any:
+    if hasattr(stage, "block_fn"):
+        return stage.block_fn
+    return stage.fn, stage.block_udf
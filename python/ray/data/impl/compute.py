@@ -1,6 +1,8 @@
+import collections
 from typing import TypeVar, Any, Union, Callable, List, Tuple, Optional
 
 import ray
+from ray.types import ObjectRef
 from ray.util.annotations import PublicAPI, DeveloperAPI
 from ray.data.block import (
     Block,
@@ -101,15 +103,32 @@ class ActorPoolStrategy(ComputeStrategy):
 
     To autoscale from ``m`` to ``n`` actors, specify ``compute=ActorPool(m, n)``.
     For a fixed-sized pool of size ``n``, specify ``compute=ActorPool(n, n)``.
+
+    Each actor is sent up to ``max_tasks_in_flight_per_actor`` blocks at a time,
+    so that the next block is already queued (and its data fetched) when the
+    actor finishes a block. Blocks are preferably sent to actors on the node
+    that holds them. The pool scales up while all actors are busy, and actors
+    beyond ``min_size`` are released as soon as no blocks are left for them.
     """
 
-    def __init__(self, min_size: int = 1, max_size: Optional[int] = None):
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+        max_tasks_in_flight_per_actor: int = 2,
+    ):
         if min_size < 1:
             raise ValueError("min_size must be > 1", min_size)
         if max_size is not None and min_size > max_size:
             raise ValueError("min_size must be <= max_size", min_size, max_size)
+        if max_tasks_in_flight_per_actor < 1:
+            raise ValueError(
+                "max_tasks_in_flight_per_actor must be >= 1",
+                max_tasks_in_flight_per_actor,
+            )
         self.min_size = min_size
         self.max_size = max_size or float("inf")
+        self.max_tasks_in_flight_per_actor = max_tasks_in_flight_per_actor
 
     def _apply(
         self,
@@ -128,12 +147,13 @@ class ActorPoolStrategy(ComputeStrategy):
             block_list.clear()
 
         orig_num_blocks = len(blocks_in)
-        results = []
+        if orig_num_blocks == 0:
+            return BlockList([], [])
         map_bar = ProgressBar("Map Progress", total=orig_num_blocks)
 
         class BlockWorker:
-            def ready(self):
-                return "ok"
+            def ready(self) -> str:
+                return ray.get_runtime_context().node_id.hex()
 
             def map_block_split(
                 self, block: Block, input_files: List[str]
@@ -151,73 +171,138 @@ class ActorPoolStrategy(ComputeStrategy):
 
         BlockWorker = ray.remote(**remote_args)(BlockWorker)
 
-        workers = [BlockWorker.remote() for _ in range(self.min_size)]
-        tasks = {w.ready.remote(): w for w in workers}
-        metadata_mapping = {}
-        ready_workers = set()
+        block_queue = _LocalityAwareBlockQueue([b for b, _ in blocks_in])
+        results = [None] * orig_num_blocks
+        metadata = [None] * orig_num_blocks
+        # Actors that are starting, by the ref of their ready() call.
+        pending_workers = {}
+        # The node of each ready actor, and its number of tasks in flight.
+        worker_nodes = {}
+        num_in_flight = {}
+        # The actor and block index of each task in flight.
+        tasks = {}
+
+        def start_worker():
+            worker = BlockWorker.remote()
+            pending_workers[worker.ready.remote()] = worker
+
+        def update_description():
+            map_bar.set_description(
+                "Map Progress ({} actors {} pending)".format(
+                    len(worker_nodes), len(pending_workers)
+                )
+            )
 
-        while len(results) < orig_num_blocks:
-            ready, _ = ray.wait(
-                list(tasks), timeout=0.01, num_returns=1, fetch_local=False
+        def submit(worker, i: int):
+            block, meta = blocks_in[i]
+            if context.block_splitting_enabled:
+                ref = worker.map_block_split.remote(block, meta.input_files)
+            else:
+                ref, metadata[i] = worker.map_block_nosplit.remote(
+                    block, meta.input_files
+                )
+            results[i] = ref
+            tasks[ref] = (worker, i)
+            num_in_flight[worker] += 1
+
+        for _ in range(self.min_size):
+            start_worker()
+
+        num_done = 0
+        while num_done < orig_num_blocks:
+            # Every state change is triggered by an actor becoming ready or a
+            # task completing, so wait without a timeout.
+            [ref], _ = ray.wait(
+                list(pending_workers) + list(tasks),
+                num_returns=1,
+                fetch_local=False,
             )
-            if not ready:
+            if ref in pending_workers:
+                worker = pending_workers.pop(ref)
+                worker_nodes[worker] = ray.get(ref)
+                num_in_flight[worker] = 0
+                update_description()
+            else:
+                worker, _ = tasks.pop(ref)
+                num_in_flight[worker] -= 1
+                num_done += 1
+                map_bar.update(1)
+
+            # Dispatch blocks to the actor until it's saturated, preferring
+            # blocks on its node.
+            while (
+                block_queue
+                and num_in_flight[worker] < self.max_tasks_in_flight_per_actor
+            ):
+                submit(worker, block_queue.pop(worker_nodes[worker]))
+
+            if block_queue:
+                # All ready actors are saturated, so scale up unless many
+                # actors are still starting.
+                num_workers = len(worker_nodes) + len(pending_workers)
                 if (
-                    len(workers) < self.max_size
-                    and len(ready_workers) / len(workers) > 0.8
+                    num_workers < self.max_size
+                    and len(worker_nodes) / num_workers > 0.8
                 ):
-                    w = BlockWorker.remote()
-                    workers.append(w)
-                    tasks[w.ready.remote()] = w
-                    map_bar.set_description(
-                        "Map Progress ({} actors {} pending)".format(
-                            len(ready_workers), len(workers) - len(ready_workers)
-                        )
-                    )
-                continue
-
-            [obj_id] = ready
-            worker = tasks[obj_id]
-            del tasks[obj_id]
-
-            # Process task result.
-            if worker in ready_workers:
-                results.append(obj_id)
-                map_bar.update(1)
+                    start_worker()
+                    update_description()
             else:
-                ready_workers.add(worker)
-                map_bar.set_description(
-                    "Map Progress ({} actors {} pending)".format(
-                        len(ready_workers), len(workers) - len(ready_workers)
-                    )
-                )
-
-            # Schedule a new task.
-            if blocks_in:
-                block, meta = blocks_in.pop()
-                if context.block_splitting_enabled:
-                    ref = worker.map_block_split.remote(block, meta.input_files)
-                else:
-                    ref, meta_ref = worker.map_block_nosplit.remote(
-                        block, meta.input_files
-                    )
-                    metadata_mapping[ref] = meta_ref
-                tasks[ref] = worker
+                # No blocks are left, so release the actors that won't get
+                # any more work.
+                for pending_worker in pending_workers.values():
+                    ray.kill(pending_worker)
+                pending_workers.clear()
+                if num_in_flight[worker] == 0 and len(worker_nodes) > self.min_size:
+                    ray.kill(worker)
+                    del worker_nodes[worker], num_in_flight[worker]
+                update_description()
 
         map_bar.close()
         new_blocks, new_metadata = [], []
         if context.block_splitting_enabled:
             for result in ray.get(results):
-                for block, metadata in result:
+                for block, meta in result:
                     new_blocks.append(block)
-                    new_metadata.append(metadata)
+                    new_metadata.append(meta)
         else:
-            for block in results:
-                new_blocks.append(block)
-                new_metadata.append(metadata_mapping[block])
-            new_metadata = ray.get(new_metadata)
+            new_blocks = results
+            new_metadata = ray.get(metadata)
         return BlockList(new_blocks, new_metadata)
 
 
+class _LocalityAwareBlockQueue:
+    """A queue of the blocks to map, which pops blocks stored on a given node
+    first, and otherwise blocks in their original order."""
+
+    def __init__(self, blocks: List[ObjectRef[Block]]):
+        self._order = collections.deque(range(len(blocks)))
+        self._by_node = collections.defaultdict(collections.deque)
+        self._popped = [False] * len(blocks)
+        self._num_left = len(blocks)
+        try:
+            locations = ray.experimental.get_object_locations(blocks)
+        except Exception:
+            # Locality is only an optimization.
+            locations = {}
+        for i, block in enumerate(blocks):
+            for node_id in locations.get(block, {}).get("node_ids", []):
+                self._by_node[node_id].append(i)
+
+    def __len__(self) -> int:
+        return self._num_left
+
+    def pop(self, node_id: str) -> int:
+        """Pop the index of a block, preferring blocks on the given node."""
+        for candidates in (self._by_node.get(node_id), self._order):
+            while candidates:
+                i = candidates.popleft()
+                if not self._popped[i]:
+                    self._popped[i] = True
+                    self._num_left -= 1
+                    return i
+        raise IndexError("pop from an empty block queue")
+
+
 def cache_wrapper(
     fn: Union[CallableClass, Callable[[Any], Any]],
     compute: Optional[Union[str, ComputeStrategy]],
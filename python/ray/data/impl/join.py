@@ -0,0 +1,197 @@
+"""
+We implement two distributed join algorithms for tabular datasets.
+
+Partitioned hash join: the blocks of both datasets are hash partitioned by the
+join key into the same number of partitions, which is an all-to-all shuffle.
+Rows with equal keys end up in the same partition of both sides, so each join
+task joins the partitions from the left side with those from the right side.
+
+Broadcast join: if one side is smaller than
+``DatasetContext.broadcast_join_threshold_bytes``, all of its blocks are sent
+to one join task per block of the other side, which avoids shuffling the
+larger side. This is only possible if the rows of the larger side are kept at
+most once by the join (i.e., it's an inner join, or an outer join that keeps
+the rows of the larger side).
+"""
+from typing import Any, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from ray.data.block import Block, BlockAccessor, BlockMetadata, BlockExecStats
+from ray.data.context import DatasetContext
+from ray.data.impl.block_list import BlockList
+from ray.data.impl.progress_bar import ProgressBar
+from ray.data.impl.remote_fn import cached_remote_fn
+from ray.data.impl.shuffle import ShuffleOp
+
+if TYPE_CHECKING:
+    import pandas
+    import pyarrow
+
+# The supported join types, with the same semantics as in pandas.merge().
+JOIN_TYPES = ("inner", "left", "right", "outer")
+
+# The suffix added to the names of right side columns that conflict with
+# names of left side columns.
+RIGHT_SUFFIX = "_right"
+
+
+def join_impl(
+    left: BlockList, right: BlockList, on: List[str], how: str
+) -> Tuple[BlockList, dict]:
+    """Join the blocks of two tabular datasets on the given key columns."""
+    left_schema = _get_schema(left, on, "left")
+    right_schema = _get_schema(right, on, "right")
+
+    ctx = DatasetContext.get_current()
+    threshold = ctx.broadcast_join_threshold_bytes
+    if how in ("inner", "left") and 0 <= right.size_bytes() < threshold:
+        return _broadcast_join(left, right, True, on, how, left_schema, right_schema)
+    if how in ("inner", "right") and 0 <= left.size_bytes() < threshold:
+        return _broadcast_join(right, left, False, on, how, left_schema, right_schema)
+
+    left_blocks, left_metadata = _unzip(left.get_blocks_with_metadata())
+    right_blocks, right_metadata = _unzip(right.get_blocks_with_metadata())
+    num_left = len(left_blocks)
+    output_num_blocks = max(num_left, len(right_blocks))
+    if output_num_blocks == 0:
+        return BlockList([], []), {}
+    join_op = JoinOp(
+        map_args=[on],
+        reduce_args=[on, how, num_left, left_schema, right_schema],
+    )
+    return join_op.execute(
+        BlockList(left_blocks + right_blocks, left_metadata + right_metadata),
+        output_num_blocks,
+    )
+
+
+class JoinOp(ShuffleOp):
+    """Hash partitions the blocks of both sides, then joins the partitions.
+
+    The input blocks are the left blocks followed by the right blocks, so the
+    reduce tells the sides apart by the mapper order. This requires all of the
+    partitions at once, so the push-based engine can't be used.
+    """
+
+    name = "Join"
+    reduce_stage_name = "join"
+    supports_partial_reduce = False
+
+    @staticmethod
+    def map(
+        idx: int, block: Block, output_num_blocks: int, on: List[str]
+    ) -> List[Union[BlockMetadata, Block]]:
+        stats = BlockExecStats.builder()
+        accessor = BlockAccessor.for_block(block)
+        parts = accessor.hash_partition(on, output_num_blocks)
+        meta = accessor.get_metadata(input_files=None, exec_stats=stats.build())
+        return [meta] + parts
+
+    @staticmethod
+    def reduce(
+        on: List[str],
+        how: str,
+        num_left: int,
+        left_schema: Any,
+        right_schema: Any,
+        *mapper_outputs: List[Block],
+        partial_reduce: bool = False,
+    ) -> Tuple[Block, BlockMetadata]:
+        stats = BlockExecStats.builder()
+        left = _concat_frames(mapper_outputs[:num_left], left_schema, on)
+        right = _concat_frames(mapper_outputs[num_left:], right_schema, on)
+        joined = left.merge(right, on=on, how=how, suffixes=("", RIGHT_SUFFIX))
+        ret = BlockAccessor.for_block(joined).to_arrow()
+        return ret, BlockAccessor.for_block(ret).get_metadata(
+            input_files=None, exec_stats=stats.build()
+        )
+
+
+def _broadcast_join(
+    large: BlockList,
+    small: BlockList,
+    small_is_right: bool,
+    on: List[str],
+    how: str,
+    left_schema: Any,
+    right_schema: Any,
+) -> Tuple[BlockList, dict]:
+    """Join each block of the large side with all blocks of the small side."""
+    small_blocks = small.get_blocks()
+    large_blocks = large.get_blocks()
+    join_block = cached_remote_fn(JoinOp.reduce).options(num_returns=2)
+
+    blocks, metadata = [], []
+    for block in large_blocks:
+        if small_is_right:
+            args = [1, left_schema, right_schema, block, *small_blocks]
+        else:
+            args = [len(small_blocks), left_schema, right_schema]
+            args += [*small_blocks, block]
+        res, meta = join_block.remote(on, how, *args)
+        blocks.append(res)
+        metadata.append(meta)
+
+    # Early release memory.
+    del large_blocks, small_blocks
+    join_bar = ProgressBar("Broadcast Join", total=len(metadata))
+    metadata = join_bar.fetch_until_complete(metadata)
+    join_bar.close()
+    return BlockList(blocks, metadata), {"broadcast": metadata}
+
+
+def _get_schema(
+    blocks: BlockList, on: List[str], side: str
+) -> Optional[Union["pyarrow.Schema", Any]]:
+    """Return the schema of a join input, validating that it has the keys."""
+    schema = None
+    for m in blocks.get_metadata():
+        if m.schema is not None and (m.num_rows is None or m.num_rows > 0):
+            schema = m.schema
+            break
+    else:
+        schema = blocks.ensure_schema_for_first_block()
+    if schema is None:
+        # The dataset is empty.
+        return None
+    if isinstance(schema, type):
+        raise ValueError(
+            f"join() is only supported for tabular datasets, but the {side} "
+            f"dataset has records of type {schema}."
+        )
+    missing = [k for k in on if k not in schema.names]
+    if missing:
+        raise ValueError(
+            f"The {side} dataset doesn't have the join key columns {missing}, "
+            f"available columns: {schema.names}"
+        )
+    return schema
+
+
+def _concat_frames(
+    blocks: List[Block], schema: Any, on: List[str]
+) -> "pandas.DataFrame":
+    """Concatenate blocks into one frame, keeping the schema if all are empty."""
+    import pandas as pd
+
+    frames = []
+    for block in blocks:
+        accessor = BlockAccessor.for_block(block)
+        if accessor.num_rows() > 0:
+            frames.append(accessor.to_pandas())
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+    if schema is None:
+        return pd.DataFrame(columns=on)
+    if hasattr(schema, "empty_table"):
+        return schema.empty_table().to_pandas()
+    return pd.DataFrame(
+        {name: pd.Series(dtype=t) for name, t in zip(schema.names, schema.types)}
+    )
+
+
+def _unzip(
+    blocks_with_metadata: List[Tuple[Block, BlockMetadata]]
+) -> Tuple[List[Block], List[BlockMetadata]]:
+    blocks = [b for b, _ in blocks_with_metadata]
+    metadata = [m for _, m in blocks_with_metadata]
+    return blocks, metadata
@@ -131,6 +131,9 @@ class PandasBlockAccessor(TableBlockAccessor):
 
         return pyarrow.table(self._table)
 
+    def select(self, columns: List[str]) -> "pandas.DataFrame":
+        return self._table[columns]
+
     def num_rows(self) -> int:
         return self._table.shape[0]
 
@@ -177,6 +180,13 @@ class PandasBlockAccessor(TableBlockAccessor):
         # TODO (kfstorm): A workaround to pass tests. Not efficient.
         return BlockAccessor.for_block(self.to_arrow()).combine(key, aggs).to_pandas()
 
+    def _combine_vectorized(
+        self, key: KeyFn, aggs: Tuple[AggregateFn]
+    ) -> Optional["pandas.DataFrame"]:
+        # Delegate to the Arrow implementation, like combine().
+        block = BlockAccessor.for_block(self.to_arrow())._combine_vectorized(key, aggs)
+        return None if block is None else BlockAccessor.for_block(block).to_pandas()
+
     @staticmethod
     def merge_sorted_blocks(
         blocks: List["pandas.DataFrame"], key: "SortKeyT", _descending: bool
@@ -191,10 +201,16 @@ class PandasBlockAccessor(TableBlockAccessor):
 
     @staticmethod
     def aggregate_combined_blocks(
-        blocks: List["pandas.DataFrame"], key: KeyFn, aggs: Tuple[AggregateFn]
+        blocks: List["pandas.DataFrame"],
+        key: KeyFn,
+        aggs: Tuple[AggregateFn],
+        finalize: bool = True,
     ) -> Tuple["pandas.DataFrame", BlockMetadata]:
         # TODO (kfstorm): A workaround to pass tests. Not efficient.
         block, metadata = ArrowBlockAccessor.aggregate_combined_blocks(
-            [BlockAccessor.for_block(block).to_arrow() for block in blocks], key, aggs
+            [BlockAccessor.for_block(block).to_arrow() for block in blocks],
+            key,
+            aggs,
+            finalize,
         )
         return BlockAccessor.for_block(block).to_pandas(), metadata
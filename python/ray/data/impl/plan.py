@@ -1,14 +1,28 @@
-from typing import Callable, Tuple, Optional, Union, Iterable, TYPE_CHECKING
+from typing import (
+    Callable,
+    List,
+    Tuple,
+    Optional,
+    Union,
+    Iterable,
+    Iterator,
+    TYPE_CHECKING,
+)
+import collections
+import time
 import uuid
 
 if TYPE_CHECKING:
     import pyarrow
 
 import ray
+from ray.types import ObjectRef
 from ray.data.context import DatasetContext
-from ray.data.block import Block
+from ray.data.block import Block, BlockMetadata
+from ray.data.datasource import ParquetDatasource
 from ray.data.impl.block_list import BlockList
-from ray.data.impl.compute import get_compute
+from ray.data.impl.compute import get_compute, TaskPoolStrategy, _map_block_nosplit
+from ray.data.impl.remote_fn import cached_remote_fn
 from ray.data.impl.stats import DatasetStats
 from ray.data.impl.lazy_block_list import LazyBlockList
 
@@ -120,21 +134,70 @@ class ExecutionPlan:
         """
         if self._out_blocks is None:
             self._optimize()
-            blocks = self._in_blocks
-            stats = self._in_stats
-            for stage in self._stages:
-                stats_builder = stats.child_builder(stage.name)
-                blocks, stage_info = stage(blocks, clear_input_blocks)
-                if stage_info:
-                    stats = stats_builder.build_multistage(stage_info)
-                else:
-                    stats = stats_builder.build(blocks)
-                stats.dataset_uuid = uuid.uuid4().hex
+            blocks, stats = self._execute_stages(self._stages, clear_input_blocks)
             self._out_blocks = blocks
             self._out_stats = stats
             self._out_stats.dataset_uuid = self._dataset_uuid
         return self._out_blocks
 
+    def execute_streaming(
+        self,
+    ) -> Tuple[Iterator[Tuple[ObjectRef[Block], BlockMetadata]], DatasetStats]:
+        """Execute this plan, streaming blocks through the trailing stages.
+
+        The trailing one-to-one stages that run as tasks are executed block by
+        block, with at most ``DatasetContext.streaming_max_blocks_in_flight``
+        blocks being processed at a time. A new block is only submitted once
+        an output block has been consumed by the caller. Stages up to the last
+        all-to-all or actor stage need all of their input at once, so they are
+        executed as usual.
+
+        Unlike execute(), the output blocks are not cached in this plan, so
+        that they can be released from memory once consumed.
+
+        Returns:
+            An iterator over the output blocks and their metadata, and the stats
+            of the execution, which are filled in as the iterator is consumed.
+        """
+        if self._out_blocks is not None:
+            return self._out_blocks.iter_blocks_with_metadata(), self._out_stats
+        self._optimize()
+        num_blocking_stages = 0
+        for i, stage in enumerate(self._stages):
+            if not _is_streamable(stage):
+                num_blocking_stages = i + 1
+        blocks, stats = self._execute_stages(
+            self._stages[:num_blocking_stages], clear_input_blocks=False
+        )
+        stages = self._stages[num_blocking_stages:]
+        if not stages:
+            return blocks.iter_blocks_with_metadata(), stats
+        name = "->".join(stage.name for stage in stages)
+        stats = DatasetStats(stages={name: []}, parent=stats)
+        stats.dataset_uuid = self._dataset_uuid
+        return _stream_stages(blocks, stages, stats, stats.stages[name]), stats
+
+    def has_computed_output(self) -> bool:
+        """Whether this plan has computed and cached its output blocks."""
+        return self._out_blocks is not None
+
+    def _execute_stages(
+        self, stages: List["Stage"], clear_input_blocks: bool
+    ) -> Tuple[BlockList, DatasetStats]:
+        """Execute the given stages of this plan one at a time, starting from
+        the input blocks."""
+        blocks = self._in_blocks
+        stats = self._in_stats
+        for stage in stages:
+            stats_builder = stats.child_builder(stage.name)
+            blocks, stage_info = stage(blocks, clear_input_blocks)
+            if stage_info:
+                stats = stats_builder.build_multistage(stage_info)
+            else:
+                stats = stats_builder.build(blocks)
+            stats.dataset_uuid = uuid.uuid4().hex
+        return blocks, stats
+
     def clear(self) -> None:
         """Clear all cached block references of this plan, including input blocks.
 
@@ -149,8 +212,10 @@ class ExecutionPlan:
         return self._out_stats
 
     def _optimize(self) -> None:
-        """Apply stage fusion optimizations, updating this plan."""
+        """Apply read pushdown and stage fusion optimizations, updating this plan."""
         context = DatasetContext.get_current()
+        if context.optimize_read_pushdown:
+            self._push_down_read_stages()
         if context.optimize_fuse_stages:
             if context.optimize_fuse_read_stages:
                 self._rewrite_read_stages()
@@ -170,6 +235,63 @@ class ExecutionPlan:
             self._in_blocks, "_read_tasks"
         )
 
+    def _push_down_read_stages(self) -> None:
+        """Pushes filter and projection stages following a read into the read.
+
+        For example, [Read -> Filter(Expr) -> SelectColumns(Cols) -> Map(Fn)] is
+        rewritten to [Read(filter=Expr, columns=Cols) -> Map(Fn)], so that the
+        datasource can skip reading unneeded columns, row groups, and files.
+        """
+        if not self._stages or not self._has_read_stage():
+            return
+        datasource = getattr(self._in_blocks, "_read_datasource", None)
+        if not isinstance(datasource, ParquetDatasource):
+            return
+        read_args = self._in_blocks._read_args
+        if read_args.get("_block_udf") is not None:
+            # The UDF must see the data as read, before any filters.
+            return
+        row_filter = read_args.get("filter")
+        columns = read_args.get("columns")
+        num_pushed = 0
+        for stage in self._stages:
+            pushdown = getattr(stage, "read_pushdown", None)
+            if pushdown is None:
+                break
+            if pushdown.columns is not None:
+                if columns is not None and not set(pushdown.columns) <= set(columns):
+                    # Let the stage raise the missing column error at runtime.
+                    break
+                columns = pushdown.columns
+            if pushdown.filter_expr is not None:
+                if columns is not None and (
+                    pushdown.filter_columns is None
+                    or not set(pushdown.filter_columns) <= set(columns)
+                ):
+                    # The filter may refer to a column that was dropped, let
+                    # the stage raise the missing column error at runtime.
+                    break
+                if row_filter is None:
+                    row_filter = pushdown.filter_expr
+                else:
+                    row_filter = row_filter & pushdown.filter_expr
+            num_pushed += 1
+        if num_pushed == 0:
+            return
+
+        # Lazy import to avoid circular dependency (read_api -> dataset -> plan).
+        from ray.data.read_api import _get_read_block_list
+
+        read_args = dict(read_args, filter=row_filter, columns=columns)
+        self._in_blocks, self._in_stats = _get_read_block_list(
+            datasource,
+            self._in_blocks._read_parallelism,
+            self._in_blocks._read_remote_args,
+            read_args,
+        )
+        self._in_stats.dataset_uuid = self._dataset_uuid
+        self._stages = self._stages[num_pushed:]
+
     def _is_read_stage(self) -> bool:
         """Whether this plan is a bare read stage."""
         return self._has_read_stage() and not self._stages
@@ -240,6 +362,29 @@ class Stage:
         raise NotImplementedError
 
 
+class ReadPushdown:
+    """A filter and/or projection that a datasource can apply while reading.
+
+    Attributes:
+        filter_expr: A ``pyarrow.dataset.Expression`` that rows must satisfy,
+            or None.
+        filter_columns: The names of the columns the filter refers to, or
+            None if unknown.
+        columns: The names of the columns to keep, or None to keep all.
+    """
+
+    def __init__(
+        self,
+        *,
+        filter_expr: Optional["pyarrow.dataset.Expression"] = None,
+        filter_columns: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+    ):
+        self.filter_expr = filter_expr
+        self.filter_columns = filter_columns
+        self.columns = columns
+
+
 class OneToOneStage(Stage):
     """A stage that transforms blocks independently (e.g., map or filter)."""
 
@@ -249,11 +394,15 @@ class OneToOneStage(Stage):
         block_fn: Callable[[Block], Block],
         compute: str,
         ray_remote_args: dict,
+        read_pushdown: Optional[ReadPushdown] = None,
     ):
         super().__init__(name, None)
         self.block_fn = block_fn
         self.compute = compute or "tasks"
         self.ray_remote_args = ray_remote_args or {}
+        # If set, this stage is equivalent to reading with these arguments and
+        # can be removed when pushed down into a preceding read.
+        self.read_pushdown = read_pushdown
 
     def can_fuse(self, prev: Stage):
         if not isinstance(prev, OneToOneStage):
@@ -339,3 +488,64 @@ class AllToAllStage(Stage):
         )
         assert isinstance(blocks, BlockList), blocks
         return blocks, stage_info
+
+
+def _is_streamable(stage: Stage) -> bool:
+    """Whether the stage can process its input blocks one at a time."""
+    return isinstance(stage, OneToOneStage) and isinstance(
+        get_compute(stage.compute), TaskPoolStrategy
+    )
+
+
+def _get_streaming_window_size() -> int:
+    """Returns the max number of blocks that the streaming executor processes
+    at a time."""
+    context = DatasetContext.get_current()
+    if context.streaming_max_blocks_in_flight:
+        return context.streaming_max_blocks_in_flight
+    return 2 * max(1, int(ray.cluster_resources().get("CPU", 1)))
+
+
+def _stream_stages(
+    blocks: BlockList,
+    stages: List[OneToOneStage],
+    stats: DatasetStats,
+    output_metadata: List[BlockMetadata],
+) -> Iterator[Tuple[ObjectRef[Block], BlockMetadata]]:
+    """Pipes each block through a chain of tasks, one per stage, yielding the
+    output blocks in order.
+
+    At most ``streaming_max_blocks_in_flight`` chains are submitted ahead of
+    the block being consumed, which bounds the amount of intermediate data.
+    """
+    max_in_flight = _get_streaming_window_size()
+    map_block = cached_remote_fn(_map_block_nosplit)
+    start_time = time.perf_counter()
+    in_flight = collections.deque()
+
+    def submit(block: ObjectRef[Block], meta: BlockMetadata):
+        for stage in stages:
+            block, meta_ref = map_block.options(
+                **dict(stage.ray_remote_args, num_returns=2)
+            ).remote(block, stage.block_fn, meta.input_files)
+        in_flight.append((block, meta_ref))
+
+    def pop() -> Tuple[ObjectRef[Block], BlockMetadata]:
+        block, meta_ref = in_flight.popleft()
+        meta = ray.get(meta_ref)
+        output_metadata.append(meta)
+        stats.time_total_s = time.perf_counter() - start_time
+        return block, meta
+
+    try:
+        for block, meta in blocks.iter_blocks_with_metadata():
+            submit(block, meta)
+            if len(in_flight) >= max_in_flight:
+                yield pop()
+        while in_flight:
+            yield pop()
+    except (ray.exceptions.RayTaskError, KeyboardInterrupt):
+        # Cancel the tasks still in flight before reraising.
+        for block, _ in in_flight:
+            ray.cancel(block)
+        raise
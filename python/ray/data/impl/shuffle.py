@@ -4,7 +4,9 @@ from typing import TypeVar, List, Optional, Dict, Any, Tuple, Union, Callable, I
 import numpy as np
 
 import ray
+from ray.types import ObjectRef
 from ray.data.block import Block, BlockAccessor, BlockMetadata, BlockExecStats
+from ray.data.context import DatasetContext
 from ray.data.impl.progress_bar import ProgressBar
 from ray.data.impl.block_list import BlockList
 from ray.data.impl.delegating_block_builder import DelegatingBlockBuilder
@@ -12,6 +14,449 @@ from ray.data.impl.remote_fn import cached_remote_fn
 
 T = TypeVar("T")
 
+# The fraction of a node resource requested to pin push-based shuffle merge and
+# reduce tasks to a node.
+_NODE_RESOURCE_FRACTION = 0.001
+
+
+class ShuffleOp:
+    """A map-reduce operation that can be executed by either shuffle engine.
+
+    Subclasses implement ``map()`` to partition a single input block into
+    ``output_num_blocks`` partitions, and ``reduce()`` to combine all of the
+    partitions destined for one output block. ``reduce()`` must be able to
+    take its own ``partial_reduce=True`` outputs as inputs, which allows the
+    push-based engine to pre-combine map outputs while the map phase is still
+    running. Ops that can't do this set ``supports_partial_reduce = False``,
+    in which case ``reduce()`` always gets the partitions in mapper order.
+    """
+
+    # Names used for progress bars and stage stats.
+    name = "Shuffle"
+    map_stage_name = "map"
+    reduce_stage_name = "reduce"
+    # Whether the push-based engine may be used for this op.
+    supports_partial_reduce = True
+    # Whether the final reduce() returns a BlockPartition (a list of block refs
+    # and their metadata) instead of a single block and its metadata.
+    reduce_returns_partition = False
+
+    def __init__(
+        self, map_args: Optional[List[Any]] = None, reduce_args: List[Any] = None
+    ):
+        self._map_args = map_args or []
+        self._reduce_args = reduce_args or []
+
+    @staticmethod
+    def map(
+        idx: int, block: Block, output_num_blocks: int, *map_args
+    ) -> List[Union[BlockMetadata, Block]]:
+        """Returns list of [BlockMetadata, O1, O2, O3, ...output_num_blocks]."""
+        raise NotImplementedError
+
+    @staticmethod
+    def reduce(
+        *reduce_args_and_mapper_outputs, partial_reduce: bool = False
+    ) -> Tuple[Block, BlockMetadata]:
+        """Combines the given partitions (preceded by the reduce args)."""
+        raise NotImplementedError
+
+    def _submit_reduce(
+        self, ray_remote_args: Dict[str, Any], *mapper_outputs: ObjectRef[Block]
+    ) -> Union[ObjectRef, List[ObjectRef]]:
+        """Submits a final reduce task, returning its output refs."""
+        shuffle_reduce = cached_remote_fn(self.reduce)
+        if not self.reduce_returns_partition:
+            ray_remote_args = dict(ray_remote_args, num_returns=2)
+        return shuffle_reduce.options(**ray_remote_args).remote(
+            *self._reduce_args, *mapper_outputs
+        )
+
+    def _get_reduce_outputs(
+        self, reduce_bar: ProgressBar, reduce_out: List[Any]
+    ) -> Tuple[List[ObjectRef[Block]], List[BlockMetadata]]:
+        """Waits for the final reduce tasks, returning the output blocks."""
+        if self.reduce_returns_partition:
+            partitions = reduce_bar.fetch_until_complete(reduce_out)
+            new_blocks = [block for partition in partitions for block, _ in partition]
+            new_metadata = [meta for partition in partitions for _, meta in partition]
+            return new_blocks, new_metadata
+        new_blocks, new_metadata = zip(*reduce_out)
+        reduce_bar.block_until_complete(list(new_blocks))
+        return list(new_blocks), ray.get(list(new_metadata))
+
+    def execute(
+        self,
+        input_blocks: BlockList,
+        output_num_blocks: int,
+        *,
+        map_ray_remote_args: Optional[Dict[str, Any]] = None,
+        reduce_ray_remote_args: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[BlockList, Dict[str, List[BlockMetadata]]]:
+        """Execute this op with the engine selected by the DatasetContext.
+
+        Returns:
+            The output blocks and the per-substage metadata for stats.
+        """
+        if map_ray_remote_args is None:
+            map_ray_remote_args = {}
+        if reduce_ray_remote_args is None:
+            reduce_ray_remote_args = {}
+        if "scheduling_strategy" not in reduce_ray_remote_args:
+            reduce_ray_remote_args = reduce_ray_remote_args.copy()
+            reduce_ray_remote_args["scheduling_strategy"] = "SPREAD"
+        if (
+            DatasetContext.get_current().use_push_based_shuffle
+            and self.supports_partial_reduce
+        ):
+            return self._execute_push_based(
+                input_blocks,
+                output_num_blocks,
+                map_ray_remote_args,
+                reduce_ray_remote_args,
+            )
+        return self._execute_simple(
+            input_blocks, output_num_blocks, map_ray_remote_args, reduce_ray_remote_args
+        )
+
+    def _execute_simple(
+        self,
+        input_blocks: BlockList,
+        output_num_blocks: int,
+        map_ray_remote_args: Dict[str, Any],
+        reduce_ray_remote_args: Dict[str, Any],
+    ) -> Tuple[BlockList, Dict[str, List[BlockMetadata]]]:
+        """All-to-all shuffle with N map tasks emitting N blocks each."""
+        input_blocks = input_blocks.get_blocks()
+        input_num_blocks = len(input_blocks)
+
+        shuffle_map = cached_remote_fn(self.map)
+
+        map_bar = ProgressBar(
+            f"{self.name} {self.map_stage_name.capitalize()}",
+            position=0,
+            total=input_num_blocks,
+        )
+        shuffle_map_out = [
+            shuffle_map.options(
+                **map_ray_remote_args,
+                num_returns=1 + output_num_blocks,
+            ).remote(i, block, output_num_blocks, *self._map_args)
+            for i, block in enumerate(input_blocks)
+        ]
+
+        # The first item returned is the BlockMetadata.
+        shuffle_map_metadata = []
+        for i, refs in enumerate(shuffle_map_out):
+            shuffle_map_metadata.append(refs[0])
+            shuffle_map_out[i] = refs[1:]
+
+        # Eagerly delete the input block references in order to eagerly release
+        # the blocks' memory.
+        del input_blocks
+        shuffle_map_metadata = map_bar.fetch_until_complete(shuffle_map_metadata)
+        map_bar.close()
+
+        reduce_bar = ProgressBar(
+            f"{self.name} {self.reduce_stage_name.capitalize()}",
+            position=0,
+            total=output_num_blocks,
+        )
+        shuffle_reduce_out = [
+            self._submit_reduce(
+                reduce_ray_remote_args,
+                *[shuffle_map_out[i][j] for i in range(input_num_blocks)],
+            )
+            for j in range(output_num_blocks)
+        ]
+        # Eagerly delete the map block references in order to eagerly release
+        # the blocks' memory.
+        del shuffle_map_out
+        new_blocks, new_metadata = self._get_reduce_outputs(
+            reduce_bar, shuffle_reduce_out
+        )
+        reduce_bar.close()
+
+        stats = {
+            self.map_stage_name: shuffle_map_metadata,
+            self.reduce_stage_name: new_metadata,
+        }
+
+        return BlockList(new_blocks, new_metadata), stats
+
+    def _execute_push_based(
+        self,
+        input_blocks: BlockList,
+        output_num_blocks: int,
+        map_ray_remote_args: Dict[str, Any],
+        reduce_ray_remote_args: Dict[str, Any],
+    ) -> Tuple[BlockList, Dict[str, List[BlockMetadata]]]:
+        """Push-based shuffle that merges map outputs per node as they arrive.
+
+        Map tasks run in rounds sized to the cluster's CPUs. Each map task
+        emits one object per merge task (instead of one per output block), and
+        the merge tasks of a round, one pinned to each node, pre-combine the
+        round's map outputs for a contiguous range of output blocks while the
+        next round of map tasks runs. Finally, one reduce task per output block
+        combines the merged outputs of all rounds on the node that merged them.
+        This reduces the number of intermediate objects from O(N^2) to
+        O(N * nodes + N * rounds), and overlaps the map and merge phases.
+        """
+        node_resources = _get_merge_node_resources()
+        if not node_resources or output_num_blocks == 0:
+            return self._execute_simple(
+                input_blocks,
+                output_num_blocks,
+                map_ray_remote_args,
+                reduce_ray_remote_args,
+            )
+        input_blocks = input_blocks.get_blocks()
+        input_num_blocks = len(input_blocks)
+        if input_num_blocks == 0:
+            return self._execute_simple(
+                BlockList([], []),
+                output_num_blocks,
+                map_ray_remote_args,
+                reduce_ray_remote_args,
+            )
+
+        num_mergers = min(len(node_resources), output_num_blocks)
+        node_resources = node_resources[:num_mergers]
+        reducer_ranges = [
+            r.tolist() for r in np.array_split(range(output_num_blocks), num_mergers)
+        ]
+        merge_sizes = [len(r) for r in reducer_ranges]
+        num_cpus = int(ray.cluster_resources().get("CPU", 1))
+        maps_per_round = max(1, num_cpus - num_mergers)
+
+        push_map = cached_remote_fn(_push_based_map)
+        push_merge = cached_remote_fn(_push_based_merge)
+
+        map_bar = ProgressBar(
+            f"{self.name} {self.map_stage_name.capitalize()}",
+            position=0,
+            total=input_num_blocks,
+        )
+        map_metadata = []
+        merge_metadata = []
+        # merge_out[round][merger] is the list of merged blocks of that merger.
+        merge_out = []
+        for round_start in range(0, input_num_blocks, maps_per_round):
+            round_blocks = input_blocks[round_start : round_start + maps_per_round]
+            map_out = [
+                push_map.options(
+                    **map_ray_remote_args,
+                    num_returns=1 + num_mergers,
+                ).remote(
+                    self.map,
+                    merge_sizes,
+                    round_start + i,
+                    block,
+                    output_num_blocks,
+                    *self._map_args,
+                )
+                for i, block in enumerate(round_blocks)
+            ]
+            map_metadata.extend(refs[0] for refs in map_out)
+
+            round_merge_out = []
+            for m in range(num_mergers):
+                refs = push_merge.options(
+                    **_pin_to_node({}, node_resources[m]),
+                    num_returns=merge_sizes[m] + 1,
+                ).remote(
+                    self.reduce,
+                    self._reduce_args,
+                    merge_sizes[m],
+                    *[refs[1 + m] for refs in map_out],
+                )
+                merge_metadata.append(refs[-1])
+                round_merge_out.append(refs[:-1])
+            merge_out.append(round_merge_out)
+            del map_out
+
+            # Backpressure: allow at most one round of merges to be pending
+            # while the next round of map tasks is submitted.
+            if len(merge_out) > 1:
+                ray.wait(
+                    merge_metadata[-2 * num_mergers : -num_mergers],
+                    num_returns=num_mergers,
+                    fetch_local=False,
+                )
+
+        # Eagerly delete the input block references in order to eagerly release
+        # the blocks' memory.
+        del input_blocks
+        map_metadata = map_bar.fetch_until_complete(map_metadata)
+        map_bar.close()
+
+        reduce_bar = ProgressBar(
+            f"{self.name} {self.reduce_stage_name.capitalize()}",
+            position=0,
+            total=output_num_blocks,
+        )
+        reduce_out = []
+        for m, reducer_range in enumerate(reducer_ranges):
+            for k in range(len(reducer_range)):
+                reduce_out.append(
+                    self._submit_reduce(
+                        _pin_to_node(reduce_ray_remote_args, node_resources[m]),
+                        *[round_merge_out[m][k] for round_merge_out in merge_out],
+                    )
+                )
+        # Eagerly delete the merge block references in order to eagerly release
+        # the blocks' memory.
+        del merge_out
+        new_blocks, new_metadata = self._get_reduce_outputs(reduce_bar, reduce_out)
+        reduce_bar.close()
+
+        merge_metadata = [m for metas in ray.get(merge_metadata) for m in metas]
+        stats = {
+            self.map_stage_name: map_metadata,
+            "combine": merge_metadata,
+            self.reduce_stage_name: new_metadata,
+        }
+        return BlockList(new_blocks, new_metadata), stats
+
+
+def _get_merge_node_resources() -> List[str]:
+    """Returns the node resource names of the alive nodes with CPUs.
+
+    Nodes that share an IP address also share their node resource, so tasks
+    pinned with it can't tell them apart. These get a single merger.
+    """
+    node_resources = set()
+    for node in ray.nodes():
+        if not node["Alive"] or node["Resources"].get("CPU", 0) <= 0:
+            continue
+        node_resources.add("node:{}".format(node["NodeManagerAddress"]))
+    return sorted(node_resources)
+
+
+def _pin_to_node(ray_remote_args: Dict[str, Any], node_resource: str) -> Dict[str, Any]:
+    """Returns a copy of the remote args that schedules the task on the node."""
+    ray_remote_args = ray_remote_args.copy()
+    ray_remote_args.pop("scheduling_strategy", None)
+    resources = dict(ray_remote_args.get("resources") or {})
+    resources[node_resource] = _NODE_RESOURCE_FRACTION
+    ray_remote_args["resources"] = resources
+    return ray_remote_args
+
+
+def _push_based_map(
+    map_fn: Callable[..., List[Union[BlockMetadata, Block]]],
+    merge_sizes: List[int],
+    idx: int,
+    block: Block,
+    output_num_blocks: int,
+    *map_args,
+) -> List[Union[BlockMetadata, List[Block]]]:
+    """Returns list of [BlockMetadata, M1, M2, ...num_mergers].
+
+    Each Mi is the list of partitions destined to the ith merge task.
+    """
+    result = map_fn(idx, block, output_num_blocks, *map_args)
+    metadata, parts = result[0], result[1:]
+    assert len(parts) == output_num_blocks, (len(parts), output_num_blocks)
+    grouped = []
+    start = 0
+    for size in merge_sizes:
+        grouped.append(parts[start : start + size])
+        start += size
+    return [metadata] + grouped
+
+
+def _push_based_merge(
+    reduce_fn: Callable[..., Tuple[Block, BlockMetadata]],
+    reduce_args: List[Any],
+    num_outputs: int,
+    *map_outputs: List[Block],
+) -> List[Union[Block, List[BlockMetadata]]]:
+    """Returns list of [B1, B2, ...num_outputs, List[BlockMetadata]]."""
+    blocks, metadata = [], []
+    for k in range(num_outputs):
+        block, meta = reduce_fn(
+            *reduce_args, *[parts[k] for parts in map_outputs], partial_reduce=True
+        )
+        blocks.append(block)
+        metadata.append(meta)
+    return blocks + [metadata]
+
+
+class RandomShuffleOp(ShuffleOp):
+    """Shuffles (or evenly repartitions) rows between blocks."""
+
+    @staticmethod
+    def map(
+        idx: int,
+        block: Block,
+        output_num_blocks: int,
+        block_udf: Optional[Callable[[Block], Iterable[Block]]],
+        random_shuffle: bool,
+        random_seed: Optional[int],
+    ) -> List[Union[BlockMetadata, Block]]:
+        stats = BlockExecStats.builder()
+        if block_udf:
+            # TODO(ekl) note that this effectively disables block splitting.
+            blocks = list(block_udf(block))
+            if len(blocks) > 1:
+                builder = BlockAccessor.for_block(blocks[0]).builder()
+                for b in blocks:
+                    builder.add_block(b)
+                block = builder.build()
+            else:
+                block = blocks[0]
+        block = BlockAccessor.for_block(block)
+
+        # Randomize the distribution of records to blocks.
+        if random_shuffle:
+            seed_i = random_seed + idx if random_seed is not None else None
+            block = block.random_shuffle(seed_i)
+            block = BlockAccessor.for_block(block)
+
+        slice_sz = max(1, math.ceil(block.num_rows() / output_num_blocks))
+        slices = []
+        for i in range(output_num_blocks):
+            slices.append(block.slice(i * slice_sz, (i + 1) * slice_sz, copy=True))
+
+        # Randomize the distribution order of the blocks (this matters when
+        # some blocks are larger than others).
+        if random_shuffle:
+            random = np.random.RandomState(seed_i)
+            random.shuffle(slices)
+
+        num_rows = sum(BlockAccessor.for_block(s).num_rows() for s in slices)
+        assert num_rows == block.num_rows(), (num_rows, block.num_rows())
+        metadata = block.get_metadata(input_files=None, exec_stats=stats.build())
+        return [metadata] + slices
+
+    @staticmethod
+    def reduce(
+        random_shuffle: bool,
+        random_seed: Optional[int],
+        *mapper_outputs: List[Block],
+        partial_reduce: bool = False,
+    ) -> Tuple[Block, BlockMetadata]:
+        stats = BlockExecStats.builder()
+        mapper_outputs = list(mapper_outputs)
+        # Randomize the reduce order of the blocks.
+        if random_shuffle and not partial_reduce:
+            random = np.random.RandomState(random_seed)
+            random.shuffle(mapper_outputs)
+        builder = DelegatingBlockBuilder()
+        for block in mapper_outputs:
+            builder.add_block(block)
+        new_block = builder.build()
+        accessor = BlockAccessor.for_block(new_block)
+        new_metadata = BlockMetadata(
+            num_rows=accessor.num_rows(),
+            size_bytes=accessor.size_bytes(),
+            schema=accessor.schema(),
+            input_files=None,
+            exec_stats=stats.build(),
+        )
+        return new_block, new_metadata
+
 
 def simple_shuffle(
     input_blocks: BlockList,
@@ -23,127 +468,14 @@ def simple_shuffle(
     map_ray_remote_args: Optional[Dict[str, Any]] = None,
     reduce_ray_remote_args: Optional[Dict[str, Any]] = None,
 ) -> Tuple[BlockList, Dict[str, List[BlockMetadata]]]:
-    input_blocks = input_blocks.get_blocks()
-    if map_ray_remote_args is None:
-        map_ray_remote_args = {}
-    if reduce_ray_remote_args is None:
-        reduce_ray_remote_args = {}
-    if "scheduling_strategy" not in reduce_ray_remote_args:
-        reduce_ray_remote_args = reduce_ray_remote_args.copy()
-        reduce_ray_remote_args["scheduling_strategy"] = "SPREAD"
-    input_num_blocks = len(input_blocks)
-
-    shuffle_map = cached_remote_fn(_shuffle_map)
-    shuffle_reduce = cached_remote_fn(_shuffle_reduce)
-
-    map_bar = ProgressBar("Shuffle Map", position=0, total=input_num_blocks)
-
-    shuffle_map_out = [
-        shuffle_map.options(
-            **map_ray_remote_args,
-            num_returns=1 + output_num_blocks,
-        ).remote(block, block_udf, i, output_num_blocks, random_shuffle, random_seed)
-        for i, block in enumerate(input_blocks)
-    ]
-
-    # The first item returned is the BlockMetadata.
-    shuffle_map_metadata = []
-    for i, refs in enumerate(shuffle_map_out):
-        shuffle_map_metadata.append(refs[0])
-        shuffle_map_out[i] = refs[1:]
-
-    # Eagerly delete the input block references in order to eagerly release
-    # the blocks' memory.
-    del input_blocks
-    shuffle_map_metadata = map_bar.fetch_until_complete(shuffle_map_metadata)
-    map_bar.close()
-
-    # Randomize the reduce order of the blocks.
-    if random_shuffle:
-        random = np.random.RandomState(random_seed)
-        random.shuffle(shuffle_map_out)
-
-    reduce_bar = ProgressBar("Shuffle Reduce", position=0, total=output_num_blocks)
-    shuffle_reduce_out = [
-        shuffle_reduce.options(
-            **reduce_ray_remote_args,
-            num_returns=2,
-        ).remote(*[shuffle_map_out[i][j] for i in range(input_num_blocks)])
-        for j in range(output_num_blocks)
-    ]
-    # Eagerly delete the map block references in order to eagerly release
-    # the blocks' memory.
-    del shuffle_map_out
-    new_blocks, new_metadata = zip(*shuffle_reduce_out)
-    reduce_bar.block_until_complete(list(new_blocks))
-    new_metadata = ray.get(list(new_metadata))
-    reduce_bar.close()
-
-    stats = {
-        "map": shuffle_map_metadata,
-        "reduce": new_metadata,
-    }
-
-    return BlockList(list(new_blocks), list(new_metadata)), stats
-
-
-def _shuffle_map(
-    block: Block,
-    block_udf: Optional[Callable[[Block], Iterable[Block]]],
-    idx: int,
-    output_num_blocks: int,
-    random_shuffle: bool,
-    random_seed: Optional[int],
-) -> List[Union[BlockMetadata, Block]]:
-    """Returns list of [BlockMetadata, O1, O2, O3, ...output_num_blocks]."""
-    stats = BlockExecStats.builder()
-    if block_udf:
-        # TODO(ekl) note that this effectively disables block splitting.
-        blocks = list(block_udf(block))
-        if len(blocks) > 1:
-            builder = BlockAccessor.for_block(blocks[0]).builder()
-            for b in blocks:
-                builder.add_block(b)
-            block = builder.build()
-        else:
-            block = blocks[0]
-    block = BlockAccessor.for_block(block)
-
-    # Randomize the distribution of records to blocks.
-    if random_shuffle:
-        seed_i = random_seed + idx if random_seed is not None else None
-        block = block.random_shuffle(seed_i)
-        block = BlockAccessor.for_block(block)
-
-    slice_sz = max(1, math.ceil(block.num_rows() / output_num_blocks))
-    slices = []
-    for i in range(output_num_blocks):
-        slices.append(block.slice(i * slice_sz, (i + 1) * slice_sz, copy=True))
-
-    # Randomize the distribution order of the blocks (this matters when
-    # some blocks are larger than others).
-    if random_shuffle:
-        random = np.random.RandomState(seed_i)
-        random.shuffle(slices)
-
-    num_rows = sum(BlockAccessor.for_block(s).num_rows() for s in slices)
-    assert num_rows == block.num_rows(), (num_rows, block.num_rows())
-    metadata = block.get_metadata(input_files=None, exec_stats=stats.build())
-    return [metadata] + slices
-
-
-def _shuffle_reduce(*mapper_outputs: List[Block]) -> (Block, BlockMetadata):
-    stats = BlockExecStats.builder()
-    builder = DelegatingBlockBuilder()
-    for block in mapper_outputs:
-        builder.add_block(block)
-    new_block = builder.build()
-    accessor = BlockAccessor.for_block(new_block)
-    new_metadata = BlockMetadata(
-        num_rows=accessor.num_rows(),
-        size_bytes=accessor.size_bytes(),
-        schema=accessor.schema(),
-        input_files=None,
-        exec_stats=stats.build(),
+    """Shuffle rows between blocks, with the engine chosen by DatasetContext."""
+    op = RandomShuffleOp(
+        map_args=[block_udf, random_shuffle, random_seed],
+        reduce_args=[random_shuffle, random_seed],
+    )
+    return op.execute(
+        input_blocks,
+        output_num_blocks,
+        map_ray_remote_args=map_ray_remote_args,
+        reduce_ray_remote_args=reduce_ray_remote_args,
     )
-    return new_block, new_metadata
@@ -97,6 +97,12 @@ class SimpleBlockAccessor(BlockAccessor):
         else:
             return None
 
+    def select(self, columns: List[str]) -> List[T]:
+        raise ValueError(
+            "Column selection requires dataset format to be 'arrow' or "
+            "'pandas', was 'simple'."
+        )
+
     def zip(self, other: "Block[T]") -> "Block[T]":
         if not isinstance(other, list):
             raise ValueError(
@@ -238,6 +244,7 @@ class SimpleBlockAccessor(BlockAccessor):
         blocks: List[Block[Tuple[KeyType, AggType]]],
         key: KeyFn,
         aggs: Tuple[AggregateFn],
+        finalize: bool = True,
     ) -> Tuple[Block[Tuple[KeyType, U]], BlockMetadata]:
         """Aggregate sorted, partially combined blocks with the same key range.
 
@@ -249,6 +256,8 @@ class SimpleBlockAccessor(BlockAccessor):
             key: The key function that returns the key from the row
                 or None for global aggregation.
             aggs: The aggregations to do.
+            finalize: Whether to finalize the aggregations. If False, the
+                output holds the merged accumulators instead.
 
         Returns:
             A block of (k, v_1, ..., v_n) tuples and its metadata where k is
@@ -294,21 +303,15 @@ class SimpleBlockAccessor(BlockAccessor):
                             accumulators[i] = aggs[i].merge(
                                 accumulators[i], r[i + 1] if key else r[i]
                             )
+                if finalize:
+                    accumulators = [
+                        agg.finalize(accumulator)
+                        for agg, accumulator in zip(aggs, accumulators)
+                    ]
                 if key is None:
-                    ret.append(
-                        tuple(
-                            agg.finalize(accumulator)
-                            for agg, accumulator in zip(aggs, accumulators)
-                        )
-                    )
+                    ret.append(tuple(accumulators))
                 else:
-                    ret.append(
-                        (next_key,)
-                        + tuple(
-                            agg.finalize(accumulator)
-                            for agg, accumulator in zip(aggs, accumulators)
-                        )
-                    )
+                    ret.append((next_key,) + tuple(accumulators))
             except StopIteration:
                 break
 
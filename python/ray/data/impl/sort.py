@@ -15,17 +15,36 @@ This is an all-to-all shuffle.
 Merging: a merge task would receive a block from every worker that consists
 of items in a certain range. It then merges the sorted blocks into one sorted
 block and becomes part of the new, sorted dataset.
+
+To bound the memory used by each merge task, the number of ranges is chosen so
+that each merge task outputs about ``DatasetContext.target_max_block_size``
+bytes, and the sorted blocks are merged incrementally with a windowed k-way
+merge instead of being concatenated and re-sorted. With block splitting
+enabled, the merge output is split into blocks of at most that size. With the
+push-based shuffle, partially merged runs are produced while the sort map tasks
+are still running, and are stored (and spilled if needed) in the object store
+until the final merge.
 """
-from typing import List, Any, Callable, TypeVar, Tuple, Union
+import heapq
+import math
+from typing import List, Any, Callable, Iterator, Optional, TypeVar, Tuple, Union
 
 import numpy as np
 import ray
 from ray.types import ObjectRef
-from ray.data.block import Block, BlockMetadata, BlockAccessor, BlockExecStats
+from ray.data.block import (
+    Block,
+    BlockMetadata,
+    BlockAccessor,
+    BlockExecStats,
+    BlockPartition,
+)
+from ray.data.context import DatasetContext
 from ray.data.impl.delegating_block_builder import DelegatingBlockBuilder
 from ray.data.impl.block_list import BlockList
 from ray.data.impl.progress_bar import ProgressBar
 from ray.data.impl.remote_fn import cached_remote_fn
+from ray.data.impl.shuffle import ShuffleOp
 
 T = TypeVar("T")
 
@@ -34,6 +53,9 @@ T = TypeVar("T")
 # (Callable).
 SortKeyT = Union[None, List[Tuple[str, str]], Callable[[T], Any]]
 
+# The max number of rows taken from each sorted run per step of the k-way merge.
+MERGE_WINDOW_ROWS = 10000
+
 
 def sample_boundaries(
     blocks: List[ObjectRef[Block]], key: SortKeyT, num_reducers: int
@@ -80,7 +102,8 @@ def sort_impl(
     blocks: BlockList, key: SortKeyT, descending: bool = False
 ) -> Tuple[BlockList, dict]:
     stage_info = {}
-    blocks = blocks.get_blocks()
+    block_list = blocks
+    blocks = block_list.get_blocks()
     if len(blocks) == 0:
         return BlockList([], []), stage_info
 
@@ -91,63 +114,194 @@ def sort_impl(
         descending = key[0][1] == "descending"
 
     num_mappers = len(blocks)
-    num_reducers = num_mappers
+    # Use enough reducers that each of them merges at most one target-sized
+    # block of data.
+    ctx = DatasetContext.get_current()
+    size_bytes = block_list.size_bytes()
+    num_reducers = max(num_mappers, math.ceil(size_bytes / ctx.target_max_block_size))
     boundaries = sample_boundaries(blocks, key, num_reducers)
     if descending:
         boundaries.reverse()
 
-    sort_block = cached_remote_fn(_sort_block).options(num_returns=num_reducers + 1)
-    merge_sorted_blocks = cached_remote_fn(_merge_sorted_blocks, num_returns=2)
-
-    map_results = np.empty((num_mappers, num_reducers), dtype=object)
-    map_meta = []
-    for i, block in enumerate(blocks):
-        result = sort_block.remote(block, boundaries, key, descending)
-        map_results[i, :] = result[:-1]
-        map_meta.append(result[-1])
-
     # Early release memory.
     del blocks
 
-    map_bar = ProgressBar("Sort Map", len(map_results))
-    map_bar.block_until_complete(map_meta)
-    map_bar.close()
-    stage_info["map"] = ray.get(map_meta)
+    # Split the merged output into target-sized blocks. This requires block
+    # splitting, since the output blocks must be owned by the block owner.
+    max_block_size = None
+    if ctx.block_splitting_enabled:
+        max_block_size = ctx.target_max_block_size
+    sort_op = SortOp(
+        map_args=[boundaries, key, descending],
+        reduce_args=[key, descending, max_block_size, ctx.block_owner],
+    )
+    sort_op.reduce_returns_partition = max_block_size is not None
+    return sort_op.execute(block_list, num_reducers)
 
-    reduce_results = []
-    for j in range(num_reducers):
-        ret = merge_sorted_blocks.remote(key, descending, *map_results[:, j].tolist())
-        reduce_results.append(ret)
 
-    # Early release memory.
-    del map_results
+class SortOp(ShuffleOp):
+    """Sorts blocks into ranges by the sampled boundaries, then merges them."""
 
-    merge_bar = ProgressBar("Sort Merge", len(reduce_results))
-    merge_bar.block_until_complete([ret[0] for ret in reduce_results])
-    merge_bar.close()
+    name = "Sort"
+    reduce_stage_name = "merge"
 
-    blocks = [b for b, _ in reduce_results]
-    metadata = ray.get([m for _, m in reduce_results])
-    stage_info["merge"] = metadata
-    return BlockList(blocks, metadata), stage_info
+    @staticmethod
+    def map(
+        idx: int,
+        block: Block,
+        output_num_blocks: int,
+        boundaries: List[T],
+        key: SortKeyT,
+        descending: bool,
+    ) -> List[Union[BlockMetadata, Block]]:
+        stats = BlockExecStats.builder()
+        out = BlockAccessor.for_block(block).sort_and_partition(
+            boundaries, key, descending
+        )
+        meta = BlockAccessor.for_block(block).get_metadata(
+            input_files=None, exec_stats=stats.build()
+        )
+        return [meta] + out
 
+    @staticmethod
+    def reduce(
+        key: SortKeyT,
+        descending: bool,
+        max_block_size: Optional[int],
+        block_owner: Optional["ray.actor.ActorHandle"],
+        *mapper_outputs: List[Block],
+        partial_reduce: bool = False,
+    ) -> Union[Tuple[Block, BlockMetadata], BlockPartition]:
+        # Merging sorted runs yields a sorted run, so partial and final
+        # reductions are the same, except that the final output is split into
+        # blocks of at most max_block_size bytes if it is set.
+        stats = BlockExecStats.builder()
+        merged = _merge_sorted_runs(list(mapper_outputs), key, descending)
+        if partial_reduce or max_block_size is None:
+            builder = DelegatingBlockBuilder()
+            for block in merged:
+                builder.add_block(block)
+            ret = builder.build()
+            return ret, BlockAccessor.for_block(ret).get_metadata(
+                None, exec_stats=stats.build()
+            )
 
-def _sample_block(block: Block[T], n_samples: int, key: SortKeyT) -> Block[T]:
-    return BlockAccessor.for_block(block).sample(n_samples, key)
+        partition: BlockPartition = []
 
+        def flush(builder: DelegatingBlockBuilder) -> None:
+            nonlocal stats
+            ret = builder.build()
+            meta = BlockAccessor.for_block(ret).get_metadata(
+                None, exec_stats=stats.build()
+            )
+            partition.append((ray.put(ret, _owner=block_owner), meta))
+            stats = BlockExecStats.builder()
 
-def _sort_block(block, boundaries, key, descending):
-    stats = BlockExecStats.builder()
-    out = BlockAccessor.for_block(block).sort_and_partition(boundaries, key, descending)
-    meta = BlockAccessor.for_block(block).get_metadata(
-        input_files=None, exec_stats=stats.build()
-    )
-    return out + [meta]
+        builder = DelegatingBlockBuilder()
+        for block in merged:
+            builder.add_block(block)
+            if builder.get_estimated_memory_usage() >= max_block_size:
+                flush(builder)
+                builder = DelegatingBlockBuilder()
+        if builder.num_rows() > 0 or not partition:
+            flush(builder)
+        return partition
 
 
-def _merge_sorted_blocks(
-    key, descending, *blocks: List[Block[T]]
-) -> Tuple[Block[T], BlockMetadata]:
-    return BlockAccessor.for_block(blocks[0]).merge_sorted_blocks(
-        list(blocks), key, descending
-    )
+def _merge_sorted_runs(
+    runs: List[Block], key: SortKeyT, descending: bool
+) -> Iterator[Block]:
+    """Incrementally merges sorted blocks, yielding sorted output blocks.
+
+    Unlike ``BlockAccessor.merge_sorted_blocks()``, this never materializes a
+    concatenated copy of all the inputs. Each step takes a window of at most
+    ``MERGE_WINDOW_ROWS`` rows from every run, finds the smallest (or largest,
+    if descending) last key of the windows, and emits the merged prefix of
+    every run up to that key. The run that defined the cutoff always emits its
+    entire window, so every step makes progress.
+    """
+    runs = [r for r in runs if BlockAccessor.for_block(r).num_rows() > 0]
+    if len(runs) <= 1:
+        if runs:
+            acc = BlockAccessor.for_block(runs[0])
+            yield from _slice_windows(acc, 0, acc.num_rows())
+        return
+    if isinstance(runs[0], list):
+        # Python object blocks: stream the rows through a heap merge.
+        items = heapq.merge(*runs, key=key, reverse=descending)
+        while True:
+            chunk = [x for _, x in zip(range(MERGE_WINDOW_ROWS), items)]
+            if not chunk:
+                return
+            yield chunk
+
+    column = key[0][0]
+    accessors = [BlockAccessor.for_block(r) for r in runs]
+    keys = [acc.to_numpy(column) for acc in accessors]
+    if any(k.dtype == object and any(v is None for v in k) for k in keys):
+        # Null keys can't be searched by numpy, so fall back to a full merge.
+        block, _ = accessors[0].merge_sorted_blocks(runs, key, descending)
+        yield block
+        return
+    # Search keys in ascending order, reversing descending runs.
+    if descending:
+        keys = [k[::-1] for k in keys]
+
+    cursors = [0] * len(runs)
+    while True:
+        active = [i for i, acc in enumerate(accessors) if cursors[i] < acc.num_rows()]
+        if not active:
+            return
+        if len(active) == 1:
+            [i] = active
+            yield from _slice_windows(accessors[i], cursors[i], accessors[i].num_rows())
+            return
+        ends = {}
+        for i in active:
+            n = accessors[i].num_rows()
+            ends[i] = min(cursors[i] + MERGE_WINDOW_ROWS, n)
+        cutoff = _window_cutoff(keys, accessors, cursors, ends, active, descending)
+        parts = []
+        for i in active:
+            n = accessors[i].num_rows()
+            if descending:
+                # keys[i] is reversed: run row r is at position n - 1 - r.
+                lo = np.searchsorted(keys[i], cutoff, side="left")
+                end = max(cursors[i], n - lo)
+            else:
+                end = np.searchsorted(keys[i], cutoff, side="right")
+            end = int(max(cursors[i], min(end, n)))
+            if end > cursors[i]:
+                parts.append(accessors[i].slice(cursors[i], end, copy=False))
+                cursors[i] = end
+        block, _ = accessors[0].merge_sorted_blocks(parts, key, descending)
+        yield block
+
+
+def _slice_windows(acc: BlockAccessor, start: int, end: int) -> Iterator[Block]:
+    """Yields the rows in [start, end) of a block in windows."""
+    for i in range(start, end, MERGE_WINDOW_ROWS):
+        yield acc.slice(i, min(i + MERGE_WINDOW_ROWS, end), copy=False)
+
+
+def _window_cutoff(
+    keys: List[np.ndarray],
+    accessors: List[BlockAccessor],
+    cursors: List[int],
+    ends: List[int],
+    active: List[int],
+    descending: bool,
+) -> Any:
+    """Returns the key up to which all active runs can be safely merged."""
+    last_keys = []
+    for i in active:
+        if descending:
+            # The last row of the window, in the reversed (ascending) keys.
+            last_keys.append(keys[i][accessors[i].num_rows() - ends[i]])
+        else:
+            last_keys.append(keys[i][ends[i] - 1])
+    return max(last_keys) if descending else min(last_keys)
+
+
+def _sample_block(block: Block[T], n_samples: int, key: SortKeyT) -> Block[T]:
+    return BlockAccessor.for_block(block).sample(n_samples, key)
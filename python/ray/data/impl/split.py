@@ -0,0 +1,185 @@
+"""
+Locality-aware equal splitting of datasets.
+
+``Dataset.split(n, equal=True, locality_hints=actors)`` gives each of the
+``n`` shards exactly ``total_rows // n`` rows, and tries to make those rows
+local to the node of the actor consuming the shard.
+
+The split is first planned on row ranges of the blocks, without touching the
+data. In the first round, each shard is filled with the rows of the blocks on
+the node of its actor. In the second round, the shards that are still short
+are filled with the remaining rows, regardless of their location. Within a
+round, whole blocks are preferred over slices of blocks, so that as few
+blocks as possible are sliced.
+
+The blocks that need to be sliced are then sliced by one remote task per
+block, pinned to the node that holds the block. The slices thus stay on the
+node of the block, and only the slices that are assigned to shards on other
+nodes are transferred.
+"""
+import collections
+from typing import Any, Dict, List, Optional, Tuple
+
+import ray
+from ray.types import ObjectRef
+from ray.data.block import Block, BlockAccessor, BlockExecStats, BlockMetadata
+from ray.data.impl.remote_fn import cached_remote_fn
+
+# The fraction of a node resource required to pin the slicing tasks to a node.
+_NODE_RESOURCE_FRACTION = 0.001
+
+# A range of rows of a block: (block index, start row, end row).
+RowRange = Tuple[int, int, int]
+
+
+def plan_equal_split(
+    num_rows: List[int],
+    block_node_ids: List[Optional[str]],
+    shard_node_ids: List[Optional[str]],
+    rows_per_shard: int,
+) -> List[List[RowRange]]:
+    """Assign row ranges of the blocks to the shards.
+
+    Each shard gets exactly ``rows_per_shard`` rows, as many of them as
+    possible from blocks on the node of the shard. Rows that aren't needed to
+    fill the shards are dropped.
+
+    Args:
+        num_rows: The number of rows of each block.
+        block_node_ids: The node of each block, or None if unknown.
+        shard_node_ids: The node of each shard, or None if unknown.
+        rows_per_shard: The number of rows of each shard.
+
+    Returns:
+        The row ranges of each shard, in block order.
+    """
+    assert sum(num_rows) >= rows_per_shard * len(shard_node_ids)
+    ranges_by_node_id = collections.defaultdict(list)
+    for i, (rows, node_id) in enumerate(zip(num_rows, block_node_ids)):
+        if rows > 0:
+            ranges_by_node_id[node_id].append((i, 0, rows))
+
+    shards = [[] for _ in shard_node_ids]
+    needed = [rows_per_shard] * len(shard_node_ids)
+
+    # In the first round, fill each shard with the rows on its node.
+    for i, node_id in enumerate(shard_node_ids):
+        if node_id is not None and node_id in ranges_by_node_id:
+            needed[i] = _fill_shard(shards[i], needed[i], ranges_by_node_id[node_id])
+
+    # In the second round, fill the shards that are still short with the
+    # remaining rows.
+    remaining = [r for ranges in ranges_by_node_id.values() for r in ranges]
+    for i in range(len(shards)):
+        needed[i] = _fill_shard(shards[i], needed[i], remaining)
+        assert needed[i] == 0, needed[i]
+
+    return [sorted(shard) for shard in shards]
+
+
+def _fill_shard(shard: List[RowRange], needed: int, ranges: List[RowRange]) -> int:
+    """Move up to ``needed`` rows from ``ranges`` to ``shard``, returning the
+    number of rows that are still needed.
+
+    The largest ranges that fit are taken whole. If the shard is still short,
+    the smallest of the remaining ranges is sliced, and the rest of it is put
+    back in ``ranges``.
+    """
+    ranges.sort(key=lambda r: r[2] - r[1])
+    leftover = []
+    while ranges and needed > 0:
+        block_idx, start, end = ranges.pop()
+        if end - start <= needed:
+            shard.append((block_idx, start, end))
+            needed -= end - start
+        else:
+            leftover.append((block_idx, start, end))
+    if needed > 0 and leftover:
+        block_idx, start, end = leftover.pop()
+        shard.append((block_idx, start, start + needed))
+        leftover.append((block_idx, start + needed, end))
+        needed = 0
+    ranges.extend(leftover)
+    return needed
+
+
+def split_blocks_by_plan(
+    blocks: List[ObjectRef[Block]],
+    metadata: List[BlockMetadata],
+    num_rows: List[int],
+    block_node_ids: List[Optional[str]],
+    plan: List[List[RowRange]],
+) -> List[Tuple[List[ObjectRef[Block]], List[BlockMetadata]]]:
+    """Build the blocks of each shard from the planned row ranges.
+
+    Blocks that are assigned whole are passed through. The other blocks are
+    sliced by one task per block, on the node of the block.
+
+    Returns:
+        The blocks and metadata of each shard.
+    """
+    ranges_by_block = collections.defaultdict(list)
+    for shard in plan:
+        for block_idx, start, end in shard:
+            ranges_by_block[block_idx].append((start, end))
+
+    node_resource_by_node_id = _get_node_resource_by_node_id()
+    slice_block = cached_remote_fn(_slice_block)
+    slices = {}
+    pending = []
+    for block_idx, ranges in ranges_by_block.items():
+        meta = metadata[block_idx]
+        if ranges == [(0, num_rows[block_idx])]:
+            slices[(block_idx, 0, num_rows[block_idx])] = (blocks[block_idx], meta)
+            continue
+        ray_remote_args = {"num_returns": len(ranges) + 1}
+        node_resource = node_resource_by_node_id.get(block_node_ids[block_idx])
+        if node_resource is not None:
+            ray_remote_args["resources"] = {node_resource: _NODE_RESOURCE_FRACTION}
+        *refs, meta_ref = slice_block.options(**ray_remote_args).remote(
+            blocks[block_idx], meta, *ranges
+        )
+        pending.append((block_idx, ranges, refs, meta_ref))
+
+    slice_metadata = ray.get([meta_ref for _, _, _, meta_ref in pending])
+    for (block_idx, ranges, refs, _), metas in zip(pending, slice_metadata):
+        for (start, end), ref, m in zip(ranges, refs, metas):
+            slices[(block_idx, start, end)] = (ref, m)
+
+    splits = []
+    for shard in plan:
+        shard_blocks = [slices[r][0] for r in shard]
+        shard_metadata = [slices[r][1] for r in shard]
+        splits.append((shard_blocks, shard_metadata))
+    return splits
+
+
+def _get_node_resource_by_node_id() -> Dict[str, str]:
+    """Return the node resource name of each alive node."""
+    return {
+        node["NodeID"]: "node:{}".format(node["NodeManagerAddress"])
+        for node in ray.nodes()
+        if node["Alive"]
+    }
+
+
+def _slice_block(
+    block: Block, meta: BlockMetadata, *ranges: Tuple[int, int]
+) -> List[Any]:
+    stats = BlockExecStats.builder()
+    accessor = BlockAccessor.for_block(block)
+    slices = [accessor.slice(start, end, copy=True) for start, end in ranges]
+    exec_stats = stats.build()
+    slice_metadata = []
+    for s in slices:
+        a = BlockAccessor.for_block(s)
+        slice_metadata.append(
+            BlockMetadata(
+                num_rows=a.num_rows(),
+                size_bytes=a.size_bytes(),
+                schema=meta.schema,
+                input_files=meta.input_files,
+                exec_stats=exec_stats,
+            )
+        )
+    return slices + [slice_metadata]
@@ -1,5 +1,5 @@
 from contextlib import contextmanager
-from typing import List, Optional, Set, Dict, Tuple, Union
+from typing import Any, List, Optional, Set, Dict, Tuple, Union
 import time
 import collections
 import numpy as np
@@ -9,6 +9,11 @@ from ray.data.block import BlockMetadata
 from ray.data.impl.block_list import BlockList
 
 
+# The max number of spans a Timer keeps for the timeline, the oldest spans are
+# dropped first.
+MAX_TIMER_SPANS = 100000
+
+
 def fmt(seconds: float) -> str:
     if seconds > 1:
         return str(round(seconds, 2)) + "s"
@@ -19,25 +24,37 @@ def fmt(seconds: float) -> str:
 
 
 class Timer:
-    """Helper class for tracking accumulated time (in seconds)."""
+    """Helper class for tracking accumulated time (in seconds).
+
+    The timed spans are also kept as (start time since the epoch, duration)
+    pairs, for the timeline of the stats.
+    """
 
     def __init__(self):
         self._value: float = 0
+        self._spans: collections.deque = collections.deque(maxlen=MAX_TIMER_SPANS)
 
     @contextmanager
     def timer(self) -> None:
+        wall_start = time.time()
         time_start = time.perf_counter()
         try:
             yield
         finally:
-            self._value += time.perf_counter() - time_start
+            value = time.perf_counter() - time_start
+            self._value += value
+            self._spans.append((wall_start, value))
 
     def add(self, value: float) -> None:
         self._value += value
+        self._spans.append((time.time() - value, value))
 
     def get(self) -> float:
         return self._value
 
+    def spans(self) -> List[Tuple[float, float]]:
+        return list(self._spans)
+
 
 class _DatasetStatsBuilder:
     """Helper class for building dataset stats.
@@ -199,13 +216,7 @@ class DatasetStats:
         if already_printed is None:
             already_printed = set()
 
-        if self.stats_actor:
-            # XXX this is a super hack, clean it up.
-            stats_map, self.time_total_s = ray.get(
-                self.stats_actor.get.remote(self.stats_uuid)
-            )
-            for i, metadata in stats_map.items():
-                self.stages["read"][i] = metadata
+        self._fetch_actor_stats()
         out = ""
         if self.parents:
             for p in self.parents:
@@ -229,6 +240,63 @@ class DatasetStats:
         out += self._summarize_iter()
         return out
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a structured summary of this Dataset's stats.
+
+        The stages of this Dataset and its parents are listed in execution
+        order. Each stage has its timings, output sizes and nodes aggregated
+        over its blocks, plus the stats of each block.
+        """
+        return {
+            "stages": [
+                _stage_to_dict(number, name, metadata, time_total_s)
+                for number, name, metadata, time_total_s in self._get_stages()
+            ],
+            "iter": _iter_to_dict(self),
+        }
+
+    def to_chrome_trace(self) -> List[Dict[str, Any]]:
+        """Return the timeline of this Dataset as Chrome trace events.
+
+        The tasks that computed the blocks are grouped by node, and the
+        iterator timings (waiting for, fetching, formatting and consuming
+        batches) are on the "driver" process.
+        """
+        events = []
+        for number, name, metadata, _ in self._get_stages():
+            events.extend(_stage_trace_events(number, name, metadata))
+        events.extend(_iter_trace_events(self, "driver"))
+        return events
+
+    def _get_stages(
+        self, already_seen: Set[str] = None
+    ) -> List[Tuple[int, str, List[BlockMetadata], float]]:
+        """Return the (number, name, metadata, total time) of the stages of this
+        Dataset and its parents, skipping the stages seen already."""
+        if already_seen is None:
+            already_seen = set()
+        self._fetch_actor_stats()
+        stages = []
+        for p in self.parents:
+            stages.extend(p._get_stages(already_seen))
+        for stage_name, metadata in self.stages.items():
+            stage_uuid = self.dataset_uuid + stage_name
+            if stage_uuid in already_seen:
+                continue
+            already_seen.add(stage_uuid)
+            stages.append((self.number, stage_name, metadata, self.time_total_s))
+        return stages
+
+    def _fetch_actor_stats(self) -> None:
+        """Pull the stats of the blocks computed by a LazyBlockList."""
+        if self.stats_actor:
+            # XXX this is a super hack, clean it up.
+            stats_map, self.time_total_s = ray.get(
+                self.stats_actor.get.remote(self.stats_uuid)
+            )
+            for i, metadata in stats_map.items():
+                self.stages["read"][i] = metadata
+
     def _summarize_iter(self) -> str:
         out = ""
         if (
@@ -351,6 +419,36 @@ class DatasetPipelineStats:
 
         return out
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a structured summary of this pipeline's stats.
+
+        This has the stats of the recent windows, the time stalled waiting
+        for each window, and the iterator timings of the pipeline.
+        """
+        return {
+            "windows": [
+                dict(window=i, **stats.to_dict()) for i, stats in self.history_buffer
+            ],
+            "wait_time_s": list(self.wait_time_s),
+            "iter": dict(
+                ds_wait_s=self.iter_ds_wait_s.get(),
+                **_iter_to_dict(self),
+            ),
+        }
+
+    def to_chrome_trace(self) -> List[Dict[str, Any]]:
+        """Return the timeline of this pipeline as Chrome trace events."""
+        events = []
+        already_seen = set()
+        for _, stats in self.history_buffer:
+            for number, name, metadata, _ in stats._get_stages(already_seen):
+                events.extend(_stage_trace_events(number, name, metadata))
+        events.extend(_iter_trace_events(self, "driver"))
+        events.extend(
+            _timer_trace_events(self.iter_ds_wait_s, "iter_ds_wait", "driver")
+        )
+        return events
+
     def summary_string(self, exclude_first_window: bool = True) -> str:
         """Return a human-readable summary of this pipeline's stats."""
         already_printed = set()
@@ -374,3 +472,133 @@ class DatasetPipelineStats:
             )
         out += self._summarize_iter()
         return out
+
+
+def _summarize_values(values: List[float]) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    return {
+        "min": min(values),
+        "max": max(values),
+        "mean": float(np.mean(values)),
+        "total": sum(values),
+    }
+
+
+def _stage_to_dict(
+    number: int, name: str, blocks: List[BlockMetadata], time_total_s: float
+) -> Dict[str, Any]:
+    exec_stats = [m.exec_stats for m in blocks if m.exec_stats is not None]
+    nodes = collections.defaultdict(
+        lambda: {"num_blocks": 0, "wall_time_s": 0.0, "cpu_time_s": 0.0}
+    )
+    for e in exec_stats:
+        node = nodes[e.node_id]
+        node["num_blocks"] += 1
+        node["wall_time_s"] += e.wall_time_s
+        node["cpu_time_s"] += e.cpu_time_s
+    return {
+        "stage": number,
+        "name": name,
+        "num_blocks": len(blocks),
+        "num_blocks_executed": len(exec_stats),
+        "time_total_s": time_total_s,
+        "wall_time_s": _summarize_values([e.wall_time_s for e in exec_stats]),
+        "cpu_time_s": _summarize_values([e.cpu_time_s for e in exec_stats]),
+        "num_rows": _summarize_values(
+            [m.num_rows for m in blocks if m.num_rows is not None]
+        ),
+        "size_bytes": _summarize_values(
+            [m.size_bytes for m in blocks if m.size_bytes is not None]
+        ),
+        "nodes": dict(nodes),
+        "blocks": [
+            {
+                "num_rows": m.num_rows,
+                "size_bytes": m.size_bytes,
+                "start_time_s": m.exec_stats and m.exec_stats.start_time_s,
+                "wall_time_s": m.exec_stats and m.exec_stats.wall_time_s,
+                "cpu_time_s": m.exec_stats and m.exec_stats.cpu_time_s,
+                "node_id": m.exec_stats and m.exec_stats.node_id,
+            }
+            for m in blocks
+        ],
+    }
+
+
+def _iter_to_dict(stats: Union[DatasetStats, DatasetPipelineStats]) -> Dict[str, Any]:
+    return {
+        "wait_s": stats.iter_wait_s.get(),
+        "get_s": stats.iter_get_s.get(),
+        "format_batch_s": stats.iter_format_batch_s.get(),
+        "user_s": stats.iter_user_s.get(),
+        "total_s": stats.iter_total_s.get(),
+    }
+
+
+def _stage_trace_events(
+    number: int, name: str, blocks: List[BlockMetadata]
+) -> List[Dict[str, Any]]:
+    """Return a trace event for each block of the stage, one process per node.
+
+    The events of a node are spread over threads such that the events of a
+    thread don't overlap, since the trace viewer expects them to nest.
+    """
+    exec_stats = [
+        e
+        for e in (m.exec_stats for m in blocks)
+        if e is not None and e.start_time_s is not None
+    ]
+    thread_end_times = collections.defaultdict(list)
+    events = []
+    for e in sorted(exec_stats, key=lambda e: e.start_time_s):
+        end_times = thread_end_times[e.node_id]
+        for tid, end_time in enumerate(end_times):
+            if end_time <= e.start_time_s:
+                break
+        else:
+            tid = len(end_times)
+            end_times.append(0)
+        end_times[tid] = e.start_time_s + e.wall_time_s
+        events.append(
+            {
+                "cat": "stage",
+                "name": "Stage {} {}".format(number, name),
+                "ph": "X",
+                "pid": "node:{}".format(e.node_id),
+                "tid": tid,
+                "ts": e.start_time_s * 1e6,
+                "dur": e.wall_time_s * 1e6,
+                "args": {"cpu_time_s": e.cpu_time_s},
+            }
+        )
+    return events
+
+
+def _iter_trace_events(
+    stats: Union[DatasetStats, DatasetPipelineStats], pid: str
+) -> List[Dict[str, Any]]:
+    events = []
+    for name, timer in [
+        ("iter_wait", stats.iter_wait_s),
+        ("iter_get", stats.iter_get_s),
+        ("iter_format_batch", stats.iter_format_batch_s),
+        ("iter_user", stats.iter_user_s),
+    ]:
+        events.extend(_timer_trace_events(timer, name, pid))
+    return events
+
+
+def _timer_trace_events(timer: Timer, name: str, pid: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "cat": "iter",
+            "name": name,
+            "ph": "X",
+            "pid": pid,
+            "tid": name,
+            "ts": start * 1e6,
+            "dur": duration * 1e6,
+        }
+        for start, duration in timer.spans()
+    ]
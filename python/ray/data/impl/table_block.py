@@ -1,5 +1,6 @@
 import collections
 
+import numpy as np
 from typing import Dict, Iterator, List, Union, Any, TypeVar, TYPE_CHECKING
 
 from ray.data.block import Block, BlockAccessor
@@ -156,3 +157,33 @@ class TableBlockAccessor(BlockAccessor):
             return self._empty_table()
         k = min(n_samples, self.num_rows())
         return self._sample(k, key)
+
+    def hash_partition(
+        self, key: Union[str, List[str]], num_partitions: int
+    ) -> List[Any]:
+        from pandas.util import hash_array
+
+        if self.num_rows() == 0:
+            # The table may not have a schema, so can't select the key.
+            return [self._empty_table() for _ in range(num_partitions)]
+        hashes = None
+        for col in [key] if isinstance(key, str) else key:
+            values = self.to_numpy(col)
+            if values.dtype.kind in "iuf":
+                # Hash equal numbers equally regardless of their type (e.g., when
+                # nulls turned an int column into floats), and -0.0 as 0.0.
+                values = values.astype(np.float64) + 0.0
+            # Hash with pandas, since its hashes are stable across processes.
+            col_hashes = hash_array(values)
+            hashes = col_hashes if hashes is None else hashes * 31 + col_hashes
+        partition_ids = (hashes % num_partitions).astype(np.int64)
+        order = np.argsort(partition_ids, kind="stable")
+        table = type(self)(self._table.take(order))
+        ret = []
+        prev_i = 0
+        for i in np.cumsum(np.bincount(partition_ids, minlength=num_partitions)):
+            # Slices need to be copied to avoid including the base table
+            # during serialization.
+            ret.append(table.slice(prev_i, i, copy=True))
+            prev_i = i
+        return ret
@@ -1,5 +1,7 @@
+import builtins
 import os
 import logging
+import math
 from typing import (
     List,
     Any,
@@ -44,8 +46,10 @@ from ray.data.datasource import (
     ParquetDatasource,
     BinaryDatasource,
     NumpyDatasource,
+    ArrowIPCDatasource,
     ReadTask,
 )
+from ray.data.datasource.datasource import _merge_read_tasks
 from ray.data.datasource.file_based_datasource import (
     _wrap_arrow_serialization_workaround,
     _unwrap_arrow_serialization_workaround,
@@ -187,7 +191,7 @@ def range_tensor(
 def read_datasource(
     datasource: Datasource[T],
     *,
-    parallelism: int = 200,
+    parallelism: int = -1,
     ray_remote_args: Dict[str, Any] = None,
     **read_args,
 ) -> Dataset[T]:
@@ -196,13 +200,39 @@ def read_datasource(
     Args:
         datasource: The datasource to read data from.
         parallelism: The requested parallelism of the read. Parallelism may be
-            limited by the available partitioning of the datasource.
+            limited by the available partitioning of the datasource. If -1,
+            it's chosen from the estimated size of the data, so that the read
+            uses the whole cluster with blocks of a reasonable size.
         read_args: Additional kwargs to pass to the datasource impl.
         ray_remote_args: kwargs passed to ray.remote in the read tasks.
 
     Returns:
         Dataset holding the data read from the datasource.
     """
+    block_list, stats = _get_read_block_list(
+        datasource, parallelism, ray_remote_args, read_args
+    )
+    return Dataset(
+        ExecutionPlan(block_list, stats),
+        0,
+        False,
+    )
+
+
+def _get_read_block_list(
+    datasource: Datasource[T],
+    parallelism: int,
+    ray_remote_args: Optional[Dict[str, Any]],
+    read_args: Dict[str, Any],
+) -> Tuple[LazyBlockList, DatasetStats]:
+    """Prepare the read tasks of a datasource and wrap them in a LazyBlockList.
+
+    This is also used by the ExecutionPlan optimizer to re-plan a read with
+    additional read arguments (e.g., pushed down filters or projections).
+
+    Returns:
+        The lazy block list of the read and the stats of the read stage.
+    """
     # TODO(ekl) remove this feature flag.
     force_local = "RAY_DATASET_FORCE_LOCAL_METADATA" in os.environ
     pa_ds = _lazy_import_pyarrow_dataset()
@@ -215,16 +245,16 @@ def read_datasource(
             )
             force_local = True
 
-    if force_local:
-        read_tasks = datasource.prepare_read(parallelism, **read_args)
-    else:
+    def prepare(parallelism: int) -> List[ReadTask]:
+        if force_local:
+            return datasource.prepare_read(parallelism, **read_args)
         # Prepare read in a remote task so that in Ray client mode, we aren't
         # attempting metadata resolution from the client machine.
         ctx = DatasetContext.get_current()
         prepare_read = cached_remote_fn(
             _prepare_read, retry_exceptions=False, num_cpus=0
         )
-        read_tasks = ray.get(
+        return ray.get(
             prepare_read.remote(
                 datasource,
                 ctx,
@@ -233,6 +263,11 @@ def read_datasource(
             )
         )
 
+    if parallelism < 0:
+        read_tasks = _autodetect_read_tasks(prepare)
+    else:
+        read_tasks = prepare(parallelism)
+
     context = DatasetContext.get_current()
     stats_actor = get_or_create_stats_actor()
     stats_uuid = uuid.uuid4()
@@ -276,6 +311,10 @@ def read_datasource(
     # TODO(ekl) consider refactoring LazyBlockList to take read_tasks explicitly.
     block_list._read_tasks = read_tasks
     block_list._read_remote_args = ray_remote_args
+    # Retained so that the read can be re-planned with pushed down arguments.
+    block_list._read_datasource = datasource
+    block_list._read_parallelism = parallelism
+    block_list._read_args = read_args
 
     # Get the schema from the first block synchronously.
     if metadata and metadata[0].schema is None:
@@ -287,11 +326,7 @@ def read_datasource(
         stats_actor=stats_actor,
         stats_uuid=stats_uuid,
     )
-    return Dataset(
-        ExecutionPlan(block_list, stats),
-        0,
-        False,
-    )
+    return block_list, stats
 
 
 @PublicAPI
@@ -300,7 +335,7 @@ def read_parquet(
     *,
     filesystem: Optional["pyarrow.fs.FileSystem"] = None,
     columns: Optional[List[str]] = None,
-    parallelism: int = 200,
+    parallelism: int = -1,
     ray_remote_args: Dict[str, Any] = None,
     tensor_column_schema: Optional[Dict[str, Tuple[np.dtype, Tuple[int, ...]]]] = None,
     **arrow_parquet_args,
@@ -319,7 +354,8 @@ def read_parquet(
         filesystem: The filesystem implementation to read from.
         columns: A list of column names to read.
         parallelism: The requested parallelism of the read. Parallelism may be
-            limited by the number of files of the dataset.
+            limited by the number of files of the dataset. If -1, it's chosen
+            from the total size of the files.
         ray_remote_args: kwargs passed to ray.remote in the read tasks.
         tensor_column_schema: A dict of column name --> tensor dtype and shape
             mappings for converting a Parquet column containing serialized
@@ -377,7 +413,7 @@ def read_json(
     paths: Union[str, List[str]],
     *,
     filesystem: Optional["pyarrow.fs.FileSystem"] = None,
-    parallelism: int = 200,
+    parallelism: int = -1,
     ray_remote_args: Dict[str, Any] = None,
     arrow_open_stream_args: Optional[Dict[str, Any]] = None,
     **arrow_json_args,
@@ -399,7 +435,8 @@ def read_json(
             A list of paths can contain both files and directories.
         filesystem: The filesystem implementation to read from.
         parallelism: The requested parallelism of the read. Parallelism may be
-            limited by the number of files of the dataset.
+            limited by the number of files of the dataset. If -1, it's chosen
+            from the total size of the files.
         ray_remote_args: kwargs passed to ray.remote in the read tasks.
         arrow_open_stream_args: kwargs passed to
             pyarrow.fs.FileSystem.open_input_stream
@@ -424,7 +461,7 @@ def read_csv(
     paths: Union[str, List[str]],
     *,
     filesystem: Optional["pyarrow.fs.FileSystem"] = None,
-    parallelism: int = 200,
+    parallelism: int = -1,
     ray_remote_args: Dict[str, Any] = None,
     arrow_open_stream_args: Optional[Dict[str, Any]] = None,
     **arrow_csv_args,
@@ -446,7 +483,8 @@ def read_csv(
             A list of paths can contain both files and directories.
         filesystem: The filesystem implementation to read from.
         parallelism: The requested parallelism of the read. Parallelism may be
-            limited by the number of files of the dataset.
+            limited by the number of files of the dataset. If -1, it's chosen
+            from the total size of the files.
         ray_remote_args: kwargs passed to ray.remote in the read tasks.
         arrow_open_stream_args: kwargs passed to
             pyarrow.fs.FileSystem.open_input_stream
@@ -466,6 +504,56 @@ def read_csv(
     )
 
 
+@PublicAPI
+def read_arrow_ipc(
+    paths: Union[str, List[str]],
+    *,
+    filesystem: Optional["pyarrow.fs.FileSystem"] = None,
+    parallelism: int = -1,
+    ray_remote_args: Dict[str, Any] = None,
+    arrow_open_file_args: Optional[Dict[str, Any]] = None,
+    **arrow_ipc_args,
+) -> Dataset[ArrowRow]:
+    """Create an Arrow dataset from Arrow IPC (Feather V2) files.
+
+    Local files are memory-mapped, so their record batches are turned into
+    blocks without decoding or copying them. This makes the format a good fit
+    for intermediate data on local disks.
+
+    Examples:
+        >>> # Read a directory of files in remote storage.
+        >>> ray.data.read_arrow_ipc("s3://bucket/path")
+
+        >>> # Read multiple local files.
+        >>> ray.data.read_arrow_ipc(["/path/to/file1", "/path/to/file2"])
+
+    Args:
+        paths: A single file/directory path or a list of file/directory paths.
+            A list of paths can contain both files and directories.
+        filesystem: The filesystem implementation to read from.
+        parallelism: The requested parallelism of the read. Parallelism may be
+            limited by the number of files of the dataset. If -1, it's chosen
+            from the total size of the files.
+        ray_remote_args: kwargs passed to ray.remote in the read tasks.
+        arrow_open_file_args: kwargs passed to
+            pyarrow.fs.FileSystem.open_input_file for non-local files.
+        arrow_ipc_args: Other IPC read options to pass to
+            pyarrow.ipc.open_file.
+
+    Returns:
+        Dataset holding Arrow records read from the specified paths.
+    """
+    return read_datasource(
+        ArrowIPCDatasource(),
+        parallelism=parallelism,
+        paths=paths,
+        filesystem=filesystem,
+        ray_remote_args=ray_remote_args,
+        open_stream_args=arrow_open_file_args,
+        **arrow_ipc_args,
+    )
+
+
 @PublicAPI
 def read_text(
     paths: Union[str, List[str]],
@@ -474,7 +562,7 @@ def read_text(
     errors: str = "ignore",
     drop_empty_lines: bool = True,
     filesystem: Optional["pyarrow.fs.FileSystem"] = None,
-    parallelism: int = 200,
+    parallelism: int = -1,
     arrow_open_stream_args: Optional[Dict[str, Any]] = None,
 ) -> Dataset[str]:
     """Create a dataset from lines stored in text files.
@@ -493,7 +581,8 @@ def read_text(
             "ignore", or "replace". Defaults to "ignore".
         filesystem: The filesystem implementation to read from.
         parallelism: The requested parallelism of the read. Parallelism may be
-            limited by the number of files of the dataset.
+            limited by the number of files of the dataset. If -1, it's chosen
+            from the total size of the files.
         arrow_open_stream_args: kwargs passed to
             pyarrow.fs.FileSystem.open_input_stream
 
@@ -520,7 +609,7 @@ def read_numpy(
     paths: Union[str, List[str]],
     *,
     filesystem: Optional["pyarrow.fs.FileSystem"] = None,
-    parallelism: int = 200,
+    parallelism: int = -1,
     arrow_open_stream_args: Optional[Dict[str, Any]] = None,
     **numpy_load_args,
 ) -> Dataset[ArrowRow]:
@@ -541,7 +630,8 @@ def read_numpy(
             A list of paths can contain both files and directories.
         filesystem: The filesystem implementation to read from.
         parallelism: The requested parallelism of the read. Parallelism may be
-            limited by the number of files of the dataset.
+            limited by the number of files of the dataset. If -1, it's chosen
+            from the total size of the files.
         arrow_open_stream_args: kwargs passed to
             pyarrow.fs.FileSystem.open_input_stream
         numpy_load_args: Other options to pass to np.load.
@@ -565,7 +655,7 @@ def read_binary_files(
     *,
     include_paths: bool = False,
     filesystem: Optional["pyarrow.fs.FileSystem"] = None,
-    parallelism: int = 200,
+    parallelism: int = -1,
     ray_remote_args: Dict[str, Any] = None,
     arrow_open_stream_args: Optional[Dict[str, Any]] = None,
 ) -> Dataset[Union[Tuple[str, bytes], bytes]]:
@@ -586,7 +676,8 @@ def read_binary_files(
         filesystem: The filesystem implementation to read from.
         ray_remote_args: kwargs passed to ray.remote in the read tasks.
         parallelism: The requested parallelism of the read. Parallelism may be
-            limited by the number of files of the dataset.
+            limited by the number of files of the dataset. If -1, it's chosen
+            from the total size of the files.
         arrow_open_stream_args: kwargs passed to
             pyarrow.fs.FileSystem.open_input_stream
 
@@ -867,6 +958,65 @@ def _get_metadata(table: Union["pyarrow.Table", "pandas.DataFrame"]) -> BlockMet
     )
 
 
+def _autodetect_read_tasks(prepare: Callable[[int], List[ReadTask]]) -> List[ReadTask]:
+    """Prepare a read with a parallelism chosen from the size of the data.
+
+    The read is prepared with ``DatasetContext.min_parallelism`` tasks, or two
+    tasks per CPU of the cluster if there are more CPUs. Based on the total
+    size estimated by the read tasks, the read is then split further so that
+    no block exceeds ``read_target_max_block_size`` (or
+    ``target_max_block_size``, if lower), or coalesced so that small
+    reads don't produce blocks under ``target_min_block_size``. Reads are
+    never coalesced below two tasks per CPU, so that they use the whole
+    cluster.
+
+    Args:
+        prepare: Prepares the read tasks for a given parallelism.
+
+    Returns:
+        The read tasks.
+    """
+    ctx = DatasetContext.get_current()
+    num_cpus = max(1, int(ray.cluster_resources().get("CPU", 1)))
+    parallelism = max(ctx.min_parallelism, 2 * num_cpus)
+    read_tasks = prepare(parallelism)
+    sizes = [task.get_metadata().size_bytes for task in read_tasks]
+    if not read_tasks or None in sizes:
+        return read_tasks
+
+    total_size = sum(sizes)
+    max_block_size = min(ctx.read_target_max_block_size, ctx.target_max_block_size)
+    min_safe_parallelism = math.ceil(total_size / max_block_size)
+    max_reasonable_parallelism = max(1, total_size // ctx.target_min_block_size)
+    target = max(
+        min(ctx.min_parallelism, max_reasonable_parallelism),
+        min_safe_parallelism,
+        2 * num_cpus,
+    )
+    # Only split further if the datasource split the data as finely as it was
+    # asked to, otherwise it's limited by the partitioning of the data (e.g.,
+    # the number of files).
+    if target > parallelism and len(read_tasks) >= parallelism:
+        read_tasks = prepare(target)
+    if target < len(read_tasks):
+        read_tasks = _coalesce_read_tasks(read_tasks, target)
+    return read_tasks
+
+
+def _coalesce_read_tasks(read_tasks: List[ReadTask], num_tasks: int) -> List[ReadTask]:
+    """Merge adjacent read tasks into num_tasks read tasks of similar size."""
+    sizes = [task.get_metadata().size_bytes or 0 for task in read_tasks]
+    if sum(sizes) == 0:
+        sizes = [1] * len(read_tasks)
+    total_size = sum(sizes)
+    groups = [[] for _ in builtins.range(num_tasks)]
+    offset = 0
+    for task, size in zip(read_tasks, sizes):
+        groups[offset * num_tasks // total_size].append(task)
+        offset += size
+    return [_merge_read_tasks(group) for group in groups if group]
+
+
 def _prepare_read(
     ds: Datasource, ctx: DatasetContext, parallelism: int, kwargs: dict
 ) -> List[ReadTask]:
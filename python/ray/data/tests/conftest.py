@@ -6,6 +6,7 @@ import pyarrow as pa
 import ray
 
 from ray.data.block import BlockAccessor
+from ray.data.context import DatasetContext
 from ray.data.tests.mock_server import *  # noqa
 from ray.data.datasource.file_based_datasource import BlockWritePathProvider
 
@@ -97,3 +98,21 @@ def test_block_write_path_provider():
             return f"{base_path}/{suffix}"
 
     yield TestBlockWritePathProvider()
+
+
+@pytest.fixture(params=[True, False])
+def use_push_based_shuffle(request):
+    ctx = DatasetContext.get_current()
+    original = ctx.use_push_based_shuffle
+    ctx.use_push_based_shuffle = request.param
+    yield request.param
+    ctx.use_push_based_shuffle = original
+
+
+@pytest.fixture(params=[True, False])
+def use_hash_aggregate(request):
+    ctx = DatasetContext.get_current()
+    original = ctx.use_hash_aggregate
+    ctx.use_hash_aggregate = request.param
+    yield request.param
+    ctx.use_hash_aggregate = original
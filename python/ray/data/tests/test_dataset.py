@@ -16,10 +16,14 @@ from ray.tests.conftest import *  # noqa
 from ray.data.dataset import _sliding_window
 from ray.data.datasource.csv_datasource import CSVDatasource
 from ray.data.block import BlockAccessor
+from ray.data.context import DatasetContext
 from ray.data.row import TableRow
-from ray.data.impl.arrow_block import ArrowRow
+from ray.data.impl.arrow_block import ArrowBlockAccessor, ArrowRow
+from ray.data.impl.block_batching import _make_async_gen
 from ray.data.impl.block_builder import BlockBuilder
+from ray.data.impl.cache import plan_fingerprint
 from ray.data.impl.pandas_block import PandasRow
+from ray.data.impl.shuffle import _get_merge_node_resources
 from ray.data.aggregate import AggregateFn, Count, Sum, Min, Max, Mean, Std
 from ray.data.extensions.tensor_extension import (
     TensorArray,
@@ -93,6 +97,23 @@ def test_basic_actors(shutdown_only, pipelined):
         ray.data.range(10).map(lambda x: x, compute=ray.data.ActorPoolStrategy(8, 4))
 
 
+def test_actor_pool_strategy(shutdown_only):
+    ray.init(num_cpus=2)
+    ds = ray.data.range(20, parallelism=20)
+
+    # The output blocks keep the order of the input blocks.
+    compute = ray.data.ActorPoolStrategy(1, 2, max_tasks_in_flight_per_actor=4)
+    assert ds.map(lambda x: x + 1, compute=compute).take_all() == list(range(1, 21))
+
+    # All blocks are pipelined through a single actor.
+    compute = ray.data.ActorPoolStrategy(1, 1, max_tasks_in_flight_per_actor=3)
+    pids = ds.map(lambda _: os.getpid(), compute=compute).take_all()
+    assert len(set(pids)) == 1
+
+    with pytest.raises(ValueError):
+        ray.data.ActorPoolStrategy(1, 2, max_tasks_in_flight_per_actor=0)
+
+
 @pytest.mark.parametrize("pipelined", [False, True])
 def test_avoid_placement_group_capture(shutdown_only, pipelined):
     ray.init(num_cpus=2)
@@ -228,6 +249,51 @@ def test_zip_arrow(ray_start_regular_shared):
     assert result[0] == {"id": 0, "id_1": 0, "id_2": 0}
 
 
+@pytest.mark.parametrize("how", ["inner", "left", "right", "outer"])
+@pytest.mark.parametrize("broadcast", [False, True])
+def test_join(ray_start_regular_shared, how, broadcast):
+    ctx = DatasetContext.get_current()
+    original = ctx.broadcast_join_threshold_bytes
+    ctx.broadcast_join_threshold_bytes = 1024 * 1024 * 1024 if broadcast else 0
+    try:
+        left = pd.DataFrame({"id": np.arange(100) % 40, "a": np.arange(100)})
+        right = pd.DataFrame(
+            {
+                "id": np.arange(30) * 2,
+                "a": np.arange(30),
+                "b": [str(i) for i in range(30)],
+            }
+        )
+        ds = ray.data.from_pandas(np.array_split(left, 5)).join(
+            ray.data.from_pandas(np.array_split(right, 3)), on="id", how=how
+        )
+        result = ds.to_pandas()
+        expected = left.merge(right, on="id", how=how, suffixes=("", "_right"))
+        assert list(result.columns) == ["id", "a", "a_right", "b"]
+        sort_cols = ["id", "a", "a_right"]
+        pd.testing.assert_frame_equal(
+            result.sort_values(sort_cols).reset_index(drop=True),
+            expected.sort_values(sort_cols).reset_index(drop=True),
+            check_dtype=False,
+        )
+    finally:
+        ctx.broadcast_join_threshold_bytes = original
+
+
+def test_join_errors(ray_start_regular_shared):
+    ds = ray.data.from_items([{"id": i, "a": i} for i in range(10)])
+    with pytest.raises(ValueError):
+        ds.join(ds, on="id", how="cross")
+    with pytest.raises(ValueError):
+        ds.join(ds, on="missing").fully_executed()
+    with pytest.raises(ValueError):
+        ray.data.range(10).join(ds, on="id").fully_executed()
+    # Joining with an empty dataset.
+    empty = ds.filter(lambda r: r["id"] > 10)
+    assert ds.join(empty, on="id").count() == 0
+    assert ds.join(empty, on="id", how="left").count() == 10
+
+
 def test_batch_tensors(ray_start_regular_shared):
     import torch
 
@@ -317,6 +383,49 @@ def test_tensors(ray_start_regular_shared):
     assert str(res) == "[{'value': array([2])}, {'value': array([3])}]"
 
 
+def test_tensors_iter_batches_numpy(ray_start_regular_shared):
+    ds = ray.data.range_tensor(6, shape=(3, 5), parallelism=2)
+
+    # Each batch within a block is a view of the tensor column.
+    batches = list(ds.iter_batches(batch_size=3, batch_format="numpy"))
+    assert len(batches) == 2
+    for i, batch in enumerate(batches):
+        assert list(batch) == ["value"]
+        arr = batch["value"]
+        assert arr.shape == (3, 3, 5)
+        assert arr.dtype == np.int64
+        assert not arr.flags.owndata
+        expected = np.arange(3 * i, 3 * i + 3).reshape(3, 1, 1)
+        assert np.array_equal(arr, np.broadcast_to(expected, (3, 3, 5)))
+
+    # Batches spanning blocks are concatenated.
+    [batch] = ds.iter_batches(batch_size=6, batch_format="numpy")
+    assert batch["value"].shape == (6, 3, 5)
+    assert np.array_equal(batch["value"][:, 0, 0], np.arange(6))
+
+
+def test_to_torch_tensor_column(ray_start_regular_shared):
+    import torch
+
+    ds = ray.data.range_tensor(6, shape=(3, 5), parallelism=2)
+    ds = ds.add_column("label", lambda df: df["value"].to_numpy()[:, 0, 0])
+
+    # A single tensor column keeps its shape.
+    torchd = ds.to_torch(label_column="label", batch_size=3)
+    for i, (features, label) in enumerate(torchd):
+        assert features.shape == (3, 3, 5)
+        assert label.shape == (3, 1)
+        assert torch.equal(features[:, 0, 0], torch.arange(3 * i, 3 * i + 3))
+        assert torch.equal(label.view(-1), torch.arange(3 * i, 3 * i + 3))
+
+    # Tensor columns are flattened when combined with other columns.
+    torchd = ds.to_torch(feature_columns=["value", "label"], batch_size=3)
+    for features, label in torchd:
+        assert features.shape == (3, 16)
+        assert label is None
+        assert torch.equal(features[:, 0], features[:, 15])
+
+
 def test_tensor_array_ops(ray_start_regular_shared):
     outer_dim = 3
     inner_shape = (2, 2, 2)
@@ -1219,6 +1328,13 @@ def test_iter_batches_basic(ray_start_regular_shared):
         assert isinstance(batch, pa.Table)
         assert batch.equals(pa.Table.from_pandas(df))
 
+    # numpy format.
+    for batch, df in zip(ds.iter_batches(batch_format="numpy"), dfs):
+        assert isinstance(batch, dict)
+        assert list(batch) == ["one", "two"]
+        assert np.array_equal(batch["one"], df["one"].to_numpy())
+        assert np.array_equal(batch["two"], df["two"].to_numpy())
+
     # blocks format.
     for batch, df in zip(ds.iter_batches(batch_format="native"), dfs):
         assert BlockAccessor.for_block(batch).to_pandas().equals(df)
@@ -1375,6 +1491,90 @@ def test_iter_batches_grid(ray_start_regular_shared):
                         assert len(batches[-1]) == num_rows % batch_size
 
 
+def test_iter_batches_prefetch_batches(ray_start_regular_shared):
+    ds = ray.data.range(100, parallelism=10)
+    batches = list(ds.iter_batches(batch_size=7, prefetch_batches=3))
+    assert [len(b) for b in batches] == [7] * 14 + [2]
+    assert [x for b in batches for x in b] == list(range(100))
+
+    # Stopping early doesn't hang.
+    for i, batch in enumerate(ds.iter_batches(batch_size=1, prefetch_batches=1)):
+        assert batch == [i]
+        if i == 5:
+            break
+
+    # Errors are raised to the consumer.
+    def fail(x):
+        raise ValueError("oops")
+
+    with pytest.raises(ValueError):
+        list(_make_async_gen(map(fail, range(10)), 2))
+    assert list(_make_async_gen(iter([]), 2)) == []
+
+
+@pytest.mark.parametrize("ds_format", ["simple", "arrow"])
+def test_iter_batches_local_shuffle(ray_start_regular_shared, ds_format):
+    if ds_format == "simple":
+        ds = ray.data.range(100, parallelism=10)
+    else:
+        ds = ray.data.range_arrow(100, parallelism=10)
+
+    def to_values(batch):
+        if ds_format == "simple":
+            return list(batch)
+        return batch["value"].tolist()
+
+    batches = list(
+        ds.iter_batches(
+            batch_size=7,
+            local_shuffle_buffer_size=25,
+            local_shuffle_seed=0,
+            batch_format="native" if ds_format == "simple" else "pandas",
+        )
+    )
+    assert [len(b) for b in batches] == [7] * 14 + [2]
+    values = [x for b in batches for x in to_values(b)]
+    assert values != list(range(100))
+    assert sorted(values) == list(range(100))
+    # The first batch is drawn from a buffer spanning multiple blocks.
+    assert max(to_values(batches[0])) >= 10
+
+    # The shuffle is deterministic given a seed.
+    batches2 = ds.iter_batches(
+        batch_size=7,
+        local_shuffle_buffer_size=25,
+        local_shuffle_seed=0,
+        batch_format="native" if ds_format == "simple" else "pandas",
+    )
+    assert [x for b in batches2 for x in to_values(b)] == values
+
+    # Drop last.
+    batches = list(
+        ds.iter_batches(batch_size=7, local_shuffle_buffer_size=25, drop_last=True)
+    )
+    assert [len(b) for b in batches] == [7] * 14
+
+    # Rows.
+    rows = list(ds.iter_rows(local_shuffle_buffer_size=25))
+    if ds_format == "arrow":
+        rows = [r["value"] for r in rows]
+    assert sorted(rows) == list(range(100))
+
+    # A batch size is required.
+    with pytest.raises(ValueError):
+        list(ds.iter_batches(local_shuffle_buffer_size=25))
+
+
+def test_randomize_block_order(ray_start_regular_shared):
+    ds = ray.data.range(12, parallelism=4)
+    shuffled = ds.randomize_block_order(seed=0)
+    blocks = [ray.get(b) for b in shuffled.get_internal_block_refs()]
+    assert sorted(blocks) == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9, 10, 11]]
+    assert blocks != sorted(blocks)
+    assert shuffled.take_all() == [x for b in blocks for x in b]
+    assert ds.randomize_block_order(seed=0).take_all() == shuffled.take_all()
+
+
 def test_lazy_loading_iter_batches_exponential_rampup(ray_start_regular_shared):
     ds = ray.data.range(32, parallelism=8)
     expected_num_blocks = [1, 2, 4, 4, 8, 8, 8, 8]
@@ -1396,6 +1596,58 @@ def test_add_column(ray_start_regular_shared):
         ds = ray.data.range(5).add_column("value", 0)
 
 
+def test_with_column(ray_start_regular_shared):
+    from ray.data import col, lit
+
+    ds = ray.data.range_arrow(5).with_column("foo", col("value") * 2 + 1)
+    assert ds.take(2) == [{"value": 0, "foo": 1}, {"value": 1, "foo": 3}]
+    assert ds._dataset_format() == "arrow"
+
+    # Overwrite an existing column, and add a constant column.
+    ds = ds.with_column("value", -col("value")).with_column("bar", lit("x"))
+    assert ds.take(2) == [
+        {"value": 0, "foo": 1, "bar": "x"},
+        {"value": -1, "foo": 3, "bar": "x"},
+    ]
+
+    # Pandas datasets are evaluated in Arrow format.
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]})
+    ds = ray.data.from_pandas(df)
+    ds = ds.with_column("c", (col("a") > 1) & col("b").is_valid())
+    ds = ds.with_column("d", col("b").call("utf8_upper"))
+    assert ds.take() == [
+        {"a": 1, "b": "x", "c": False, "d": "X"},
+        {"a": 2, "b": "y", "c": True, "d": "Y"},
+        {"a": 3, "b": None, "c": False, "d": None},
+    ]
+
+    # Filter by expression.
+    ds = ray.data.range_arrow(10)
+    assert ds.filter(col("value") >= 7).take() == [{"value": i} for i in [7, 8, 9]]
+    assert ds.filter((col("value") < 2) | col("value").is_in([5, 6])).take() == [
+        {"value": i} for i in [0, 1, 5, 6]
+    ]
+    assert ds.filter(~(col("value") > 0)).count() == 1
+
+    with pytest.raises(ValueError):
+        ray.data.range(5).with_column("foo", col("value")).take()
+    with pytest.raises(ValueError):
+        ray.data.range_arrow(5).with_column("foo", col("missing")).take()
+    with pytest.raises(ValueError):
+        ray.data.range_arrow(5).with_column("foo", lambda x: 1)
+    with pytest.raises(TypeError):
+        col("a") > 1 and col("b") > 1
+
+    # Expressions are hashable, and convert to Arrow dataset expressions.
+    import pyarrow.dataset as pds
+
+    expr = (col("value") > 3) | col("value").is_in([0])
+    assert len({expr, expr}) == 1
+    table = pa.table({"value": list(range(5))})
+    filtered = pds.dataset(table).to_table(filter=expr.to_pyarrow())
+    assert filtered["value"].to_pylist() == [0, 4]
+
+
 def test_map_batch(ray_start_regular_shared, tmp_path):
     # Test input validation
     ds = ray.data.range(5)
@@ -1606,7 +1858,8 @@ def test_to_tf_feature_columns(ray_start_regular_shared, label_column):
 
 
 @pytest.mark.parametrize("pipelined", [False, True])
-def test_to_torch(ray_start_regular_shared, pipelined):
+@pytest.mark.parametrize("prefetch_batches", [0, 2])
+def test_to_torch(ray_start_regular_shared, pipelined, prefetch_batches):
     import torch
 
     df1 = pd.DataFrame(
@@ -1619,7 +1872,9 @@ def test_to_torch(ray_start_regular_shared, pipelined):
     df = pd.concat([df1, df2, df3])
     ds = ray.data.from_pandas([df1, df2, df3])
     ds = maybe_pipeline(ds, pipelined)
-    torchd = ds.to_torch(label_column="label", batch_size=3)
+    torchd = ds.to_torch(
+        label_column="label", batch_size=3, prefetch_batches=prefetch_batches
+    )
 
     num_epochs = 1 if pipelined else 2
     for _ in range(num_epochs):
@@ -1842,7 +2097,7 @@ def test_groupby_agg_name_conflict(ray_start_regular_shared, num_parts):
 
 
 @pytest.mark.parametrize("num_parts", [1, 30])
-def test_groupby_arrow_count(ray_start_regular_shared, num_parts):
+def test_groupby_arrow_count(ray_start_regular_shared, num_parts, use_hash_aggregate):
     # Test built-in count aggregation
     seed = int(time.time())
     print(f"Seeding RNG for test_groupby_arrow_count with: {seed}")
@@ -1864,7 +2119,9 @@ def test_groupby_arrow_count(ray_start_regular_shared, num_parts):
 
 
 @pytest.mark.parametrize("num_parts", [1, 30])
-def test_groupby_arrow_sum(ray_start_regular_shared, num_parts):
+def test_groupby_arrow_sum(
+    ray_start_regular_shared, num_parts, use_push_based_shuffle, use_hash_aggregate
+):
     # Test built-in sum aggregation
     seed = int(time.time())
     print(f"Seeding RNG for test_groupby_arrow_sum with: {seed}")
@@ -1943,6 +2200,70 @@ def test_groupby_arrow_sum(ray_start_regular_shared, num_parts):
     assert nan_ds.sum("A") is None
 
 
+@pytest.mark.parametrize("num_parts", [1, 30])
+def test_groupby_hash_aggregate(ray_start_regular_shared, num_parts):
+    ctx = DatasetContext.get_current()
+    ctx.use_hash_aggregate = True
+    try:
+        df = pd.DataFrame(
+            {
+                "A": np.random.randint(0, 50, 1000),
+                "B": np.random.rand(1000),
+                "C": [f"c{i % 7}" for i in range(1000)],
+            }
+        )
+        df.loc[::13, "B"] = None
+        ds = ray.data.from_pandas(df).repartition(num_parts)
+        agg_ds = ds.groupby("A").aggregate(
+            Count(), Sum("B"), Min("B"), Max("B"), Mean("B"), Std("B")
+        )
+        # The output is not globally sorted by key with hash partitioning.
+        result = agg_ds.to_pandas().sort_values("A").reset_index(drop=True)
+        grouped = df.groupby("A")["B"]
+        expected = pd.DataFrame(
+            {
+                "A": grouped.size().index,
+                "count()": grouped.size().values,
+                "sum(B)": grouped.sum().values,
+                "min(B)": grouped.min().values,
+                "max(B)": grouped.max().values,
+                "mean(B)": grouped.mean().values,
+                "std(B)": grouped.std().values,
+            }
+        )
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+        # Custom aggregations fall back to sorting each partition.
+        agg_ds = ds.groupby("C").aggregate(
+            AggregateFn(
+                init=lambda k: 0,
+                accumulate=lambda a, r: a + 1,
+                merge=lambda a1, a2: a1 + a2,
+                name="n",
+            )
+        )
+        result = {r["C"]: r["n"] for r in agg_ds.iter_rows()}
+        assert result == df.groupby("C").size().to_dict()
+    finally:
+        ctx.use_hash_aggregate = False
+
+
+def test_groupby_arrow_nullable_int_dtype(ray_start_regular_shared, use_hash_aggregate):
+    # Integer columns with nulls are not combined via pandas, which would turn
+    # them into floats.
+    table = pa.table(
+        {"A": [0, 1, 0, 1], "B": pa.array([1, None, 3, 4], type=pa.int64())}
+    )
+    agg_ds = ray.data.from_arrow(table).groupby("A").sum("B")
+    assert agg_ds.schema().field("sum(B)").type == pa.int64()
+    assert sorted(agg_ds.take_all(), key=lambda r: r["A"]) == [
+        {"A": 0, "sum(B)": 4},
+        {"A": 1, "sum(B)": 4},
+    ]
+    block = ArrowBlockAccessor(table)
+    assert block._combine_vectorized("A", (Sum("B"),)) is None
+
+
 @pytest.mark.parametrize("num_parts", [1, 30])
 def test_groupby_arrow_min(ray_start_regular_shared, num_parts):
     # Test built-in min aggregation
@@ -3004,7 +3325,7 @@ def test_groupby_simple_multi_agg(ray_start_regular_shared, num_parts):
             assert result == expected
 
 
-def test_sort_simple(ray_start_regular_shared):
+def test_sort_simple(ray_start_regular_shared, use_push_based_shuffle):
     num_items = 100
     parallelism = 4
     xs = list(range(num_items))
@@ -3053,6 +3374,123 @@ def test_column_name_type_check(ray_start_regular_shared):
         ray.data.from_pandas(df)
 
 
+def test_streaming_executor(ray_start_regular_shared):
+    ctx = DatasetContext.get_current()
+    ctx.use_streaming_executor = True
+    ctx.streaming_max_blocks_in_flight = 2
+    try:
+        ds = ray.data.range(100, parallelism=10)._experimental_lazy()
+        ds = ds.map(lambda x: x * 2).filter(lambda x: x % 3 == 0)
+        assert list(ds.iter_rows()) == [x for x in range(0, 200, 2) if x % 3 == 0]
+        # The output blocks are streamed instead of being cached.
+        assert not ds._plan.has_computed_output()
+
+        # Stages up to an all-to-all stage are executed in full first.
+        ds = ray.data.range(100, parallelism=10)._experimental_lazy()
+        ds = ds.random_shuffle().map(lambda x: -x)
+        assert sorted(ds.iter_rows()) == list(range(-99, 1))
+        assert not ds._plan.has_computed_output()
+
+        # Datasets that were already computed are iterated as usual.
+        ds = ray.data.range(10)._experimental_lazy().map(lambda x: x + 1)
+        ds._plan.execute()
+        assert list(ds.iter_rows()) == list(range(1, 11))
+
+        # Eager datasets are computed when they are created.
+        ds = ray.data.range(10).map(lambda x: x + 1)
+        assert ds._plan.has_computed_output()
+        assert list(ds.iter_rows()) == list(range(1, 11))
+    finally:
+        ctx.use_streaming_executor = False
+        ctx.streaming_max_blocks_in_flight = None
+
+
+def test_cache(ray_start_regular_shared, tmp_path):
+    def double(x):
+        return x * 2
+
+    path = str(tmp_path)
+    ds = ray.data.range(100, parallelism=10)._experimental_lazy().map(double)
+    cached = ds.cache(path, storage="disk")
+    assert cached.num_blocks() == 10
+    assert cached.take_all() == list(range(0, 200, 2))
+    assert cached.repeat(2).take_all() == list(range(0, 200, 2)) * 2
+    assert len(os.listdir(path)) == 1
+
+    # The same dataset is read back from the cache without being computed.
+    ds = ray.data.range(100, parallelism=10)._experimental_lazy().map(double)
+    assert ds.cache(path, storage="disk").take_all() == list(range(0, 200, 2))
+    assert not ds._plan.has_computed_output()
+    assert len(os.listdir(path)) == 1
+
+    # The key is the same in other processes, e.g., in later jobs.
+    @ray.remote
+    def remote_fingerprint(fn):
+        ds = ray.data.range(100, parallelism=10)._experimental_lazy().map(fn)
+        return plan_fingerprint(ds._plan)
+
+    assert ray.get(remote_fingerprint.remote(double)) == plan_fingerprint(ds._plan)
+    assert ray.get(remote_fingerprint.remote(lambda x: x * 3)) != plan_fingerprint(
+        ds._plan
+    )
+
+    # Other transforms and explicit keys are cached separately.
+    ds = ray.data.range(100, parallelism=10).map(lambda x: x + 1)
+    assert ds.cache(path, storage="disk").take_all() == list(range(1, 101))
+    ds = ray.data.range(100, parallelism=10)
+    assert ds.cache(path, storage="disk", key="k").take_all() == list(range(100))
+    assert len(os.listdir(path)) == 3
+    assert "k" in os.listdir(path)
+
+    # Tabular blocks are read back as Arrow tables.
+    ds = ray.data.from_pandas(pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]}))
+    cached = ds.cache(path, storage="disk")
+    assert cached._dataset_format() == "arrow"
+    assert cached.to_pandas().equals(ds.to_pandas())
+
+    cached = ray.data.range(10).cache()
+    assert cached.take_all() == list(range(10))
+
+    with pytest.raises(ValueError):
+        ray.data.range(10).cache(path)
+    with pytest.raises(ValueError):
+        ray.data.range(10).cache(storage="disk")
+    with pytest.raises(ValueError):
+        ray.data.range(10).cache(path, storage="ssd")
+
+
+def test_push_based_shuffle_multi_node(ray_start_cluster):
+    cluster = ray_start_cluster
+    for _ in range(3):
+        cluster.add_node(num_cpus=2)
+    ray.init(cluster.address)
+    ctx = DatasetContext.get_current()
+    ctx.use_push_based_shuffle = True
+    try:
+        # The local nodes share an IP address, so they share one merger.
+        assert _get_merge_node_resources() == [
+            "node:{}".format(ray.util.get_node_ip_address())
+        ]
+        ds = ray.data.range(100, parallelism=20)
+        shuffled = ds.random_shuffle(seed=0)
+        assert shuffled.num_blocks() == 20
+        assert sorted(shuffled.take_all()) == list(range(100))
+        assert shuffled.take_all() == ds.random_shuffle(seed=0).take_all()
+        assert "combine" in shuffled.stats()
+
+        assert ds.random_shuffle().sort().take_all() == list(range(100))
+        assert ds.repartition(7, shuffle=True).num_blocks() == 7
+
+        grouped = ds.groupby(lambda x: x % 3).sum().take_all()
+        assert grouped == [(0, 1683), (1, 1617), (2, 1650)]
+        assert (
+            ray.data.range_arrow(100, parallelism=20).groupby("value").count().count()
+            == 100
+        )
+    finally:
+        ctx.use_push_based_shuffle = False
+
+
 @pytest.mark.parametrize("pipelined", [False, True])
 def test_random_shuffle(shutdown_only, pipelined):
     def range(n, parallelism=200):
@@ -3244,6 +3682,63 @@ def test_sort_arrow_with_empty_blocks(ray_start_regular):
     assert ds.sort("value").count() == 0
 
 
+def test_sort_bounded_block_size(ray_start_regular_shared, use_push_based_shuffle):
+    ctx = DatasetContext.get_current()
+    old_target = ctx.target_max_block_size
+    ctx.target_max_block_size = 1000
+    try:
+        ds = ray.data.range_arrow(1000, parallelism=2).random_shuffle()
+        sorted_ds = ds.sort("value")
+        # The number of merge tasks scales with the dataset size.
+        assert sorted_ds.num_blocks() > 2
+        assert [r["value"] for r in sorted_ds.iter_rows()] == list(range(1000))
+        sorted_ds = ds.sort("value", descending=True)
+        assert [r["value"] for r in sorted_ds.iter_rows()] == list(
+            reversed(range(1000))
+        )
+    finally:
+        ctx.target_max_block_size = old_target
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_merge_sorted_runs(monkeypatch, descending):
+    from ray.data.impl import sort
+
+    monkeypatch.setattr(sort, "MERGE_WINDOW_ROWS", 7)
+    runs = [
+        pd.DataFrame({"A": sorted(np.random.randint(0, 30, n), reverse=descending)})
+        for n in [0, 5, 40, 23]
+    ]
+    key = [("A", "descending" if descending else "ascending")]
+    out = list(sort._merge_sorted_runs(runs, key, descending))
+    assert len(out) > 1
+    result = pd.concat(out)["A"].tolist()
+    expected = sorted(pd.concat(runs)["A"].tolist(), reverse=descending)
+    assert result == expected
+
+
+def test_sort_merge_splits_output(ray_start_regular_shared, monkeypatch):
+    from ray.data.impl import sort
+
+    monkeypatch.setattr(sort, "MERGE_WINDOW_ROWS", 10)
+    runs = [pa.table({"A": list(range(i, 200, 2))}) for i in range(2)]
+    key = [("A", "ascending")]
+
+    # Partial merges produce a single block.
+    block, meta = sort.SortOp.reduce(key, False, 400, None, *runs, partial_reduce=True)
+    assert meta.num_rows == 200
+
+    # The final merge output is split into blocks of about max_block_size.
+    partition = sort.SortOp.reduce(key, False, 400, None, *runs)
+    assert len(partition) > 1
+    blocks = ray.get([block for block, _ in partition])
+    for block, (_, meta) in zip(blocks, partition):
+        assert meta.num_rows == block.num_rows
+        # At most one merge step (20 int64 rows) past the limit.
+        assert meta.size_bytes < 400 + 20 * 8
+    assert pa.concat_tables(blocks)["A"].to_pylist() == list(range(200))
+
+
 @ray.remote
 class Counter:
     def __init__(self):
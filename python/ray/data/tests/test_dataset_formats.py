@@ -12,8 +12,9 @@ from pytest_lazyfixture import lazy_fixture
 import ray
 
 from ray.tests.conftest import *  # noqa
-from ray.data.datasource import DummyOutputDatasource
+from ray.data.datasource import DummyOutputDatasource, RangeDatasource
 from ray.data.block import BlockAccessor
+from ray.data.context import DatasetContext
 from ray.data.datasource.file_based_datasource import _unwrap_protocol
 from ray.data.datasource.parquet_datasource import PARALLELIZE_META_FETCH_THRESHOLD
 from ray.data.tests.conftest import *  # noqa
@@ -383,6 +384,71 @@ def test_parquet_read_partitioned_with_filter(ray_start_regular_shared, tmp_path
     assert sorted(values) == [[1, "a"], [1, "a"]]
 
 
+def test_parquet_read_pushdown(ray_start_regular_shared, tmp_path):
+    df = pd.DataFrame(
+        {"one": [1, 2, 3, 4, 5, 6], "two": ["a", "b", "c", "d", "e", "f"]}
+    )
+    table = pa.Table.from_pandas(df)
+    pq.write_table(table, os.path.join(str(tmp_path), "test.parquet"))
+
+    ds = ray.data.read_parquet(str(tmp_path))._experimental_lazy()
+    ds = ds.filter(pa.dataset.field("one") > 2).select_columns(["two"])
+    ds._plan._optimize()
+    # Both stages are pushed down into the read.
+    assert ds._plan._stages == [], ds._plan._stages
+    assert ds._plan._in_blocks._read_args["columns"] == ["two"]
+    assert ds.schema().names == ["two"]
+    assert sorted(r["two"] for r in ds.take()) == ["c", "d", "e", "f"]
+    assert ds.count() == 4
+
+    # Column expressions are pushed down as Arrow expressions.
+    ds = ray.data.read_parquet(str(tmp_path))._experimental_lazy()
+    ds = ds.filter(ray.data.col("one") > 3)
+    ds._plan._optimize()
+    assert ds._plan._stages == [], ds._plan._stages
+    assert sorted(r["one"] for r in ds.take()) == [4, 5, 6]
+
+    # Stages following a non-pushdown stage are not pushed down.
+    ds = ray.data.read_parquet(str(tmp_path))._experimental_lazy()
+    ds = ds.map_batches(lambda df: df).filter(pa.dataset.field("one") > 2)
+    ds._plan._optimize()
+    assert "filter" in ds._plan._stages[0].name, ds._plan._stages
+    assert sorted(r["one"] for r in ds.take()) == [3, 4, 5, 6]
+
+    # Filters on columns dropped by an earlier projection are not pushed down.
+    ds = ray.data.read_parquet(str(tmp_path))._experimental_lazy()
+    ds = ds.select_columns(["two"]).filter(ray.data.col("one") > 2)
+    ds._plan._optimize()
+    assert "filter" in ds._plan._stages[0].name, ds._plan._stages
+    assert ds._plan._in_blocks._read_args["columns"] == ["two"]
+    ds = ray.data.read_parquet(str(tmp_path))._experimental_lazy()
+    ds = ds.select_columns(["one", "two"]).filter(ray.data.col("one") > 2)
+    ds._plan._optimize()
+    assert ds._plan._stages == [], ds._plan._stages
+    assert sorted(r["two"] for r in ds.take()) == ["c", "d", "e", "f"]
+
+    # Results are the same with pushdown disabled.
+    context = DatasetContext.get_current()
+    try:
+        context.optimize_read_pushdown = False
+        ds = ray.data.read_parquet(str(tmp_path))
+        ds = ds.filter(pa.dataset.field("one") > 2).select_columns(["two"])
+        assert sorted(r["two"] for r in ds.take()) == ["c", "d", "e", "f"]
+    finally:
+        context.optimize_read_pushdown = True
+
+
+def test_select_columns(ray_start_regular_shared):
+    ds = ray.data.from_pandas(pd.DataFrame({"a": [1, 2], "b": [3, 4], "c": [5, 6]}))
+    assert ds.select_columns(["c", "a"]).take() == [
+        {"c": 5, "a": 1},
+        {"c": 6, "a": 2},
+    ]
+    assert ds.filter(pa.dataset.field("b") > 3).take() == [{"a": 2, "b": 4, "c": 6}]
+    with pytest.raises(ValueError):
+        ray.data.range(10).select_columns(["a"]).take()
+
+
 def test_parquet_read_partitioned_explicit(ray_start_regular_shared, tmp_path):
     df = pd.DataFrame(
         {"one": [1, 1, 1, 3, 3, 3], "two": ["a", "b", "c", "e", "f", "g"]}
@@ -511,6 +577,34 @@ def test_parquet_read_parallel_meta_fetch(ray_start_regular_shared, fs, data_pat
     assert sorted(values) == list(range(3 * num_dfs))
 
 
+def test_read_autodetect_parallelism(ray_start_regular_shared, tmp_path):
+    ctx = DatasetContext.get_current()
+    original = (ctx.read_target_max_block_size, ctx.min_parallelism)
+    num_files = 20
+    for i in range(num_files):
+        df = pd.DataFrame({"one": list(range(3 * i, 3 * (i + 1)))})
+        pq.write_table(pa.Table.from_pandas(df), os.path.join(tmp_path, f"{i}.parquet"))
+    try:
+        # Small reads are coalesced, down to two tasks per CPU.
+        ds = ray.data.read_parquet(str(tmp_path))
+        assert ds.num_blocks() == 2
+        assert len(ds.input_files()) == num_files
+        assert sorted(r["one"] for r in ds.take_all()) == list(range(3 * num_files))
+
+        # An explicit parallelism is kept.
+        assert ray.data.read_parquet(str(tmp_path), parallelism=5).num_blocks() == 5
+
+        # Large reads are split further, up to the partitioning of the data.
+        ctx.min_parallelism = 10
+        ctx.read_target_max_block_size = 10
+        assert ray.data.read_parquet(str(tmp_path)).num_blocks() == num_files
+        ds = ray.data.read_datasource(RangeDatasource(), n=1000)
+        assert ds.num_blocks() == 800
+        assert ds.take_all() == list(range(1000))
+    finally:
+        ctx.read_target_max_block_size, ctx.min_parallelism = original
+
+
 @pytest.mark.parametrize(
     "fs,data_path,endpoint_url",
     [
@@ -550,6 +644,101 @@ def test_parquet_write(ray_start_regular_shared, fs, data_path, endpoint_url):
         fs.delete_dir(_unwrap_protocol(path))
 
 
+def test_parquet_write_rolling(ray_start_regular_shared, tmp_path):
+    ds = ray.data.range_arrow(1000, parallelism=20)
+    ds._set_uuid("data")
+    block_size = ds.size_bytes() // 20
+
+    def file_sizes(path):
+        return [
+            os.path.getsize(os.path.join(path, f)) for f in sorted(os.listdir(path))
+        ]
+
+    # Small blocks are coalesced into fewer files.
+    path = os.path.join(tmp_path, "coalesced")
+    ds.write_parquet(path, target_file_size_bytes=5 * block_size)
+    files = sorted(os.listdir(path))
+    assert len(files) < 20, files
+    assert files[0] == "data_000000_000000.parquet"
+    assert sorted(ray.data.read_parquet(path).to_pandas()["value"]) == list(range(1000))
+
+    # Large blocks are split over several files, which are rolled by the bytes
+    # written to them.
+    path = os.path.join(tmp_path, "split")
+    target = 4 * block_size
+    ds.repartition(1).write_parquet(path, target_file_size_bytes=target)
+    sizes = file_sizes(path)
+    assert len(sizes) > 2, sizes
+    assert all(target / 2 <= size <= 2 * target for size in sizes[:-1]), sizes
+    assert sorted(ray.data.read_parquet(path).to_pandas()["value"]) == list(range(1000))
+
+    # Formats that are written at once when a file is complete are rolled by
+    # the written size of the previous files.
+    path = os.path.join(tmp_path, "json")
+    ds.repartition(1).write_json(path, target_file_size_bytes=target)
+    sizes = file_sizes(path)
+    assert all(size <= 2 * target for size in sizes), sizes
+    assert all(target / 2 <= size for size in sizes[1:-1]), sizes
+    assert ray.data.read_json(path).count() == 1000
+
+    # The CSV header is only written once per file.
+    path = os.path.join(tmp_path, "csv")
+    ds.write_csv(path, target_file_size_bytes=2 * block_size)
+    assert ray.data.read_csv(path).count() == 1000
+
+    # Streaming writes roll the files of each window.
+    ctx = DatasetContext.get_current()
+    ctx.use_streaming_executor = True
+    ctx.streaming_max_blocks_in_flight = 5
+    try:
+        ds = ray.data.range_arrow(1000, parallelism=20)._experimental_lazy()
+        ds = ds.map_batches(lambda df: df)
+        ds._set_uuid("data")
+        path = os.path.join(tmp_path, "streaming")
+        ds.write_parquet(path, target_file_size_bytes=target)
+        assert not ds._plan.has_computed_output()
+        files = os.listdir(path)
+        # The files are named {uuid}_{window}_{task}_{file}.parquet.
+        assert len({f.split("_")[1] for f in files}) == 4, files
+        result = ray.data.read_parquet(path).to_pandas()["value"]
+        assert sorted(result) == list(range(1000))
+    finally:
+        ctx.use_streaming_executor = False
+        ctx.streaming_max_blocks_in_flight = None
+
+
+def test_parquet_write_partitioned(ray_start_regular_shared, tmp_path):
+    df1 = pd.DataFrame({"one": [1, 2, 1], "two": ["a", "b", None], "v": [1, 2, 3]})
+    df2 = pd.DataFrame({"one": [2, 2, 3], "two": ["b", "b", "c"], "v": [4, 5, 6]})
+    ds = ray.data.from_pandas([df1, df2])
+    ds._set_uuid("data")
+    path = os.path.join(tmp_path, "partitioned")
+    ds.write_parquet(path, partition_cols=["one", "two"])
+    assert sorted(os.listdir(path)) == ["one=1", "one=2", "one=3"]
+    assert sorted(os.listdir(os.path.join(path, "one=1"))) == [
+        "two=__HIVE_DEFAULT_PARTITION__",
+        "two=a",
+    ]
+    # One file per partition and write task, without the partition columns.
+    files = os.listdir(os.path.join(path, "one=2", "two=b"))
+    assert sorted(files) == [
+        "data_000000_000000.parquet",
+        "data_000001_000000.parquet",
+    ]
+    table = pq.read_table(os.path.join(path, "one=2", "two=b", files[0]))
+    assert table.column_names == ["v"]
+
+    # The partitions are read back from the directory names.
+    result = ray.data.read_parquet(path).to_pandas()
+    assert sorted(result["v"]) == [1, 2, 3, 4, 5, 6]
+    assert sorted(result[result["one"] == 2]["v"]) == [2, 4, 5]
+
+    with pytest.raises(ValueError):
+        ds.write_parquet(path, partition_cols=["missing"])
+    with pytest.raises(ValueError):
+        ray.data.range(10).write_csv(path, partition_cols=["value"])
+
+
 @pytest.mark.parametrize(
     "fs,data_path,endpoint_url",
     [
@@ -865,6 +1054,79 @@ def test_write_datasource(ray_start_regular_shared, pipelined):
     assert ray.get(output.data_sink.get_rows_written.remote()) == 10
 
 
+def test_write_streaming(ray_start_regular_shared, tmp_path):
+    ctx = DatasetContext.get_current()
+    ctx.use_streaming_executor = True
+    ctx.streaming_max_blocks_in_flight = 2
+    try:
+        ds = ray.data.range(10, parallelism=5)._experimental_lazy()
+        ds = ds.map(lambda x: x + 1)
+        output = DummyOutputDatasource()
+        ds.write_datasource(output)
+        assert output.num_ok == 1
+        assert ray.get(output.data_sink.get_rows_written.remote()) == 10
+        assert not ds._plan.has_computed_output()
+
+        ds = ray.data.range_arrow(10, parallelism=5)._experimental_lazy()
+        ds = ds.map_batches(lambda df: df * 2)
+        ds.write_parquet(str(tmp_path))
+        assert not ds._plan.has_computed_output()
+        files = os.listdir(tmp_path)
+        assert len(files) == 5
+        # The 5 blocks are written in 3 windows of at most 2 blocks, each with
+        # its own dataset_uuid.
+        assert len({f.rsplit("_", 1)[0] for f in files}) == 3, files
+        values = ray.data.read_parquet(str(tmp_path)).to_pandas()["value"]
+        assert sorted(values) == list(range(0, 20, 2))
+    finally:
+        ctx.use_streaming_executor = False
+        ctx.streaming_max_blocks_in_flight = None
+
+
+@pytest.mark.parametrize(
+    "fs,data_path",
+    [
+        (None, lazy_fixture("local_path")),
+        (lazy_fixture("local_fs"), lazy_fixture("local_path")),
+        (lazy_fixture("s3_fs"), lazy_fixture("s3_path")),
+    ],
+)
+def test_arrow_ipc_roundtrip(ray_start_regular_shared, fs, data_path):
+    df = pd.DataFrame({"one": [1, 2, 3], "two": ["a", "b", "c"]})
+    df2 = pd.DataFrame({"one": [4, 5, 6], "two": ["e", "f", "g"]})
+    ds = ray.data.from_pandas([df, df2])
+    ds._set_uuid("data")
+    ds.write_arrow_ipc(data_path, filesystem=fs)
+    file_path = os.path.join(data_path, "data_000000.arrow")
+    assert ray.data.read_arrow_ipc(file_path, filesystem=fs).to_pandas().equals(df)
+
+    ds2 = ray.data.read_arrow_ipc(data_path, parallelism=2, filesystem=fs)
+    assert ds2._dataset_format() == "arrow"
+    assert pd.concat([df, df2], ignore_index=True).equals(ds2.to_pandas())
+    # Test metadata ops.
+    for block, meta in ds2._plan.execute().get_blocks_with_metadata():
+        assert BlockAccessor.for_block(ray.get(block)).size_bytes() == meta.size_bytes
+
+
+def test_arrow_ipc_read(ray_start_regular_shared, tmp_path):
+    # A file with several record batches.
+    table = pa.table({"one": list(range(10))})
+    path = os.path.join(tmp_path, "batches.arrow")
+    with pa.ipc.new_file(path, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=3):
+            writer.write_batch(batch)
+    ds = ray.data.read_arrow_ipc(path)
+    assert [r["one"] for r in ds.take_all()] == list(range(10))
+
+    # An empty file keeps its schema.
+    path = os.path.join(tmp_path, "empty.arrow")
+    with pa.ipc.new_file(path, table.schema) as writer:
+        pass
+    ds = ray.data.read_arrow_ipc(path)
+    assert ds.count() == 0
+    assert ds.schema() == table.schema
+
+
 @pytest.mark.parametrize(
     "fs,data_path,endpoint_url",
     [
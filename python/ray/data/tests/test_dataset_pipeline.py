@@ -242,6 +242,29 @@ def test_iter_batches_batch_across_windows(ray_start_regular_shared):
     assert len(batches[-1]) == 3
 
 
+def test_iter_batches_local_shuffle(ray_start_regular_shared):
+    pipe = ray.data.range(27, parallelism=9).window(blocks_per_window=3)
+    batches = list(pipe.iter_batches(batch_size=4, local_shuffle_buffer_size=10))
+    assert [len(b) for b in batches] == [4] * 6 + [3]
+    values = [x for b in batches for x in b]
+    assert values != list(range(27))
+    assert sorted(values) == list(range(27))
+
+
+def test_randomize_block_order_each_window(ray_start_regular_shared):
+    pipe = ray.data.range(20, parallelism=10).repeat(3)
+    pipe = pipe.randomize_block_order_each_window()
+    epochs = [list(ds.iter_rows()) for ds in pipe.iter_epochs()]
+    assert len(epochs) == 3
+    for epoch in epochs:
+        assert sorted(epoch) == list(range(20))
+        # The blocks are shuffled, not the rows within the blocks.
+        blocks = [epoch[i : i + 2] for i in range(0, 20, 2)]
+        assert all(b[0] % 2 == 0 and b[1] == b[0] + 1 for b in blocks)
+    # Each epoch gets a different block order.
+    assert len({tuple(epoch) for epoch in epochs}) > 1
+
+
 def test_iter_datasets(ray_start_regular_shared):
     pipe = ray.data.range(10).window(blocks_per_window=2)
     ds = list(pipe.iter_datasets())
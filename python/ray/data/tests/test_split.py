@@ -356,3 +356,66 @@ def test_split_hints(ray_start_regular_shared):
         ["n1", "n2", "n0"],
         [range(200, 301), range(100, 200), list(range(0, 50)) + list(range(50, 100))],
     )
+
+
+@pytest.mark.parametrize(
+    "block_sizes,block_node_ids,actor_node_ids",
+    [
+        ([3, 6, 3], ["n1", "n2", "n1"], ["n1", "n2", "n3"]),
+        ([5, 5, 5, 5], ["n1", "n1", "n1", "n1"], ["n1", "n2"]),
+        ([4, 7, 2, 9], ["n2", None, "n1", "n2"], ["n1", "n2", None]),
+        ([10, 1], ["n1", "n2"], ["n2", "n1", "n1"]),
+    ],
+)
+def test_equal_split_hints(
+    ray_start_regular_shared, block_sizes, block_node_ids, actor_node_ids
+):
+    @ray.remote
+    class Actor(object):
+        def __init__(self):
+            pass
+
+    blocks = []
+    metadata = []
+    total_rows = 0
+    for block_size in block_sizes:
+        block = list(range(total_rows, total_rows + block_size))
+        blocks.append(ray.put(block))
+        metadata.append(BlockAccessor.for_block(block).get_metadata(None, None))
+        total_rows += block_size
+    ds = Dataset(
+        ExecutionPlan(BlockList(blocks, metadata), DatasetStats.TODO()), 0, False
+    )
+    actors = [Actor.remote() for _ in actor_node_ids]
+    with patch("ray.experimental.get_object_locations") as location_mock:
+        with patch("ray.state.actors") as state_mock:
+            location_mock.return_value = {
+                b: {"node_ids": [node_id]}
+                for b, node_id in zip(blocks, block_node_ids)
+                if node_id
+            }
+            state_mock.return_value = {
+                actor._actor_id.hex(): {"Address": {"NodeID": node_id}}
+                for actor, node_id in zip(actors, actor_node_ids)
+            }
+            splits = ds.split(len(actors), equal=True, locality_hints=actors)
+
+    rows_per_split = total_rows // len(actors)
+    assert [split.count() for split in splits] == [rows_per_split] * len(actors)
+    split_rows = [split.take(total_rows) for split in splits]
+    all_rows = [row for rows in split_rows for row in rows]
+    assert len(set(all_rows)) == len(all_rows)
+
+    # Each split gets as many rows as possible from blocks on its node.
+    row_node_ids = [
+        node_id
+        for block_size, node_id in zip(block_sizes, block_node_ids)
+        for _ in range(block_size)
+    ]
+    for rows, node_id in zip(split_rows, actor_node_ids):
+        if node_id is None:
+            continue
+        num_local_rows = sum(1 for row in rows if row_node_ids[row] == node_id)
+        num_actors_on_node = actor_node_ids.count(node_id)
+        available = row_node_ids.count(node_id) // num_actors_on_node
+        assert num_local_rows >= min(rows_per_split, available)
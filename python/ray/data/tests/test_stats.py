@@ -1,3 +1,5 @@
+import json
+import os
 import pytest
 import re
 
@@ -51,6 +53,45 @@ Dataset iterator time breakdown:
     )
 
 
+def test_dataset_stats_dict(ray_start_regular_shared, tmp_path):
+    context = DatasetContext.get_current()
+    context.optimize_fuse_stages = True
+    ds = ray.data.range(1000, parallelism=10)
+    ds = ds.map_batches(lambda x: x)
+    ds = ds.map(lambda x: x)
+    for batch in ds.iter_batches():
+        pass
+    stats = ds.stats_dict()
+    assert [s["name"] for s in stats["stages"]] == ["read->map_batches", "map"]
+    for stage in stats["stages"]:
+        assert stage["num_blocks"] == 10
+        assert stage["num_blocks_executed"] == 10
+        assert stage["num_rows"]["total"] == 1000
+        assert stage["wall_time_s"]["total"] > 0
+        assert sum(n["num_blocks"] for n in stage["nodes"].values()) == 10
+        assert len(stage["blocks"]) == 10
+        assert all(b["start_time_s"] is not None for b in stage["blocks"])
+    assert stats["iter"]["get_s"] > 0
+    assert stats["iter"]["total_s"] > 0
+
+    events = ds.timeline()
+    stage_events = [e for e in events if e["cat"] == "stage"]
+    assert len(stage_events) == 20
+    assert sum(e["name"].endswith(" read->map_batches") for e in stage_events) == 10
+    assert sum(e["name"].endswith(" map") for e in stage_events) == 10
+    assert {e["name"] for e in events if e["cat"] == "iter"} >= {
+        "iter_wait",
+        "iter_get",
+        "iter_user",
+    }
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+    path = os.path.join(tmp_path, "timeline.json")
+    ds.timeline(path)
+    with open(path) as f:
+        assert len(json.load(f)) == len(events)
+
+
 def test_dataset_stats_shuffle(ray_start_regular_shared):
     context = DatasetContext.get_current()
     context.optimize_fuse_stages = True
@@ -203,6 +244,30 @@ DatasetPipeline iterator time breakdown:
     )
 
 
+def test_dataset_pipeline_stats_dict(ray_start_regular_shared):
+    context = DatasetContext.get_current()
+    context.optimize_fuse_stages = True
+    ds = ray.data.range(1000, parallelism=10)
+    ds = ds.map_batches(lambda x: x)
+    pipe = ds.repeat(5).map(lambda x: x)
+    for batch in pipe.iter_batches():
+        pass
+    stats = pipe.stats_dict()
+    assert [w["window"] for w in stats["windows"]] == [2, 3, 4]
+    assert len(stats["wait_time_s"]) == 5
+    assert stats["iter"]["ds_wait_s"] > 0
+    for window in stats["windows"]:
+        assert window["stages"][-1]["name"] == "map"
+        assert window["stages"][-1]["num_rows"]["total"] == 1000
+
+    events = pipe.timeline()
+    # The read is shared by all windows, so it's only in the timeline once.
+    stage_names = [e["name"] for e in events if e["cat"] == "stage"]
+    assert sum(name.endswith(" read->map_batches") for name in stage_names) == 10
+    assert sum(name.endswith(" map") for name in stage_names) == 30
+    assert "iter_ds_wait" in {e["name"] for e in events}
+
+
 def test_dataset_pipeline_split_stats_basic(ray_start_regular_shared):
     context = DatasetContext.get_current()
     context.optimize_fuse_stages = True
@@ -4,7 +4,10 @@ import numpy as np
 import pandas as pd
 import torch
 
-from ray.ml.utils.torch_utils import convert_pandas_to_torch_tensor
+from ray.ml.utils.torch_utils import (
+    convert_numpy_to_torch_tensor,
+    convert_pandas_to_torch_tensor,
+)
 
 data_batch = pd.DataFrame({"A": [1, 2, 3], "B": [4, 5, 6]})
 
@@ -73,6 +76,37 @@ class TestConvertPandasToTorch:
             )
 
 
+class TestConvertNumpyToTorch:
+    numpy_batch = {
+        "A": np.array([1, 2, 3]),
+        "B": np.array([4, 5, 6]),
+        "T": np.arange(12).reshape(3, 2, 2),
+    }
+
+    def test_matches_pandas(self):
+        batch = {col: data_batch[col].to_numpy() for col in data_batch.columns}
+        for columns in [None, ["A"], [["A"], ["B"]]]:
+            tensors = convert_numpy_to_torch_tensor(batch, columns=columns)
+            expected = convert_pandas_to_torch_tensor(data_batch, columns=columns)
+            if isinstance(expected, list):
+                assert all(t.equal(e) for t, e in zip(tensors, expected))
+            else:
+                assert tensors.equal(expected)
+
+    def test_single_tensor_column(self):
+        tensor = convert_numpy_to_torch_tensor(self.numpy_batch, columns=["T"])
+        assert tensor.size() == (3, 2, 2)
+        assert np.array_equal(tensor.numpy(), self.numpy_batch["T"])
+
+    def test_tensor_columns_flattened(self):
+        tensor = convert_numpy_to_torch_tensor(
+            self.numpy_batch, columns=["A", "T"], column_dtypes=torch.float
+        )
+        assert tensor.size() == (3, 5)
+        assert tensor.dtype == torch.float
+        assert np.array_equal(tensor[:, 1:].numpy(), np.arange(12).reshape(3, 4))
+
+
 if __name__ == "__main__":
     import sys
 
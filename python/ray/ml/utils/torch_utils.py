@@ -1,5 +1,6 @@
-from typing import Optional, Union, List
+from typing import Callable, Dict, Optional, Union, List
 
+import numpy as np
 import pandas as pd
 import torch
 
@@ -35,35 +36,80 @@ def convert_pandas_to_torch_tensor(
 
     """
 
+    return _convert_columns_to_torch_tensor(
+        lambda col: data_batch[col].values,
+        list(data_batch.columns),
+        columns,
+        column_dtypes,
+    )
+
+
+def convert_numpy_to_torch_tensor(
+    data_batch: Dict[str, np.ndarray],
+    columns: Optional[Union[List[str], List[List[str]]]] = None,
+    column_dtypes: Optional[Union[torch.dtype, List[torch.dtype]]] = None,
+) -> Union[torch.Tensor, List[torch.Tensor]]:
+    """Converts a batch of column ndarrays to a torch Tensor or list of
+    torch Tensors.
+
+    Like ``convert_pandas_to_torch_tensor()``, but tensor columns are
+    supported: they are flattened to (N, prod(shape)), and if a single tensor
+    column is selected, its tensor of shape (N, *shape) is returned as is,
+    sharing memory with the ndarray when the dtype doesn't change.
+
+    Args:
+        data_batch (Dict[str, numpy.ndarray]): The ndarrays of the columns
+            to convert to a torch tensor.
+        columns (Optional[Union[List[str], List[List[str]]]):
+            The names of the columns to include in the torch tensor. If this
+            arg is a List[List[str]], then the return type will be a List of
+            tensors. If None, then use all columns in the ``data_batch``.
+        column_dtype (Optional[Union[torch.dtype, List[torch.dtype]): The
+            torch dtype to use for the tensor. If set to None,
+            then automatically infer the dtype.
+
+    Returns:
+        Either a torch tensor or a list of tensors, as for
+        ``convert_pandas_to_torch_tensor()``.
+    """
+    return _convert_columns_to_torch_tensor(
+        data_batch.__getitem__, list(data_batch), columns, column_dtypes
+    )
+
+
+def _convert_columns_to_torch_tensor(
+    get_column: Callable[[str], np.ndarray],
+    all_columns: List[str],
+    columns: Optional[Union[List[str], List[List[str]]]],
+    column_dtypes: Optional[Union[torch.dtype, List[torch.dtype]]],
+) -> Union[torch.Tensor, List[torch.Tensor]]:
     multi_input = columns and (isinstance(columns[0], (list, tuple)))
 
-    if not multi_input and column_dtypes and type(column_dtypes) != torch.dtype:
+    if not multi_input and column_dtypes and not isinstance(column_dtypes, torch.dtype):
         raise TypeError(
             "If `columns` is a list of strings, "
             "`column_dtypes` must be None or a single `torch.dtype`."
             f"Got {type(column_dtypes)} instead."
         )
 
-    columns = columns if columns else []
-
     def get_tensor_for_columns(columns, dtype):
-        feature_tensors = []
+        columns = columns or all_columns
+        if len(columns) == 1 and get_column(columns[0]).ndim > 1:
+            return torch.as_tensor(get_column(columns[0]), dtype=dtype)
 
-        if columns:
-            batch = data_batch[columns]
-        else:
-            batch = data_batch
-
-        for col in batch.columns:
-            col_vals = batch[col].values
-            t = torch.as_tensor(col_vals, dtype=dtype)
-            t = t.view(-1, 1)
+        feature_tensors = []
+        for col in columns:
+            t = torch.as_tensor(get_column(col), dtype=dtype)
+            if t.ndim > 1:
+                t = t.reshape(len(t), -1)
+            else:
+                t = t.view(-1, 1)
             feature_tensors.append(t)
 
         return torch.cat(feature_tensors, dim=1)
 
     if multi_input:
-        if type(column_dtypes) not in [list, tuple]:
+        if not isinstance(column_dtypes, (list, tuple)):
             column_dtypes = [column_dtypes] * len(columns)
         return [
             get_tensor_for_columns(columns=subcolumns, dtype=dtype)
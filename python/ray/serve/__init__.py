@@ -10,6 +10,7 @@ try:
     )
     from ray.serve.batching import batch
     from ray.serve.config import HTTPOptions
+    from ray.serve.multiplex import get_multiplexed_model_id, multiplexed
 except ModuleNotFoundError as e:
     e.msg += (
         '. You can run `pip install "ray[serve]"` to install all Ray Serve'
@@ -33,4 +34,6 @@ __all__ = [
     "deployment",
     "get_deployment",
     "list_deployments",
+    "multiplexed",
+    "get_multiplexed_model_id",
 ]
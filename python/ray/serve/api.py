@@ -37,6 +37,7 @@ from ray.serve.config import (
     DeploymentConfig,
     HTTPOptions,
     ReplicaConfig,
+    ResponseCacheConfig,
 )
 from ray.serve.constants import (
     DEFAULT_CHECKPOINT_PATH,
@@ -48,7 +49,7 @@ from ray.serve.constants import (
 from ray.serve.controller import ServeController
 from ray.serve.exceptions import RayServeException
 from ray.serve.handle import RayServeHandle, RayServeSyncHandle
-from ray.serve.http_util import ASGIHTTPSender, make_fastapi_class_based_view
+from ray.serve.http_util import BoundASGIApp, make_fastapi_class_based_view
 from ray.serve.utils import (
     LoggingContext,
     ensure_serialization_context,
@@ -190,6 +191,10 @@ class Client:
         instance.
         """
         if ray.is_initialized() and not self._shutdown:
+            for handle in self.handle_cache.values():
+                handle.router.shutdown()
+            self.handle_cache.clear()
+
             ray.get(self._controller.shutdown.remote())
             self._wait_for_deployments_shutdown()
 
@@ -861,13 +866,9 @@ def ingress(app: Union["FastAPI", "APIRouter", Callable]):
                     await self._serve_asgi_lifespan.startup()
 
             async def __call__(self, request: Request):
-                sender = ASGIHTTPSender()
-                await self._serve_app(
-                    request.scope,
-                    request.receive,
-                    sender,
-                )
-                return sender.build_asgi_response()
+                # The replica runs the app, so that it can stream the
+                # response to the HTTP proxy.
+                return BoundASGIApp(self._serve_app, request.scope, request.receive)
 
             # NOTE: __del__ must be async so that we can run asgi shutdown
             # in the same event loop.
@@ -1118,6 +1119,8 @@ class Deployment:
         _graceful_shutdown_timeout_s: Optional[float] = None,
         _health_check_period_s: Optional[float] = None,
         _health_check_timeout_s: Optional[float] = None,
+        _load_balancing_policy: Optional[str] = None,
+        _response_cache_config: Optional[Union[Dict, ResponseCacheConfig]] = None,
     ) -> "Deployment":
         """Return a copy of this deployment with updated options.
 
@@ -1169,6 +1172,12 @@ class Deployment:
         if _health_check_timeout_s is not None:
             new_config.health_check_timeout_s = _health_check_timeout_s
 
+        if _load_balancing_policy is not None:
+            new_config.load_balancing_policy = _load_balancing_policy
+
+        if _response_cache_config is not None:
+            new_config.response_cache_config = _response_cache_config
+
         return Deployment(
             func_or_class,
             name,
@@ -1236,6 +1245,8 @@ def deployment(
     _graceful_shutdown_timeout_s: Optional[float] = None,
     _health_check_period_s: Optional[float] = None,
     _health_check_timeout_s: Optional[float] = None,
+    _load_balancing_policy: Optional[str] = None,
+    _response_cache_config: Optional[Union[Dict, ResponseCacheConfig]] = None,
 ) -> Callable[[Callable], Deployment]:
     pass
 
@@ -1258,6 +1269,8 @@ def deployment(
     _graceful_shutdown_timeout_s: Optional[float] = None,
     _health_check_period_s: Optional[float] = None,
     _health_check_timeout_s: Optional[float] = None,
+    _load_balancing_policy: Optional[str] = None,
+    _response_cache_config: Optional[Union[Dict, ResponseCacheConfig]] = None,
 ) -> Callable[[Callable], Deployment]:
     """Define a Serve deployment.
 
@@ -1347,6 +1360,12 @@ def deployment(
     if _health_check_timeout_s is not None:
         config.health_check_timeout_s = _health_check_timeout_s
 
+    if _load_balancing_policy is not None:
+        config.load_balancing_policy = _load_balancing_policy
+
+    if _response_cache_config is not None:
+        config.response_cache_config = _response_cache_config
+
     def decorator(_func_or_class):
         return Deployment(
             _func_or_class,
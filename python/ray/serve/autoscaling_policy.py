@@ -1,10 +1,13 @@
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from dataclasses import dataclass
 import math
 
 from ray.serve.config import AutoscalingConfig
 from ray.serve.constants import CONTROL_LOOP_PERIOD_S
+from ray.serve.utils import import_attr
 
-from typing import List
+from typing import Deque, List, Optional, Tuple
 
 
 def calculate_desired_num_replicas(
@@ -51,6 +54,24 @@ def calculate_desired_num_replicas(
     return desired_num_replicas
 
 
+@dataclass
+class AutoscalingMetrics:
+    """Metrics of a deployment, besides the ongoing requests of its replicas,
+    that autoscaling policies may base their decisions on."""
+
+    # The time the metrics were collected at.
+    timestamp: float
+    # The number of queries queued in the routers of the deployment, waiting
+    # for a replica to be available.
+    num_queued_queries: float = 0.0
+    # The rate of requests sent to the deployment, in requests per second, or
+    # None if the routers haven't reported it.
+    arrival_rate: Optional[float] = None
+    # How long new replicas take to start and be ready to serve requests, or
+    # None if no replica start has been observed yet.
+    replica_startup_time_s: Optional[float] = None
+
+
 class AutoscalingPolicy:
     """Defines the interface for an autoscaling policy.
 
@@ -68,7 +89,10 @@ class AutoscalingPolicy:
 
     @abstractmethod
     def get_decision_num_replicas(
-        self, current_num_ongoing_requests: List[float], curr_target_num_replicas: int
+        self,
+        current_num_ongoing_requests: List[float],
+        curr_target_num_replicas: int,
+        metrics: Optional[AutoscalingMetrics] = None,
     ) -> int:
         """Make a decision to scale replicas.
 
@@ -77,6 +101,8 @@ class AutoscalingPolicy:
                 ongoing requests for each replica.
             curr_target_num_replicas (int): The number of replicas that the
                 deployment is currently trying to scale to.
+            metrics (Optional[AutoscalingMetrics]): Other metrics of the
+                deployment, if available.
 
         Returns:
             int: The new number of replicas to scale to.
@@ -119,15 +145,18 @@ class BasicAutoscalingPolicy(AutoscalingPolicy):
         self.decision_counter = 0
 
     def get_decision_num_replicas(
-        self, current_num_ongoing_requests: List[float], curr_target_num_replicas: int
+        self,
+        current_num_ongoing_requests: List[float],
+        curr_target_num_replicas: int,
+        metrics: Optional[AutoscalingMetrics] = None,
     ) -> int:
         if len(current_num_ongoing_requests) == 0:
             return curr_target_num_replicas
 
         decision_num_replicas = curr_target_num_replicas
 
-        desired_num_replicas = calculate_desired_num_replicas(
-            self.config, current_num_ongoing_requests
+        desired_num_replicas = self.get_desired_num_replicas(
+            current_num_ongoing_requests, curr_target_num_replicas, metrics
         )
         # Scale up.
         if desired_num_replicas > curr_target_num_replicas:
@@ -163,3 +192,153 @@ class BasicAutoscalingPolicy(AutoscalingPolicy):
             self.decision_counter = 0
 
         return decision_num_replicas
+
+    def get_desired_num_replicas(
+        self,
+        current_num_ongoing_requests: List[float],
+        curr_target_num_replicas: int,
+        metrics: Optional[AutoscalingMetrics],
+    ) -> int:
+        """Returns the number of replicas the load calls for, before the
+        upscale and downscale delays are applied."""
+        return calculate_desired_num_replicas(self.config, current_num_ongoing_requests)
+
+
+class QueueAwareAutoscalingPolicy(BasicAutoscalingPolicy):
+    """Like the basic policy, but counts the queries queued in the routers as
+    ongoing requests of the replicas.
+
+    The number of ongoing requests of a replica is capped by its
+    `max_concurrent_queries`, so under overload the basic policy sees at most
+    that many, however many queries wait for a replica. Spreading the queued
+    queries over the replicas makes the scale up proportional to the backlog.
+    The queries that the replicas still starting will take on (their target
+    number of ongoing requests) aren't counted, to not scale up twice for the
+    same backlog.
+    """
+
+    def get_desired_num_replicas(
+        self,
+        current_num_ongoing_requests: List[float],
+        curr_target_num_replicas: int,
+        metrics: Optional[AutoscalingMetrics],
+    ) -> int:
+        return calculate_desired_num_replicas(
+            self.config,
+            self._get_load(
+                current_num_ongoing_requests, curr_target_num_replicas, metrics
+            ),
+        )
+
+    def _get_load(
+        self,
+        current_num_ongoing_requests: List[float],
+        curr_target_num_replicas: int,
+        metrics: Optional[AutoscalingMetrics],
+    ) -> List[float]:
+        if metrics is None:
+            return current_num_ongoing_requests
+        num_running_replicas = len(current_num_ongoing_requests)
+        num_starting_replicas = max(0, curr_target_num_replicas - num_running_replicas)
+        num_queued_queries = (
+            metrics.num_queued_queries
+            - num_starting_replicas
+            * self.config.target_num_ongoing_requests_per_replica
+        )
+        if num_queued_queries <= 0:
+            return current_num_ongoing_requests
+        num_queued_per_replica = num_queued_queries / num_running_replicas
+        return [n + num_queued_per_replica for n in current_num_ongoing_requests]
+
+
+class PredictiveAutoscalingPolicy(QueueAwareAutoscalingPolicy):
+    """Scales ahead of demand by extrapolating the trend of the arrival rate.
+
+    The arrival rates observed during the last `look_back_period_s` are fit
+    with a line, which predicts the arrival rate once a replica started now
+    would be ready to serve: after the upscale delay and the measured replica
+    startup time. If the arrival rate is predicted to grow, the load (the
+    ongoing and queued requests, as in the queue aware policy) is scaled up
+    proportionally. A predicted decrease is ignored, scaling down waits for
+    the load to actually drop.
+    """
+
+    # The minimum number of arrival rates and time span to fit a trend on.
+    MIN_NUM_TREND_POINTS = 10
+    MIN_TREND_PERIOD_S = 1.0
+
+    def __init__(self, config: AutoscalingConfig):
+        super().__init__(config)
+        self._arrival_rates: Deque[Tuple[float, float]] = deque()
+
+    def get_desired_num_replicas(
+        self,
+        current_num_ongoing_requests: List[float],
+        curr_target_num_replicas: int,
+        metrics: Optional[AutoscalingMetrics],
+    ) -> int:
+        load = self._get_load(
+            current_num_ongoing_requests, curr_target_num_replicas, metrics
+        )
+        if metrics is not None and metrics.arrival_rate is not None:
+            self._record_arrival_rate(metrics.timestamp, metrics.arrival_rate)
+            horizon_s = self.config.upscale_delay_s
+            if metrics.replica_startup_time_s is not None:
+                horizon_s += metrics.replica_startup_time_s
+            growth = self.predict_arrival_rate_growth(metrics.timestamp, horizon_s)
+            load = [n * growth for n in load]
+        return calculate_desired_num_replicas(self.config, load)
+
+    def _record_arrival_rate(self, timestamp: float, arrival_rate: float) -> None:
+        self._arrival_rates.append((timestamp, arrival_rate))
+        window_start = timestamp - self.config.look_back_period_s
+        while self._arrival_rates[0][0] < window_start:
+            self._arrival_rates.popleft()
+
+    def predict_arrival_rate_growth(self, timestamp: float, horizon_s: float) -> float:
+        """Returns the ratio of the arrival rate predicted in `horizon_s` to
+        the current one, at least 1."""
+        if len(self._arrival_rates) < self.MIN_NUM_TREND_POINTS:
+            return 1.0
+        if (
+            self._arrival_rates[-1][0] - self._arrival_rates[0][0]
+            < self.MIN_TREND_PERIOD_S
+        ):
+            return 1.0
+
+        # Least squares fit of the arrival rate over time.
+        num_points = len(self._arrival_rates)
+        mean_t = sum(t for t, _ in self._arrival_rates) / num_points
+        mean_rate = sum(rate for _, rate in self._arrival_rates) / num_points
+        covariance = sum(
+            (t - mean_t) * (rate - mean_rate) for t, rate in self._arrival_rates
+        )
+        variance = sum((t - mean_t) ** 2 for t, _ in self._arrival_rates)
+        slope = covariance / variance
+
+        current_rate = mean_rate + slope * (timestamp - mean_t)
+        if slope <= 0 or current_rate <= 0:
+            return 1.0
+        return (current_rate + slope * horizon_s) / current_rate
+
+
+AUTOSCALING_POLICIES = {
+    "basic": BasicAutoscalingPolicy,
+    "queue_aware": QueueAwareAutoscalingPolicy,
+    "predictive": PredictiveAutoscalingPolicy,
+}
+
+
+def create_autoscaling_policy(config: AutoscalingConfig) -> AutoscalingPolicy:
+    """Create the policy named in the config, which may also be the import
+    path of an AutoscalingPolicy subclass."""
+    if config.policy in AUTOSCALING_POLICIES:
+        return AUTOSCALING_POLICIES[config.policy](config)
+    policy_cls = import_attr(config.policy)
+    if not (isinstance(policy_cls, type) and issubclass(policy_cls, AutoscalingPolicy)):
+        raise TypeError(
+            f"The autoscaling policy '{config.policy}' must be one of "
+            f"{list(AUTOSCALING_POLICIES)} or the import path of an "
+            "AutoscalingPolicy subclass."
+        )
+    return policy_cls(config)
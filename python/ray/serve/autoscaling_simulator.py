@@ -0,0 +1,259 @@
+"""Replays a recorded load against an autoscaling policy offline.
+
+The load is a trace of the arrival rate of requests over time, e.g. the rate
+of the `serve_num_router_requests` metric exported to Prometheus, as a CSV
+file with a `timestamp` and an `arrival_rate` column. The deployment is
+modeled as replicas serving up to `max_concurrent_queries` requests at a time,
+each taking `service_time_s`, with the excess queued in the routers, and new
+replicas only serving requests `replica_startup_time_s` after the policy
+decides to add them.
+
+Usage:
+    python -m ray.serve.autoscaling_simulator trace.csv --policy predictive \\
+        --service-time-s 0.05 --max-concurrent-queries 8 \\
+        --replica-startup-time-s 30 \\
+        --autoscaling-config '{"max_replicas": 20}'
+"""
+import bisect
+import csv
+from dataclasses import dataclass
+import json
+import math
+from typing import Dict, List, Optional, Tuple
+
+import click
+
+from ray.serve.autoscaling_policy import (
+    AutoscalingMetrics,
+    AutoscalingPolicy,
+    create_autoscaling_policy,
+)
+from ray.serve.config import AutoscalingConfig
+from ray.serve.constants import CONTROL_LOOP_PERIOD_S
+
+
+@dataclass
+class SimulationStep:
+    timestamp: float
+    arrival_rate: float
+    target_num_replicas: int
+    num_running_replicas: int
+    num_ongoing_requests: float
+    num_queued_queries: float
+
+
+@dataclass
+class SimulationResult:
+    steps: List[SimulationStep]
+    period_s: float
+
+    @property
+    def replica_seconds(self) -> float:
+        """The total time replicas were running (or starting), i.e. the cost."""
+        return sum(step.target_num_replicas for step in self.steps) * self.period_s
+
+    @property
+    def mean_queue_wait_s(self) -> float:
+        """The average time requests waited in the routers for a replica."""
+        num_requests = sum(step.arrival_rate for step in self.steps) * self.period_s
+        if num_requests == 0:
+            return 0.0
+        # Little's law: the average wait is the average queue length divided
+        # by the arrival rate.
+        queued_seconds = sum(step.num_queued_queries for step in self.steps)
+        return queued_seconds * self.period_s / num_requests
+
+    @property
+    def max_num_queued_queries(self) -> float:
+        return max((step.num_queued_queries for step in self.steps), default=0.0)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "replica_seconds": self.replica_seconds,
+            "mean_queue_wait_s": self.mean_queue_wait_s,
+            "max_num_queued_queries": self.max_num_queued_queries,
+            "max_num_replicas": max(
+                (step.target_num_replicas for step in self.steps), default=0
+            ),
+        }
+
+
+def load_trace(path: str) -> List[Tuple[float, float]]:
+    """Load a trace of (timestamp, arrival_rate) from a CSV file."""
+    with open(path) as f:
+        trace = [
+            (float(row["timestamp"]), float(row["arrival_rate"]))
+            for row in csv.DictReader(f)
+        ]
+    return sorted(trace)
+
+
+def _interpolate(trace: List[Tuple[float, float]], timestamp: float) -> float:
+    idx = bisect.bisect(trace, (timestamp, math.inf))
+    if idx == 0:
+        return trace[0][1]
+    if idx == len(trace):
+        return trace[-1][1]
+    (t0, rate0), (t1, rate1) = trace[idx - 1], trace[idx]
+    return rate0 + (rate1 - rate0) * (timestamp - t0) / (t1 - t0)
+
+
+def simulate_autoscaling(
+    policy: AutoscalingPolicy,
+    trace: List[Tuple[float, float]],
+    service_time_s: float,
+    max_concurrent_queries: int,
+    replica_startup_time_s: float,
+    initial_num_replicas: Optional[int] = None,
+    period_s: float = CONTROL_LOOP_PERIOD_S,
+) -> SimulationResult:
+    """Run the policy against the arrival rates of the trace.
+
+    The policy is called every `period_s`, like in the controller, with the
+    current number of ongoing requests of each replica and the current
+    queued queries and arrival rate (the controller averages them over
+    recent metrics instead).
+
+    Args:
+        policy (AutoscalingPolicy): The policy to simulate.
+        trace (List[Tuple[float, float]]): The arrival rate of requests over
+            time, as (timestamp, arrival_rate) sorted by timestamp. The
+            arrival rate is interpolated linearly between the points.
+        service_time_s (float): How long each request takes.
+        max_concurrent_queries (int): How many requests each replica serves
+            at a time.
+        replica_startup_time_s (float): How long new replicas take to start.
+        initial_num_replicas (Optional[int]): The number of running replicas
+            at the start of the trace, defaults to `min_replicas`.
+        period_s (float): The period of the simulation and the decisions.
+
+    Returns:
+        SimulationResult: The state of the deployment at each period.
+    """
+    if len(trace) == 0:
+        raise ValueError("The trace is empty.")
+
+    config = policy.config
+    if initial_num_replicas is None:
+        initial_num_replicas = config.min_replicas
+    num_running_replicas = initial_num_replicas
+    target_num_replicas = initial_num_replicas
+    # The times the starting replicas will be running at.
+    replica_ready_times: List[float] = []
+    num_ongoing_requests = 0.0
+    num_queued_queries = 0.0
+    completion_ratio = 1 - math.exp(-period_s / service_time_s)
+
+    steps = []
+    timestamp = trace[0][0]
+    while timestamp <= trace[-1][0]:
+        arrival_rate = _interpolate(trace, timestamp)
+
+        while replica_ready_times and replica_ready_times[0] <= timestamp:
+            replica_ready_times.pop(0)
+            num_running_replicas += 1
+
+        # Each ongoing request completes after service_time_s on average.
+        num_ongoing_requests -= num_ongoing_requests * completion_ratio
+        num_queued_queries += arrival_rate * period_s
+        capacity = num_running_replicas * max_concurrent_queries
+        num_assigned = max(
+            0.0, min(num_queued_queries, capacity - num_ongoing_requests)
+        )
+        num_ongoing_requests += num_assigned
+        num_queued_queries -= num_assigned
+        if num_ongoing_requests > capacity:
+            # Replicas were stopped, their requests are queued again.
+            num_queued_queries += num_ongoing_requests - capacity
+            num_ongoing_requests = capacity
+
+        if num_running_replicas > 0:
+            decision_num_replicas = policy.get_decision_num_replicas(
+                current_num_ongoing_requests=[
+                    num_ongoing_requests / num_running_replicas
+                ]
+                * num_running_replicas,
+                curr_target_num_replicas=target_num_replicas,
+                metrics=AutoscalingMetrics(
+                    timestamp=timestamp,
+                    num_queued_queries=num_queued_queries,
+                    arrival_rate=arrival_rate,
+                    replica_startup_time_s=replica_startup_time_s,
+                ),
+            )
+            if decision_num_replicas > target_num_replicas:
+                replica_ready_times.extend(
+                    [timestamp + replica_startup_time_s]
+                    * (decision_num_replicas - target_num_replicas)
+                )
+            elif decision_num_replicas < target_num_replicas:
+                # Stop the starting replicas first, then running ones.
+                num_to_stop = target_num_replicas - decision_num_replicas
+                num_starting_to_stop = min(num_to_stop, len(replica_ready_times))
+                del replica_ready_times[
+                    len(replica_ready_times) - num_starting_to_stop :
+                ]
+                num_running_replicas -= num_to_stop - num_starting_to_stop
+            target_num_replicas = decision_num_replicas
+
+        steps.append(
+            SimulationStep(
+                timestamp=timestamp,
+                arrival_rate=arrival_rate,
+                target_num_replicas=target_num_replicas,
+                num_running_replicas=num_running_replicas,
+                num_ongoing_requests=num_ongoing_requests,
+                num_queued_queries=num_queued_queries,
+            )
+        )
+        timestamp += period_s
+
+    return SimulationResult(steps=steps, period_s=period_s)
+
+
+@click.command()
+@click.argument("trace_path")
+@click.option("--policy", default="basic", help="The autoscaling policy.")
+@click.option(
+    "--autoscaling-config",
+    default="{}",
+    help="The other options of the autoscaling config, as JSON.",
+)
+@click.option("--service-time-s", type=float, required=True)
+@click.option("--max-concurrent-queries", type=int, default=100)
+@click.option("--replica-startup-time-s", type=float, default=0.0)
+@click.option("--initial-num-replicas", type=int, default=None)
+@click.option(
+    "--output-path", default=None, help="Write the state at each step as CSV."
+)
+def main(
+    trace_path: str,
+    policy: str,
+    autoscaling_config: str,
+    service_time_s: float,
+    max_concurrent_queries: int,
+    replica_startup_time_s: float,
+    initial_num_replicas: Optional[int],
+    output_path: Optional[str],
+):
+    config = AutoscalingConfig(policy=policy, **json.loads(autoscaling_config))
+    result = simulate_autoscaling(
+        create_autoscaling_policy(config),
+        load_trace(trace_path),
+        service_time_s=service_time_s,
+        max_concurrent_queries=max_concurrent_queries,
+        replica_startup_time_s=replica_startup_time_s,
+        initial_num_replicas=initial_num_replicas,
+    )
+
+    if output_path is not None:
+        with open(output_path, "w") as f:
+            writer = csv.DictWriter(f, fieldnames=SimulationStep.__annotations__)
+            writer.writeheader()
+            for step in result.steps:
+                writer.writerow(step.__dict__)
+    print(json.dumps(result.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
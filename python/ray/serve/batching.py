@@ -1,6 +1,7 @@
 import asyncio
 from functools import wraps
 from inspect import iscoroutinefunction
+import math
 import time
 from typing import Any, Callable, Dict, List, Optional, overload, Tuple, TypeVar
 from dataclasses import dataclass
@@ -8,6 +9,19 @@ from dataclasses import dataclass
 
 from ray._private.signature import extract_signature, flatten_args, recover_args
 from ray.serve.exceptions import RayServeException
+from ray.serve.utils import logger
+from ray.util import metrics
+
+# Weight of each new batch latency sample in the moving averages.
+ADAPTIVE_BATCH_LATENCY_SMOOTHING = 0.2
+# Time constant of the moving average of the request arrival rate.
+ADAPTIVE_BATCH_ARRIVAL_RATE_WINDOW_S = 1.0
+# Batches are sized to process requests this many times faster than they
+# arrive, so that the queue doesn't build up.
+ADAPTIVE_BATCH_THROUGHPUT_HEADROOM = 1.2
+# Number of standard deviations above the mean batch latency to estimate its
+# 99th percentile, assuming a normal distribution.
+P99_NUM_STDDEVS = 2.33
 
 
 @dataclass
@@ -42,12 +56,150 @@ def _batch_args_kwargs(
     return recover_args(batched_flattened_args)
 
 
+class _AdaptiveBatchSizer:
+    """Picks the batch size and wait timeout of a batch queue to maximize
+    throughput while meeting a target latency.
+
+    The latency of a request is modeled as the time it waits for its batch
+    to be formed, plus the execution of the batch already running when the
+    batch is formed, plus the execution of its own batch. The 99th
+    percentile of the execution latency is tracked for each batch size, and
+    interpolated linearly for the batch sizes that haven't run yet.
+
+    The batch size is capped to the largest one that can meet the target
+    latency, and the queue only waits for as many requests as needed to keep
+    up with the arrival rate. So at low traffic, requests don't wait for a
+    batch to fill, and at peak traffic, batches grow as large as the target
+    latency allows.
+    """
+
+    def __init__(
+        self, max_batch_size: int, max_timeout_s: float, target_latency_s: float
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_timeout_s = max_timeout_s
+        self.target_latency_s = target_latency_s
+
+        # Moving average and variance of the batch latency, by batch size.
+        self._latency_mean: Dict[int, float] = {}
+        self._latency_var: Dict[int, float] = {}
+
+        # Moving average of the number of requests per second.
+        self.arrival_rate = 0.0
+        self._num_arrivals = 0
+        self._last_arrival_rate_update = time.time()
+
+    def record_arrival(self) -> None:
+        self._num_arrivals += 1
+
+    def record_batch(self, batch_size: int, latency_s: float) -> None:
+        if batch_size not in self._latency_mean:
+            self._latency_mean[batch_size] = latency_s
+            self._latency_var[batch_size] = 0.0
+            return
+
+        alpha = ADAPTIVE_BATCH_LATENCY_SMOOTHING
+        delta = latency_s - self._latency_mean[batch_size]
+        self._latency_mean[batch_size] += alpha * delta
+        self._latency_var[batch_size] = (1 - alpha) * (
+            self._latency_var[batch_size] + alpha * delta ** 2
+        )
+
+    def _update_arrival_rate(self) -> None:
+        now = time.time()
+        elapsed_s = now - self._last_arrival_rate_update
+        if elapsed_s <= 0:
+            return
+        # Weigh the rate of the last interval by its duration, so that the
+        # average doesn't depend on how often batches are formed.
+        alpha = 1 - math.exp(-elapsed_s / ADAPTIVE_BATCH_ARRIVAL_RATE_WINDOW_S)
+        rate = self._num_arrivals / elapsed_s
+        self.arrival_rate += alpha * (rate - self.arrival_rate)
+        self._num_arrivals = 0
+        self._last_arrival_rate_update = now
+
+    def estimate_latencies(self) -> List[float]:
+        """Return the estimated p99 latency of the batches of each size, from
+        1 to max_batch_size (index 0 is batch size 1)."""
+        observed = {
+            size: mean + P99_NUM_STDDEVS * math.sqrt(self._latency_var[size])
+            for size, mean in self._latency_mean.items()
+        }
+        if len(observed) == 1:
+            # Without information on how the latency scales, pessimistically
+            # assume that batching doesn't save any work.
+            [(observed_size, observed_latency)] = observed.items()
+
+            def interpolate(size):
+                return observed_latency * max(size, observed_size) / observed_size
+
+        else:
+            # Least squares fit of latency = intercept + slope * size.
+            n = len(observed)
+            mean_size = sum(observed) / n
+            mean_latency = sum(observed.values()) / n
+            cov = sum(
+                (size - mean_size) * (latency - mean_latency)
+                for size, latency in observed.items()
+            )
+            var = sum((size - mean_size) ** 2 for size in observed)
+            slope = max(cov / var, 0.0)
+            intercept = max(mean_latency - slope * mean_size, 0.0)
+
+            def interpolate(size):
+                return intercept + slope * size
+
+        return [
+            observed[size] if size in observed else interpolate(size)
+            for size in range(1, self.max_batch_size + 1)
+        ]
+
+    def choose(self) -> Tuple[int, float]:
+        """Return the batch size and the wait timeout for the next batch."""
+        self._update_arrival_rate()
+        if len(self._latency_mean) == 0:
+            # Nothing is known yet, run batches as they come to learn.
+            return self.max_batch_size, 0.0
+
+        latencies = [max(latency, 1e-6) for latency in self.estimate_latencies()]
+        sizes = range(1, self.max_batch_size + 1)
+        feasible = [
+            size for size in sizes if 2 * latencies[size - 1] <= self.target_latency_s
+        ]
+        if feasible:
+            batch_size = max(feasible)
+        else:
+            # The target can't be met, at least don't let the queue grow.
+            batch_size = max(sizes, key=lambda size: size / latencies[size - 1])
+
+        # The smallest batch that keeps up with the arrival rate.
+        required_throughput = ADAPTIVE_BATCH_THROUGHPUT_HEADROOM * self.arrival_rate
+        required_size = next(
+            (
+                size
+                for size in range(1, batch_size + 1)
+                if size / latencies[size - 1] >= required_throughput
+            ),
+            batch_size,
+        )
+        if required_size == 1:
+            return batch_size, 0.0
+
+        # Wait long enough for the required batch to fill, without exceeding
+        # the latency left over by the execution.
+        fill_time_s = (required_size - 1) / self.arrival_rate
+        latency_budget_s = self.target_latency_s - 2 * latencies[batch_size - 1]
+        timeout_s = max(0.0, min(self.max_timeout_s, fill_time_s, latency_budget_s))
+        return batch_size, timeout_s
+
+
 class _BatchQueue:
     def __init__(
         self,
         max_batch_size: int,
         timeout_s: float,
         handle_batch_func: Optional[Callable] = None,
+        target_latency_s: Optional[float] = None,
     ) -> None:
         """Async queue that accepts individual items and returns batches.
 
@@ -64,20 +216,76 @@ class _BatchQueue:
                 batch.
             handle_batch_func(Optional[Callable]): callback to run in the
                 background to handle batches if provided.
+            target_latency_s(Optional[float]): if provided, the batch size
+                and timeout are adapted to meet this p99 latency, with
+                max_batch_size and timeout_s as upper bounds. Requires
+                handle_batch_func, to measure the batch latencies.
         """
         self.queue: asyncio.Queue[SingleRequest] = asyncio.Queue()
         self.full_batch_event = asyncio.Event()
         self.max_batch_size = max_batch_size
         self.timeout_s = timeout_s
 
+        self._sizer = None
+        if target_latency_s is not None:
+            self._sizer = _AdaptiveBatchSizer(
+                max_batch_size, timeout_s, target_latency_s
+            )
+            self._init_adaptive_metrics(handle_batch_func)
+
         self._handle_batch_task = None
         if handle_batch_func is not None:
             self._handle_batch_task = asyncio.get_event_loop().create_task(
                 self._handle_batches(handle_batch_func)
             )
 
+    def _init_adaptive_metrics(self, handle_batch_func: Optional[Callable]):
+        # Delayed import since api depends on the serve package.
+        from ray.serve.api import get_replica_context
+
+        # All the tag keys must have a value, including outside a replica.
+        tags = {
+            "deployment": "",
+            "replica": "",
+            "function": getattr(handle_batch_func, "__qualname__", ""),
+        }
+        try:
+            context = get_replica_context()
+            tags.update(
+                {"deployment": context.deployment, "replica": context.replica_tag}
+            )
+        except RayServeException:
+            # Not running in a replica.
+            pass
+
+        self.batch_size_gauge = metrics.Gauge(
+            "serve_adaptive_batch_size",
+            description="The max batch size picked by adaptive batching.",
+            tag_keys=("deployment", "replica", "function"),
+        )
+        self.batch_size_gauge.set_default_tags(tags)
+        self.batch_wait_timeout_gauge = metrics.Gauge(
+            "serve_adaptive_batch_wait_timeout_s",
+            description="The batch wait timeout picked by adaptive batching.",
+            tag_keys=("deployment", "replica", "function"),
+        )
+        self.batch_wait_timeout_gauge.set_default_tags(tags)
+
+    def _adapt_batch_size(self) -> None:
+        self.max_batch_size, self.timeout_s = self._sizer.choose()
+        if self.queue.qsize() >= self.max_batch_size:
+            self.full_batch_event.set()
+        try:
+            self.batch_size_gauge.set(self.max_batch_size)
+            self.batch_wait_timeout_gauge.set(self.timeout_s)
+        except Exception:
+            # Metrics must never stop the batches from being handled.
+            logger.exception("Failed to record the adaptive batch size.")
+
     def put(self, request: Tuple[SingleRequest, asyncio.Future]) -> None:
         self.queue.put_nowait(request)
+        if self._sizer is not None:
+            self._sizer.record_arrival()
         # Signal when the full batch is ready. The event will be reset
         # in wait_for_batch.
         if self.queue.qsize() == self.max_batch_size:
@@ -129,12 +337,15 @@ class _BatchQueue:
 
     async def _handle_batches(self, func):
         while True:
+            if self._sizer is not None:
+                self._adapt_batch_size()
             batch: List[SingleRequest] = await self.wait_for_batch()
             assert len(batch) > 0
             self_arg = batch[0].self_arg
             args, kwargs = _batch_args_kwargs([item.flattened_args for item in batch])
             futures = [item.future for item in batch]
 
+            start = time.time()
             try:
                 # Method call.
                 if self_arg is not None:
@@ -156,6 +367,9 @@ class _BatchQueue:
                 for future in futures:
                     future.set_exception(e)
 
+            if self._sizer is not None:
+                self._sizer.record_batch(len(batch), time.time() - start)
+
     def __del__(self):
         if self._handle_batch_task is None or not asyncio.get_event_loop().is_running():
             return
@@ -205,12 +419,16 @@ def batch(func: F) -> G:
 # "Decorator factory" use case (called with arguments).
 @overload
 def batch(
-    max_batch_size: Optional[int] = 10, batch_wait_timeout_s: Optional[float] = 0.0
+    max_batch_size: Optional[int] = 10,
+    batch_wait_timeout_s: Optional[float] = 0.0,
+    target_latency_s: Optional[float] = None,
 ) -> Callable[[F], G]:
     pass
 
 
-def batch(_func=None, max_batch_size=10, batch_wait_timeout_s=0.0):
+def batch(
+    _func=None, max_batch_size=10, batch_wait_timeout_s=0.0, target_latency_s=None
+):
     """Converts a function to asynchronously handle batches.
 
     The function can be a standalone function or a class method. In both
@@ -230,11 +448,22 @@ def batch(_func=None, max_batch_size=10, batch_wait_timeout_s=0.0):
     >>> async def handle_single(s: str):
             return await handle_batch(s) # Returns s.lower().
 
+    If `target_latency_s` is set, the batch size and wait timeout adapt to
+    the traffic: the batch latency is measured for each batch size, and the
+    largest batches whose p99 request latency (including the time spent
+    waiting in the queue) meets the target are used. The queue only waits
+    for as many requests as needed to keep up with the arrival rate. The
+    picked values are exported as the `serve_adaptive_batch_size` and
+    `serve_adaptive_batch_wait_timeout_s` metrics.
+
     Arguments:
         max_batch_size (int): the maximum batch size that will be executed in
             one call to the underlying function.
         batch_wait_timeout_s (float): the maximum duration to wait for
             `max_batch_size` elements before running the underlying function.
+        target_latency_s (Optional[float]): the target p99 latency of a
+            request, to adapt the batch size to. If set, `max_batch_size`
+            and `batch_wait_timeout_s` are upper bounds.
     """
     # `_func` will be None in the case when the decorator is parametrized.
     # See the comment at the end of this function for a detailed explanation.
@@ -262,6 +491,13 @@ def batch(_func=None, max_batch_size=10, batch_wait_timeout_s=0.0):
     if batch_wait_timeout_s < 0:
         raise ValueError("batch_wait_timeout_s must be a float >= 0")
 
+    if target_latency_s is not None:
+        if not isinstance(target_latency_s, (float, int)):
+            raise TypeError("target_latency_s must be a float > 0")
+
+        if target_latency_s <= 0:
+            raise ValueError("target_latency_s must be a float > 0")
+
     def _batch_decorator(_func):
         @wraps(_func)
         async def batch_wrapper(*args, **kwargs):
@@ -284,7 +520,9 @@ def batch(_func=None, max_batch_size=10, batch_wait_timeout_s=0.0):
             # runs, we just get a reference to the attribute.
             batch_queue_attr = f"__serve_batch_queue_{_func.__name__}"
             if not hasattr(batch_queue_object, batch_queue_attr):
-                batch_queue = _BatchQueue(max_batch_size, batch_wait_timeout_s, _func)
+                batch_queue = _BatchQueue(
+                    max_batch_size, batch_wait_timeout_s, _func, target_latency_s
+                )
                 setattr(batch_queue_object, batch_queue_attr, batch_queue)
             else:
                 batch_queue = getattr(batch_queue_object, batch_queue_attr)
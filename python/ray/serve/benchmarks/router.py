@@ -0,0 +1,110 @@
+# Measures the overhead of the router (ReplicaSet) when many queries are in
+# flight, without the controller, the proxy or the replica wrapper.
+#
+# Mock replicas take a fixed time to handle each query, and their
+# max_concurrent_queries add up to `--num-in-flight`. Twice as many queries
+# are submitted at once, so that the replicas are saturated and half of the
+# queries wait in the router for a free replica. We report the time it takes
+# to assign all queries, compared to the ideal time given the replica
+# capacity, and the CPU time spent by the driver (mostly in the router) per
+# query.
+#
+# Sample usage:
+# python router.py --num-replicas 10 --num-in-flight 10000
+
+import asyncio
+import time
+
+import click
+
+import ray
+from ray.serve.common import RunningReplicaInfo
+from ray.serve.router import Query, ReplicaSet, RequestMetadata
+
+
+@ray.remote(num_cpus=0)
+class MockReplica:
+    def __init__(self, query_duration_s: float):
+        self.query_duration_s = query_duration_s
+
+    @ray.method(num_returns=2)
+    async def handle_request(self, request_metadata, *args, **kwargs):
+        await asyncio.sleep(self.query_duration_s)
+        return b"", b"ok"
+
+    def ready(self):
+        pass
+
+
+async def run_benchmark(
+    num_replicas: int, num_in_flight: int, num_queries: int, query_duration_s: float
+):
+    max_concurrent_queries = num_in_flight // num_replicas
+    actors = [
+        MockReplica.options(max_concurrency=max_concurrent_queries + 1).remote(
+            query_duration_s
+        )
+        for _ in range(num_replicas)
+    ]
+    ray.get([actor.ready.remote() for actor in actors])
+
+    replica_set = ReplicaSet("bench", asyncio.get_event_loop())
+    replica_set.update_running_replicas(
+        [
+            RunningReplicaInfo(
+                deployment_name="bench",
+                replica_tag=str(i),
+                actor_handle=actor,
+                max_concurrent_queries=max_concurrent_queries,
+            )
+            for i, actor in enumerate(actors)
+        ]
+    )
+    query = Query([], {}, RequestMetadata("request-id", "bench"))
+
+    start = time.perf_counter()
+    start_cpu = time.process_time()
+    refs = await asyncio.gather(
+        *[replica_set.assign_replica(query) for _ in range(num_queries)]
+    )
+    assign_s = time.perf_counter() - start
+    assign_cpu_s = time.process_time() - start_cpu
+    await asyncio.gather(*refs)
+    total_s = time.perf_counter() - start
+
+    # All but the last batch of queries must complete before the last batch
+    # can be assigned.
+    ideal_assign_s = (num_queries // num_in_flight - 1) * query_duration_s
+    print(
+        f"{num_replicas} replicas, {num_in_flight} in-flight queries, "
+        f"{num_queries} queries of {query_duration_s}s:"
+    )
+    print(f"\tassigned in {assign_s:.2f}s (ideal {ideal_assign_s:.2f}s)")
+    print(f"\tcompleted in {total_s:.2f}s")
+    print(f"\trouter CPU time per query: {assign_cpu_s / num_queries * 1e6:.1f}us")
+
+
+@click.command()
+@click.option("--num-replicas", type=int, default=10)
+@click.option("--num-in-flight", type=int, default=10000)
+@click.option("--num-queries", type=int, default=None)
+@click.option("--query-duration-s", type=float, default=1.0)
+def main(
+    num_replicas: int,
+    num_in_flight: int,
+    num_queries: int,
+    query_duration_s: float,
+):
+    ray.init()
+    asyncio.get_event_loop().run_until_complete(
+        run_benchmark(
+            num_replicas,
+            num_in_flight,
+            num_queries or 2 * num_in_flight,
+            query_duration_s,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -26,13 +26,24 @@
 # Transfer/sec:     29.48KB
 #
 # [...] similar results for remaining nodes
-
+#
+# Then, the test measures how the controller scales with the number of
+# deployments and replicas: it deploys many deployments of zero-CPU replicas
+# and measures the latency of the calls to the controller, which share its
+# event loop with the control loop, in steady state and while deployments are
+# scaled, and the size and latency of the long-poll updates of the running
+# replicas of all the deployments.
+
+import os
 import time
 import subprocess
+
+import numpy as np
 import requests
 
 import ray
-from ray import serve
+from ray import cloudpickle, serve
+from ray.serve.long_poll import LongPollNamespace
 from ray.serve.utils import logger
 
 from ray.util.placement_group import placement_group, remove_placement_group
@@ -48,6 +59,13 @@ num_replicas = 11
 num_connections = 20
 num_threads = 2
 time_to_run = "20s"
+# Controller scalability test config
+num_deployments = int(os.environ.get("SERVE_SCALABILITY_NUM_DEPLOYMENTS", "500"))
+num_replicas_per_deployment = int(
+    os.environ.get("SERVE_SCALABILITY_NUM_REPLICAS_PER_DEPLOYMENT", "10")
+)
+num_controller_calls = 200
+num_scaled_deployments = 20
 
 # Wait until the expected number of nodes have joined the cluster.
 while True:
@@ -116,3 +134,91 @@ for i in range(expected_num_nodes):
     logger.info(results[i])
 
 remove_placement_group(pg)
+
+
+def controller_call_latencies_ms(controller, num_calls):
+    latencies = []
+    for _ in range(num_calls):
+        start = time.perf_counter()
+        ray.get(controller.get_http_config.remote())
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def log_latencies(name, latencies_ms):
+    logger.info(
+        "%s: p50 %.2fms, p99 %.2fms, max %.2fms",
+        name,
+        np.percentile(latencies_ms, 50),
+        np.percentile(latencies_ms, 99),
+        np.max(latencies_ms),
+    )
+
+
+logger.info(
+    "Starting %i deployments of %i replicas",
+    num_deployments,
+    num_replicas_per_deployment,
+)
+deployment_names = [f"scale_{i}" for i in range(num_deployments)]
+for name in deployment_names:
+    hey.options(
+        name=name,
+        num_replicas=num_replicas_per_deployment,
+        ray_actor_options={"num_cpus": 0},
+    ).deploy(_blocking=False)
+
+start = time.time()
+while any(
+    status.status.name != "HEALTHY"
+    for status in serve.get_deployment_statuses().values()
+):
+    time.sleep(1)
+logger.info("All deployments are healthy after %.1fs.", time.time() - start)
+
+controller = serve.api.internal_get_global_client()._controller
+log_latencies(
+    "Controller call latency in steady state",
+    controller_call_latencies_ms(controller, num_controller_calls),
+)
+
+# A new client receives the full running replicas of all the deployments.
+keys = [(LongPollNamespace.RUNNING_REPLICAS, name) for name in deployment_names]
+updates = ray.get(controller.listen_for_change.remote({key: -1 for key in keys}))
+snapshot_ids = {key: update.snapshot_id for key, update in updates.items()}
+logger.info(
+    "Long-poll update of all the deployments: %.1fKB",
+    len(cloudpickle.dumps(updates)) / 1024,
+)
+
+# Clients that are up to date receive the changes of each scaled deployment.
+update_latencies_ms = []
+update_sizes = []
+scaling_controller_latencies_ms = []
+for name in deployment_names[:num_scaled_deployments]:
+    ref = controller.listen_for_change.remote(snapshot_ids)
+    start = time.perf_counter()
+    hey.options(
+        name=name,
+        num_replicas=num_replicas_per_deployment + 1,
+        ray_actor_options={"num_cpus": 0},
+    ).deploy(_blocking=False)
+    # The update is sent once the new replica is running.
+    while True:
+        ready, _ = ray.wait([ref], timeout=0)
+        if ready:
+            break
+        scaling_controller_latencies_ms.extend(
+            controller_call_latencies_ms(controller, 1)
+        )
+    update_latencies_ms.append((time.perf_counter() - start) * 1000)
+    updates = ray.get(ref)
+    update_sizes.append(len(cloudpickle.dumps(updates)))
+    snapshot_ids.update({key: update.snapshot_id for key, update in updates.items()})
+
+log_latencies("Controller call latency while scaling", scaling_controller_latencies_ms)
+log_latencies("Long-poll update latency after scaling", update_latencies_ms)
+logger.info(
+    "Long-poll update of a scaled deployment: %.1fKB on average",
+    np.mean(update_sizes) / 1024,
+)
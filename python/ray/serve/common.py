@@ -1,11 +1,12 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
 import ray
 from ray.actor import ActorHandle
-from ray.serve.config import DeploymentConfig, ReplicaConfig
+from ray.serve.config import DeploymentConfig, ReplicaConfig, ResponseCacheConfig
 from ray.serve.autoscaling_policy import AutoscalingPolicy
+from ray.serve.constants import DEFAULT_LOAD_BALANCING_POLICY
 
 EndpointTag = str
 ReplicaTag = str
@@ -136,3 +137,14 @@ class RunningReplicaInfo:
     replica_tag: ReplicaTag
     actor_handle: ActorHandle
     max_concurrent_queries: int
+    node_id: Optional[NodeId] = None
+    load_balancing_policy: str = DEFAULT_LOAD_BALANCING_POLICY
+    response_cache_config: Optional[ResponseCacheConfig] = None
+    # Whether the routers must report their metrics for autoscaling.
+    autoscaling_enabled: bool = False
+    # Hash of the version of the replica, to invalidate cached responses
+    # when it changes.
+    version_hash: Optional[int] = None
+    # The multiplexed models loaded by the replica, which change while the
+    # replica is running, so they aren't part of its identity.
+    multiplexed_model_ids: FrozenSet[str] = field(default=frozenset(), compare=False)
@@ -22,11 +22,13 @@ from ray.serve.constants import (
     DEFAULT_HEALTH_CHECK_TIMEOUT_S,
     DEFAULT_HTTP_HOST,
     DEFAULT_HTTP_PORT,
+    DEFAULT_LOAD_BALANCING_POLICY,
 )
 from ray.serve.generated.serve_pb2 import (
     DeploymentConfig as DeploymentConfigProto,
     DeploymentLanguage,
     AutoscalingConfig as AutoscalingConfigProto,
+    ResponseCacheConfig as ResponseCacheConfigProto,
 )
 
 
@@ -60,6 +62,10 @@ class AutoscalingConfig(BaseModel):
     # How long to wait before scaling up replicas
     upscale_delay_s: NonNegativeFloat = 30.0
 
+    # The policy making the scaling decisions: "basic", "queue_aware",
+    # "predictive" or the import path of an AutoscalingPolicy subclass.
+    policy: str = "basic"
+
     @validator("max_replicas")
     def max_replicas_greater_than_or_equal_to_min_replicas(cls, v, values):
         if "min_replicas" in values and v < values["min_replicas"]:
@@ -70,6 +76,11 @@ class AutoscalingConfig(BaseModel):
             )
         return v
 
+    @validator("policy", always=True)
+    def set_default_policy(cls, v):  # noqa 805
+        # The policy is unset in configs from other languages.
+        return v or "basic"
+
     # TODO(architkulkarni): implement below
     # The number of replicas to start with when creating the deployment
     # initial_replicas: int = 1
@@ -80,6 +91,40 @@ class AutoscalingConfig(BaseModel):
     # TODO(architkulkarni): Add reasonable defaults
 
 
+class ResponseCacheConfig(BaseModel):
+    """Configuration of the cache of a deployment's responses in its handles.
+
+    Args:
+        max_entries (int): The maximum number of responses cached by each
+            handle (and HTTP proxy). The least recently used ones are evicted.
+        ttl_s (float): How long a response is cached for.
+        key_function (Optional[str]): The import path of a function returning
+            the cache key of a request, or None to not cache it. It's called
+            with the arguments of the request (a Starlette request for HTTP
+            requests) and can be `async def`. By default, only GET and HEAD
+            HTTP requests are cached, keyed by their method, path, query
+            string, body and Authorization and Cookie headers, and handle
+            calls are keyed by their method and pickled arguments.
+    """
+
+    # Please keep these options in sync with those in
+    # `src/ray/protobuf/serve.proto`.
+
+    max_entries: PositiveInt = 1000
+    ttl_s: PositiveFloat = 60.0
+    key_function: Optional[str] = None
+
+    class Config:
+        # Frozen so that it's hashable, to be sent to routers along with the
+        # running replicas.
+        frozen = True
+
+    @validator("key_function")
+    def key_function_empty_to_none(cls, v):  # noqa 805
+        # The import path is empty in configs from the proto.
+        return v or None
+
+
 class DeploymentConfig(BaseModel):
     """Configuration options for a deployment, to be set by the user.
 
@@ -103,6 +148,16 @@ class DeploymentConfig(BaseModel):
         health_check_timeout_s (Optional[float]):
             Timeout that the controller will wait for a response from the
             replica's health check before marking it unhealthy.
+        load_balancing_policy (Optional[str]): The policy used by the
+            routers to choose the replica for each query:
+            "round_robin" (default), "least_outstanding_requests",
+            "power_of_two_choices", "same_node_first", or the import path of a
+            ``ray.serve.load_balancing_policy.LoadBalancingPolicy`` subclass.
+        response_cache_config (Optional[ResponseCacheConfig]): If set, the
+            responses are cached by the handles (and HTTP proxies), which
+            return the cached response to repeated requests without sending
+            them to a replica. The cache is invalidated when the version of the
+            deployment changes.
     """
 
     num_replicas: PositiveInt = 1
@@ -121,6 +176,10 @@ class DeploymentConfig(BaseModel):
 
     autoscaling_config: Optional[AutoscalingConfig] = None
 
+    load_balancing_policy: str = DEFAULT_LOAD_BALANCING_POLICY
+
+    response_cache_config: Optional[ResponseCacheConfig] = None
+
     # This flag is used to let replica know they are deplyed from
     # a different language.
     is_cross_language: bool = False
@@ -144,6 +203,11 @@ class DeploymentConfig(BaseModel):
                 raise ValueError("max_concurrent_queries must be >= 0")
         return v
 
+    @validator("load_balancing_policy", always=True)
+    def set_default_load_balancing_policy(cls, v):  # noqa 805
+        # The policy is unset in configs from other languages.
+        return v or DEFAULT_LOAD_BALANCING_POLICY
+
     def to_proto_bytes(self):
         data = self.dict()
         if data.get("user_config"):
@@ -152,6 +216,10 @@ class DeploymentConfig(BaseModel):
             data["autoscaling_config"] = AutoscalingConfigProto(
                 **data["autoscaling_config"]
             )
+        if data.get("response_cache_config"):
+            data["response_cache_config"] = ResponseCacheConfigProto(
+                **data["response_cache_config"]
+            )
         return DeploymentConfigProto(**data).SerializeToString()
 
     @classmethod
@@ -170,6 +238,10 @@ class DeploymentConfig(BaseModel):
                 data["user_config"] = None
         if "autoscaling_config" in data:
             data["autoscaling_config"] = AutoscalingConfig(**data["autoscaling_config"])
+        if "response_cache_config" in data:
+            data["response_cache_config"] = ResponseCacheConfig(
+                **data["response_cache_config"]
+            )
 
         return cls(**data)
 
@@ -73,10 +73,21 @@ DEFAULT_GRACEFUL_SHUTDOWN_WAIT_LOOP_S = 2
 DEFAULT_HEALTH_CHECK_PERIOD_S = 10
 DEFAULT_HEALTH_CHECK_TIMEOUT_S = 30
 
+#: The default policy for routers to choose replicas.
+DEFAULT_LOAD_BALANCING_POLICY = "round_robin"
+
 #: Number of times in a row that a replica must fail the health check before
 #: being marked unhealthy.
 REPLICA_HEALTH_CHECK_UNHEALTHY_THRESHOLD = 3
 
+#: Maximum number of ASGI messages buffered by the sender of a streamed HTTP
+#: request or response body before it waits for the receiver.
+HTTP_STREAM_MAX_BUFFERED_MESSAGES = 8
+
+#: How long the sender of a streamed HTTP body waits for the receiver to pull
+#: more messages before giving up on the stream.
+HTTP_STREAM_TIMEOUT_S = 60
+
 # Key used to idenfity given json represents a serialized RayServeHandle
 SERVE_HANDLE_JSON_KEY = "__SerializedServeHandle__"
 
@@ -84,3 +95,19 @@ SERVE_HANDLE_JSON_KEY = "__SerializedServeHandle__"
 class ServeHandleType(str, Enum):
     SYNC = "SYNC"
     ASYNC = "ASYNC"
+
+
+#: How often routers report their queued queries and the arrival rate of
+#: requests to the controller, for autoscaling.
+HANDLE_METRICS_PUSH_INTERVAL_S = 1.0
+
+#: Smoothing factor of the moving average of replica startup times.
+REPLICA_STARTUP_TIME_SMOOTHING_FACTOR = 0.5
+
+#: The HTTP header and handle option setting the model ID of requests to
+#: multiplexed deployments.
+SERVE_MULTIPLEXED_MODEL_ID = "serve_multiplexed_model_id"
+
+#: The request status returned by replicas along with responses that must not
+#: be reused by the response cache: errors and streams.
+RESPONSE_NOT_REUSABLE_STATUS = b"not_reusable"
@@ -3,8 +3,8 @@ import json
 import time
 from collections import defaultdict
 import os
-from typing import Dict, List, Optional, Tuple, Any
-from ray.serve.autoscaling_policy import BasicAutoscalingPolicy
+from typing import DefaultDict, Dict, List, Optional, Set, Tuple, Any
+from ray.serve.autoscaling_policy import AutoscalingMetrics, create_autoscaling_policy
 from copy import copy
 
 import ray
@@ -19,7 +19,11 @@ from ray.serve.common import (
     RunningReplicaInfo,
 )
 from ray.serve.config import DeploymentConfig, HTTPOptions, ReplicaConfig
-from ray.serve.constants import CONTROL_LOOP_PERIOD_S, SERVE_ROOT_URL_ENV_KEY
+from ray.serve.constants import (
+    CONTROL_LOOP_PERIOD_S,
+    HANDLE_METRICS_PUSH_INTERVAL_S,
+    SERVE_ROOT_URL_ENV_KEY,
+)
 from ray.serve.endpoint_state import EndpointState
 from ray.serve.http_state import HTTPState
 from ray.serve.storage.checkpoint_path import make_kv_store
@@ -75,6 +79,8 @@ class ServeController:
         kv_store_namespace = f"{self.controller_name}-{self.controller_namespace}"
         self.kv_store = make_kv_store(checkpoint_path, namespace=kv_store_namespace)
         self.snapshot_store = RayInternalKVStore(namespace=kv_store_namespace)
+        # The last snapshot put, to only put it again when it changes.
+        self._last_serve_snapshot: Optional[bytes] = None
 
         # Dictionary of deployment_name -> proxy_name -> queue length.
         self.deployment_stats = defaultdict(lambda: defaultdict(dict))
@@ -100,12 +106,67 @@ class ServeController:
 
         # TODO(simon): move autoscaling related stuff into a manager.
         self.autoscaling_metrics_store = InMemoryMetricsStore()
+        # The routers that reported metrics of each autoscaling deployment.
+        self.autoscaling_router_ids: DefaultDict[str, Set[str]] = defaultdict(set)
 
         asyncio.get_event_loop().create_task(self.run_control_loop())
 
     def record_autoscaling_metrics(self, data: Dict[str, float], send_timestamp: float):
         self.autoscaling_metrics_store.add_metrics_point(data, send_timestamp)
 
+    def record_handle_metrics(
+        self,
+        deployment_name: str,
+        router_id: str,
+        data: Dict[str, float],
+        send_timestamp: float,
+    ):
+        deployment_info = self.deployment_state_manager.get_deployment(deployment_name)
+        if deployment_info is None or deployment_info.autoscaling_policy is None:
+            return
+        self.autoscaling_router_ids[deployment_name].add(router_id)
+        self.autoscaling_metrics_store.add_metrics_point(
+            {f"{router_id}/{name}": value for name, value in data.items()},
+            send_timestamp,
+        )
+
+    def _get_router_metrics(
+        self, deployment_name: str
+    ) -> Tuple[float, Optional[float]]:
+        """Returns the number of queued queries and the arrival rate of
+        requests recently reported by the routers of the deployment."""
+        window_start = time.time() - 2 * HANDLE_METRICS_PUSH_INTERVAL_S
+        num_queued_queries = 0.0
+        arrival_rate = None
+        router_ids = self.autoscaling_router_ids[deployment_name]
+        for router_id in list(router_ids):
+            router_num_queued_queries = self.autoscaling_metrics_store.window_average(
+                f"{router_id}/num_queued_queries", window_start
+            )
+            router_arrival_rate = self.autoscaling_metrics_store.window_average(
+                f"{router_id}/arrival_rate", window_start
+            )
+            if router_num_queued_queries is None or router_arrival_rate is None:
+                # The router is idle or gone.
+                router_ids.remove(router_id)
+                self.autoscaling_metrics_store.data.pop(
+                    f"{router_id}/num_queued_queries", None
+                )
+                self.autoscaling_metrics_store.data.pop(
+                    f"{router_id}/arrival_rate", None
+                )
+                continue
+            num_queued_queries += router_num_queued_queries
+            arrival_rate = (arrival_rate or 0.0) + router_arrival_rate
+        return num_queued_queries, arrival_rate
+
+    def record_multiplexed_model_ids(
+        self, deployment_name: str, replica_tag: str, model_ids: List[str]
+    ):
+        self.deployment_state_manager.record_multiplexed_model_ids(
+            deployment_name, replica_tag, model_ids
+        )
+
     def _dump_autoscaling_metrics_for_testing(self):
         return self.autoscaling_metrics_store.data
 
@@ -152,9 +213,10 @@ class ServeController:
             if autoscaling_policy is None:
                 continue
 
-            replicas = self.deployment_state_manager._deployment_states[
+            deployment_state = self.deployment_state_manager._deployment_states[
                 deployment_name
-            ]._replicas
+            ]
+            replicas = deployment_state._replicas
             running_replicas = replicas.get([ReplicaState.RUNNING])
 
             current_num_ongoing_requests = []
@@ -170,11 +232,20 @@ class ServeController:
             if len(current_num_ongoing_requests) == 0:
                 continue
 
+            num_queued_queries, arrival_rate = self._get_router_metrics(deployment_name)
+            metrics = AutoscalingMetrics(
+                timestamp=time.time(),
+                num_queued_queries=num_queued_queries,
+                arrival_rate=arrival_rate,
+                replica_startup_time_s=deployment_state.replica_startup_time_s,
+            )
+
             new_deployment_config = deployment_config.copy()
 
             decision_num_replicas = autoscaling_policy.get_decision_num_replicas(
                 current_num_ongoing_requests=current_num_ongoing_requests,
                 curr_target_num_replicas=deployment_config.num_replicas,
+                metrics=metrics,
             )
             new_deployment_config.num_replicas = decision_num_replicas
 
@@ -193,6 +264,7 @@ class ServeController:
             except Exception:
                 logger.exception("Exception in autoscaling.")
 
+            deployments_updated = True
             async with self.write_lock:
                 try:
                     self.http_state.update()
@@ -200,14 +272,16 @@ class ServeController:
                     logger.exception("Exception updating HTTP state.")
 
                 try:
-                    self.deployment_state_manager.update()
+                    deployments_updated = self.deployment_state_manager.update()
                 except Exception:
                     logger.exception("Exception updating deployment state.")
 
-            try:
-                self._put_serve_snapshot()
-            except Exception:
-                logger.exception("Exception putting serve snapshot.")
+            # The snapshot only changes when the deployments are updated.
+            if deployments_updated:
+                try:
+                    self._put_serve_snapshot()
+                except Exception:
+                    logger.exception("Exception putting serve snapshot.")
             await asyncio.sleep(CONTROL_LOOP_PERIOD_S)
 
     def _put_serve_snapshot(self) -> None:
@@ -250,7 +324,10 @@ class ServeController:
                     }
 
             val[deployment_name] = entry
-        self.snapshot_store.put(SNAPSHOT_KEY, json.dumps(val).encode("utf-8"))
+        snapshot = json.dumps(val).encode("utf-8")
+        if snapshot != self._last_serve_snapshot:
+            self.snapshot_store.put(SNAPSHOT_KEY, snapshot)
+            self._last_serve_snapshot = snapshot
 
     def _all_running_replicas(self) -> Dict[str, List[RunningReplicaInfo]]:
         """Used for testing."""
@@ -318,7 +395,7 @@ class ServeController:
             # TODO: is this the desired behaviour? Should this be a setting?
             deployment_config.num_replicas = autoscaling_config.min_replicas
 
-            autoscaling_policy = BasicAutoscalingPolicy(autoscaling_config)
+            autoscaling_policy = create_autoscaling_policy(autoscaling_config)
         else:
             autoscaling_policy = None
 
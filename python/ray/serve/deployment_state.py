@@ -7,7 +7,7 @@ import os
 import pickle
 import random
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 import ray
 from ray import ObjectRef
@@ -22,11 +22,13 @@ from ray.serve.common import (
     ReplicaName,
     RunningReplicaInfo,
 )
-from ray.serve.config import DeploymentConfig
+from ray.serve.config import DeploymentConfig, ResponseCacheConfig
 from ray.serve.constants import (
+    DEFAULT_LOAD_BALANCING_POLICY,
     MAX_DEPLOYMENT_CONSTRUCTOR_RETRY_COUNT,
     MAX_NUM_DELETED_DEPLOYMENTS,
     REPLICA_HEALTH_CHECK_UNHEALTHY_THRESHOLD,
+    REPLICA_STARTUP_TIME_SMOOTHING_FACTOR,
 )
 from ray.serve.generated.serve_pb2 import DeploymentLanguage
 from ray.serve.storage.kv_store import KVStoreBase
@@ -152,6 +154,9 @@ class ActorReplicaWrapper:
 
         self._actor_resources: Dict[str, float] = None
         self._max_concurrent_queries: int = None
+        self._load_balancing_policy: str = DEFAULT_LOAD_BALANCING_POLICY
+        self._response_cache_config: Optional[ResponseCacheConfig] = None
+        self._autoscaling_enabled: bool = False
         self._graceful_shutdown_timeout_s: float = 0.0
         self._healthy: bool = True
         self._health_check_period_s: float = 0.0
@@ -200,6 +205,18 @@ class ActorReplicaWrapper:
     def max_concurrent_queries(self) -> int:
         return self._max_concurrent_queries
 
+    @property
+    def load_balancing_policy(self) -> str:
+        return self._load_balancing_policy
+
+    @property
+    def response_cache_config(self) -> Optional[ResponseCacheConfig]:
+        return self._response_cache_config
+
+    @property
+    def autoscaling_enabled(self) -> bool:
+        return self._autoscaling_enabled
+
     @property
     def node_id(self) -> Optional[str]:
         """Returns the node id of the actor, None if not placed."""
@@ -249,6 +266,15 @@ class ActorReplicaWrapper:
         self._max_concurrent_queries = (
             deployment_info.deployment_config.max_concurrent_queries
         )
+        self._load_balancing_policy = (
+            deployment_info.deployment_config.load_balancing_policy
+        )
+        self._response_cache_config = (
+            deployment_info.deployment_config.response_cache_config
+        )
+        self._autoscaling_enabled = (
+            deployment_info.deployment_config.autoscaling_config is not None
+        )
         self._graceful_shutdown_timeout_s = (
             deployment_info.deployment_config.graceful_shutdown_timeout_s
         )
@@ -408,6 +434,11 @@ class ActorReplicaWrapper:
 
                 deployment_config, version = ray.get(self._ready_obj_ref)
                 self._max_concurrent_queries = deployment_config.max_concurrent_queries
+                self._load_balancing_policy = deployment_config.load_balancing_policy
+                self._response_cache_config = deployment_config.response_cache_config
+                self._autoscaling_enabled = (
+                    deployment_config.autoscaling_config is not None
+                )
                 self._graceful_shutdown_timeout_s = (
                     deployment_config.graceful_shutdown_timeout_s
                 )
@@ -525,6 +556,17 @@ class ActorReplicaWrapper:
         randomized_period = self._health_check_period_s * random.uniform(0.9, 1.1)
         return time_since_last > randomized_period
 
+    @property
+    def next_health_check_time(self) -> float:
+        """The earliest time check_health() may find the replica unhealthy.
+
+        While a health check is ongoing, that's as soon as possible, else
+        it's when the next health check may be started.
+        """
+        if self._health_check_ref is not None:
+            return self._last_health_check_time
+        return self._last_health_check_time + self._health_check_period_s * 0.9
+
     def check_health(self) -> bool:
         """Check if the actor is healthy.
 
@@ -623,6 +665,7 @@ class DeploymentReplica(VersionedReplica):
         self._version = version
         self._start_time = None
         self._prev_slow_startup_warning_time = None
+        self.multiplexed_model_ids: FrozenSet[str] = frozenset()
 
     def get_running_replica_info(self) -> RunningReplicaInfo:
         return RunningReplicaInfo(
@@ -630,6 +673,12 @@ class DeploymentReplica(VersionedReplica):
             replica_tag=self._replica_tag,
             actor_handle=self._actor.actor_handle,
             max_concurrent_queries=self._actor.max_concurrent_queries,
+            node_id=self._actor.node_id,
+            load_balancing_policy=self._actor.load_balancing_policy,
+            response_cache_config=self._actor.response_cache_config,
+            autoscaling_enabled=self._actor.autoscaling_enabled,
+            version_hash=hash(self._version),
+            multiplexed_model_ids=self.multiplexed_model_ids,
         )
 
     @property
@@ -739,6 +788,10 @@ class DeploymentReplica(VersionedReplica):
         """
         return self._actor.check_health()
 
+    @property
+    def next_health_check_time(self) -> float:
+        return self._actor.next_health_check_time
+
     def resource_requirements(self) -> Tuple[str, str]:
         """Returns required and currently available resources.
 
@@ -926,6 +979,17 @@ class DeploymentState:
         self._curr_status_info: DeploymentStatusInfo = DeploymentStatusInfo(
             DeploymentStatus.UPDATING
         )
+        # Moving average of how long new replicas take to start, from being
+        # scheduled to being ready to serve requests.
+        self.replica_startup_time_s: Optional[float] = None
+        # Whether the multiplexed models of the running replicas changed since
+        # they were last broadcast to the routers.
+        self._multiplexed_model_ids_changed: bool = False
+        # Whether the deployment must be reconciled in the next update. Once
+        # it's in steady state, it's only updated to check the health of its
+        # replicas, until its goal or its replicas change.
+        self._dirty: bool = True
+        self._next_health_check_time: float = 0.0
 
     def get_target_state_checkpoint_data(self):
         """
@@ -946,6 +1010,7 @@ class DeploymentState:
             self._target_replicas,
             self._target_version,
         ) = target_state_checkpoint
+        self._dirty = True
 
     def recover_current_state_from_replica_actor_names(
         self, replica_actor_names: List[str]
@@ -1000,6 +1065,17 @@ class DeploymentState:
             for replica in self._replicas.get([ReplicaState.RUNNING])
         ]
 
+    def record_multiplexed_model_ids(
+        self, replica_tag: ReplicaTag, model_ids: List[str]
+    ) -> None:
+        for replica in self._replicas.get([ReplicaState.RUNNING]):
+            if replica.replica_tag == replica_tag:
+                replica.multiplexed_model_ids = frozenset(model_ids)
+                # Broadcast once per update, however many replicas changed.
+                self._multiplexed_model_ids_changed = True
+                self._dirty = True
+                return
+
     def _notify_running_replicas_changed(self):
         self._long_poll_host.notify_changed(
             (LongPollNamespace.RUNNING_REPLICAS, self._name),
@@ -1028,6 +1104,7 @@ class DeploymentState:
             self._target_replicas = 0
 
         self._curr_status_info = DeploymentStatusInfo(DeploymentStatus.UPDATING)
+        self._dirty = True
 
         version_str = (
             deployment_info if deployment_info is None else deployment_info.version
@@ -1260,10 +1337,6 @@ class DeploymentState:
         Returns:
             was_deleted
         """
-        # TODO(edoakes): we could make this more efficient in steady-state by
-        # having a "healthy" flag that gets flipped if an update or replica
-        # failure happens.
-
         target_version = self._target_version
         target_replica_count = self._target_replicas
 
@@ -1345,6 +1418,8 @@ class DeploymentState:
                 # set.
                 self._replicas.add(ReplicaState.RUNNING, replica)
                 transitioned_to_running = True
+                if original_state == ReplicaState.STARTING:
+                    self._record_replica_startup_time(time.time() - replica._start_time)
             elif start_status == ReplicaStartupStatus.FAILED:
                 # Replica reconfigure (deploy / upgrade) failed
                 if self._replica_constructor_retry_counter >= 0:
@@ -1373,6 +1448,14 @@ class DeploymentState:
 
         return slow_replicas, transitioned_to_running
 
+    def _record_replica_startup_time(self, startup_time_s: float) -> None:
+        if self.replica_startup_time_s is None:
+            self.replica_startup_time_s = startup_time_s
+        else:
+            self.replica_startup_time_s += REPLICA_STARTUP_TIME_SMOOTHING_FACTOR * (
+                startup_time_s - self.replica_startup_time_s
+            )
+
     def _check_and_update_replicas(self) -> bool:
         """
         Check current state of all DeploymentReplica being tracked, and compare
@@ -1489,24 +1572,55 @@ class DeploymentState:
             # Check the state of existing replicas and transition if necessary.
             running_replicas_changed |= self._check_and_update_replicas()
 
-            if running_replicas_changed:
+            if running_replicas_changed or self._multiplexed_model_ids_changed:
+                self._multiplexed_model_ids_changed = False
                 self._notify_running_replicas_changed()
 
             deleted = self._check_curr_status()
+
+            self._dirty = not self._is_steady()
+            if not self._dirty:
+                self._next_health_check_time = min(
+                    (
+                        replica.next_health_check_time
+                        for replica in self._replicas.get([ReplicaState.RUNNING])
+                    ),
+                    default=math.inf,
+                )
         except Exception as e:
             self._curr_status_info = DeploymentStatusInfo(
                 status=DeploymentStatus.UNHEALTHY,
                 message=f"Failed to update deployment:\n{e}.",
             )
+            self._dirty = True
             deleted = False
 
         return deleted
 
+    def _is_steady(self) -> bool:
+        """Whether the deployment is healthy with only running replicas at the
+        target version, so that update() has nothing to do but check the
+        health of the replicas."""
+        num_replicas = self._replicas.count()
+        return (
+            self._curr_status_info.status == DeploymentStatus.HEALTHY
+            and num_replicas == self._target_replicas
+            and num_replicas
+            == self._replicas.count(
+                states=[ReplicaState.RUNNING], version=self._target_version
+            )
+        )
+
+    def needs_update(self) -> bool:
+        """Whether update() may have anything to do."""
+        return self._dirty or time.time() >= self._next_health_check_time
+
     def _stop_one_running_replica_for_testing(self):
         running_replicas = self._replicas.pop(states=[ReplicaState.RUNNING])
         replica_to_stop = running_replicas.pop()
         replica_to_stop.stop(graceful=False)
         self._replicas.add(ReplicaState.STOPPING, replica_to_stop)
+        self._dirty = True
         for replica in running_replicas:
             self._replicas.add(ReplicaState.RUNNING, replica)
 
@@ -1643,6 +1757,14 @@ class DeploymentStateManager:
             pickle.dumps((deployment_state_info, self._deleted_deployment_metadata)),
         )
 
+    def record_multiplexed_model_ids(
+        self, deployment_name: str, replica_tag: ReplicaTag, model_ids: List[str]
+    ) -> None:
+        if deployment_name in self._deployment_states:
+            self._deployment_states[deployment_name].record_multiplexed_model_ids(
+                replica_tag, model_ids
+            )
+
     def get_running_replica_infos(
         self,
     ) -> Dict[str, List[RunningReplicaInfo]]:
@@ -1709,10 +1831,20 @@ class DeploymentStateManager:
         if deployment_name in self._deployment_states:
             self._deployment_states[deployment_name].delete()
 
-    def update(self):
-        """Updates the state of all deployments to match their goal state."""
+    def update(self) -> bool:
+        """Updates the state of all deployments to match their goal state.
+
+        The deployments in steady state are skipped until they must check
+        the health of their replicas.
+
+        Returns whether any deployment was updated.
+        """
         deleted_tags = []
+        any_updated = False
         for deployment_name, deployment_state in self._deployment_states.items():
+            if not deployment_state.needs_update():
+                continue
+            any_updated = True
             deleted = deployment_state.update()
             if deleted:
                 deleted_tags.append(deployment_name)
@@ -1724,3 +1856,5 @@ class DeploymentStateManager:
 
         for tag in deleted_tags:
             del self._deployment_states[tag]
+
+        return any_updated
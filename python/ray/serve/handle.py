@@ -30,6 +30,7 @@ class HandleOptions:
     """Options for each ServeHandle instances. These fields are immutable."""
 
     method_name: str = "__call__"
+    multiplexed_model_id: str = ""
 
 
 class RayServeHandle:
@@ -113,16 +114,22 @@ class RayServeHandle:
         self,
         *,
         method_name: Union[str, DEFAULT] = DEFAULT.VALUE,
+        multiplexed_model_id: Union[str, DEFAULT] = DEFAULT.VALUE,
     ):
         """Set options for this handle.
 
         Args:
             method_name(str): The method to invoke.
+            multiplexed_model_id(str): The model to send requests for, in a
+                deployment using `@serve.multiplexed`.
         """
         new_options_dict = self.handle_options.__dict__.copy()
         user_modified_options_dict = {
             key: value
-            for key, value in zip(["method_name"], [method_name])
+            for key, value in zip(
+                ["method_name", "multiplexed_model_id"],
+                [method_name, multiplexed_model_id],
+            )
             if value != DEFAULT.VALUE
         }
         new_options_dict.update(user_modified_options_dict)
@@ -142,6 +149,7 @@ class RayServeHandle:
             deployment_name,
             call_method=handle_options.method_name,
             http_arg_is_pickled=self._pickled_http_request,
+            multiplexed_model_id=handle_options.multiplexed_model_id,
         )
         coro = self.router.assign_request(request_metadata, *args, **kwargs)
         return coro
@@ -1,5 +1,6 @@
 import asyncio
 from asyncio.tasks import FIRST_COMPLETED
+import dataclasses
 import socket
 import time
 import pickle
@@ -15,39 +16,176 @@ from ray.exceptions import RayActorError, RayTaskError
 from ray.serve.common import EndpointInfo, EndpointTag
 from ray.serve.long_poll import LongPollNamespace
 from ray.util import metrics
-from ray.serve.utils import logger
+from ray.serve.exceptions import RayServeException
+from ray.serve.utils import get_random_letters, logger
 from ray.serve.handle import RayServeHandle
 from ray.serve.http_util import (
+    ASGIMessageQueue,
+    ASGIMessageStream,
     HTTPRequestWrapper,
+    is_final_asgi_message,
     RawASGIResponse,
     receive_http_body,
     Response,
 )
 from ray.serve.long_poll import LongPollClient
+from ray.serve.constants import SERVE_MULTIPLEXED_MODEL_ID
 
 MAX_REPLICA_FAILURE_RETRIES = 10
 DISCONNECT_ERROR_CODE = "disconnection"
 
 
-async def _send_request_to_handle(handle, scope, receive, send) -> str:
-    http_body_bytes = await receive_http_body(scope, receive, send)
+async def _stream_request_body(receive, queue: ASGIMessageQueue) -> Dict:
+    """Forward the body messages to the queue as they arrive.
+
+    Returns the disconnect message, either when the client disconnects while
+    sending the body or, after the whole body has been received, once the
+    next `receive` call returns (which can only be `http.disconnect`).
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            # Let the replica know if it's still reading the body.
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                pass
+            return message
+        await queue.put(message)
+        if is_final_asgi_message(message):
+            break
+    return await receive()
+
+
+async def _send_streamed_response(
+    stream: ASGIMessageStream, scope, send, client_disconnection_task
+) -> str:
+    """Send the messages of a response streamed by a replica as they arrive."""
+    loop = asyncio.get_event_loop()
+    status_code = "200"
+    while True:
+        receive_task = loop.create_task(stream.receive_messages())
+        done, _ = await asyncio.wait(
+            [receive_task, client_disconnection_task], return_when=FIRST_COMPLETED
+        )
+        if receive_task not in done:
+            logger.warning(
+                f"Client from {scope['client']} disconnected, cancelling the "
+                "streamed response."
+            )
+            receive_task.cancel()
+            stream.actor_handle.cancel_asgi_stream.remote(stream.stream_id)
+            return DISCONNECT_ERROR_CODE
+        try:
+            messages = receive_task.result()
+        except (RayTaskError, RayActorError) as error:
+            # The response has already started, so it can only be aborted.
+            logger.error(f"Streamed response failed: {error}")
+            return "500"
+        for message in messages:
+            if message["type"] == "http.response.start":
+                status_code = str(message["status"])
+            await send(message)
+            if is_final_asgi_message(message):
+                return status_code
+
+
+async def _send_request_to_handle(
+    handle,
+    scope,
+    receive,
+    send,
+    request_body_streams: Optional[Dict[str, ASGIMessageQueue]] = None,
+    multiplexed_model_id: str = "",
+) -> str:
+    """Send the request to a replica through the handle, and its response to
+    the client.
+
+    If the request body arrives in several chunks and `request_body_streams`
+    is passed, the body is streamed to the replica instead of being buffered
+    in full: the queue of its messages is added to `request_body_streams`
+    for the replica to pull from, until the request completes.
+
+    If `multiplexed_model_id` is set, the request is sent to the replicas
+    that have the model loaded.
+    """
+    loop = asyncio.get_event_loop()
+    body_queue = None
+    body_stream = None
+    if request_body_streams is None:
+        http_body_bytes = await receive_http_body(scope, receive, send)
+    else:
+        message = await receive()
+        assert message["type"] == "http.request"
+        http_body_bytes = message["body"]
+        if message.get("more_body", False):
+            body_queue = ASGIMessageQueue()
+            body_stream = ASGIMessageStream(
+                ray.get_runtime_context().current_actor, get_random_letters(10)
+            )
+            request_body_streams[body_stream.stream_id] = body_queue
 
     # NOTE(edoakes): it's important that we defer building the starlette
     # request until it reaches the replica to avoid unnecessary
     # serialization cost, so we use a simple dataclass here.
-    request = HTTPRequestWrapper(scope, http_body_bytes)
+    request = HTTPRequestWrapper(scope, http_body_bytes, body_stream)
     # Perform a pickle here to improve latency. Stdlib pickle for simple
     # dataclasses are 10-100x faster than cloudpickle.
     request = pickle.dumps(request)
 
+    if body_queue is not None:
+        # The rest of the body is streamed, and the task completes when the
+        # client disconnects.
+        client_disconnection_task = loop.create_task(
+            _stream_request_body(receive, body_queue)
+        )
+    else:
+        # We have received all the http request conent. The next `receive`
+        # call might never arrive; if it does, it can only be
+        # `http.disconnect`.
+        client_disconnection_task = loop.create_task(receive())
+    try:
+        return await _assign_request(
+            handle,
+            scope,
+            receive,
+            send,
+            request,
+            client_disconnection_task,
+            body_queue,
+            multiplexed_model_id,
+        )
+    finally:
+        client_disconnection_task.cancel()
+        if body_stream is not None:
+            del request_body_streams[body_stream.stream_id]
+
+
+async def _assign_request(
+    handle,
+    scope,
+    receive,
+    send,
+    request: bytes,
+    client_disconnection_task: asyncio.Task,
+    body_queue: Optional[ASGIMessageQueue],
+    multiplexed_model_id: str,
+) -> str:
+    # The options are set per request rather than with `handle.options()`,
+    # which would create a new handle (and metrics) for each request.
+    handle_options = handle.handle_options
+    if multiplexed_model_id:
+        handle_options = dataclasses.replace(
+            handle_options, multiplexed_model_id=multiplexed_model_id
+        )
     retries = 0
     backoff_time_s = 0.05
     loop = asyncio.get_event_loop()
-    # We have received all the http request conent. The next `receive`
-    # call might never arrive; if it does, it can only be `http.disconnect`.
-    client_disconnection_task = loop.create_task(receive())
     while retries < MAX_REPLICA_FAILURE_RETRIES:
-        assignment_task = loop.create_task(handle.remote(request))
+        handle.request_counter.inc()
+        assignment_task = loop.create_task(
+            handle._remote(handle.deployment_name, handle_options, (request,), {})
+        )
         done, _ = await asyncio.wait(
             [assignment_task, client_disconnection_task], return_when=FIRST_COMPLETED
         )
@@ -67,7 +205,6 @@ async def _send_request_to_handle(handle, scope, receive, send) -> str:
         try:
             object_ref = await assignment_task
             result = await object_ref
-            client_disconnection_task.cancel()
             break
         except asyncio.CancelledError:
             # Here because the client disconnected, we will return a custom
@@ -78,6 +215,13 @@ async def _send_request_to_handle(handle, scope, receive, send) -> str:
             await Response(error_message, status_code=500).send(scope, receive, send)
             return "500"
         except RayActorError:
+            if body_queue is not None and body_queue.started:
+                # The streamed body can't be sent again to another replica.
+                error_message = "Replica failed while receiving the request body."
+                await Response(error_message, status_code=500).send(
+                    scope, receive, send
+                )
+                return "500"
             logger.debug(
                 "Request failed due to replica failure. There are "
                 f"{MAX_REPLICA_FAILURE_RETRIES - retries} retries "
@@ -94,7 +238,11 @@ async def _send_request_to_handle(handle, scope, receive, send) -> str:
         await Response(error_message, status_code=500).send(scope, receive, send)
         return "500"
 
-    if isinstance(result, (starlette.responses.Response, RawASGIResponse)):
+    if isinstance(result, ASGIMessageStream):
+        return await _send_streamed_response(
+            result, scope, send, client_disconnection_task
+        )
+    elif isinstance(result, (starlette.responses.Response, RawASGIResponse)):
         await result(scope, receive, send)
         return str(result.status_code)
     else:
@@ -134,7 +282,7 @@ class LongestPrefixRouter:
 
         # Clean up any handles that are no longer used.
         for endpoint in existing_handles:
-            del self.handles[endpoint]
+            self.handles.pop(endpoint).router.shutdown()
 
         # Routes are sorted in order of decreasing length to enable longest
         # prefix matching.
@@ -193,6 +341,8 @@ class HTTPProxy:
 
         # Used only for displaying the route table.
         self.route_info: Dict[str, EndpointTag] = dict()
+        # Bodies of the requests being streamed to replicas, by stream ID.
+        self.request_body_streams: Dict[str, ASGIMessageQueue] = dict()
 
         def get_handle(name):
             return serve.api.internal_get_global_client().get_handle(
@@ -250,6 +400,14 @@ class HTTPProxy:
                     return
             await asyncio.sleep(0.2)
 
+    async def receive_asgi_messages(self, stream_id: str) -> List[Dict]:
+        if stream_id not in self.request_body_streams:
+            raise RayServeException(
+                f"Request body stream {stream_id} doesn't exist, the request "
+                "has completed."
+            )
+        return await self.request_body_streams[stream_id].get_messages()
+
     async def _not_found(self, scope, receive, send):
         current_path = scope["path"]
         response = Response(
@@ -294,7 +452,22 @@ class HTTPProxy:
             scope["path"] = route_path.replace(route_prefix, "", 1)
             scope["root_path"] = root_path + route_prefix
 
-        status_code = await _send_request_to_handle(handle, scope, receive, send)
+        # Route the requests for a multiplexed model to the replicas that
+        # have it loaded.
+        multiplexed_model_id = ""
+        for key, value in scope["headers"]:
+            if key.decode() == SERVE_MULTIPLEXED_MODEL_ID:
+                multiplexed_model_id = value.decode()
+                break
+
+        status_code = await _send_request_to_handle(
+            handle,
+            scope,
+            receive,
+            send,
+            self.request_body_streams,
+            multiplexed_model_id,
+        )
         if status_code != "200":
             self.request_error_counter.inc(
                 tags={"route": route_path, "error_code": status_code}
@@ -357,6 +530,9 @@ class HTTPProxyActor:
     ):
         await self.app.block_until_endpoint_exists(endpoint, timeout_s)
 
+    async def receive_asgi_messages(self, stream_id: str) -> List[Dict]:
+        return await self.app.receive_asgi_messages(stream_id)
+
     async def run(self):
         sock = socket.socket()
         # These two socket options will allow multiple process to bind the the
@@ -1,45 +1,172 @@
 import asyncio
+from collections import deque
 from dataclasses import dataclass
 import inspect
 import json
-from typing import Any, Dict, Type
+from typing import Any, Dict, List, Optional, Type
 
 import starlette.responses
 import starlette.requests
 from starlette.types import Send, ASGIApp
 
+from ray.actor import ActorHandle
+from ray.serve.constants import HTTP_STREAM_MAX_BUFFERED_MESSAGES
 from ray.serve.exceptions import RayServeException
 
 
+@dataclass
+class ASGIMessageStream:
+    """Reference to a stream of ASGI messages sent by another actor.
+
+    The messages are pulled in batches by calling `receive_asgi_messages` on
+    the actor: the HTTP proxy sends the bodies of streamed requests, and the
+    replicas send streamed responses.
+    """
+
+    actor_handle: ActorHandle
+    stream_id: str
+
+    async def receive_messages(self) -> List[Dict[str, Any]]:
+        return await self.actor_handle.receive_asgi_messages.remote(self.stream_id)
+
+
 @dataclass
 class HTTPRequestWrapper:
     scope: Dict[Any, Any]
     body: bytes
+    # Set if the body didn't arrive in a single message. In that case `body`
+    # is only the first chunk, and the rest is pulled from the HTTP proxy as
+    # the replica reads the request.
+    body_stream: Optional[ASGIMessageStream] = None
+
+
+def is_final_asgi_message(message: Dict[str, Any]) -> bool:
+    """Whether no more messages follow this one in a request or response."""
+    if message["type"] == "http.disconnect":
+        return True
+    if message["type"] in ("http.request", "http.response.body"):
+        return not message.get("more_body", False)
+    return False
+
+
+class ASGIMessageQueue:
+    """Buffers the ASGI messages of a stream until the receiver pulls them.
+
+    The sender waits when the buffer is full, so that a slow receiver applies
+    backpressure instead of the whole body piling up in memory. The receiver
+    pulls all the buffered messages at once, to amortize the actor call.
+
+    An exception put in the queue is raised to the receiver.
+    """
+
+    def __init__(
+        self,
+        max_size: int = HTTP_STREAM_MAX_BUFFERED_MESSAGES,
+        timeout_s: Optional[float] = None,
+    ):
+        self._queue = asyncio.Queue(maxsize=max_size)
+        self._timeout_s = timeout_s
+        # Whether the receiver has started pulling messages.
+        self.started = False
+
+    async def put(self, message: Any) -> None:
+        """Wait for space in the buffer and add the message.
+
+        Raises asyncio.TimeoutError if the receiver doesn't pull any message
+        within the timeout.
+        """
+        await asyncio.wait_for(self._queue.put(message), self._timeout_s)
+
+    def put_nowait(self, message: Any) -> None:
+        """Add the message, raising asyncio.QueueFull if the buffer is full."""
+        self._queue.put_nowait(message)
+
+    async def join(self) -> None:
+        """Wait until the receiver has pulled all the messages."""
+        await self._queue.join()
+
+    async def get_messages(self) -> List[Dict[str, Any]]:
+        """Wait for at least one message and return all buffered messages."""
+        self.started = True
+        items = [await self._queue.get()]
+        self._queue.task_done()
+        items.extend(self._get_all_nowait())
+        for item in items:
+            if isinstance(item, Exception):
+                raise item
+        return items
+
+    def get_messages_nowait(self) -> List[Dict[str, Any]]:
+        """Return all buffered messages without waiting."""
+        return self._get_all_nowait()
+
+    def _get_all_nowait(self) -> List[Any]:
+        items = []
+        while not self._queue.empty():
+            items.append(self._queue.get_nowait())
+            self._queue.task_done()
+        return items
+
+
+class BoundASGIApp(ASGIApp):
+    """An ASGI app bound to the scope and receive channel of a request.
+
+    Ingress deployments return this instead of running the app themselves,
+    so that the replica can stream the response to the HTTP proxy.
+    """
+
+    def __init__(self, app: ASGIApp, scope, receive):
+        self._app = app
+        self._scope = scope
+        self._receive = receive
+
+    async def __call__(self, _scope, _receive, send):
+        await self._app(self._scope, self._receive, send)
 
 
-def build_starlette_request(scope, serialized_body: bytes):
+def build_starlette_request(
+    scope,
+    serialized_body: bytes,
+    body_stream: Optional[ASGIMessageStream] = None,
+):
     """Build and return a Starlette Request from ASGI payload.
 
     This function is intended to be used immediately before task invocation
-    happens.
+    happens. If `body_stream` is set, `serialized_body` is only the first
+    chunk of the body and the rest is pulled from the HTTP proxy as the
+    request is read.
     """
 
-    # Simulates receiving HTTP body from TCP socket.  In reality, the body has
-    # already been streamed in chunks and stored in serialized_body.
-    received = False
+    # Simulates receiving HTTP body from TCP socket. In reality, the body has
+    # already been received by the HTTP proxy, at least in part.
+    messages = deque(
+        [
+            {
+                "body": serialized_body,
+                "type": "http.request",
+                "more_body": body_stream is not None,
+            }
+        ]
+    )
+    more_messages = body_stream is not None
 
     async def mock_receive():
-        nonlocal received
+        nonlocal more_messages
+
+        if not messages and more_messages:
+            messages.extend(await body_stream.receive_messages())
 
         # If the request has already been received, starlette will keep polling
         # for HTTP disconnect. We will pause forever. The coroutine should be
         # cancelled by starlette after the response has been sent.
-        if received:
+        if not messages:
             block_forever = asyncio.Event()
             await block_forever.wait()
 
-        received = True
-        return {"body": serialized_body, "type": "http.request", "more_body": False}
+        message = messages.popleft()
+        if is_final_asgi_message(message):
+            more_messages = False
+        return message
 
     return starlette.requests.Request(scope, mock_receive)
 
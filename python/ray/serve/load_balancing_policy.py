@@ -0,0 +1,164 @@
+from abc import ABCMeta, abstractmethod
+import itertools
+import random
+from typing import Callable, Iterable, List, Optional
+
+import ray
+from ray.serve.common import RunningReplicaInfo
+from ray.serve.utils import import_attr
+
+# Returns the number of queries in flight to the given replica from this router.
+GetNumInFlight = Callable[[RunningReplicaInfo], int]
+
+
+class LoadBalancingPolicy:
+    """Defines the interface for a load balancing policy.
+
+    The router of each handle (and of the HTTP proxy) uses a policy to choose
+    the replica to send each query to. The policy orders the replicas for
+    each query, and the router assigns the query to the first replica that
+    has fewer than ``max_concurrent_queries`` queries in flight. If all of
+    them are busy, the query waits and the policy is asked again when a
+    query completes.
+
+    To add a new policy, a class should be defined that provides this
+    interface, and passed as the import path of the class (e.g.,
+    "my_module.MyPolicy") in the ``_load_balancing_policy`` deployment option.
+    Each router has its own instance of the policy, so the policy only knows
+    about the queries sent by its router.
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self):
+        self.replicas: List[RunningReplicaInfo] = []
+
+    def update_replicas(self, replicas: List[RunningReplicaInfo]) -> None:
+        """Called when the set of running replicas changes."""
+        self.replicas = list(replicas)
+
+    @abstractmethod
+    def choose_replicas(self, get_num_in_flight: GetNumInFlight) -> Iterable:
+        """Return the replicas to try for the next query, in order.
+
+        The returned iterable is consumed lazily, until a replica that isn't
+        overloaded is found.
+
+        Arguments:
+            get_num_in_flight: Returns the number of queries in flight to a
+                replica from this router.
+        """
+        return []
+
+
+class RoundRobinPolicy(LoadBalancingPolicy):
+    """Cycles through the replicas, skipping the overloaded ones.
+
+    The replicas are shuffled on every update, so that routers don't all
+    send their queries to the same replica at the same time.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._replica_iterator = itertools.cycle(self.replicas)
+
+    def update_replicas(self, replicas: List[RunningReplicaInfo]) -> None:
+        super().update_replicas(replicas)
+        random.shuffle(self.replicas)
+        self._replica_iterator = itertools.cycle(self.replicas)
+
+    def choose_replicas(self, get_num_in_flight: GetNumInFlight) -> Iterable:
+        return itertools.islice(self._replica_iterator, len(self.replicas))
+
+
+class LeastOutstandingRequestsPolicy(LoadBalancingPolicy):
+    """Sends each query to the replica with the fewest queries in flight.
+
+    Unlike round robin, this avoids queueing queries behind expensive ones,
+    at the cost of a scan over all replicas per query. Ties are broken
+    randomly.
+    """
+
+    def choose_replicas(self, get_num_in_flight: GetNumInFlight) -> Iterable:
+        return _sort_by_num_in_flight(self.replicas, get_num_in_flight)
+
+
+class PowerOfTwoChoicesPolicy(LoadBalancingPolicy):
+    """Samples two random replicas and sends the query to the one with fewer
+    queries in flight.
+
+    This balances load almost as well as least outstanding requests, in
+    constant time, and routers don't all pick the same least loaded replica.
+    If both replicas are overloaded, the other replicas are tried in random
+    order.
+    """
+
+    def choose_replicas(self, get_num_in_flight: GetNumInFlight) -> Iterable:
+        if len(self.replicas) <= 2:
+            yield from _sort_by_num_in_flight(self.replicas, get_num_in_flight)
+            return
+        indices = random.sample(range(len(self.replicas)), 2)
+        choices = [self.replicas[i] for i in indices]
+        yield from _sort_by_num_in_flight(choices, get_num_in_flight)
+        rest = [r for i, r in enumerate(self.replicas) if i not in indices]
+        random.shuffle(rest)
+        yield from rest
+
+
+class SameNodeFirstPolicy(LoadBalancingPolicy):
+    """Prefers the replicas on the node of the router, i.e., of the HTTP proxy
+    or of the replica calling the deployment through a handle.
+
+    This avoids transferring requests and responses across nodes. The local
+    replicas are tried in order of queries in flight, and the other replicas
+    are only used once all local replicas are overloaded.
+    """
+
+    def __init__(self, node_id: Optional[str] = None):
+        super().__init__()
+        self._node_id = node_id or ray.get_runtime_context().node_id
+        self._local_replicas = []
+        self._remote_replicas = []
+
+    def update_replicas(self, replicas: List[RunningReplicaInfo]) -> None:
+        super().update_replicas(replicas)
+        self._local_replicas = [r for r in replicas if r.node_id == self._node_id]
+        self._remote_replicas = [r for r in replicas if r.node_id != self._node_id]
+
+    def choose_replicas(self, get_num_in_flight: GetNumInFlight) -> Iterable:
+        yield from _sort_by_num_in_flight(self._local_replicas, get_num_in_flight)
+        yield from _sort_by_num_in_flight(self._remote_replicas, get_num_in_flight)
+
+
+LOAD_BALANCING_POLICIES = {
+    "round_robin": RoundRobinPolicy,
+    "least_outstanding_requests": LeastOutstandingRequestsPolicy,
+    "power_of_two_choices": PowerOfTwoChoicesPolicy,
+    "same_node_first": SameNodeFirstPolicy,
+}
+
+
+def create_load_balancing_policy(name: str) -> LoadBalancingPolicy:
+    """Create the policy with the given name, or the import path of a
+    LoadBalancingPolicy subclass."""
+    if name in LOAD_BALANCING_POLICIES:
+        return LOAD_BALANCING_POLICIES[name]()
+    policy_cls = import_attr(name)
+    if not (
+        isinstance(policy_cls, type) and issubclass(policy_cls, LoadBalancingPolicy)
+    ):
+        raise TypeError(
+            f"The load balancing policy '{name}' must be one of "
+            f"{list(LOAD_BALANCING_POLICIES)} or the import path of a "
+            "LoadBalancingPolicy subclass."
+        )
+    return policy_cls()
+
+
+def _sort_by_num_in_flight(
+    replicas: List[RunningReplicaInfo], get_num_in_flight: GetNumInFlight
+) -> List[RunningReplicaInfo]:
+    replicas = list(replicas)
+    # Shuffle first, so that ties are broken randomly.
+    random.shuffle(replicas)
+    return sorted(replicas, key=get_num_in_flight)
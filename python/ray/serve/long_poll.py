@@ -2,10 +2,22 @@ import asyncio
 from asyncio.events import AbstractEventLoop
 import random
 import os
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Tuple, Callable, DefaultDict, Dict, Set, Union
+from operator import attrgetter
+from typing import (
+    Any,
+    Tuple,
+    Callable,
+    DefaultDict,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Union,
+)
 
 import ray
 from ray.serve.utils import logger
@@ -22,6 +34,10 @@ LISTEN_FOR_CHANGE_REQUEST_TIMEOUT_S = (
     int(os.environ.get("LISTEN_FOR_CHANGE_REQUEST_TIMEOUT_S_UPPER_BOUND", "60")),
 )
 
+# The number of previous snapshots of each object kept by the LongPollHost, to
+# send the clients that have one of them only the items that changed since.
+LONG_POLL_SNAPSHOT_HISTORY_SIZE = 16
+
 
 class LongPollNamespace(Enum):
     def __repr__(self):
@@ -31,19 +47,85 @@ class LongPollNamespace(Enum):
     ROUTE_TABLE = auto()
 
 
+# Type signature for the update state callbacks. E.g.
+# async def update_state(updated_object: Any):
+#     do_something(updated_object)
+UpdateStateCallable = Callable[[Any], None]
+KeyType = Union[str, LongPollNamespace, Tuple[LongPollNamespace, str]]
+
+# The functions identifying the items of the objects that are lists, so that
+# they can be delta-encoded like dictionaries.
+_ITEM_KEY_FUNCTIONS: Dict[LongPollNamespace, Callable[[Any], Hashable]] = {
+    LongPollNamespace.RUNNING_REPLICAS: attrgetter("replica_tag"),
+}
+
+
+def _get_items(object_key: KeyType, snapshot: Any) -> Optional[Dict[Hashable, Any]]:
+    """Returns a copy of the items of the snapshot by key, or None if the
+    snapshot can't be delta-encoded."""
+    if isinstance(snapshot, dict):
+        return dict(snapshot)
+
+    namespace = object_key[0] if isinstance(object_key, tuple) else object_key
+    key_function = _ITEM_KEY_FUNCTIONS.get(namespace)
+    if key_function is not None and isinstance(snapshot, list):
+        return {key_function(item): item for item in snapshot}
+    return None
+
+
+def _item_changed(old_item: Any, new_item: Any) -> bool:
+    if old_item is new_item:
+        return False
+    # Compare all the attributes, including the dataclass fields excluded
+    # from __eq__.
+    return getattr(old_item, "__dict__", old_item) != getattr(
+        new_item, "__dict__", new_item
+    )
+
+
+@dataclass
+class SnapshotDelta:
+    """The items that changed between two snapshots of an object."""
+
+    # The snapshot the changes apply to.
+    base_snapshot_id: int
+    updated_items: Dict[Hashable, Any]
+    removed_keys: List[Hashable]
+
+    @classmethod
+    def compute(
+        cls,
+        base_snapshot_id: int,
+        base_items: Dict[Hashable, Any],
+        items: Dict[Hashable, Any],
+    ) -> "SnapshotDelta":
+        return cls(
+            base_snapshot_id=base_snapshot_id,
+            updated_items={
+                key: item
+                for key, item in items.items()
+                if key not in base_items or _item_changed(base_items[key], item)
+            },
+            removed_keys=[key for key in base_items if key not in items],
+        )
+
+    def apply(self, object_key: KeyType, base_snapshot: Any) -> Any:
+        items = _get_items(object_key, base_snapshot)
+        for key in self.removed_keys:
+            items.pop(key, None)
+        items.update(self.updated_items)
+        return items if isinstance(base_snapshot, dict) else list(items.values())
+
+
 @dataclass
 class UpdatedObject:
     object_snapshot: Any
     # The identifier for the object's version. There is not sequential relation
     # among different object's snapshot_ids.
     snapshot_id: int
-
-
-# Type signature for the update state callbacks. E.g.
-# async def update_state(updated_object: Any):
-#     do_something(updated_object)
-UpdateStateCallable = Callable[[Any], None]
-KeyType = Union[str, LongPollNamespace, Tuple[LongPollNamespace, str]]
+    # Sent instead of the object_snapshot when the client has a recent
+    # snapshot of the object.
+    delta: Optional[SnapshotDelta] = None
 
 
 class LongPollClient:
@@ -148,13 +230,17 @@ class LongPollClient:
             f"{list(updates.keys())}."
         )
         for key, update in updates.items():
-            self.object_snapshots[key] = update.object_snapshot
+            if update.delta is not None:
+                object_snapshot = update.delta.apply(key, self.object_snapshots[key])
+            else:
+                object_snapshot = update.object_snapshot
+            self.object_snapshots[key] = object_snapshot
             self.snapshot_ids[key] = update.snapshot_id
             callback = self.key_listeners[key]
 
             # Bind the parameters because closures are late-binding.
             # https://docs.python-guide.org/writing/gotchas/#late-binding-closures # noqa: E501
-            def chained(callback=callback, arg=update.object_snapshot):
+            def chained(callback=callback, arg=object_snapshot):
                 callback(arg)
                 self._on_callback_completed(trigger_at=len(updates))
 
@@ -173,15 +259,28 @@ class LongPollHost:
     outdated object and immediately return the result. If the client has the
     up-to-date verison, then the listen_for_change call will only return when
     the object is updated.
+
+    Objects that are dictionaries, or lists whose items have a key function
+    in _ITEM_KEY_FUNCTIONS, are delta-encoded: a client that has one of the
+    recent snapshots of the object only receives the items that changed
+    since, which is computed once for all the clients with that snapshot.
     """
 
     def __init__(self):
-        # Map object_key -> int
+        # Map object_key -> int. The IDs start at random in a large range so
+        # that the clients of a restarted host don't match an old snapshot.
         self.snapshot_ids: DefaultDict[KeyType, int] = defaultdict(
-            lambda: random.randint(0, 1_000_000)
+            lambda: random.randint(0, 2 ** 62)
         )
         # Map object_key -> object
         self.object_snapshots: Dict[KeyType, Any] = dict()
+        # Map object_key -> OrderedDict(snapshot_id -> items by key) of the
+        # recent snapshots of the objects that can be delta-encoded.
+        self.snapshot_items: DefaultDict[
+            KeyType, Dict[int, Dict[Hashable, Any]]
+        ] = defaultdict(OrderedDict)
+        # Map object_key -> (base snapshot_id -> delta to the latest snapshot)
+        self.deltas: DefaultDict[KeyType, Dict[int, SnapshotDelta]] = defaultdict(dict)
         # Map object_key -> set(asyncio.Event waiting for updates)
         self.notifier_events: DefaultDict[KeyType, Set[asyncio.Event]] = defaultdict(
             set
@@ -203,7 +302,7 @@ class LongPollHost:
         # If there are any outdated keys (by comparing snapshot ids)
         # return immediately.
         client_outdated_keys = {
-            key: UpdatedObject(self.object_snapshots[key], self.snapshot_ids[key])
+            key: self._get_updated_object(key, keys_to_snapshot_ids[key])
             for key in existent_keys
             if self.snapshot_ids[key] != keys_to_snapshot_ids[key]
         }
@@ -235,12 +334,28 @@ class LongPollHost:
         else:
             updated_object_key: str = async_task_to_watched_keys[done.pop()]
             return {
-                updated_object_key: UpdatedObject(
-                    self.object_snapshots[updated_object_key],
-                    self.snapshot_ids[updated_object_key],
+                updated_object_key: self._get_updated_object(
+                    updated_object_key, keys_to_snapshot_ids[updated_object_key]
                 )
             }
 
+    def _get_updated_object(
+        self, object_key: KeyType, client_snapshot_id: int
+    ) -> UpdatedObject:
+        snapshot_id = self.snapshot_ids[object_key]
+        snapshot_items = self.snapshot_items.get(object_key)
+        if snapshot_items is None or client_snapshot_id not in snapshot_items:
+            return UpdatedObject(self.object_snapshots[object_key], snapshot_id)
+
+        deltas = self.deltas[object_key]
+        if client_snapshot_id not in deltas:
+            deltas[client_snapshot_id] = SnapshotDelta.compute(
+                client_snapshot_id,
+                snapshot_items[client_snapshot_id],
+                snapshot_items[snapshot_id],
+            )
+        return UpdatedObject(None, snapshot_id, deltas[client_snapshot_id])
+
     def notify_changed(
         self,
         object_key: KeyType,
@@ -248,6 +363,17 @@ class LongPollHost:
     ):
         self.snapshot_ids[object_key] += 1
         self.object_snapshots[object_key] = updated_object
+
+        # The items are copied as the object may be modified in place later.
+        items = _get_items(object_key, updated_object)
+        snapshot_items = self.snapshot_items[object_key]
+        if items is None:
+            snapshot_items.clear()
+        else:
+            snapshot_items[self.snapshot_ids[object_key]] = items
+            while len(snapshot_items) > LONG_POLL_SNAPSHOT_HISTORY_SIZE:
+                snapshot_items.popitem(last=False)
+        self.deltas.pop(object_key, None)
         logger.debug(f"LongPollHost: Notify change for key {object_key}.")
 
         if object_key in self.notifier_events:
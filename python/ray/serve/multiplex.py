@@ -0,0 +1,217 @@
+import asyncio
+from collections import OrderedDict
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+import ray
+from ray.serve.batching import extract_self_if_method_call
+from ray.serve.utils import logger
+from ray.util import metrics
+from ray.util.annotations import PublicAPI
+
+# The model ID of the request being handled by the replica, set from its
+# metadata.
+_multiplexed_model_id: ContextVar[str] = ContextVar(
+    "serve_multiplexed_model_id", default=""
+)
+
+
+def _set_multiplexed_model_id(model_id: str) -> None:
+    _multiplexed_model_id.set(model_id)
+
+
+@PublicAPI(stability="alpha")
+def get_multiplexed_model_id() -> str:
+    """Returns the model ID of the request being handled, or "" if unset.
+
+    The model ID is set by the `serve_multiplexed_model_id` header of HTTP
+    requests, or with `handle.options(multiplexed_model_id=...)`.
+
+    Example:
+        >>> @serve.deployment
+            class ModelHost:
+                @serve.multiplexed(max_num_models_per_replica=10)
+                async def get_model(self, model_id: str):
+                    return await load_model_from_storage(model_id)
+
+                async def __call__(self, request):
+                    model_id = serve.get_multiplexed_model_id()
+                    model = await self.get_model(model_id)
+                    return model.predict(await request.json())
+    """
+    return _multiplexed_model_id.get()
+
+
+class _ModelMultiplexWrapper:
+    """Holds the models loaded by a replica in an LRU cache.
+
+    Loading a model that isn't cached first evicts the least recently used
+    models to keep at most `max_num_models` (including the ones being
+    loaded), so that their resources are freed before loading it.
+    Concurrent requests for a model being loaded wait for the same load.
+    The IDs of the models are reported to the controller whenever they
+    change, so that routers send the requests for a model to the replicas
+    that already loaded it.
+    """
+
+    def __init__(
+        self,
+        load_model_func: Callable,
+        self_arg: Optional[Any],
+        max_num_models: int,
+    ):
+        self._load_model_func = load_model_func
+        self._self_arg = self_arg
+        self.max_num_models = max_num_models
+        self.models: Dict[str, Any] = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._reported_model_ids: FrozenSet[str] = frozenset()
+        self._controller_handle = None
+
+        self.num_models_gauge = metrics.Gauge(
+            "serve_num_multiplexed_models",
+            description="The number of models loaded by the replica.",
+        )
+        self.num_model_loads = metrics.Counter(
+            "serve_multiplexed_model_loads",
+            description="The number of models loaded by the replica.",
+        )
+        self.num_model_unloads = metrics.Counter(
+            "serve_multiplexed_model_unloads",
+            description="The number of models evicted by the replica.",
+        )
+
+    async def load_model(self, model_id: str) -> Any:
+        if not isinstance(model_id, str) or model_id == "":
+            raise TypeError("The model ID must be a non-empty string.")
+
+        if model_id in self.models:
+            self.models.move_to_end(model_id)
+            return self.models[model_id]
+
+        load_future = self._loading.get(model_id)
+        if load_future is None:
+            load_future = asyncio.ensure_future(self._load_model(model_id))
+            self._loading[model_id] = load_future
+            load_future.add_done_callback(lambda _: self._loading.pop(model_id, None))
+        # Shielded so that a cancelled request doesn't cancel the load for
+        # the others waiting for it.
+        return await asyncio.shield(load_future)
+
+    async def _load_model(self, model_id: str) -> Any:
+        self._report_model_ids()
+        try:
+            while self.models and (
+                len(self.models) + len(self._loading) > self.max_num_models
+            ):
+                self._unload_model(next(iter(self.models)))
+
+            logger.info(f"Loading model '{model_id}'.")
+            if self._self_arg is None:
+                model = await self._load_model_func(model_id)
+            else:
+                model = await self._load_model_func(self._self_arg, model_id)
+            self.models[model_id] = model
+            self.num_model_loads.inc()
+            # Models loaded concurrently couldn't make room for each other.
+            while len(self.models) > self.max_num_models:
+                self._unload_model(next(iter(self.models)))
+            return model
+        finally:
+            self._loading.pop(model_id, None)
+            self.num_models_gauge.set(len(self.models))
+            self._report_model_ids()
+
+    def _unload_model(self, model_id: str) -> None:
+        # The model is released once the requests using it are done, models
+        # can free their resources in `__del__`.
+        logger.info(f"Unloading model '{model_id}'.")
+        del self.models[model_id]
+        self.num_model_unloads.inc()
+
+    def _report_model_ids(self) -> None:
+        model_ids = frozenset(self.models) | frozenset(self._loading)
+        if model_ids == self._reported_model_ids:
+            return
+        self._reported_model_ids = model_ids
+
+        context = ray.serve.api._INTERNAL_REPLICA_CONTEXT
+        if context is None:
+            # Not running in a replica.
+            return
+        if self._controller_handle is None:
+            self._controller_handle = ray.get_actor(
+                context._internal_controller_name,
+                namespace=context._internal_controller_namespace,
+            )
+        self._controller_handle.record_multiplexed_model_ids.remote(
+            context.deployment, context.replica_tag, list(model_ids)
+        )
+
+
+@PublicAPI(stability="alpha")
+def multiplexed(_func: Optional[Callable] = None, max_num_models_per_replica: int = 3):
+    """Wraps a function loading a model, to cache the models in each replica.
+
+    Serves many models from a single deployment: the function, which must be
+    `async def`, loads the model with the given ID. The replica keeps the
+    last `max_num_models_per_replica` models used, and calling the function
+    for one of them returns it without loading it again. Requests for a model
+    are routed to the replicas that have it loaded first.
+
+    See `serve.get_multiplexed_model_id()` for an example.
+
+    Arguments:
+        max_num_models_per_replica (int): the maximum number of models loaded
+            by each replica at a time.
+    """
+    if _func is not None:
+        if not callable(_func):
+            raise TypeError(
+                "@serve.multiplexed can only be used to decorate functions or "
+                "methods."
+            )
+
+        if not iscoroutinefunction(_func):
+            raise TypeError(
+                "Functions decorated with @serve.multiplexed must be 'async def'"
+            )
+
+    if not isinstance(max_num_models_per_replica, int):
+        raise TypeError("max_num_models_per_replica must be an integer >= 1")
+
+    if max_num_models_per_replica < 1:
+        raise ValueError("max_num_models_per_replica must be an integer >= 1")
+
+    def _multiplex_decorator(_func):
+        @wraps(_func)
+        async def multiplex_wrapper(*args):
+            self = extract_self_if_method_call(args, _func)
+            if self is None:
+                # For functions, inject the models as an attribute of the
+                # function.
+                wrapper_object = _func
+                model_id = args[0]
+            else:
+                # For methods, inject the models as an attribute of the object.
+                wrapper_object = self
+                model_id = args[1]
+
+            wrapper_attr = f"__serve_multiplex_{_func.__name__}"
+            if not hasattr(wrapper_object, wrapper_attr):
+                model_multiplex_wrapper = _ModelMultiplexWrapper(
+                    _func, self, max_num_models_per_replica
+                )
+                setattr(wrapper_object, wrapper_attr, model_multiplex_wrapper)
+            else:
+                model_multiplex_wrapper = getattr(wrapper_object, wrapper_attr)
+
+            return await model_multiplex_wrapper.load_model(model_id)
+
+        return multiplex_wrapper
+
+    # Like @serve.batch, handle both the non-parametrized and parametrized
+    # usage.
+    return _multiplex_decorator(_func) if callable(_func) else _multiplex_decorator
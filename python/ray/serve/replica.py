@@ -2,12 +2,13 @@ import asyncio
 import logging
 import pickle
 import inspect
-from typing import Any, Callable, Optional, Tuple, Dict
+from typing import Any, Callable, List, Optional, Tuple, Dict
 import time
 import aiorwlock
 from importlib import import_module
 
 import starlette.responses
+from starlette.types import ASGIApp
 
 import ray
 from ray import cloudpickle
@@ -18,15 +19,24 @@ from ray._private.async_compat import sync_to_async
 from ray.serve.autoscaling_metrics import start_metrics_pusher
 from ray.serve.common import ReplicaTag
 from ray.serve.config import DeploymentConfig
-from ray.serve.http_util import ASGIHTTPSender
-from ray.serve.utils import parse_request_item, _get_logger
+from ray.serve.http_util import (
+    ASGIHTTPSender,
+    ASGIMessageQueue,
+    ASGIMessageStream,
+    BoundASGIApp,
+    RawASGIResponse,
+)
+from ray.serve.multiplex import _set_multiplexed_model_id
+from ray.serve.utils import get_random_letters, parse_request_item, _get_logger
 from ray.serve.exceptions import RayServeException
 from ray.util import metrics
 from ray.serve.router import Query, RequestMetadata
 from ray.serve.constants import (
     HEALTH_CHECK_METHOD,
+    HTTP_STREAM_TIMEOUT_S,
     RECONFIGURE_METHOD,
     DEFAULT_LATENCY_BUCKET_MS,
+    RESPONSE_NOT_REUSABLE_STATUS,
 )
 from ray.serve.version import DeploymentVersion
 from ray.serve.utils import wrap_to_ray_error, parse_import_path
@@ -180,6 +190,12 @@ def create_replica_wrapper(
             query = Query(request_args, request_kwargs, request_metadata)
             return await self.replica.handle_request(query)
 
+        async def receive_asgi_messages(self, stream_id: str) -> List[Dict]:
+            return await self.replica.receive_asgi_messages(stream_id)
+
+        def cancel_asgi_stream(self, stream_id: str):
+            self.replica.cancel_asgi_stream(stream_id)
+
         async def is_allocated(self) -> str:
             """poke the replica to check whether it's alive.
 
@@ -249,6 +265,10 @@ class RayServeReplica:
         self.user_health_check = sync_to_async(user_health_check)
 
         self.num_ongoing_requests = 0
+        # Responses being streamed to the HTTP proxy, by stream ID.
+        self._response_streams: Dict[
+            str, Tuple[ASGIMessageQueue, asyncio.Task]
+        ] = dict()
 
         self.request_counter = metrics.Counter(
             "serve_deployment_request_counter",
@@ -363,8 +383,24 @@ class RayServeReplica:
             return self.callable
         return getattr(self.callable, method_name)
 
-    async def ensure_serializable_response(self, response: Any) -> Any:
-        if isinstance(response, starlette.responses.StreamingResponse):
+    async def ensure_serializable_response(
+        self, response: Any, stream: bool = False
+    ) -> Any:
+        """Convert responses that can't be pickled to ones that can.
+
+        If `stream` is set, i.e. the request comes from the HTTP proxy,
+        generators and streaming responses are streamed to the proxy instead
+        of being buffered in full.
+        """
+        if stream:
+            if inspect.isgenerator(response) or inspect.isasyncgen(response):
+                response = starlette.responses.StreamingResponse(response)
+            if isinstance(
+                response, (starlette.responses.StreamingResponse, BoundASGIApp)
+            ):
+                return await self._stream_asgi_response(response)
+
+        if isinstance(response, (starlette.responses.StreamingResponse, BoundASGIApp)):
 
             async def mock_receive():
                 # This is called in a tight loop in response() just to check
@@ -378,6 +414,80 @@ class RayServeReplica:
             return sender.build_asgi_response()
         return response
 
+    async def _stream_asgi_response(self, response: ASGIApp) -> Any:
+        """Run the ASGI response and stream its messages to the HTTP proxy.
+
+        If the response completes without sending the body in several chunks,
+        it's returned in one piece as a RawASGIResponse, which saves the round
+        trips of the stream. Otherwise, the rest of the response keeps running
+        in the background, and an ASGIMessageStream is returned for the proxy
+        to pull the messages from.
+        """
+        stream_id = get_random_letters(10)
+        queue = ASGIMessageQueue(timeout_s=HTTP_STREAM_TIMEOUT_S)
+        streaming = asyncio.Event()
+
+        async def mock_receive():
+            # The proxy cancels the stream if the client disconnects.
+            never_set_event = asyncio.Event()
+            await never_set_event.wait()
+
+        async def send(message):
+            await queue.put(message)
+            if message["type"] == "http.response.body" and message.get(
+                "more_body", False
+            ):
+                streaming.set()
+
+        async def run_response():
+            try:
+                await response(scope=None, receive=mock_receive, send=send)
+            except Exception as e:
+                if not streaming.is_set():
+                    raise
+                # The response has already started, the proxy can only abort
+                # it.
+                await queue.put(e)
+            if streaming.is_set():
+                await asyncio.wait_for(queue.join(), HTTP_STREAM_TIMEOUT_S)
+
+        def on_stream_done(task: asyncio.Task):
+            self._response_streams.pop(stream_id, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(
+                    f"Streaming response {stream_id} failed: {task.exception()!r}"
+                )
+
+        loop = asyncio.get_event_loop()
+        response_task = loop.create_task(run_response())
+        streaming_task = loop.create_task(streaming.wait())
+        await asyncio.wait(
+            [response_task, streaming_task], return_when=asyncio.FIRST_COMPLETED
+        )
+        streaming_task.cancel()
+        if not streaming.is_set():
+            # Raises the exception of the response, if any.
+            await response_task
+            return RawASGIResponse(queue.get_messages_nowait())
+
+        self._response_streams[stream_id] = (queue, response_task)
+        response_task.add_done_callback(on_stream_done)
+        return ASGIMessageStream(ray.get_runtime_context().current_actor, stream_id)
+
+    async def receive_asgi_messages(self, stream_id: str) -> List[Dict]:
+        if stream_id not in self._response_streams:
+            raise RayServeException(
+                f"Response stream {stream_id} doesn't exist, it has either "
+                "completed or timed out."
+            )
+        queue, _ = self._response_streams[stream_id]
+        return await queue.get_messages()
+
+    def cancel_asgi_stream(self, stream_id: str):
+        if stream_id in self._response_streams:
+            _, response_task = self._response_streams.pop(stream_id)
+            response_task.cancel()
+
     async def invoke_single(self, request_item: Query) -> Any:
         logger.debug(
             "Replica {} started executing request {}".format(
@@ -385,6 +495,8 @@ class RayServeReplica:
             )
         )
         args, kwargs = parse_request_item(request_item)
+        # Each request is handled in its own task, with its own context.
+        _set_multiplexed_model_id(request_item.metadata.multiplexed_model_id)
 
         start = time.time()
         method_to_call = None
@@ -399,7 +511,9 @@ class RayServeReplica:
                 # information, so we pass nothing into it
                 result = await method_to_call()
 
-            result = await self.ensure_serializable_response(result)
+            result = await self.ensure_serializable_response(
+                result, stream=request_item.metadata.http_arg_is_pickled
+            )
             self.request_counter.inc()
         except Exception as e:
             import os
@@ -458,7 +572,10 @@ class RayServeReplica:
                 )
             )
 
-            # Returns a small object for router to track request status.
+            # Returns a small object for router to track request status,
+            # which also tells whether the result can be cached.
+            if isinstance(result, (Exception, ASGIMessageStream)):
+                return RESPONSE_NOT_REUSABLE_STATUS, result
             return b"", result
 
     async def prepare_for_shutdown(self):
@@ -475,8 +592,12 @@ class RayServeReplica:
             # The handle_request method wasn't even invoked.
             if method_stat is None:
                 break
-            # The handle_request method has 0 inflight requests.
-            if method_stat["running"] + method_stat["pending"] == 0:
+            # The handle_request method has 0 inflight requests and all
+            # streamed responses have been sent.
+            if (
+                method_stat["running"] + method_stat["pending"] == 0
+                and not self._response_streams
+            ):
                 break
             else:
                 logger.info(
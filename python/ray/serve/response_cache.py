@@ -0,0 +1,166 @@
+import asyncio
+from collections import OrderedDict
+import functools
+import inspect
+import pickle
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import ray
+from ray.serve.config import ResponseCacheConfig
+from ray.serve.constants import RESPONSE_NOT_REUSABLE_STATUS
+from ray.serve.http_util import build_starlette_request, HTTPRequestWrapper
+from ray.serve.utils import import_attr, logger
+from ray.util import metrics
+
+# The HTTP methods whose responses are cached, unless keyed by a custom
+# function.
+_CACHED_HTTP_METHODS = {"GET", "HEAD"}
+# The HTTP headers that are part of the default key, so that responses aren't
+# shared across clients.
+_KEY_HTTP_HEADERS = {b"authorization", b"cookie"}
+
+
+class ResponseCache:
+    """Caches the responses of a deployment in a handle, keyed by request.
+
+    The responses are cached as the ObjectRefs returned by the router, so a
+    hit returns the same ObjectRef without sending the request to a replica
+    or copying the response. A response is only served from the cache once
+    the small status the replica returns along with it tells that it can be
+    reused, i.e., it's neither an error nor a stream, without fetching the
+    response. Until then, identical requests are sent to replicas as well.
+
+    Only GET and HEAD HTTP requests are cached by default, keyed by their
+    URL along with the headers that identify the client.
+
+    The cache holds at most `max_entries` responses, evicting the least
+    recently used ones, and responses expire after `ttl_s`.
+    """
+
+    def __init__(
+        self,
+        deployment_name: str,
+        config: ResponseCacheConfig,
+        event_loop: asyncio.AbstractEventLoop,
+    ):
+        self.config = config
+        self._event_loop = event_loop
+        self._key_function = None
+        if config.key_function is not None:
+            self._key_function = import_attr(config.key_function)
+        # Cached responses and the time they expire at, in LRU order.
+        self._entries: Dict[Hashable, Tuple[ray.ObjectRef, float]] = OrderedDict()
+        # Responses whose status isn't known yet, they aren't served.
+        self._pending: Dict[Hashable, ray.ObjectRef] = {}
+
+        self.num_hits = metrics.Counter(
+            "serve_response_cache_hits",
+            description="The number of requests answered from the response cache.",
+            tag_keys=("deployment",),
+        )
+        self.num_hits.set_default_tags({"deployment": deployment_name})
+        self.num_misses = metrics.Counter(
+            "serve_response_cache_misses",
+            description=(
+                "The number of cacheable requests that weren't found in the "
+                "response cache."
+            ),
+            tag_keys=("deployment",),
+        )
+        self.num_misses.set_default_tags({"deployment": deployment_name})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_key(
+        self, call_method: str, http_arg_is_pickled: bool, args: List, kwargs: Dict
+    ) -> Optional[Hashable]:
+        """Return the cache key of the request, or None if it can't be cached."""
+        if http_arg_is_pickled:
+            request: HTTPRequestWrapper = pickle.loads(args[0])
+            if request.body_stream is not None:
+                # The body hasn't been received in full.
+                return None
+            if self._key_function is None:
+                scope = request.scope
+                if scope["method"] not in _CACHED_HTTP_METHODS:
+                    return None
+                return (
+                    scope["method"],
+                    scope["root_path"],
+                    scope["path"],
+                    scope["query_string"],
+                    tuple(
+                        (name, value)
+                        for name, value in scope["headers"]
+                        if name.lower() in _KEY_HTTP_HEADERS
+                    ),
+                    request.body,
+                )
+            args = [build_starlette_request(request.scope, request.body)]
+        elif self._key_function is None:
+            try:
+                return call_method, pickle.dumps((args, sorted(kwargs.items())))
+            except Exception:
+                # E.g., ObjectRefs can't be pickled with the standard pickle.
+                return None
+
+        key = self._key_function(*args, **kwargs)
+        if inspect.isawaitable(key):
+            key = await key
+        return key
+
+    def get(self, key: Hashable) -> Optional[ray.ObjectRef]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] < time.time():
+            del self._entries[key]
+            entry = None
+
+        if entry is None:
+            self.num_misses.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        self.num_hits.inc()
+        return entry[0]
+
+    def put(self, key: Hashable, ref: ray.ObjectRef, status_ref: ray.ObjectRef) -> None:
+        """Cache the response ref once status_ref, the status of the request
+        returned by the replica along with it, tells that it can be reused."""
+        self._pending[key] = ref
+        status_ref._on_completed(
+            functools.partial(self._on_status_completed_threadsafe, key, ref)
+        )
+
+    def _on_status_completed_threadsafe(
+        self, key: Hashable, ref: ray.ObjectRef, status: Any
+    ) -> None:
+        # Called in a Ray thread, hand the status over to the event loop.
+        try:
+            self._event_loop.call_soon_threadsafe(
+                self._add_if_reusable, key, ref, status
+            )
+        except RuntimeError:
+            # The event loop is closed.
+            pass
+
+    def _add_if_reusable(self, key: Hashable, ref: ray.ObjectRef, status: Any) -> None:
+        # The response is stale if the cache was cleared since, or was
+        # superseded by a later identical request.
+        if self._pending.get(key) != ref:
+            return
+        del self._pending[key]
+        # The status is an exception if the replica failed.
+        if isinstance(status, Exception) or status == RESPONSE_NOT_REUSABLE_STATUS:
+            logger.debug(f"Not caching response: {status!r}.")
+            return
+
+        self._entries[key] = (ref, time.time() + self.config.ttl_s)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._pending.clear()
@@ -1,15 +1,25 @@
-import sys
 import asyncio
+import collections
+import functools
 import pickle
-import itertools
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-import random
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
 
 from ray.actor import ActorHandle
 from ray.serve.common import RunningReplicaInfo
+from ray.serve.constants import (
+    DEFAULT_LOAD_BALANCING_POLICY,
+    HANDLE_METRICS_PUSH_INTERVAL_S,
+)
+from ray.serve.load_balancing_policy import (
+    LoadBalancingPolicy,
+    RoundRobinPolicy,
+    create_load_balancing_policy,
+)
 from ray.serve.long_poll import LongPollClient, LongPollNamespace
-from ray.serve.utils import compute_iterable_delta, logger
+from ray.serve.response_cache import ResponseCache
+from ray.serve.utils import compute_iterable_delta, get_random_letters, logger
 
 import ray
 from ray.util import metrics
@@ -25,6 +35,9 @@ class RequestMetadata:
     # and it needs to be deserialized by the replica.
     http_arg_is_pickled: bool = False
 
+    # The model the request is for, in multiplexed deployments.
+    multiplexed_model_id: str = ""
+
 
 @dataclass
 class Query:
@@ -40,27 +53,31 @@ class ReplicaSet:
         self,
         deployment_name,
         event_loop: asyncio.AbstractEventLoop,
+        load_balancing_policy: Optional[LoadBalancingPolicy] = None,
     ):
         self.deployment_name = deployment_name
         self.in_flight_queries: Dict[RunningReplicaInfo, set] = dict()
-        # The iterator used for load balancing among replicas. Using itertools
-        # cycle, we implements a round-robin policy, skipping overloaded
-        # replicas.
-        # NOTE(simon): We can make this more pluggable and consider different
-        # policies like: min load, pick min of two replicas, pick replicas on
-        # the same node.
-        self.replica_iterator = itertools.cycle(self.in_flight_queries.keys())
-
-        # Used to unblock this replica set waiting for free replicas. A newly
-        # added replica or updated max_concurrent_queries value means the
-        # query that waits on a free replica might be unblocked on.
-
-        # Python 3.8 has deprecated the 'loop' parameter, and Python 3.10 has
-        # removed it alltogether. Call accordingly.
-        if sys.version_info.major >= 3 and sys.version_info.minor >= 10:
-            self.config_updated_event = asyncio.Event()
-        else:
-            self.config_updated_event = asyncio.Event(loop=event_loop)
+        # The IDs of the multiplexed models loaded by each replica, including
+        # the ones it was sent queries for since the last update.
+        self.multiplexed_model_ids: Dict[str, Set[str]] = dict()
+        # The policy used for load balancing among replicas, skipping
+        # overloaded replicas. Unless a policy is passed in, it's the policy
+        # configured for the deployment, which is received along with the
+        # running replicas.
+        self._policy_override = load_balancing_policy is not None
+        self._load_balancing_policy_name = DEFAULT_LOAD_BALANCING_POLICY
+        self.load_balancing_policy = load_balancing_policy or RoundRobinPolicy()
+
+        # The completion of each in-flight query is reported to the event loop
+        # by a callback on its tracker ref, which removes the query from
+        # in_flight_queries and wakes up one query waiting for a free replica.
+        # This makes freeing capacity O(1), instead of waiting on all the
+        # in-flight refs whenever the replicas are busy.
+        self._event_loop = event_loop
+        # Futures of the queries waiting for a free replica, in FIFO order. A
+        # newly added replica or updated max_concurrent_queries value wakes up
+        # all of them, a completed query wakes up the first one.
+        self._waiters: Deque[asyncio.Future] = collections.deque()
 
         self.num_queued_queries = 0
         self.num_queued_queries_gauge = metrics.Gauge(
@@ -87,24 +104,50 @@ class ReplicaSet:
             # Delete it directly because shutdown is processed by controller.
             del self.in_flight_queries[removed_replica]
 
-        if len(added) > 0 or len(removed) > 0:
-            # Shuffle the keys to avoid synchronization across clients.
-            replicas = list(self.in_flight_queries.keys())
-            random.shuffle(replicas)
-            self.replica_iterator = itertools.cycle(replicas)
+        # The models loaded by the replicas don't change their identity.
+        self.multiplexed_model_ids = {
+            replica.replica_tag: set(replica.multiplexed_model_ids)
+            for replica in running_replicas
+        }
+
+        policy_changed = False
+        if len(running_replicas) > 0 and not self._policy_override:
+            policy_name = running_replicas[0].load_balancing_policy
+            if policy_name != self._load_balancing_policy_name:
+                self.load_balancing_policy = create_load_balancing_policy(policy_name)
+                self._load_balancing_policy_name = policy_name
+                policy_changed = True
+
+        if len(added) > 0 or len(removed) > 0 or policy_changed:
+            self.load_balancing_policy.update_replicas(
+                list(self.in_flight_queries.keys())
+            )
             logger.debug(f"ReplicaSet: +{len(added)}, -{len(removed)} replicas.")
-            self.config_updated_event.set()
+            while self._waiters:
+                self._wake_up_waiter()
 
-    def _try_assign_replica(self, query: Query) -> Optional[ray.ObjectRef]:
-        """Try to assign query to a replica, return the object ref if succeeded
-        or return None if it can't assign this query to any replicas.
+    def _try_assign_replica(
+        self, query: Query
+    ) -> Optional[Tuple[ray.ObjectRef, ray.ObjectRef]]:
+        """Try to assign query to a replica, return the object refs of the
+        request status and the result if succeeded or return None if it can't
+        assign this query to any replicas.
         """
-        for _ in range(len(self.in_flight_queries.keys())):
-            replica = next(self.replica_iterator)
+        replicas = self.load_balancing_policy.choose_replicas(self._get_num_in_flight)
+        model_id = query.metadata.multiplexed_model_id
+        if model_id:
+            replicas = self._prefer_replicas_with_model(replicas, model_id)
+
+        for replica in replicas:
             if len(self.in_flight_queries[replica]) >= replica.max_concurrent_queries:
                 # This replica is overloaded, try next one
                 continue
 
+            if model_id:
+                self.multiplexed_model_ids.setdefault(replica.replica_tag, set()).add(
+                    model_id
+                )
+
             logger.debug(
                 f"Assigned query {query.metadata.request_id} "
                 f"to replica {replica.replica_tag}."
@@ -114,19 +157,57 @@ class ReplicaSet:
                 pickle.dumps(query.metadata), *query.args, **query.kwargs
             )
             self.in_flight_queries[replica].add(tracker_ref)
-            return user_ref
+            tracker_ref._on_completed(
+                functools.partial(
+                    self._on_query_completed_threadsafe, replica, tracker_ref
+                )
+            )
+            return tracker_ref, user_ref
         return None
 
-    @property
-    def _all_query_refs(self):
-        return list(itertools.chain.from_iterable(self.in_flight_queries.values()))
+    def _prefer_replicas_with_model(
+        self, replicas: Iterable[RunningReplicaInfo], model_id: str
+    ) -> List[RunningReplicaInfo]:
+        """Order the replicas that have the model loaded first, then the
+        others, keeping the order of the load balancing policy."""
+        with_model, without_model = [], []
+        for replica in replicas:
+            if model_id in self.multiplexed_model_ids.get(replica.replica_tag, ()):
+                with_model.append(replica)
+            else:
+                without_model.append(replica)
+        return with_model + without_model
 
-    def _drain_completed_object_refs(self) -> int:
-        refs = self._all_query_refs
-        done, _ = ray.wait(refs, num_returns=len(refs), timeout=0)
-        for replica_in_flight_queries in self.in_flight_queries.values():
-            replica_in_flight_queries.difference_update(done)
-        return len(done)
+    def _get_num_in_flight(self, replica: RunningReplicaInfo) -> int:
+        return len(self.in_flight_queries[replica])
+
+    def _on_query_completed_threadsafe(
+        self, replica: RunningReplicaInfo, tracker_ref: ray.ObjectRef, _result: Any
+    ):
+        """Called from a Ray thread once the tracker ref of a query is ready."""
+        try:
+            self._event_loop.call_soon_threadsafe(
+                self._on_query_completed, replica, tracker_ref
+            )
+        except RuntimeError:
+            # The event loop is closed, so no query is waiting anymore.
+            pass
+
+    def _on_query_completed(
+        self, replica: RunningReplicaInfo, tracker_ref: ray.ObjectRef
+    ):
+        replica_in_flight_queries = self.in_flight_queries.get(replica)
+        if replica_in_flight_queries is not None:
+            replica_in_flight_queries.discard(tracker_ref)
+        self._wake_up_waiter()
+
+    def _wake_up_waiter(self):
+        """Wake up the first query waiting for a free replica, if any."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
 
     async def assign_replica(self, query: Query) -> ray.ObjectRef:
         """Given a query, submit it to a replica and return the object ref.
@@ -134,37 +215,49 @@ class ReplicaSet:
         and only send a query to available replicas (determined by the
         max_concurrent_quries value.)
         """
+        _, user_ref = await self.assign_replica_with_status(query)
+        return user_ref
+
+    async def assign_replica_with_status(
+        self, query: Query
+    ) -> Tuple[ray.ObjectRef, ray.ObjectRef]:
+        """Like assign_replica, but also return the object ref of the small
+        status of the request returned by the replica along with the result.
+        """
         endpoint = query.metadata.endpoint
         self.num_queued_queries += 1
         self.num_queued_queries_gauge.set(
             self.num_queued_queries, tags={"endpoint": endpoint}
         )
-        assigned_ref = self._try_assign_replica(query)
-        while assigned_ref is None:  # Can't assign a replica right now.
-            logger.debug(
-                "Failed to assign a replica for " f"query {query.metadata.request_id}"
-            )
-            # Maybe there exists a free replica, we just need to refresh our
-            # query tracker.
-            num_finished = self._drain_completed_object_refs()
-            # All replicas are really busy, wait for a query to complete or the
-            # config to be updated.
-            if num_finished == 0:
-                logger.debug("All replicas are busy, waiting for a free replica.")
-                await asyncio.wait(
-                    self._all_query_refs + [self.config_updated_event.wait()],
-                    return_when=asyncio.FIRST_COMPLETED,
+        try:
+            assigned_refs = self._try_assign_replica(query)
+            while assigned_refs is None:  # Can't assign a replica right now.
+                logger.debug(
+                    "Failed to assign a replica for "
+                    f"query {query.metadata.request_id}"
                 )
-                if self.config_updated_event.is_set():
-                    self.config_updated_event.clear()
-            # We are pretty sure a free replica is ready now, let's recurse and
-            # assign this query a replica.
-            assigned_ref = self._try_assign_replica(query)
-        self.num_queued_queries -= 1
-        self.num_queued_queries_gauge.set(
-            self.num_queued_queries, tags={"endpoint": endpoint}
-        )
-        return assigned_ref
+                # All replicas are busy, wait for a query to complete or the
+                # replicas to be updated.
+                logger.debug("All replicas are busy, waiting for a free replica.")
+                waiter = self._event_loop.create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                except asyncio.CancelledError:
+                    if waiter.done() and not waiter.cancelled():
+                        # This query was woken up for a free replica that it
+                        # won't use, so pass it on to the next waiting query.
+                        self._wake_up_waiter()
+                    raise
+                # We are pretty sure a free replica is ready now, let's retry
+                # to assign this query a replica.
+                assigned_refs = self._try_assign_replica(query)
+        finally:
+            self.num_queued_queries -= 1
+            self.num_queued_queries_gauge.set(
+                self.num_queued_queries, tags={"endpoint": endpoint}
+            )
+        return assigned_refs
 
 
 class Router:
@@ -173,14 +266,33 @@ class Router:
         controller_handle: ActorHandle,
         deployment_name: str,
         event_loop: asyncio.BaseEventLoop = None,
+        load_balancing_policy: Optional[LoadBalancingPolicy] = None,
     ):
         """Router process incoming queries: assign a replica.
 
         Args:
             controller_handle(ActorHandle): The controller handle.
+            load_balancing_policy(LoadBalancingPolicy): The policy to choose
+                replicas with, instead of the one configured for the
+                deployment.
         """
         self._event_loop = event_loop
-        self._replica_set = ReplicaSet(deployment_name, event_loop)
+        self._controller_handle = controller_handle
+        self._deployment_name = deployment_name
+        self._router_id = get_random_letters()
+        # The number of requests assigned to replicas since the metrics were
+        # last pushed to the controller.
+        self._num_assigned_requests = 0
+        self._replica_set = ReplicaSet(
+            deployment_name, event_loop, load_balancing_policy
+        )
+        # The cache of responses, if enabled for the deployment, and the
+        # versions of the replicas the responses come from.
+        self._response_cache: Optional[ResponseCache] = None
+        self._replica_version_hashes = set()
+        # Pushes the metrics of the router to the controller, only while the
+        # deployment autoscales.
+        self._push_metrics_task: Optional[asyncio.Task] = None
 
         # -- Metrics Registration -- #
         self.num_router_requests = metrics.Counter(
@@ -196,11 +308,82 @@ class Router:
                 (
                     LongPollNamespace.RUNNING_REPLICAS,
                     deployment_name,
-                ): self._replica_set.update_running_replicas,
+                ): self._update_running_replicas,
             },
             call_in_event_loop=event_loop,
         )
 
+    def shutdown(self):
+        """Stop pushing the metrics of the router to the controller, when the
+        handles using the router are torn down.
+
+        The metrics are pushed again if the router is later told that the
+        deployment autoscales, e.g., if its handle is reused for a new
+        deployment of the same name.
+        """
+        task = self._push_metrics_task
+        if task is not None:
+            self._push_metrics_task = None
+            try:
+                self._event_loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # The event loop is closed, so the task isn't running.
+                pass
+
+    async def _push_autoscaling_metrics_forever(self):
+        """Periodically report the queued queries and the arrival rate of
+        requests to the controller, as input of autoscaling policies."""
+        last_push_time = time.time()
+        last_data = {}
+        # Stop along with the updates of the deployment.
+        while self.long_poll_client.is_running:
+            await asyncio.sleep(HANDLE_METRICS_PUSH_INTERVAL_S)
+            now = time.time()
+            data = {
+                "num_queued_queries": self._replica_set.num_queued_queries,
+                "arrival_rate": self._num_assigned_requests / (now - last_push_time),
+            }
+            self._num_assigned_requests = 0
+            last_push_time = now
+
+            # Idle routers stop reporting once they reported being idle.
+            if any(data.values()) or any(last_data.values()):
+                self._controller_handle.record_handle_metrics.remote(
+                    self._deployment_name, self._router_id, data, now
+                )
+            last_data = data
+
+    def _update_running_replicas(self, running_replicas: List[RunningReplicaInfo]):
+        if len(running_replicas) > 0:
+            cache_config = running_replicas[0].response_cache_config
+            if cache_config is None:
+                self._response_cache = None
+            elif (
+                self._response_cache is None
+                or self._response_cache.config != cache_config
+            ):
+                self._response_cache = ResponseCache(
+                    self._deployment_name, cache_config, self._event_loop
+                )
+
+            autoscaling_enabled = running_replicas[0].autoscaling_enabled
+            if autoscaling_enabled and self._push_metrics_task is None:
+                self._push_metrics_task = self._event_loop.create_task(
+                    self._push_autoscaling_metrics_forever()
+                )
+            elif not autoscaling_enabled and self._push_metrics_task is not None:
+                self._push_metrics_task.cancel()
+                self._push_metrics_task = None
+
+            # Responses from another version of the deployment are stale.
+            version_hashes = {replica.version_hash for replica in running_replicas}
+            if version_hashes != self._replica_version_hashes:
+                self._replica_version_hashes = version_hashes
+                if self._response_cache is not None:
+                    self._response_cache.clear()
+
+        self._replica_set.update_running_replicas(running_replicas)
+
     async def assign_request(
         self,
         request_meta: RequestMetadata,
@@ -210,10 +393,30 @@ class Router:
         """Assign a query and returns an object ref represent the result"""
 
         self.num_router_requests.inc()
-        return await self._replica_set.assign_replica(
+        cache = self._response_cache
+        cache_key = None
+        if cache is not None:
+            cache_key = await cache.get_key(
+                request_meta.call_method,
+                request_meta.http_arg_is_pickled,
+                request_args,
+                request_kwargs,
+            )
+            if cache_key is not None and request_meta.multiplexed_model_id:
+                cache_key = (request_meta.multiplexed_model_id, cache_key)
+            if cache_key is not None:
+                cached_ref = cache.get(cache_key)
+                if cached_ref is not None:
+                    return cached_ref
+
+        self._num_assigned_requests += 1
+        status_ref, ref = await self._replica_set.assign_replica_with_status(
             Query(
                 args=list(request_args),
                 kwargs=request_kwargs,
                 metadata=request_meta,
             )
         )
+        if cache_key is not None:
+            cache.put(cache_key, ref, status_ref)
+        return ref
@@ -83,6 +83,60 @@ def test_starlette_response(serve_instance):
     assert resp.status_code == 418
 
 
+def test_streaming_response(serve_instance):
+    signal = SignalActor.remote()
+
+    @serve.deployment(name="stream")
+    class Streamer:
+        async def __call__(self, _):
+            yield "first"
+            # The first chunk is sent to the client before the rest of the
+            # response is generated.
+            await signal.wait.remote()
+            for i in range(3):
+                yield str(i)
+
+    Streamer.deploy()
+
+    with requests.get("http://127.0.0.1:8000/stream", stream=True) as resp:
+        assert resp.status_code == 200
+        chunks = resp.iter_content(chunk_size=None, decode_unicode=True)
+        assert next(chunks) == "first"
+        ray.get(signal.send.remote())
+        assert "".join(chunks) == "012"
+
+    # Sync generators are streamed as well, and the handle path is unchanged.
+    @serve.deployment(name="sync_stream")
+    def sync_streamer(_):
+        for i in range(100):
+            yield f"{i},"
+
+    sync_streamer.deploy()
+    resp = requests.get("http://127.0.0.1:8000/sync_stream")
+    assert resp.text == "".join(f"{i}," for i in range(100))
+
+
+def test_streaming_request_body(serve_instance):
+    @serve.deployment(name="upload")
+    async def upload(request):
+        num_bytes = 0
+        async for chunk in request.stream():
+            num_bytes += len(chunk)
+        return num_bytes
+
+    upload.deploy()
+
+    def chunked_body():
+        for _ in range(100):
+            yield b"x" * 10000
+
+    # A generator body is sent with chunked transfer encoding.
+    resp = requests.post("http://127.0.0.1:8000/upload", data=chunked_body())
+    assert resp.json() == 100 * 10000
+    resp = requests.post("http://127.0.0.1:8000/upload", data=b"x" * 100)
+    assert resp.json() == 100
+
+
 def test_deploy_sync_function_no_params(serve_instance):
     @serve.deployment()
     def sync_d():
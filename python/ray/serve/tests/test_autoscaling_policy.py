@@ -8,9 +8,14 @@ from typing import List, Iterable
 
 from ray._private.test_utils import SignalActor, wait_for_condition
 from ray.serve.autoscaling_policy import (
+    AutoscalingMetrics,
     BasicAutoscalingPolicy,
+    PredictiveAutoscalingPolicy,
+    QueueAwareAutoscalingPolicy,
     calculate_desired_num_replicas,
+    create_autoscaling_policy,
 )
+from ray.serve.autoscaling_simulator import simulate_autoscaling
 from ray.serve.deployment_state import ReplicaState
 from ray.serve.config import AutoscalingConfig
 from ray.serve.constants import CONTROL_LOOP_PERIOD_S
@@ -479,6 +484,118 @@ def test_single_replica_receives_all_requests(ongoing_requests):
     assert new_num_replicas == sum(ongoing_requests) / target_requests
 
 
+def test_queue_aware_policy():
+    config = AutoscalingConfig(
+        min_replicas=1,
+        max_replicas=50,
+        target_num_ongoing_requests_per_replica=2,
+        upscale_delay_s=0.0,
+        downscale_delay_s=0.0,
+    )
+    policy = QueueAwareAutoscalingPolicy(config)
+
+    # The ongoing requests are capped by max_concurrent_queries, the queued
+    # queries are counted too.
+    metrics = AutoscalingMetrics(timestamp=0, num_queued_queries=12)
+    assert policy.get_decision_num_replicas([4, 4], 2, metrics) == 10
+    assert policy.get_decision_num_replicas([4, 4], 2) == 4
+
+    # The queued queries are left for the 3 replicas starting.
+    assert policy.get_decision_num_replicas([4, 4], 5, metrics) == 7
+
+
+def test_predictive_policy():
+    config = AutoscalingConfig(
+        min_replicas=1,
+        max_replicas=100,
+        target_num_ongoing_requests_per_replica=1,
+        upscale_delay_s=0.0,
+        downscale_delay_s=0.0,
+        look_back_period_s=10.0,
+    )
+    policy = PredictiveAutoscalingPolicy(config)
+
+    def decide(timestamp, arrival_rate, ongoing_requests, target):
+        return policy.get_decision_num_replicas(
+            ongoing_requests,
+            target,
+            AutoscalingMetrics(
+                timestamp=timestamp,
+                arrival_rate=arrival_rate,
+                replica_startup_time_s=10.0,
+            ),
+        )
+
+    # Without a trend yet, it scales like the basic policy.
+    assert decide(0.0, 10.0, [2.0] * 5, 5) == 10
+
+    # The arrival rate almost doubles during the startup time of replicas,
+    # so does the load to scale for.
+    for i in range(1, 100):
+        num_replicas = decide(i * 0.1, 10.0 + i, [1.0] * 10, 10)
+    assert num_replicas == 20
+
+    # A decreasing arrival rate doesn't scale down ahead of the load.
+    policy = PredictiveAutoscalingPolicy(config)
+    for i in range(100):
+        num_replicas = decide(i * 0.1, 100.0 - i, [1.0] * 10, 10)
+    assert num_replicas == 10
+
+
+def test_create_autoscaling_policy():
+    assert isinstance(
+        create_autoscaling_policy(AutoscalingConfig()), BasicAutoscalingPolicy
+    )
+    assert isinstance(
+        create_autoscaling_policy(AutoscalingConfig(policy="predictive")),
+        PredictiveAutoscalingPolicy,
+    )
+    assert isinstance(
+        create_autoscaling_policy(
+            AutoscalingConfig(
+                policy="ray.serve.autoscaling_policy.QueueAwareAutoscalingPolicy"
+            )
+        ),
+        QueueAwareAutoscalingPolicy,
+    )
+    with pytest.raises(TypeError):
+        create_autoscaling_policy(
+            AutoscalingConfig(policy="ray.serve.autoscaling_policy.math")
+        )
+
+
+def test_simulate_autoscaling():
+    # The load ramps up from 10 to 400 requests per second, which 20 replicas
+    # serve at their target number of ongoing requests.
+    trace = [(0, 10), (60, 10), (180, 400), (300, 400)]
+
+    results = {}
+    for policy in ["basic", "queue_aware", "predictive"]:
+        config = AutoscalingConfig(
+            min_replicas=1,
+            max_replicas=100,
+            target_num_ongoing_requests_per_replica=2,
+            upscale_delay_s=1.0,
+            downscale_delay_s=60.0,
+            look_back_period_s=10.0,
+            policy=policy,
+        )
+        results[policy] = simulate_autoscaling(
+            create_autoscaling_policy(config),
+            trace,
+            service_time_s=0.1,
+            max_concurrent_queries=4,
+            replica_startup_time_s=10.0,
+        )
+        assert results[policy].steps[-1].num_running_replicas >= 20
+
+    assert (
+        results["predictive"].mean_queue_wait_s
+        < results["queue_aware"].mean_queue_wait_s
+        < results["basic"].mean_queue_wait_s
+    )
+
+
 @pytest.mark.skipif(sys.platform == "win32", reason="Failing on Windows.")
 def test_e2e_bursty(serve_instance):
     """
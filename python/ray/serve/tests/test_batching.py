@@ -1,9 +1,12 @@
 import asyncio
+import time
+from unittest.mock import patch
 
 import pytest
 
 import ray
 from ray import serve
+from ray.serve.batching import _AdaptiveBatchSizer
 
 
 def test_batching(serve_instance):
@@ -133,6 +136,13 @@ async def test_decorator_validation():
             async def method(self, requests):
                 pass
 
+    with pytest.raises(ValueError):
+
+        class ZeroTargetLatency:
+            @serve.batch(target_latency_s=0)
+            async def method(self, requests):
+                pass
+
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize("use_class", [True, False])
@@ -292,6 +302,96 @@ async def test_batch_args_kwargs(mode, use_class):
     assert result == [("hi1", "hi2"), ("hi3", "hi4")]
 
 
+class MockTimer:
+    def __init__(self):
+        self._curr = time.time()
+
+    def time(self):
+        return self._curr
+
+    def advance(self, by):
+        self._curr += by
+
+
+@pytest.fixture
+def mock_timer():
+    timer = MockTimer()
+    with patch("time.time", new=timer.time):
+        yield timer
+
+
+def test_adaptive_batch_sizer(mock_timer):
+    def receive(qps, duration_s=20):
+        # Long enough for the moving average to converge to the new rate.
+        for _ in range(int(qps * duration_s)):
+            sizer.record_arrival()
+        mock_timer.advance(duration_s)
+
+    sizer = _AdaptiveBatchSizer(
+        max_batch_size=64, max_timeout_s=0.1, target_latency_s=0.2
+    )
+    # Batches run as they come until latencies have been measured.
+    assert sizer.choose() == (64, 0.0)
+
+    # The batch latency is 10ms + 1ms per item.
+    for batch_size in [1, 2, 4, 8]:
+        sizer.record_batch(batch_size, 0.01 + 0.001 * batch_size)
+    latencies = sizer.estimate_latencies()
+    assert latencies[15] == pytest.approx(0.026)
+
+    # The batch size is capped by the target latency, including the batch
+    # that's already running: 2 * (10ms + 1ms * 90) = 200ms.
+    sizer.max_batch_size = 128
+    sizer.target_latency_s = 0.201
+    batch_size, _ = sizer.choose()
+    assert batch_size == 90
+    sizer.max_batch_size = 64
+    sizer.target_latency_s = 0.2
+
+    # At low traffic, requests don't wait for a batch to fill.
+    receive(qps=0)
+    assert sizer.choose() == (64, 0.0)
+
+    # At 400 QPS, batches of 10 keep up with 20% headroom, so the queue
+    # waits for 9 more requests.
+    receive(qps=400)
+    batch_size, timeout_s = sizer.choose()
+    assert sizer.arrival_rate == pytest.approx(400)
+    assert batch_size == 64
+    assert timeout_s == pytest.approx(9 / 400)
+
+    # Above the max throughput, the queue waits for full batches, but no
+    # longer than the latency left over by the execution: 200ms - 2 * 74ms.
+    receive(qps=1100)
+    assert sizer.choose() == (64, pytest.approx(0.052))
+    sizer.max_timeout_s = 0.01
+    assert sizer.choose() == (64, pytest.approx(0.01))
+
+
+@pytest.mark.asyncio
+async def test_adaptive_batching():
+    batch_sizes = []
+
+    @serve.batch(max_batch_size=32, batch_wait_timeout_s=0.1, target_latency_s=0.5)
+    async def adaptive(requests):
+        batch_sizes.append(len(requests))
+        await asyncio.sleep(0.01 + 0.001 * len(requests))
+        return requests
+
+    # Batches are formed from the queued requests and the results are
+    # returned to the right callers.
+    tasks = [asyncio.get_event_loop().create_task(adaptive(i)) for i in range(100)]
+    assert await asyncio.gather(*tasks) == list(range(100))
+    assert max(batch_sizes) <= 32
+    assert len(batch_sizes) < 100
+
+    # A single request isn't held back waiting for a batch to fill.
+    await asyncio.sleep(2)
+    start = asyncio.get_event_loop().time()
+    assert await adaptive("hi") == "hi"
+    assert asyncio.get_event_loop().time() - start < 0.1
+
+
 if __name__ == "__main__":
     import sys
 
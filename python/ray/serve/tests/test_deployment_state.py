@@ -17,6 +17,7 @@ from ray.serve.common import (
     ReplicaTag,
     ReplicaName,
 )
+from ray.serve.constants import DEFAULT_LOAD_BALANCING_POLICY
 from ray.serve.deployment_state import (
     DeploymentState,
     DeploymentStateManager,
@@ -57,6 +58,8 @@ class MockReplicaActorWrapper:
         self.stopped = False
         # Expected to be set in the test.
         self.done_stopping = False
+        # Expected to be set in the test, always due by default.
+        self.next_health_check_time = 0.0
         # Will be set when `force_stop()` is called.
         self.force_stopped_counter = 0
         # Will be cleaned up when `cleanup()` is called.
@@ -82,6 +85,18 @@ class MockReplicaActorWrapper:
     def max_concurrent_queries(self) -> int:
         return 100
 
+    @property
+    def load_balancing_policy(self) -> str:
+        return DEFAULT_LOAD_BALANCING_POLICY
+
+    @property
+    def response_cache_config(self):
+        return None
+
+    @property
+    def autoscaling_enabled(self) -> bool:
+        return False
+
     @property
     def node_id(self) -> Optional[str]:
         if self.ready == ReplicaStartupStatus.SUCCEEDED or self.started:
@@ -494,6 +509,29 @@ def test_create_delete_single_replica(mock_deployment_state):
     assert replica._actor.cleaned_up
 
 
+def test_replica_startup_time(mock_deployment_state):
+    deployment_state, timer = mock_deployment_state
+
+    b_info_1, b_version_1 = deployment_info(num_replicas=2)
+    deployment_state.deploy(b_info_1)
+    deployment_state.update()
+    check_counts(deployment_state, total=2, by_state=[(ReplicaState.STARTING, 2)])
+    assert deployment_state.replica_startup_time_s is None
+
+    replica_1, replica_2 = deployment_state._replicas.get()
+    timer.advance(4)
+    replica_1._actor.set_ready()
+    deployment_state.update()
+    assert deployment_state.replica_startup_time_s == pytest.approx(4)
+
+    # The startup time is a moving average.
+    timer.advance(2)
+    replica_2._actor.set_ready()
+    deployment_state.update()
+    check_counts(deployment_state, total=2, by_state=[(ReplicaState.RUNNING, 2)])
+    assert deployment_state.replica_startup_time_s == pytest.approx(5)
+
+
 def test_force_kill(mock_deployment_state):
     deployment_state, timer = mock_deployment_state
 
@@ -2002,6 +2040,73 @@ def test_shutdown(mock_deployment_state_manager):
     assert len(deployment_state_manager.get_deployment_statuses()) == 0
 
 
+def test_skip_steady_deployments(mock_deployment_state_manager):
+    """
+    Test that the deployments in steady state are only updated when their
+    goal changes or the health of their replicas must be checked.
+    """
+    deployment_state_manager, timer = mock_deployment_state_manager
+
+    b_info_1, b_version_1 = deployment_info(num_replicas=2, version="1")
+    assert deployment_state_manager.deploy("test", b_info_1)
+    deployment_state = deployment_state_manager._deployment_states["test"]
+
+    assert deployment_state_manager.update()
+    for replica in deployment_state._replicas.get():
+        replica._actor.set_ready()
+        replica._actor.next_health_check_time = timer.time() + 10
+    assert deployment_state_manager.update()
+    check_counts(deployment_state, total=2, by_state=[(ReplicaState.RUNNING, 2)])
+    assert deployment_state.curr_status_info.status == DeploymentStatus.HEALTHY
+
+    # The deployment is in steady state, so it isn't updated.
+    for replica in deployment_state._replicas.get():
+        replica._actor.health_check_called = False
+    assert not deployment_state_manager.update()
+    assert not any(
+        replica._actor.health_check_called
+        for replica in deployment_state._replicas.get()
+    )
+
+    # Until a health check is due.
+    deployment_state._replicas.get()[0]._actor.set_unhealthy()
+    timer.advance(10)
+    assert deployment_state_manager.update()
+    check_counts(
+        deployment_state,
+        total=2,
+        by_state=[(ReplicaState.RUNNING, 1), (ReplicaState.STOPPING, 1)],
+    )
+
+    # The deployment isn't in steady state while the replica is replaced.
+    replica = deployment_state._replicas.get(states=[ReplicaState.STOPPING])[0]
+    replica._actor.set_done_stopping()
+    assert deployment_state_manager.update()
+    check_counts(deployment_state, total=1, by_state=[(ReplicaState.RUNNING, 1)])
+    assert deployment_state_manager.update()
+    check_counts(
+        deployment_state,
+        total=2,
+        by_state=[(ReplicaState.RUNNING, 1), (ReplicaState.STARTING, 1)],
+    )
+    replica = deployment_state._replicas.get(states=[ReplicaState.STARTING])[0]
+    replica._actor.set_ready()
+    replica._actor.next_health_check_time = timer.time() + 10
+    assert deployment_state_manager.update()
+    assert deployment_state.curr_status_info.status == DeploymentStatus.HEALTHY
+    assert not deployment_state_manager.update()
+
+    # Changing the goal of the deployment updates it again.
+    b_info_2, b_version_2 = deployment_info(num_replicas=3, version="1")
+    assert deployment_state_manager.deploy("test", b_info_2)
+    assert deployment_state_manager.update()
+    check_counts(
+        deployment_state,
+        total=3,
+        by_state=[(ReplicaState.RUNNING, 2), (ReplicaState.STARTING, 1)],
+    )
+
+
 def test_resume_deployment_state_from_replica_tags(mock_deployment_state_manager):
     deployment_state_manager, timer = mock_deployment_state_manager
 
@@ -636,6 +636,35 @@ def test_fastapi_same_app_multiple_deployments(serve_instance):
         assert requests.get("http://localhost:8000" + path).status_code == 404, path
 
 
+def test_fastapi_streaming_response(serve_instance):
+    app = FastAPI()
+    signal = SignalActor.remote()
+
+    @serve.deployment(name="stream")
+    @serve.ingress(app)
+    class Streamer:
+        @app.get("/")
+        def stream(self):
+            async def numbers():
+                yield "first"
+                await signal.wait.remote()
+                for i in range(3):
+                    yield str(i)
+
+            return starlette.responses.StreamingResponse(
+                numbers(), media_type="text/plain", status_code=201
+            )
+
+    Streamer.deploy()
+
+    with requests.get("http://localhost:8000/stream", stream=True) as resp:
+        assert resp.status_code == 201
+        chunks = resp.iter_content(chunk_size=None, decode_unicode=True)
+        assert next(chunks) == "first"
+        ray.get(signal.send.remote())
+        assert "".join(chunks) == "012"
+
+
 if __name__ == "__main__":
     import sys
 
@@ -4,10 +4,23 @@ from ray.serve.common import EndpointInfo
 from ray.serve.http_proxy import LongestPrefixRouter
 
 
+class MockRouter:
+    def __init__(self):
+        self.is_shutdown = False
+
+    def shutdown(self):
+        self.is_shutdown = True
+
+
+class MockHandle(str):
+    def __init__(self, name):
+        self.router = MockRouter()
+
+
 @pytest.fixture
 def mock_longest_prefix_router() -> LongestPrefixRouter:
     def mock_get_handle(name, *args, **kwargs):
-        return name
+        return MockHandle(name)
 
     yield LongestPrefixRouter(mock_get_handle)
 
@@ -87,11 +100,14 @@ def test_update_routes(mock_longest_prefix_router):
 
     route, handle = router.match_route("/endpoint")
     assert route == "/endpoint" and handle == "endpoint"
+    removed_handle = handle
 
     router.update_routes({"endpoint2": EndpointInfo(route="/endpoint2")})
 
     route, handle = router.match_route("/endpoint")
     assert route is None and handle is None
+    # The handles of removed endpoints are torn down.
+    assert removed_handle.router.is_shutdown
 
     route, handle = router.match_route("/endpoint2")
     assert route == "/endpoint2" and handle == "endpoint2"
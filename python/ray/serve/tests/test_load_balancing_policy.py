@@ -0,0 +1,105 @@
+import sys
+from collections import Counter
+
+import pytest
+
+from ray.serve.common import RunningReplicaInfo
+from ray.serve.load_balancing_policy import (
+    LeastOutstandingRequestsPolicy,
+    LoadBalancingPolicy,
+    PowerOfTwoChoicesPolicy,
+    RoundRobinPolicy,
+    SameNodeFirstPolicy,
+    create_load_balancing_policy,
+)
+
+
+def make_replicas(node_ids):
+    return [
+        RunningReplicaInfo(
+            deployment_name="d",
+            replica_tag=str(i),
+            actor_handle=None,
+            max_concurrent_queries=10,
+            node_id=node_id,
+        )
+        for i, node_id in enumerate(node_ids)
+    ]
+
+
+class FirstReplicaPolicy(LoadBalancingPolicy):
+    def choose_replicas(self, get_num_in_flight):
+        return self.replicas[:1]
+
+
+def test_round_robin():
+    replicas = make_replicas([None] * 3)
+    policy = RoundRobinPolicy()
+    assert list(policy.choose_replicas(lambda r: 0)) == []
+    policy.update_replicas(replicas)
+
+    # Each call tries every replica once, starting from the next one.
+    first = list(policy.choose_replicas(lambda r: 0))
+    second = list(policy.choose_replicas(lambda r: 0))
+    assert sorted(first, key=lambda r: r.replica_tag) == replicas
+    assert second == first[1:] + first[:1]
+
+
+def test_least_outstanding_requests():
+    replicas = make_replicas([None] * 4)
+    num_in_flight = {r: int(r.replica_tag) for r in replicas}
+    num_in_flight[replicas[0]] = 5
+    policy = LeastOutstandingRequestsPolicy()
+    policy.update_replicas(replicas)
+    order = list(policy.choose_replicas(num_in_flight.__getitem__))
+    assert order == replicas[1:] + replicas[:1]
+
+
+def test_power_of_two_choices():
+    replicas = make_replicas([None] * 10)
+    num_in_flight = {r: int(r.replica_tag) for r in replicas}
+    policy = PowerOfTwoChoicesPolicy()
+    policy.update_replicas(replicas)
+
+    chosen = Counter()
+    for _ in range(1000):
+        order = list(policy.choose_replicas(num_in_flight.__getitem__))
+        # All replicas are tried, the less loaded of the two choices first.
+        assert sorted(order, key=num_in_flight.__getitem__) == replicas
+        assert num_in_flight[order[0]] < num_in_flight[order[1]]
+        chosen[order[0]] += 1
+    # The most loaded replica is never chosen first, and lightly loaded
+    # replicas are chosen first much more often than heavily loaded ones.
+    assert chosen[replicas[-1]] == 0
+    assert chosen[replicas[0]] > chosen[replicas[-2]]
+
+
+def test_same_node_first():
+    replicas = make_replicas(["a", "b", "a", None])
+    num_in_flight = {r: 0 for r in replicas}
+    num_in_flight[replicas[0]] = 3
+    policy = SameNodeFirstPolicy(node_id="a")
+    policy.update_replicas(replicas)
+    order = list(policy.choose_replicas(num_in_flight.__getitem__))
+    assert order[:2] == [replicas[2], replicas[0]]
+    assert set(order[2:]) == {replicas[1], replicas[3]}
+
+
+def test_create_load_balancing_policy():
+    assert isinstance(create_load_balancing_policy("round_robin"), RoundRobinPolicy)
+    assert isinstance(
+        create_load_balancing_policy("power_of_two_choices"),
+        PowerOfTwoChoicesPolicy,
+    )
+    policy = create_load_balancing_policy(
+        "ray.serve.tests.test_load_balancing_policy.FirstReplicaPolicy"
+    )
+    assert isinstance(policy, FirstReplicaPolicy)
+    with pytest.raises(TypeError):
+        create_load_balancing_policy(
+            "ray.serve.tests.test_load_balancing_policy.Counter"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", "-s", __file__]))
@@ -7,7 +7,13 @@ from typing import Dict
 import pytest
 
 import ray
-from ray.serve.long_poll import LongPollClient, LongPollHost, UpdatedObject
+from ray.serve.common import RunningReplicaInfo
+from ray.serve.long_poll import (
+    LongPollClient,
+    LongPollHost,
+    LongPollNamespace,
+    UpdatedObject,
+)
 
 
 def test_host_standalone(serve_instance):
@@ -156,5 +162,85 @@ async def test_client_threadsafe(serve_instance):
     await e.wait()
 
 
+@pytest.mark.asyncio
+async def test_delta_updates():
+    host = LongPollHost()
+    replicas_key = (LongPollNamespace.RUNNING_REPLICAS, "d")
+    replicas = [RunningReplicaInfo("d", f"r{i}", None, 1) for i in range(3)]
+    host.notify_changed(replicas_key, replicas)
+    host.notify_changed(LongPollNamespace.ROUTE_TABLE, {"a": 1, "b": 2})
+    host.notify_changed("key", 1)
+
+    # New clients receive the full snapshots.
+    keys = [replicas_key, LongPollNamespace.ROUTE_TABLE, "key"]
+    result = await host.listen_for_change({key: -1 for key in keys})
+    assert all(update.delta is None for update in result.values())
+    assert result[replicas_key].object_snapshot == replicas
+    snapshot_ids = {key: update.snapshot_id for key, update in result.items()}
+
+    # Clients with a recent snapshot only receive the changed items,
+    # including the fields that aren't part of the equality.
+    new_replicas = [
+        RunningReplicaInfo("d", "r1", None, 1, multiplexed_model_ids={"m"}),
+        replicas[2],
+        RunningReplicaInfo("d", "r3", None, 1),
+    ]
+    host.notify_changed(replicas_key, new_replicas)
+    host.notify_changed(LongPollNamespace.ROUTE_TABLE, {"a": 1, "c": 3})
+    host.notify_changed("key", 2)
+
+    result = await host.listen_for_change(snapshot_ids)
+    delta = result[replicas_key].delta
+    assert result[replicas_key].object_snapshot is None
+    assert set(delta.updated_items) == {"r1", "r3"}
+    assert delta.removed_keys == ["r0"]
+    applied = delta.apply(replicas_key, replicas)
+    assert [r.replica_tag for r in applied] == ["r1", "r2", "r3"]
+    assert applied[0].multiplexed_model_ids == {"m"}
+
+    route_table_delta = result[LongPollNamespace.ROUTE_TABLE].delta
+    assert route_table_delta.updated_items == {"c": 3}
+    assert route_table_delta.apply(LongPollNamespace.ROUTE_TABLE, {"a": 1, "b": 2}) == {
+        "a": 1,
+        "c": 3,
+    }
+
+    # Other objects are always sent in full.
+    assert result["key"].delta is None
+    assert result["key"].object_snapshot == 2
+
+    # The delta is computed once for all the clients with the same snapshot.
+    result = await host.listen_for_change({replicas_key: snapshot_ids[replicas_key]})
+    assert result[replicas_key].delta is delta
+
+    # Clients with an unknown snapshot receive the full snapshot.
+    result = await host.listen_for_change({replicas_key: 12345})
+    assert result[replicas_key].object_snapshot == new_replicas
+
+
+@pytest.mark.asyncio
+async def test_client_delta_updates(serve_instance):
+    host = ray.remote(LongPollHost).remote()
+    replicas_key = (LongPollNamespace.RUNNING_REPLICAS, "d")
+    replicas = [RunningReplicaInfo("d", f"r{i}", None, 1) for i in range(3)]
+    ray.get(host.notify_changed.remote(replicas_key, replicas))
+
+    callback_results = []
+    client = LongPollClient(
+        host,
+        {replicas_key: callback_results.append},
+        call_in_event_loop=asyncio.get_event_loop(),
+    )
+    while len(callback_results) == 0:
+        await asyncio.sleep(0.1)
+    assert callback_results[-1] == replicas
+
+    ray.get(host.notify_changed.remote(replicas_key, replicas[1:]))
+    while len(callback_results) == 1:
+        await asyncio.sleep(0.1)
+    assert callback_results[-1] == replicas[1:]
+    assert client.object_snapshots[replicas_key] == replicas[1:]
+
+
 if __name__ == "__main__":
     sys.exit(pytest.main(["-v", "-s", __file__]))
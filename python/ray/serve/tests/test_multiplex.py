@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+import requests
+
+import ray
+from ray import serve
+from ray._private.test_utils import wait_for_condition
+from ray.serve.multiplex import _set_multiplexed_model_id
+
+
+@pytest.fixture
+def ray_instance():
+    ray.init(num_cpus=1)
+    yield
+    ray.shutdown()
+
+
+def test_decorator_validation():
+    with pytest.raises(TypeError, match="async def"):
+
+        @serve.multiplexed
+        def load_model(model_id):
+            pass
+
+    with pytest.raises(ValueError):
+
+        @serve.multiplexed(max_num_models_per_replica=0)
+        async def load_model_zero(model_id):
+            pass
+
+    with pytest.raises(TypeError):
+
+        @serve.multiplexed(max_num_models_per_replica="1")
+        async def load_model_str(model_id):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_multiplexed_lru(ray_instance):
+    class Model:
+        def __init__(self, model_id, unloaded):
+            self.model_id = model_id
+            self.unloaded = unloaded
+
+        def __del__(self):
+            self.unloaded.append(self.model_id)
+
+    class ModelHost:
+        def __init__(self):
+            self.loaded = []
+            self.unloaded = []
+
+        @serve.multiplexed(max_num_models_per_replica=2)
+        async def get_model(self, model_id: str):
+            await asyncio.sleep(0.1)
+            self.loaded.append(model_id)
+            return Model(model_id, self.unloaded)
+
+    host = ModelHost()
+
+    # Concurrent requests for a model share the same load.
+    models = await asyncio.gather(*[host.get_model("a") for _ in range(5)])
+    assert all(model is models[0] for model in models)
+    assert host.loaded == ["a"]
+
+    await host.get_model("b")
+    await host.get_model("a")
+    # "b" is the least recently used model.
+    await host.get_model("c")
+    assert host.unloaded == ["b"]
+    assert (await host.get_model("a")).model_id == "a"
+    assert host.loaded == ["a", "b", "c"]
+
+    with pytest.raises(TypeError):
+        await host.get_model("")
+
+
+@pytest.mark.asyncio
+async def test_get_multiplexed_model_id():
+    assert serve.get_multiplexed_model_id() == ""
+
+    async def handle(model_id):
+        _set_multiplexed_model_id(model_id)
+        await asyncio.sleep(0.01)
+        return serve.get_multiplexed_model_id()
+
+    # The model ID is local to the task handling each request.
+    model_ids = [str(i) for i in range(10)]
+    assert await asyncio.gather(*[handle(i) for i in model_ids]) == model_ids
+
+
+def test_multiplexed_e2e(serve_instance):
+    @serve.deployment(num_replicas=2)
+    class ModelHost:
+        @serve.multiplexed(max_num_models_per_replica=2)
+        async def get_model(self, model_id: str):
+            return model_id
+
+        async def __call__(self, *args):
+            model = await self.get_model(serve.get_multiplexed_model_id())
+            return model, serve.get_replica_context().replica_tag
+
+    ModelHost.deploy()
+    handle = ModelHost.get_handle()
+
+    # The requests for a model are sent to the replica that loaded it.
+    model, replica_tag = ray.get(handle.options(multiplexed_model_id="1").remote())
+    assert model == "1"
+    for _ in range(10):
+        assert ray.get(handle.options(multiplexed_model_id="1").remote()) == (
+            "1",
+            replica_tag,
+        )
+
+    # HTTP requests set the model ID with a header, and are routed once the
+    # replica reported the model.
+    def routed_to_replica():
+        resp = requests.get(
+            "http://127.0.0.1:8000/ModelHost",
+            headers={"serve_multiplexed_model_id": "1"},
+        )
+        return resp.json() == ["1", replica_tag]
+
+    wait_for_condition(routed_to_replica)
+    for _ in range(10):
+        assert routed_to_replica()
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(["-v", "-s", __file__]))
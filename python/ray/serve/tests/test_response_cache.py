@@ -0,0 +1,225 @@
+import asyncio
+import pickle
+import time
+
+import pytest
+import requests
+
+import ray
+from ray import serve
+from ray._private.test_utils import wait_for_condition
+from ray.serve.config import ResponseCacheConfig
+from ray.serve.constants import RESPONSE_NOT_REUSABLE_STATUS
+from ray.serve.http_util import HTTPRequestWrapper
+from ray.serve.response_cache import ResponseCache
+
+
+@pytest.fixture
+def ray_instance():
+    ray.init(num_cpus=1)
+    yield
+    ray.shutdown()
+
+
+def key_by_first_arg(x, *args, **kwargs):
+    return x
+
+
+async def key_by_path(request):
+    return request.url.path
+
+
+async def wait_cached(cache, *keys):
+    for _ in range(100):
+        if all(key in cache._entries for key in keys):
+            return
+        await asyncio.sleep(0.1)
+    raise TimeoutError(f"{keys} weren't cached.")
+
+
+def make_http_arg(method="GET", headers=(), body=b""):
+    scope = {
+        "type": "http",
+        "method": method,
+        "root_path": "",
+        "path": "/d",
+        "query_string": b"x=1",
+        "headers": list(headers),
+    }
+    return pickle.dumps(HTTPRequestWrapper(scope, body))
+
+
+@pytest.mark.asyncio
+async def test_response_cache_lru_and_ttl(ray_instance):
+    cache = ResponseCache(
+        "d",
+        ResponseCacheConfig(max_entries=2, ttl_s=0.5),
+        asyncio.get_event_loop(),
+    )
+    refs = [ray.put(i) for i in range(3)]
+    ok = ray.put(b"")
+    cache.put("a", refs[0], ok)
+    cache.put("b", refs[1], ok)
+    await wait_cached(cache, "a", "b")
+    assert cache.get("a") == refs[0]
+
+    # "b" is the least recently used entry.
+    cache.put("c", refs[2], ok)
+    await wait_cached(cache, "c")
+    assert cache.get("b") is None
+    assert cache.get("a") == refs[0]
+    assert cache.get("c") == refs[2]
+    assert len(cache) == 2
+
+    time.sleep(0.5)
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_drops_errors(ray_instance):
+    @ray.remote
+    def fail():
+        raise ValueError()
+
+    cache = ResponseCache("d", ResponseCacheConfig(), asyncio.get_event_loop())
+    cache.put("ok", ray.put(1), ray.put(b""))
+    # The replica tells that the response is an error or a stream.
+    cache.put("error", ray.put(2), ray.put(RESPONSE_NOT_REUSABLE_STATUS))
+    # The replica failed.
+    cache.put("failed", fail.remote(), fail.remote())
+    await wait_cached(cache, "ok")
+    for _ in range(100):
+        if not cache._pending:
+            break
+        await asyncio.sleep(0.1)
+    assert cache.get("error") is None
+    assert cache.get("failed") is None
+    assert cache.get("ok") is not None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_pending(ray_instance):
+    @ray.remote
+    def delayed_status():
+        time.sleep(1)
+        return b""
+
+    cache = ResponseCache("d", ResponseCacheConfig(), asyncio.get_event_loop())
+    ref = ray.put(1)
+    # Responses aren't served until they're known to be reusable.
+    cache.put("a", ref, delayed_status.remote())
+    assert cache.get("a") is None
+    await wait_cached(cache, "a")
+    assert cache.get("a") == ref
+
+    # Responses of requests sent before the cache was cleared are stale.
+    cache.put("b", ray.put(2), delayed_status.remote())
+    cache.clear()
+    await asyncio.sleep(1.5)
+    assert cache.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_response_cache_keys(ray_instance):
+    cache = ResponseCache("d", ResponseCacheConfig(), asyncio.get_event_loop())
+    key = await cache.get_key("__call__", False, [1, "a"], {"k": "v"})
+    assert key == await cache.get_key("__call__", False, [1, "a"], {"k": "v"})
+    assert key != await cache.get_key("other", False, [1, "a"], {"k": "v"})
+    assert key != await cache.get_key("__call__", False, [1, "a"], {"k": "w"})
+    # ObjectRef arguments can't be keyed.
+    assert await cache.get_key("__call__", False, [ray.put(1)], {}) is None
+
+    # Only GET and HEAD HTTP requests are cached, per client.
+    key = await cache.get_key("__call__", True, [make_http_arg()], {})
+    assert key is not None
+    assert key == await cache.get_key(
+        "__call__", True, [make_http_arg(headers=[(b"accept", b"*/*")])], {}
+    )
+    assert key != await cache.get_key(
+        "__call__", True, [make_http_arg(headers=[(b"cookie", b"s=1")])], {}
+    )
+    assert key != await cache.get_key(
+        "__call__",
+        True,
+        [make_http_arg(headers=[(b"authorization", b"Bearer t")])],
+        {},
+    )
+    assert await cache.get_key("__call__", True, [make_http_arg("POST")], {}) is None
+
+    cache = ResponseCache(
+        "d",
+        ResponseCacheConfig(
+            key_function="ray.serve.tests.test_response_cache.key_by_first_arg"
+        ),
+        asyncio.get_event_loop(),
+    )
+    assert await cache.get_key("__call__", False, [1, "a"], {}) == 1
+
+
+def test_response_cache_e2e(serve_instance):
+    @ray.remote
+    class Counter:
+        def __init__(self):
+            self.count = 0
+
+        def incr(self):
+            self.count += 1
+            return self.count
+
+    counter = Counter.remote()
+
+    @serve.deployment(
+        name="cached",
+        version="1",
+        _response_cache_config={"max_entries": 10, "ttl_s": 60},
+    )
+    class Cached:
+        def __call__(self, *args):
+            return ray.get(counter.incr.remote())
+
+    Cached.deploy()
+    handle = Cached.get_handle()
+
+    # Repeated requests are answered from the cache of each handle, once the
+    # response is known to be reusable.
+    assert ray.get(handle.remote(1)) == 1
+    wait_for_condition(lambda: len(handle.router._response_cache) == 1)
+    assert ray.get(handle.remote(1)) == 1
+    assert ray.get(handle.remote(2)) == 2
+
+    def get(query):
+        return requests.get("http://127.0.0.1:8000/cached?" + query).json()
+
+    wait_for_condition(lambda: get("x=1") == get("x=1"))
+    count = get("x=1")
+    assert count > 2
+    assert get("x=2") > count
+    # Other methods aren't cached.
+    url = "http://127.0.0.1:8000/cached?x=1"
+    assert requests.post(url).json() != requests.post(url).json()
+
+    # A new version of the deployment invalidates the cache.
+    count = ray.get(counter.incr.remote())
+    Cached.options(version="2").deploy()
+    wait_for_condition(lambda: get("x=1") > count)
+
+    # The query string isn't part of the custom key.
+    Cached.options(
+        version="3",
+        _response_cache_config={
+            "key_function": "ray.serve.tests.test_response_cache.key_by_path"
+        },
+    ).deploy()
+
+    def query_string_ignored():
+        url = "http://127.0.0.1:8000/cached"
+        return requests.get(url + "?x=1").json() == requests.get(url + "?x=2").json()
+
+    wait_for_condition(query_string_ignored)
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main(["-v", "-s", __file__]))
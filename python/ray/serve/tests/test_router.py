@@ -8,7 +8,11 @@ import pytest
 
 import ray
 from ray.serve.common import RunningReplicaInfo
-from ray.serve.router import Query, ReplicaSet, RequestMetadata
+from ray.serve.load_balancing_policy import (
+    LeastOutstandingRequestsPolicy,
+    RoundRobinPolicy,
+)
+from ray.serve.router import Query, ReplicaSet, RequestMetadata, Router
 from ray._private.test_utils import SignalActor
 
 pytestmark = pytest.mark.asyncio
@@ -137,6 +141,189 @@ async def test_replica_set(ray_instance):
     assert num_queries_set == {2, 1}
 
 
+async def test_replica_set_many_waiting_queries(ray_instance):
+    @ray.remote(num_cpus=0)
+    class MockWorker:
+        @ray.method(num_returns=2)
+        async def handle_request(self, request):
+            await asyncio.sleep(0.01)
+            return b"", "DONE"
+
+    rs = ReplicaSet("my_deployment", asyncio.get_event_loop())
+    rs.update_running_replicas(
+        [
+            RunningReplicaInfo(
+                deployment_name="my_deployment",
+                replica_tag=str(i),
+                actor_handle=MockWorker.remote(),
+                max_concurrent_queries=2,
+            )
+            for i in range(2)
+        ]
+    )
+
+    # Queries waiting for a free replica are woken up as the in-flight
+    # queries complete.
+    query = Query([], {}, RequestMetadata("request-id", "endpoint"))
+    refs = await asyncio.gather(*[rs.assign_replica(query) for _ in range(50)])
+    assert await asyncio.gather(*refs) == ["DONE"] * 50
+
+    # A cancelled waiting query doesn't block the other ones.
+    tasks = [
+        asyncio.get_event_loop().create_task(rs.assign_replica(query))
+        for _ in range(10)
+    ]
+    tasks[5].cancel()
+    refs = await asyncio.gather(*tasks[:5], *tasks[6:])
+    assert await asyncio.gather(*refs) == ["DONE"] * 9
+
+    # The completed queries are no longer tracked as in flight.
+    while any(rs.in_flight_queries.values()):
+        await asyncio.sleep(0.01)
+    assert rs.num_queued_queries == 0
+
+
+async def test_replica_set_load_balancing_policy(ray_instance):
+    def make_replicas(policy):
+        return [
+            RunningReplicaInfo(
+                deployment_name="my_deployment",
+                replica_tag=str(i),
+                actor_handle=None,
+                max_concurrent_queries=1,
+                load_balancing_policy=policy,
+            )
+            for i in range(2)
+        ]
+
+    # The policy configured for the deployment is picked up from the
+    # running replicas, and updated when it changes.
+    rs = ReplicaSet("my_deployment", asyncio.get_event_loop())
+    assert isinstance(rs.load_balancing_policy, RoundRobinPolicy)
+    rs.update_running_replicas(make_replicas("least_outstanding_requests"))
+    assert isinstance(rs.load_balancing_policy, LeastOutstandingRequestsPolicy)
+    assert len(rs.load_balancing_policy.replicas) == 2
+    rs.update_running_replicas(make_replicas("round_robin"))
+    assert isinstance(rs.load_balancing_policy, RoundRobinPolicy)
+    assert len(rs.load_balancing_policy.replicas) == 2
+
+    # A policy passed in explicitly takes precedence.
+    policy = LeastOutstandingRequestsPolicy()
+    rs = ReplicaSet("my_deployment", asyncio.get_event_loop(), policy)
+    rs.update_running_replicas(make_replicas("round_robin"))
+    assert rs.load_balancing_policy is policy
+    assert len(policy.replicas) == 2
+
+
+async def test_replica_set_multiplexed_models(ray_instance):
+    @ray.remote(num_cpus=0)
+    class MockWorker:
+        def __init__(self, replica_tag):
+            self.replica_tag = replica_tag
+
+        @ray.method(num_returns=2)
+        async def handle_request(self, request):
+            return b"", self.replica_tag
+
+    def make_replicas(model_ids):
+        return [
+            RunningReplicaInfo(
+                deployment_name="my_deployment",
+                replica_tag=str(i),
+                actor_handle=workers[i],
+                max_concurrent_queries=100,
+                multiplexed_model_ids=frozenset(model_ids[i]),
+            )
+            for i in range(2)
+        ]
+
+    def query(model_id):
+        return Query(
+            [],
+            {},
+            RequestMetadata("request-id", "endpoint", multiplexed_model_id=model_id),
+        )
+
+    workers = [MockWorker.remote(str(i)) for i in range(2)]
+    rs = ReplicaSet("my_deployment", asyncio.get_event_loop())
+    rs.update_running_replicas(make_replicas([[], ["a"]]))
+
+    # The queries for a model go to the replica that has it loaded.
+    for _ in range(10):
+        assert await (await rs.assign_replica(query("a"))) == "1"
+
+    # The queries for a new model stick to the replica they were first sent to.
+    first = await (await rs.assign_replica(query("b")))
+    for _ in range(10):
+        assert await (await rs.assign_replica(query("b"))) == first
+
+    # The loaded models are updated without resetting the replicas.
+    replica_keys = list(rs.in_flight_queries.keys())
+    rs.update_running_replicas(make_replicas([["a"], []]))
+    assert list(rs.in_flight_queries.keys()) == replica_keys
+    for _ in range(10):
+        assert await (await rs.assign_replica(query("a"))) == "0"
+
+
+async def test_router_pushes_metrics_only_when_autoscaling(ray_instance):
+    @ray.remote(num_cpus=0)
+    class MockController:
+        def __init__(self):
+            self.num_pushes = 0
+
+        async def listen_for_change(self, keys_to_snapshot_ids):
+            await asyncio.sleep(1000)
+
+        def record_handle_metrics(self, *args):
+            self.num_pushes += 1
+
+        def get_num_pushes(self):
+            return self.num_pushes
+
+    def make_replicas(autoscaling_enabled):
+        return [
+            RunningReplicaInfo(
+                deployment_name="my_deployment",
+                replica_tag="0",
+                actor_handle=worker,
+                max_concurrent_queries=1,
+                autoscaling_enabled=autoscaling_enabled,
+            )
+        ]
+
+    controller = MockController.remote()
+    worker = mock_task_runner()
+    router = Router(controller, "my_deployment", asyncio.get_event_loop())
+
+    router._update_running_replicas(make_replicas(False))
+    assert router._push_metrics_task is None
+
+    router._update_running_replicas(make_replicas(True))
+    task = router._push_metrics_task
+    assert task is not None
+    # The metrics are only pushed while there's traffic.
+    await router.assign_request(RequestMetadata("request-id", "endpoint"))
+    for _ in range(50):
+        if ray.get(controller.get_num_pushes.remote()) > 0:
+            break
+        await asyncio.sleep(0.1)
+    assert ray.get(controller.get_num_pushes.remote()) > 0
+
+    # An update of the replicas doesn't restart the task.
+    router._update_running_replicas(make_replicas(True))
+    assert router._push_metrics_task is task
+
+    router.shutdown()
+    await asyncio.sleep(0.1)
+    assert task.cancelled()
+
+    # The task is restarted if the router is reused for an autoscaling
+    # deployment.
+    router._update_running_replicas(make_replicas(True))
+    assert router._push_metrics_task not in (None, task)
+    router.shutdown()
+
+
 if __name__ == "__main__":
     import sys
 